@@ -5,20 +5,96 @@ Claude가 직접 모든 blog_posts를 분석하여 sentiments DB에 저장
 API 없이 직접 분석 수행
 """
 
+import argparse
+import bisect
+import hashlib
 import sqlite3
 import json
 import re
 from datetime import datetime
 
+from post_batch_pipeline import add_pipeline_arguments, run_post_batch, skipped_steps
+from sentiment_factors import ensure_factor_schema
+from sentiment_scorers import SCORER_BACKENDS, create_scorer
+from theme_taxonomy import load_taxonomy
+
+# FTS5 trigram 토크나이저는 3글자 이상 부분 문자열만 인덱스로 검색 가능
+TRIGRAM_MIN_LENGTH = 3
+
+# 언급 인덱스에 저장할 문맥 스니펫의 앞뒤 글자 수
+MENTION_CONTEXT_WINDOW = 40
+
+# 언급 인덱스 일괄 생성 시 한 트랜잭션에서 처리할 포스트 수
+MENTION_INDEX_BATCH_SIZE = 200
+
+# IN (...) 조회 한 번에 넘기는 ID 수 (SQLite 바인딩 변수 한도 이하)
+ID_QUERY_CHUNK_SIZE = 500
+
+# blog_posts 본문 검색용 FTS5 trigram 인덱스 (database/migrations/0009_blog_posts_fts.py)
+# 공유 테이블인 blog_posts에 동기화 트리거 3개를 설치하므로 웹 앱/다른 스크립트의 INSERT/UPDATE/DELETE도
+# FTS 인덱스를 함께 갱신함 (쓰기마다 trigram 인덱스 갱신 비용이 추가됨)
+SEARCH_INDEX_STATEMENTS = [
+    """CREATE VIRTUAL TABLE blog_posts_fts USING fts5(
+        title, content, content='blog_posts', content_rowid='id', tokenize='trigram'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS blog_posts_fts_ai AFTER INSERT ON blog_posts BEGIN
+        INSERT INTO blog_posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS blog_posts_fts_ad AFTER DELETE ON blog_posts BEGIN
+        INSERT INTO blog_posts_fts(blog_posts_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS blog_posts_fts_au AFTER UPDATE OF title, content ON blog_posts BEGIN
+        INSERT INTO blog_posts_fts(blog_posts_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO blog_posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+    "INSERT INTO blog_posts_fts(blog_posts_fts) VALUES ('rebuild')",
+]
+
+
+def ensure_search_index(conn):
+    """blog_posts_fts(trigram)와 동기화 트리거 생성 - 이미 있으면 그대로 둠 (문장 단위 실행, 커밋하지 않음)
+    trigram이 아닌 같은 이름의 FTS 테이블(트리거 없이 만들어진 것)은 지우고 다시 만듦"""
+    row = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'blog_posts_fts'"
+    ).fetchone()
+    if row and 'trigram' in row[0]:
+        return False
+    if row:
+        for trigger in ('blog_posts_fts_ai', 'blog_posts_fts_ad', 'blog_posts_fts_au'):
+            conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        conn.execute("DROP TABLE blog_posts_fts")
+    for statement in SEARCH_INDEX_STATEMENTS:
+        conn.execute(statement)
+    return True
+
+
+
+class KeywordHits:
+    """규칙 함수에 text_lower 대신 넘기는 키워드 적중 뷰 (`keyword in text_lower` 그대로 사용 가능)"""
+
+    def __init__(self, hits):
+        self.hits = hits
+
+    def __contains__(self, keyword):
+        if keyword not in self.hits:
+            raise KeyError(f"분석 아티팩트에 없는 키워드: {keyword}")
+        return bool(self.hits[keyword])
+
 class DirectClaudeAnalyzer:
-    def __init__(self):
-        self.conn = sqlite3.connect('database.db')
+    def __init__(self, db_path='database.db', scorer='keyword'):
+        self.conn = sqlite3.connect(db_path)
         self.cursor = self.conn.cursor()
         # 현재 최대 ID 확인하여 시작점 설정
         self.cursor.execute("SELECT MAX(id) FROM sentiments")
         max_id = self.cursor.fetchone()[0]
         self.next_id = (max_id + 1) if max_id else 56
         
+        # 근거/관점/불확실성 요인 정규화 테이블 (sentiments 트리거가 저장/재채점 시 함께 갱신)
+        ensure_factor_schema(self.conn)
+        self.conn.commit()
+        
         # 종목명 매핑 (확장 가능)
         self.ticker_to_name_map = {
             # 한국 종목
@@ -98,6 +174,25 @@ class DirectClaudeAnalyzer:
             'neutral': ['유지', '보합', '관망', '중립', '분석', '검토', '평가', '현황', 
                        '발표', '공시', '지켜봐야', '불확실']
         }
+        
+        # 투자 관점 테마 분류표 (config/theme-taxonomy.json)
+        self.theme_matcher = load_taxonomy()
+        
+        # 투자 기간 키워드 (앞에서부터 먼저 일치하는 기간 사용)
+        self.timeframe_keywords = [
+            ('단기', ['단기', '즉시']),
+            ('장기', ['장기', '미래']),
+            ('중기', ['중기']),
+        ]
+        
+        # 불확실성 키워드
+        self.uncertainty_keywords = ['불확실', '리스크', '변동', '우려', '가능성', '예상', '전망']
+        
+        # 최근 포스트 아티팩트 (한 포스트의 여러 종목 분석 시 재사용)
+        self._artifact_memo = (None, None)
+        
+        # 감정/점수 채점 백엔드 (sentiment_scorers.SCORER_BACKENDS)
+        self.scorer = create_scorer(scorer, self)
 
     def find_mentioned_stocks(self, text):
         """텍스트에서 언급된 종목들 찾기"""
@@ -123,18 +218,159 @@ class DirectClaudeAnalyzer:
         
         return unique_stocks
 
-    def analyze_sentiment(self, ticker, company_name, title, content):
-        """Claude가 직접 감정 분석 수행"""
+    def get_alias_patterns(self):
+        """종목별 별칭 정규식 (긴 별칭 우선) - 별칭 매핑이 바뀌면 다시 컴파일"""
+        signature = tuple((ticker, tuple(names)) for ticker, names in self.ticker_to_name_map.items())
+        if getattr(self, '_alias_signature', None) != signature:
+            self._alias_patterns = {
+                ticker: re.compile('|'.join(
+                    re.escape(name.lower()) for name in sorted(names, key=len, reverse=True)
+                ))
+                for ticker, names in self.ticker_to_name_map.items()
+            }
+            self._alias_signature = signature
+        return self._alias_patterns
+
+    def find_mention_offsets(self, text):
+        """텍스트 내 모든 종목 언급 위치 찾기 (find_mentioned_stocks와 같은 매칭 규칙)"""
+        text_lower = text.lower()
+        # lower()로 길이가 바뀌는 문자가 있으면 오프셋이 어긋나므로 원문 기준으로 매칭
+        haystack = text_lower if len(text_lower) == len(text) else text
+        
+        mentions = []
+        for ticker, pattern in self.get_alias_patterns().items():
+            for match in pattern.finditer(haystack):
+                start, end = match.span()
+                context = text[max(0, start - MENTION_CONTEXT_WINDOW):end + MENTION_CONTEXT_WINDOW]
+                mentions.append({
+                    'ticker': ticker,
+                    'alias': text[start:end],
+                    'start_offset': start,
+                    'end_offset': end,
+                    'mention_context': ' '.join(context.split())
+                })
+        
+        return mentions
+
+    def rule_keywords(self):
+        """점수 규칙이 사용하는 전체 키워드 목록"""
+        keywords = set()
+        for words in self.sentiment_keywords.values():
+            keywords.update(words)
+        for _, words in self.timeframe_keywords:
+            keywords.update(words)
+        keywords.update(self.uncertainty_keywords)
+        return keywords
+
+    def alias_hash(self):
+        """종목 별칭 매핑 해시 - 바뀌면 아티팩트의 종목별 문맥을 다시 계산"""
+        payload = json.dumps(self.ticker_to_name_map, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def find_keyword_hits(self, text_lower, keywords):
+        """키워드별 등장 위치 목록"""
+        hits = {}
+        for keyword in keywords:
+            positions = []
+            position = text_lower.find(keyword)
+            while position != -1:
+                positions.append(position)
+                position = text_lower.find(keyword, position + 1)
+            hits[keyword] = positions
+        return hits
+
+    def build_artifacts(self, title, content):
+        """텍스트 스캔 단계 결과 (문장 분리, 종목 언급 위치, 키워드 적중 위치, 테마 적중 수)"""
         full_text = f"{title}\n{content}"
-        text_lower = full_text.lower()
         
-        # 종목 관련 문맥 추출
-        context_sentences = []
+        # analyze_sentiment의 문장 분리 규칙('.' 기준)과 같은 경계
         sentences = full_text.split('.')
+        sentence_starts = []
+        position = 0
         for sentence in sentences:
-            if any(name.lower() in sentence.lower() for name in self.ticker_to_name_map.get(ticker, [])):
-                context_sentences.append(sentence.strip())
+            sentence_starts.append(position)
+            position += len(sentence) + 1
         
+        mentions = self.find_mention_offsets(full_text)
+        ticker_sentences = {}
+        for mention in mentions:
+            index = bisect.bisect_right(sentence_starts, mention['start_offset']) - 1
+            indexes = ticker_sentences.setdefault(mention['ticker'], [])
+            if index not in indexes:
+                indexes.append(index)
+        for indexes in ticker_sentences.values():
+            indexes.sort()
+        
+        used = {index for indexes in ticker_sentences.values() for index in indexes}
+        return {
+            'sentences': {str(index): sentences[index].strip() for index in sorted(used)},
+            'ticker_sentences': ticker_sentences,
+            'mentions': [[m['ticker'], m['start_offset'], m['end_offset']] for m in mentions],
+            'keyword_hits': self.find_keyword_hits(full_text.lower(), self.rule_keywords()),
+            'theme_hits': self.theme_matcher.match(full_text),
+            'taxonomy_hash': self.theme_matcher.hash,
+        }
+
+    def ensure_artifact_schema(self):
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS post_analysis_artifacts (
+                content_hash TEXT PRIMARY KEY,
+                alias_hash TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+    def get_artifacts(self, title, content):
+        """내용 해시 기준 캐시된 아티팩트 조회 - 없거나 별칭이 바뀌었으면 새로 스캔"""
+        full_text = f"{title}\n{content}"
+        content_hash = hashlib.sha1(full_text.encode('utf-8')).hexdigest()
+        if self._artifact_memo[0] == content_hash:
+            return self._artifact_memo[1]
+        
+        self.ensure_artifact_schema()
+        alias_hash = self.alias_hash()
+        self.cursor.execute(
+            "SELECT alias_hash, payload FROM post_analysis_artifacts WHERE content_hash = ?",
+            (content_hash,)
+        )
+        row = self.cursor.fetchone()
+        
+        if row and row[0] == alias_hash:
+            artifacts = json.loads(row[1])
+            # 규칙에 새 키워드가 추가된 경우 그 키워드만 스캔
+            missing = self.rule_keywords() - artifacts['keyword_hits'].keys()
+            changed = bool(missing)
+            if missing:
+                artifacts['keyword_hits'].update(self.find_keyword_hits(full_text.lower(), missing))
+            # 테마 분류표가 바뀐 경우 테마만 다시 스캔
+            if artifacts.get('taxonomy_hash') != self.theme_matcher.hash:
+                artifacts['theme_hits'] = self.theme_matcher.match(full_text)
+                artifacts['taxonomy_hash'] = self.theme_matcher.hash
+                changed = True
+        else:
+            artifacts = self.build_artifacts(title, content)
+            changed = True
+        
+        if changed:
+            self.cursor.execute("""
+                INSERT OR REPLACE INTO post_analysis_artifacts (content_hash, alias_hash, payload, updated_at)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            """, (content_hash, alias_hash, json.dumps(artifacts, ensure_ascii=False, separators=(',', ':'))))
+        
+        self._artifact_memo = (content_hash, artifacts)
+        return artifacts
+
+    def analyze_sentiment(self, ticker, company_name, title, content):
+        """Claude가 직접 감정 분석 수행"""
+        return self.score_from_artifacts(ticker, company_name, self.get_artifacts(title, content))
+
+    def keyword_sentiment(self, artifacts):
+        """키워드 개수 기반 감정 결정 - (sentiment, sentiment_score)"""
+        return self.count_keyword_sentiment(KeywordHits(artifacts['keyword_hits']))
+
+    def count_keyword_sentiment(self, text_lower):
+        """text_lower(소문자 텍스트 또는 KeywordHits)에 포함된 감정 키워드 개수로 감정 결정"""
         # 감정 점수 계산
         positive_score = sum(1 for keyword in self.sentiment_keywords['positive'] if keyword in text_lower)
         negative_score = sum(1 for keyword in self.sentiment_keywords['negative'] if keyword in text_lower)
@@ -142,14 +378,37 @@ class DirectClaudeAnalyzer:
         
         # 감정 결정
         if positive_score > negative_score and positive_score > neutral_score:
-            sentiment = 'positive'
-            sentiment_score = min(1.0, positive_score * 0.15)
+            return 'positive', min(1.0, positive_score * 0.15)
         elif negative_score > positive_score and negative_score > neutral_score:
-            sentiment = 'negative'
-            sentiment_score = max(-1.0, -negative_score * 0.15)
+            return 'negative', max(-1.0, -negative_score * 0.15)
         else:
-            sentiment = 'neutral'
-            sentiment_score = 0.0
+            return 'neutral', 0.0
+
+    def context_sentences(self, ticker, artifacts):
+        """종목 관련 문맥 문장"""
+        return [
+            artifacts['sentences'][str(index)] for index in artifacts['ticker_sentences'].get(ticker, [])
+        ]
+
+    def scoring_item(self, ticker, artifacts, company_name=None):
+        """채점 백엔드에 넘기는 (종목, 문맥) 단위"""
+        names = self.ticker_to_name_map.get(ticker, [ticker])
+        return {
+            'ticker': ticker,
+            'company_name': company_name or names[0],
+            'context_windows': self.context_sentences(ticker, artifacts),
+            'artifacts': artifacts
+        }
+
+    def score_from_artifacts(self, ticker, company_name, artifacts, scored=None):
+        """스캔 결과만으로 분석 결과 생성 (원문 재스캔 없음)
+        scored: 배치 채점 결과 (sentiment, sentiment_score) - 없으면 채점 백엔드로 단건 채점"""
+        text_lower = KeywordHits(artifacts['keyword_hits'])
+        context_sentences = self.context_sentences(ticker, artifacts)
+        
+        if scored is None:
+            scored = self.scorer.score_batch([self.scoring_item(ticker, artifacts, company_name)])[0]
+        sentiment, sentiment_score = scored
         
         # 핵심 논리 생성
         key_reasoning = self.generate_key_reasoning(ticker, company_name, context_sentences, sentiment)
@@ -158,7 +417,7 @@ class DirectClaudeAnalyzer:
         supporting_evidence = self.extract_supporting_evidence(text_lower, context_sentences)
         
         # 투자 관점 및 기타 메타데이터
-        investment_perspective = self.determine_investment_perspective(text_lower)
+        investment_perspective = self.determine_investment_perspective(artifacts.get('theme_hits', {}))
         investment_timeframe = self.determine_timeframe(text_lower)
         conviction_level = self.determine_conviction(sentiment_score)
         
@@ -214,33 +473,16 @@ class DirectClaudeAnalyzer:
             'neutral_factors': neutral_factors[:3]
         }
 
-    def determine_investment_perspective(self, text_lower):
-        """투자 관점 결정"""
-        perspectives = []
-        
-        if '파운드리' in text_lower or '반도체' in text_lower:
-            perspectives.append('반도체')
-        if '배터리' in text_lower or '전기차' in text_lower:
-            perspectives.append('전기차')
-        if 'AI' in text_lower or '인공지능' in text_lower:
-            perspectives.append('AI')
-        if '조선' in text_lower or '선박' in text_lower:
-            perspectives.append('조선')
-        if '제약' in text_lower or '바이오' in text_lower:
-            perspectives.append('바이오')
-        
-        return perspectives[:3] if perspectives else ['일반']
+    def determine_investment_perspective(self, theme_hits):
+        """투자 관점 결정 - 테마 적중 수 상위 (분류표 maxThemesPerPost개, 없으면 '일반')"""
+        return self.theme_matcher.top_themes(theme_hits)
 
     def determine_timeframe(self, text_lower):
         """투자 기간 결정"""
-        if '단기' in text_lower or '즉시' in text_lower:
-            return '단기'
-        elif '장기' in text_lower or '미래' in text_lower:
-            return '장기'
-        elif '중기' in text_lower:
-            return '중기'
-        else:
-            return '중장기'
+        for timeframe, keywords in self.timeframe_keywords:
+            if any(keyword in text_lower for keyword in keywords):
+                return timeframe
+        return '중장기'
 
     def determine_conviction(self, sentiment_score):
         """확신 수준 결정"""
@@ -258,8 +500,7 @@ class DirectClaudeAnalyzer:
         """불확실성 요인 추출"""
         factors = []
         
-        uncertainty_keywords = ['불확실', '리스크', '변동', '우려', '가능성', '예상', '전망']
-        for keyword in uncertainty_keywords:
+        for keyword in self.uncertainty_keywords:
             if keyword in text_lower:
                 factors.append(keyword)
         
@@ -267,6 +508,7 @@ class DirectClaudeAnalyzer:
 
     def save_to_db(self, log_no, ticker, analysis):
         """분석 결과를 DB에 저장"""
+        self.ensure_mention_index_schema()
         try:
             self.cursor.execute("""
                 INSERT INTO sentiments (
@@ -290,6 +532,10 @@ class DirectClaudeAnalyzer:
             ))
             
             self.next_id += 1
+            self.cursor.execute(
+                "UPDATE merry_post_stock_mentions SET mention_sentiment = ? WHERE log_no = ? AND ticker = ?",
+                (analysis['sentiment'], log_no, ticker)
+            )
             return True
         except Exception as e:
             print(f"Error saving to DB: {e}")
@@ -299,13 +545,13 @@ class DirectClaudeAnalyzer:
         """모든 미분석 포스트 분석"""
         print("Claude direct analysis starting...")
         
-        # 미분석 포스트 조회
-        self.cursor.execute("""
+        # 미분석 포스트 조회 (중복 포스트는 원본만 분석)
+        self.cursor.execute(f"""
             SELECT DISTINCT bp.id, bp.title, bp.content, bp.created_date
             FROM blog_posts bp
-            WHERE bp.id NOT IN (
-                SELECT DISTINCT log_no FROM sentiments
-            )
+            WHERE bp.content IS NOT NULL AND NOT EXISTS (
+                SELECT 1 FROM sentiments s WHERE s.log_no = bp.id
+            ){self.duplicate_filter_sql()}
             ORDER BY bp.created_date DESC
         """)
         
@@ -319,40 +565,341 @@ class DirectClaudeAnalyzer:
             
             # 종목 찾기
             mentioned_stocks = self.find_mentioned_stocks(f"{title} {content}")
+            self.save_mentions(log_no, title, content)
             
-            if mentioned_stocks:
-                for stock in mentioned_stocks:
-                    # 이미 분석된 종목인지 확인
-                    self.cursor.execute(
-                        "SELECT id FROM sentiments WHERE log_no = ? AND ticker = ?",
-                        (log_no, stock['ticker'])
-                    )
-                    if self.cursor.fetchone():
-                        continue
-                    
-                    # 감정 분석 수행
-                    analysis = self.analyze_sentiment(
-                        stock['ticker'],
-                        stock['name'],
-                        title,
-                        content
-                    )
-                    
-                    # DB 저장
-                    if self.save_to_db(log_no, stock['ticker'], analysis):
-                        total_analyses += 1
-                        print(f"  - {stock['ticker']}: {analysis['sentiment']} ({analysis['sentiment_score']})")
+            total_analyses += self.analyze_post(log_no, title, content, mentioned_stocks)
         
         self.conn.commit()
         print(f"\nAnalysis complete: Total {total_analyses} saved")
+
+    def rescore_all(self):
+        """저장된 sentiments 전체를 캐시된 아티팩트로 다시 채점 (규칙 변경 반영용)"""
+        print("Rescoring from cached artifacts...")
+        
+        read_cursor = self.conn.cursor()
+        read_cursor.execute("""
+            SELECT s.id, s.log_no, s.ticker, bp.title, bp.content
+            FROM sentiments s
+            JOIN blog_posts bp ON bp.id = s.log_no
+            WHERE bp.content IS NOT NULL
+            ORDER BY s.log_no
+        """)
+        
+        total = 0
+        while True:
+            rows = read_cursor.fetchmany(MENTION_INDEX_BATCH_SIZE)
+            if not rows:
+                break
+            
+            items = []
+            for sentiment_id, log_no, ticker, title, content in rows:
+                items.append(self.scoring_item(ticker, self.get_artifacts(title or '', content or '')))
+            
+            updates = []
+            for (sentiment_id, *_), item, scored in zip(rows, items, self.scorer.score_batch(items)):
+                analysis = self.score_from_artifacts(item['ticker'], item['company_name'], item['artifacts'], scored)
+                updates.append((
+                    analysis['sentiment'],
+                    analysis['sentiment_score'],
+                    analysis['key_reasoning'],
+                    json.dumps(analysis['supporting_evidence'], ensure_ascii=False),
+                    json.dumps(analysis['investment_perspective'], ensure_ascii=False),
+                    analysis['investment_timeframe'],
+                    analysis['conviction_level'],
+                    json.dumps(analysis['uncertainty_factors'], ensure_ascii=False),
+                    analysis['mention_context'],
+                    sentiment_id
+                ))
+            
+            self.cursor.executemany("""
+                UPDATE sentiments SET
+                    sentiment = ?, sentiment_score = ?, key_reasoning = ?,
+                    supporting_evidence = ?, investment_perspective = ?, investment_timeframe = ?,
+                    conviction_level = ?, uncertainty_factors = ?, mention_context = ?
+                WHERE id = ?
+            """, updates)
+            total += len(updates)
+            self.conn.commit()
+            print(f"  - {total} sentiments rescored")
+        
+        self.ensure_mention_index_schema()
+        self.cursor.execute("""
+            UPDATE merry_post_stock_mentions SET mention_sentiment = COALESCE((
+                SELECT s.sentiment FROM sentiments s
+                WHERE s.log_no = merry_post_stock_mentions.log_no
+                  AND s.ticker = merry_post_stock_mentions.ticker
+            ), mention_sentiment)
+        """)
+        self.conn.commit()
+        print(f"\nRescore complete: {total} sentiments updated")
+        return total
+
+    def duplicate_filter_sql(self):
+        """post_dedup.py가 중복으로 표시한 포스트 제외 조건 (서명 테이블이 없으면 빈 문자열)"""
+        self.cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'post_minhash_signatures'"
+        )
+        if not self.cursor.fetchone():
+            return ''
+        return """
+              AND NOT EXISTS (
+                SELECT 1 FROM post_minhash_signatures pms
+                WHERE pms.post_id = bp.id AND pms.duplicate_of IS NOT NULL
+              )"""
+
+    def analyze_post(self, log_no, title, content, stocks):
+        """포스트 하나의 언급 종목을 한 번에 채점 후 저장 - 이미 분석된 종목은 건너뜀"""
+        pending = []
+        for stock in stocks:
+            self.cursor.execute(
+                "SELECT id FROM sentiments WHERE log_no = ? AND ticker = ?",
+                (log_no, stock['ticker'])
+            )
+            if not self.cursor.fetchone():
+                pending.append(stock)
+        if not pending:
+            return 0
+        
+        artifacts = self.get_artifacts(title, content)
+        items = [self.scoring_item(stock['ticker'], artifacts, stock['name']) for stock in pending]
+        
+        saved = 0
+        for stock, scored in zip(pending, self.scorer.score_batch(items)):
+            analysis = self.score_from_artifacts(stock['ticker'], stock['name'], artifacts, scored)
+            if self.save_to_db(log_no, stock['ticker'], analysis):
+                saved += 1
+                print(f"  - {stock['ticker']}: {analysis['sentiment']} ({analysis['sentiment_score']})")
+        return saved
+
+    def analyze_pair(self, log_no, title, content, stock):
+        """(포스트, 종목) 한 쌍 분석 후 저장 - 이미 분석된 쌍은 건너뜀"""
+        return self.analyze_post(log_no, title, content, [stock]) > 0
+
+    def ensure_mention_index_schema(self):
+        """merry_post_stock_mentions에 오프셋 컬럼과 중복 방지 인덱스 추가"""
+        if getattr(self, '_mention_schema_ready', False):
+            return
+        
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS merry_post_stock_mentions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                log_no INTEGER NOT NULL,
+                ticker VARCHAR(20) NOT NULL,
+                mention_sentiment VARCHAR(10) DEFAULT 'neutral',
+                mention_context TEXT,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        self.cursor.execute("PRAGMA table_info(merry_post_stock_mentions)")
+        columns = {row[1] for row in self.cursor.fetchall()}
+        for column, definition in [('alias', 'TEXT'), ('start_offset', 'INTEGER'), ('end_offset', 'INTEGER')]:
+            if column not in columns:
+                self.cursor.execute(f"ALTER TABLE merry_post_stock_mentions ADD COLUMN {column} {definition}")
+        
+        self.cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_post_mentions_unique
+            ON merry_post_stock_mentions(log_no, ticker, start_offset)
+        """)
+        self.cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_post_mentions_ticker_log_no
+            ON merry_post_stock_mentions(ticker, log_no)
+        """)
+        self._mention_schema_ready = True
+
+    def save_mentions(self, log_no, title, content):
+        """포스트의 종목 언급 위치를 merry_post_stock_mentions에 저장 (재실행해도 결과 동일)"""
+        self.ensure_mention_index_schema()
+        # 오프셋은 analyze_sentiment와 같은 "제목\n본문" 기준
+        mentions = self.find_mention_offsets(f"{title}\n{content}")
+        
+        self.cursor.execute("DELETE FROM merry_post_stock_mentions WHERE log_no = ?", (log_no,))
+        self.cursor.executemany("""
+            INSERT INTO merry_post_stock_mentions (
+                log_no, ticker, alias, start_offset, end_offset, mention_context, mention_sentiment
+            ) VALUES (?, ?, ?, ?, ?, ?, COALESCE(
+                (SELECT sentiment FROM sentiments WHERE log_no = ? AND ticker = ?), 'neutral'
+            ))
+        """, [
+            (log_no, m['ticker'], m['alias'], m['start_offset'], m['end_offset'],
+             m['mention_context'], log_no, m['ticker'])
+            for m in mentions
+        ])
+        return len(mentions)
+
+    def index_all_mentions(self):
+        """전체 포스트의 종목 언급 인덱스 재생성"""
+        print("Mention index rebuild starting...")
+        self.ensure_mention_index_schema()
+        
+        read_cursor = self.conn.cursor()
+        # 본문이 아카이브된 포스트의 기존 언급은 그대로 둠 (post_archive 참고)
+        read_cursor.execute("SELECT id, title, content FROM blog_posts WHERE content IS NOT NULL ORDER BY id")
+        
+        total_posts = 0
+        total_mentions = 0
+        while True:
+            rows = read_cursor.fetchmany(MENTION_INDEX_BATCH_SIZE)
+            if not rows:
+                break
+            for log_no, title, content in rows:
+                total_mentions += self.save_mentions(log_no, title or '', content or '')
+            total_posts += len(rows)
+            self.conn.commit()
+            print(f"  - {total_posts} posts indexed ({total_mentions} mentions)")
+        
+        print(f"\nMention index complete: {total_mentions} mentions in {total_posts} posts")
+        return total_mentions
+
+    def ensure_search_index(self):
+        """blog_posts 본문 검색용 FTS5 trigram 인덱스 생성 (공유 blog_posts에 동기화 트리거 설치)"""
+        if ensure_search_index(self.conn):
+            self.conn.commit()
+
+    def find_candidate_posts(self, aliases):
+        """검색 인덱스로 별칭이 등장하는 포스트 ID 후보 집합 조회"""
+        self.ensure_search_index()
+        candidate_ids = set()
+        
+        for alias in aliases:
+            if len(alias) >= TRIGRAM_MIN_LENGTH:
+                phrase = '"' + alias.replace('"', '""') + '"'
+                self.cursor.execute(
+                    "SELECT rowid FROM blog_posts_fts WHERE blog_posts_fts MATCH ?", (phrase,)
+                )
+            else:
+                # trigram으로 찾을 수 없는 짧은 별칭(삼성, LG 등)은 본문 직접 검색
+                self.cursor.execute(
+                    "SELECT id FROM blog_posts WHERE content IS NOT NULL AND instr(lower(title || ' ' || content), lower(?)) > 0",
+                    (alias,)
+                )
+            candidate_ids.update(row[0] for row in self.cursor.fetchall())
+        
+        return candidate_ids
+
+    def backfill_tickers(self, ticker_aliases):
+        """종목별 별칭이 등장하는 후보 포스트만 골라 (포스트, 종목) 쌍 분석"""
+        total_analyses = 0
+        
+        for ticker, aliases in ticker_aliases.items():
+            candidate_ids = self.find_candidate_posts(aliases)
+            print(f"\n[{ticker}] 후보 포스트: {len(candidate_ids)}개 (별칭: {', '.join(aliases)})")
+            if not candidate_ids:
+                continue
+            
+            duplicate_filter = self.duplicate_filter_sql()
+            posts = []
+            ids = sorted(candidate_ids)
+            for start in range(0, len(ids), ID_QUERY_CHUNK_SIZE):
+                chunk = ids[start:start + ID_QUERY_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                self.cursor.execute(f"""
+                    SELECT bp.id, bp.title, bp.content, bp.created_date
+                    FROM blog_posts bp
+                    WHERE bp.id IN ({placeholders}) AND bp.content IS NOT NULL
+                      AND NOT EXISTS (
+                        SELECT 1 FROM sentiments s WHERE s.log_no = bp.id AND s.ticker = ?
+                      ){duplicate_filter}
+                """, (*chunk, ticker))
+                posts.extend(self.cursor.fetchall())
+            posts.sort(key=lambda row: row[3] or '', reverse=True)
+            
+            for log_no, title, content, _ in posts:
+                # 후보는 검색 인덱스 기준이므로 기존 종목 매칭 규칙으로 한 번 더 확인
+                mentioned = self.find_mentioned_stocks(f"{title} {content}")
+                self.save_mentions(log_no, title, content)
+                stock = next((s for s in mentioned if s['ticker'] == ticker), None)
+                if stock and self.analyze_pair(log_no, title, content, stock):
+                    total_analyses += 1
+        
+        self.conn.commit()
+        print(f"\nBackfill complete: Total {total_analyses} saved")
+        return total_analyses
+
+    def backfill_ticker(self, ticker):
+        """특정 종목만 전체 포스트 대상으로 백필"""
+        if ticker not in self.ticker_to_name_map:
+            raise ValueError(f"종목 매핑에 없는 티커: {ticker}")
+        return self.backfill_tickers({ticker: self.ticker_to_name_map[ticker]})
+
+    def save_alias_snapshot(self):
+        self.cursor.execute("DELETE FROM analyzer_alias_snapshot")
+        self.cursor.executemany(
+            "INSERT INTO analyzer_alias_snapshot (ticker, alias) VALUES (?, ?)",
+            [(ticker, name) for ticker, names in self.ticker_to_name_map.items() for name in names]
+        )
+        self.conn.commit()
+
+    def backfill_since_alias_change(self):
+        """마지막 실행 이후 추가된 별칭만 대상으로 백필
+        첫 실행(스냅샷 없음)은 모든 별칭이 새 별칭이 되어 전체 재분석과 같으므로 백필 없이 기준 스냅샷만 저장
+        (전체 백필이 필요하면 --ticker 또는 기본 분석 모드 사용)"""
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS analyzer_alias_snapshot (
+                ticker TEXT NOT NULL,
+                alias TEXT NOT NULL,
+                PRIMARY KEY (ticker, alias)
+            )
+        """)
+        self.cursor.execute("SELECT ticker, alias FROM analyzer_alias_snapshot")
+        known = set(self.cursor.fetchall())
+        if not known:
+            self.save_alias_snapshot()
+            print("별칭 기준 스냅샷 저장 (첫 실행 - 백필 없음, 이후 추가되는 별칭부터 백필)")
+            return 0
+        
+        added = {}
+        for ticker, names in self.ticker_to_name_map.items():
+            new_aliases = [name for name in names if (ticker, name) not in known]
+            if new_aliases:
+                added[ticker] = new_aliases
+        
+        if not added:
+            print("변경된 별칭 없음")
+            return 0
+        
+        total_analyses = self.backfill_tickers(added)
+        self.save_alias_snapshot()
+        return total_analyses
         
     def close(self):
         """DB 연결 종료"""
         self.conn.close()
 
 if __name__ == "__main__":
-    analyzer = DirectClaudeAnalyzer()
+    parser = argparse.ArgumentParser(description="blog_posts 감정 분석")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--ticker', help="해당 종목 별칭이 등장하는 포스트만 백필")
+    mode.add_argument('--since-alias-change', action='store_true',
+                      help="마지막 실행 이후 추가된 별칭이 등장하는 포스트만 백필 (첫 실행은 기준 스냅샷만 저장)")
+    mode.add_argument('--index-mentions', action='store_true',
+                      help="전체 포스트의 종목 언급 인덱스(merry_post_stock_mentions) 재생성")
+    mode.add_argument('--rescore', action='store_true',
+                      help="기존 sentiments를 캐시된 분석 아티팩트로 다시 채점")
+    parser.add_argument('--scorer', default='keyword', choices=sorted(SCORER_BACKENDS),
+                        help="감정 채점 백엔드")
+    parser.add_argument('--db', default='database.db', help="SQLite DB 경로")
+    add_pipeline_arguments(parser)
+    args = parser.parse_args()
+    
+    analyzer = DirectClaudeAnalyzer(args.db, args.scorer)
     try:
-        analyzer.analyze_all_posts()
+        # 모드별로 바뀌는 입력 - 후처리는 이 입력에 의존하는 단계만 실행
+        if args.ticker:
+            analyzer.backfill_ticker(args.ticker)
+            changes = {'sentiments', 'mentions'}
+        elif args.since_alias_change:
+            analyzer.backfill_since_alias_change()
+            changes = {'sentiments', 'mentions'}
+        elif args.index_mentions:
+            analyzer.index_all_mentions()
+            changes = {'mentions'}
+        elif args.rescore:
+            analyzer.rescore_all()
+            changes = {'sentiments'}
+        else:
+            analyzer.analyze_all_posts()
+            changes = {'content', 'sentiments', 'mentions'}
     finally:
-        analyzer.close()
\ No newline at end of file
+        analyzer.close()
+
+    run_post_batch(args.db, changes, skipped_steps(args), theme_matcher=analyzer.theme_matcher)
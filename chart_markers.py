@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+종목 차트 메르 언급 마커(파란 원) 사전 계산 (docs/stock-page-requirements.md)
+종목별로 작성일 → 거래일 정렬, 종가, 포스트 ID, 감정을 미리 계산해 chart_markers 테이블에 종목당 1행으로 저장
+기간(1M/3M/6M/1Y) 구간은 날짜마다 달라지므로 저장하지 않고 읽는 쪽에서 markers_for_period로 자름
+(shard_export.py 종목 샤드 → src/app/api/merry/stocks/[ticker]/route.ts가 요청 시점 기준으로 나눔)
+소스(감정/언급/가격)가 바뀐 종목만 다시 계산 - 날짜가 바뀌었다는 이유만으로는 다시 계산하지 않음
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+from collections import defaultdict
+from datetime import datetime
+
+import numpy as np
+
+from post_dates import KST, created_dates_array
+from trading_calendar import calendar_for
+
+# Stock Price API와 같은 기간 정의
+CHART_PERIODS = {'1M': 30, '3M': 90, '6M': 180, '1Y': 365}
+
+# 하나의 날짜에 여러 감정이 있으면 긍정 > 부정 > 중립 순으로 표시
+SENTIMENT_PRIORITY = ['positive', 'negative', 'neutral']
+
+
+def markers_for_period(markers, period, as_of=None):
+    """전체 마커 중 기간(CHART_PERIODS) 안에 작성일이 있는 마커 - as_of: 기준일 (기본값 KST 오늘)"""
+    as_of = np.datetime64(as_of or datetime.now(KST).date(), 'D')
+    start = str(as_of - CHART_PERIODS[period])
+    return [marker for marker in markers if marker['postDates'][-1] >= start]
+
+
+class ChartMarkerBuilder:
+    def __init__(self, db_path='database.db'):
+        self.conn = sqlite3.connect(db_path)
+        self.cursor = self.conn.cursor()
+
+    def table_exists(self, name):
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,))
+        return self.cursor.fetchone() is not None
+
+    def ensure_schema(self):
+        # 기간별로 행을 나눠 저장하던 이전 형식은 파생 데이터라 지우고 다시 계산
+        self.cursor.execute("PRAGMA table_info(chart_markers)")
+        if 'period' in {row[1] for row in self.cursor.fetchall()}:
+            self.cursor.execute("DROP TABLE chart_markers")
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS chart_markers (
+                ticker TEXT PRIMARY KEY,
+                marker_count INTEGER NOT NULL,
+                payload TEXT NOT NULL,
+                source_hash TEXT NOT NULL,
+                built_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            ) WITHOUT ROWID
+        """)
+
+    def duplicate_filter_sql(self):
+        """post_dedup.py가 중복으로 표시한 포스트는 마커에서 제외"""
+        if not self.table_exists('post_minhash_signatures'):
+            return ''
+        return " AND bp.id NOT IN (SELECT post_id FROM post_minhash_signatures WHERE duplicate_of IS NOT NULL)"
+
+    def mention_sources(self):
+        """(ticker, log_no) 언급 목록 SQL - sentiments + merry_post_stock_mentions"""
+        sources = ["SELECT ticker, log_no FROM sentiments"]
+        if self.table_exists('merry_post_stock_mentions'):
+            sources.append("SELECT ticker, log_no FROM merry_post_stock_mentions")
+        return " UNION ".join(sources)
+
+    def source_hashes(self):
+        """종목별 소스 지문 - 감정/언급/가격 중 하나라도 바뀌면 달라짐 (기준일은 포함하지 않음)"""
+        parts = defaultdict(list)
+        self.cursor.execute("""
+            SELECT ticker, COUNT(*), MAX(id), TOTAL(sentiment_score), GROUP_CONCAT(SUBSTR(sentiment, 1, 3), '')
+            FROM sentiments GROUP BY ticker
+        """)
+        for ticker, *values in self.cursor.fetchall():
+            parts[ticker].append(f"s{values}")
+
+        if self.table_exists('merry_post_stock_mentions'):
+            self.cursor.execute("SELECT ticker, COUNT(DISTINCT log_no), MAX(log_no) FROM merry_post_stock_mentions GROUP BY ticker")
+            for ticker, *values in self.cursor.fetchall():
+                parts[ticker].append(f"m{values}")
+
+        if self.table_exists('stock_daily_prices'):
+            self.cursor.execute("SELECT ticker, COUNT(*), MAX(trade_date), TOTAL(close_price) FROM stock_daily_prices GROUP BY ticker")
+            for ticker, *values in self.cursor.fetchall():
+                if ticker in parts:
+                    parts[ticker].append(f"p{values}")
+
+        return {
+            ticker: hashlib.sha1('|'.join(values).encode('utf-8')).hexdigest()
+            for ticker, values in parts.items()
+            if any(value.startswith(('s', 'm')) for value in values)
+        }
+
+    def stored_hashes(self):
+        self.cursor.execute("SELECT ticker, source_hash FROM chart_markers")
+        return dict(self.cursor.fetchall())
+
+    def load_posts(self, tickers):
+        """종목별 [(log_no, created_date, sentiment, sentiment_score)]"""
+        self.cursor.execute(f"""
+            SELECT m.ticker, bp.id, bp.created_date, s.sentiment, s.sentiment_score
+            FROM ({self.mention_sources()}) m
+            JOIN blog_posts bp ON bp.id = m.log_no
+            LEFT JOIN sentiments s ON s.log_no = m.log_no AND s.ticker = m.ticker
+            WHERE 1 = 1{self.duplicate_filter_sql()}
+            ORDER BY m.ticker, bp.id
+        """)
+        posts = defaultdict(list)
+        for ticker, *row in self.cursor.fetchall():
+            if ticker in tickers:
+                posts[ticker].append(row)
+        return posts
+
+    def load_prices(self, tickers):
+        """종목별 (거래일 배열, 종가 배열)"""
+        if not self.table_exists('stock_daily_prices'):
+            return {}
+        self.cursor.execute("SELECT ticker, trade_date, close_price FROM stock_daily_prices ORDER BY ticker, trade_date")
+        grouped = defaultdict(lambda: ([], []))
+        for ticker, trade_date, close_price in self.cursor.fetchall():
+            if ticker in tickers:
+                grouped[ticker][0].append(str(trade_date)[:10])
+                grouped[ticker][1].append(close_price)
+        return {
+            ticker: (np.array(dates, dtype='datetime64[D]'), np.array(closes, dtype=np.float64))
+            for ticker, (dates, closes) in grouped.items()
+        }
+
+    def load_markets(self):
+        if not self.table_exists('merry_mentioned_stocks'):
+            return {}
+        self.cursor.execute("SELECT ticker, market FROM merry_mentioned_stocks")
+        return dict(self.cursor.fetchall())
+
+    @staticmethod
+    def build_markers(ticker, market, posts, prices):
+        """작성일 → 당일/다음 거래일 정렬 후 거래일별 마커 목록 (작성일 배열과 함께 반환)"""
+        post_dates = created_dates_array([row[1] for row in posts])
+        valid = ~np.isnat(post_dates)
+        posts = [row for row, ok in zip(posts, valid) if ok]
+        post_dates = post_dates[valid]
+        if not posts:
+            return []
+
+        # 캘린더 범위(휴장일 목록이 있는 연도) 밖 작성일은 그대로 두고 이후 첫 가격 행에 맞춤
+        calendar = calendar_for(market, ticker)
+        indices = calendar.index_on_or_after(post_dates)
+        trade_days = np.where(indices >= 0, calendar.day_at(indices), post_dates)
+
+        # 정렬된 거래일에 가격이 없으면 그 이후 첫 가격 행에 표시 (가격 없으면 price는 None)
+        closes = np.full(len(posts), np.nan)
+        if prices is not None and len(prices[0]):
+            price_dates, price_closes = prices
+            positions = np.searchsorted(price_dates, trade_days, side='left')
+            has_price = positions < len(price_dates)
+            trade_days[has_price] = price_dates[positions[has_price]]
+            closes[has_price] = price_closes[positions[has_price]]
+
+        grouped = defaultdict(list)
+        for i in np.argsort(trade_days, kind='stable'):
+            grouped[str(trade_days[i])].append(i)
+
+        markers = []
+        for trade_date, members in grouped.items():
+            sentiments = [posts[i][2] for i in members if posts[i][2]]
+            scores = [posts[i][3] for i in members if posts[i][3] is not None]
+            sentiment = next((s for s in SENTIMENT_PRIORITY if s in sentiments), None)
+            markers.append({
+                'date': trade_date,
+                'postDates': sorted({str(post_dates[i]) for i in members}),
+                'price': None if np.isnan(closes[members[0]]) else round(float(closes[members[0]]), 4),
+                'postIds': [int(posts[i][0]) for i in members],
+                'sentiment': sentiment,
+                'sentimentScore': round(sum(scores) / len(scores), 3) if scores else None,
+            })
+        return markers
+
+    def refresh(self, tickers=None, force=False):
+        """소스가 바뀐 종목만 마커 재계산 - 갱신한 종목 수"""
+        self.ensure_schema()
+        current = self.source_hashes()
+        stored = {} if force else self.stored_hashes()
+
+        targets = {
+            ticker for ticker, digest in current.items()
+            if stored.get(ticker) != digest and (not tickers or ticker in tickers)
+        }
+        stale = [(ticker,) for ticker in stored if ticker not in current and (not tickers or ticker in tickers)]
+        self.cursor.executemany("DELETE FROM chart_markers WHERE ticker = ?", stale)
+        if not targets:
+            self.conn.commit()
+            return 0
+
+        posts = self.load_posts(targets)
+        prices = self.load_prices(targets)
+        markets = self.load_markets()
+
+        records = []
+        for ticker in sorted(targets):
+            markers = self.build_markers(ticker, markets.get(ticker), posts.get(ticker, []), prices.get(ticker))
+            records.append((
+                ticker, len(markers), json.dumps(markers, ensure_ascii=False, separators=(',', ':')), current[ticker]
+            ))
+
+        self.cursor.executemany("""
+            INSERT OR REPLACE INTO chart_markers (ticker, marker_count, payload, source_hash, built_at)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, records)
+        self.conn.commit()
+        return len(targets)
+
+    def close(self):
+        """DB 연결 종료"""
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="종목 차트 언급 마커 사전 계산")
+    parser.add_argument('--ticker', action='append', help="대상 종목 (여러 번 지정 가능)")
+    parser.add_argument('--force', action='store_true', help="변경 여부와 관계없이 전체 재계산")
+    parser.add_argument('--db', default='database.db', help="SQLite DB 경로")
+    args = parser.parse_args()
+
+    builder = ChartMarkerBuilder(args.db)
+    try:
+        count = builder.refresh(set(args.ticker or []) or None, args.force)
+        print(f"차트 마커 갱신 완료: {count}개 종목")
+    finally:
+        builder.close()
@@ -0,0 +1,366 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+종목 동시 언급 그래프 (종목 × 종목 희소 인접 행렬)
+한 포스트에 함께 언급된 종목 쌍마다 포스트 수 / 시간 감쇠 가중치를 ticker_comentions에 누적하고
+종목별 상위 k개 이웃(가중치 순, lift 포함)을 ticker_related에 저장 → 종목 페이지 '관련 종목'은 인덱스 조회 한 번
+포스트별 종목 집합(comention_post_tickers)과 비교해 새 포스트 / 언급이 바뀐 포스트의 쌍만 더하고 뺌
+바뀐 포스트는 sentiments / merry_post_stock_mentions / blog_posts / post_minhash_signatures 트리거(마이그레이션 0011)가
+comention_dirty_posts에 기록하므로 갱신 시 전체 언급을 다시 읽지 않고, 순위도 쌍이 바뀐 종목만 다시 매김
+"""
+
+import argparse
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+
+from post_dates import KST, created_dates_array
+
+# 감쇠 가중치 반감기 (일) - 바꾸면 --rebuild 필요
+HALF_LIFE_DAYS = 180
+# 가중치는 기준일 대비 2^((작성일 - 기준일) / 반감기)로 저장해 새 포스트는 더하기만 하면 됨
+# (조회 시점 가중치 = 저장값 × 2^(-(오늘 - 기준일) / 반감기), 종목 내 순위에는 영향 없음)
+WEIGHT_REFERENCE_DAY = np.datetime64('2023-01-01', 'D')
+DEFAULT_TOP_K = 10
+# 바뀐 포스트 조회 시 IN (...) 한 번에 넘기는 ID 수
+DIRTY_QUERY_CHUNK_SIZE = 500
+
+# 언급 / 작성일 / 중복 표시가 바뀐 포스트를 comention_dirty_posts에 기록하는 트리거
+# (database/migrations/0011_comention_dirty_triggers.py가 설치 - 공유 테이블에 걸리므로 스크립트에서 만들지 않음)
+DIRTY_TRIGGER_NAMES = (
+    'trg_comention_sentiments_insert', 'trg_comention_sentiments_delete', 'trg_comention_sentiments_update',
+    'trg_comention_mentions_insert', 'trg_comention_mentions_delete', 'trg_comention_mentions_update',
+    'trg_comention_posts_update', 'trg_comention_posts_delete',
+    'trg_comention_duplicates_insert', 'trg_comention_duplicates_update', 'trg_comention_duplicates_delete',
+)
+
+SCHEMA_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS comention_post_tickers (
+        log_no INTEGER NOT NULL,
+        ticker TEXT NOT NULL,
+        post_day INTEGER NOT NULL,
+        PRIMARY KEY (log_no, ticker)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS ticker_comentions (
+        ticker_a TEXT NOT NULL,
+        ticker_b TEXT NOT NULL,
+        post_count INTEGER NOT NULL,
+        weight REAL NOT NULL,
+        PRIMARY KEY (ticker_a, ticker_b)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS ticker_related (
+        ticker TEXT NOT NULL,
+        rank INTEGER NOT NULL,
+        related_ticker TEXT NOT NULL,
+        post_count INTEGER NOT NULL,
+        weight REAL NOT NULL,
+        lift REAL NOT NULL,
+        built_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (ticker, rank)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_comention_post_tickers_ticker ON comention_post_tickers(ticker)",
+    """
+    CREATE TABLE IF NOT EXISTS comention_dirty_posts (
+        log_no INTEGER PRIMARY KEY
+    )
+    """,
+]
+
+
+def pair_indices(group_ids):
+    """그룹 ID로 정렬된 배열에서 같은 그룹 안의 모든 (i, j) 위치 쌍 (i < j)"""
+    n = len(group_ids)
+    if n < 2:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    boundaries = np.flatnonzero(group_ids[1:] != group_ids[:-1]) + 1
+    group_ends = np.repeat(np.append(boundaries, n), np.diff(np.concatenate([[0], boundaries, [n]])))
+    positions = np.arange(n)
+    counts = group_ends - positions - 1
+    firsts = np.repeat(positions, counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return firsts, firsts + 1 + offsets
+
+
+class ComentionGraph:
+    def __init__(self, db_path='database.db', top_k=DEFAULT_TOP_K):
+        self.conn = sqlite3.connect(db_path)
+        self.cursor = self.conn.cursor()
+        self.top_k = top_k
+
+    def table_exists(self, name):
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,))
+        return self.cursor.fetchone() is not None
+
+    def ensure_schema(self):
+        for statement in SCHEMA_STATEMENTS:
+            self.cursor.execute(statement)
+
+    def dirty_tracking_installed(self):
+        """마이그레이션 0011의 변경 기록 트리거가 모두 있는지"""
+        self.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_comention_%'")
+        return {row[0] for row in self.cursor.fetchall()}.issuperset(DIRTY_TRIGGER_NAMES)
+
+    def duplicate_filter_sql(self):
+        """post_dedup.py가 중복으로 표시한 포스트는 제외 (같은 글이 쌍을 두 번 세지 않도록)"""
+        if not self.table_exists('post_minhash_signatures'):
+            return ''
+        return " AND bp.id NOT IN (SELECT post_id FROM post_minhash_signatures WHERE duplicate_of IS NOT NULL)"
+
+    def mention_sources(self, where=''):
+        """(ticker, log_no) 언급 목록 SQL - sentiments + merry_post_stock_mentions (각 원본에 where 조건 적용)"""
+        sources = [f"SELECT ticker, log_no FROM sentiments{where}"]
+        if self.table_exists('merry_post_stock_mentions'):
+            sources.append(f"SELECT ticker, log_no FROM merry_post_stock_mentions{where}")
+        return " UNION ".join(sources)
+
+    def load_current(self, log_nos=None):
+        """현재 언급 기준 {log_no: (작성일 일수, 정렬된 종목 튜플)} - log_nos가 있으면 그 포스트만"""
+        if log_nos is None:
+            chunks = [([], '')]
+        else:
+            ids = sorted(log_nos)
+            chunks = [
+                (ids[i:i + DIRTY_QUERY_CHUNK_SIZE],
+                 f" WHERE log_no IN ({','.join('?' * len(ids[i:i + DIRTY_QUERY_CHUNK_SIZE]))})")
+                for i in range(0, len(ids), DIRTY_QUERY_CHUNK_SIZE)
+            ]
+        rows = []
+        for chunk, where in chunks:
+            sources = self.mention_sources(where)
+            # 원본마다 같은 ID 목록을 바인딩
+            params = chunk * (sources.count('?') // len(chunk)) if chunk else []
+            self.cursor.execute(f"""
+                SELECT m.log_no, m.ticker, bp.created_date
+                FROM ({sources}) m
+                JOIN blog_posts bp ON bp.id = m.log_no
+                WHERE 1 = 1{self.duplicate_filter_sql()}
+                ORDER BY m.log_no, m.ticker
+            """, params)
+            rows.extend(self.cursor.fetchall())
+        days = created_dates_array([row[2] for row in rows])
+        posts = {}
+        for (log_no, ticker, _), day in zip(rows, days):
+            if np.isnat(day):
+                continue
+            posts.setdefault(log_no, (int(day.astype(np.int64)), []))[1].append(ticker)
+        return {log_no: (day, tuple(tickers)) for log_no, (day, tickers) in posts.items()}
+
+    def load_stored(self, log_nos=None):
+        """마지막 갱신 때 반영한 {log_no: (작성일 일수, 정렬된 종목 튜플)} - log_nos가 있으면 그 포스트만"""
+        if log_nos is None:
+            self.cursor.execute("SELECT log_no, ticker, post_day FROM comention_post_tickers ORDER BY log_no, ticker")
+            rows = self.cursor.fetchall()
+        else:
+            ids = sorted(log_nos)
+            rows = []
+            for i in range(0, len(ids), DIRTY_QUERY_CHUNK_SIZE):
+                chunk = ids[i:i + DIRTY_QUERY_CHUNK_SIZE]
+                self.cursor.execute(f"""
+                    SELECT log_no, ticker, post_day FROM comention_post_tickers
+                    WHERE log_no IN ({','.join('?' * len(chunk))}) ORDER BY log_no, ticker
+                """, chunk)
+                rows.extend(self.cursor.fetchall())
+        posts = {}
+        for log_no, ticker, day in rows:
+            posts.setdefault(log_no, (day, []))[1].append(ticker)
+        return {log_no: (day, tuple(tickers)) for log_no, (day, tickers) in posts.items()}
+
+    @staticmethod
+    def pair_deltas(posts, sign):
+        """[(작성일 일수, 종목 튜플)] → ([(ticker_a, ticker_b)], 포스트 수 변화 배열, 가중치 변화 배열) (ticker_a < ticker_b)"""
+        post_ids = np.repeat(np.arange(len(posts)), [len(tickers) for _, tickers in posts])
+        if len(post_ids) < 2:
+            return [], np.zeros(0), np.zeros(0)
+        tickers = np.array([ticker for _, post_tickers in posts for ticker in post_tickers])
+        first, second = pair_indices(post_ids)
+        days = np.array([day for day, _ in posts], dtype=np.float64)
+        reference = float(WEIGHT_REFERENCE_DAY.astype(np.int64))
+        weights = np.exp2((days[post_ids[first]] - reference) / HALF_LIFE_DAYS)
+        pairs = list(zip(tickers[first].tolist(), tickers[second].tolist()))
+        return pairs, np.full(len(pairs), sign, dtype=np.int64), sign * weights
+
+    def refresh(self, rebuild=False):
+        """언급이 바뀐 포스트(comention_dirty_posts)의 쌍만 반영하고 그 종목들의 관련 종목 순위만 재계산
+        - 반영한 포스트 수 (rebuild / 변경 기록 트리거가 없는 DB는 전체 비교)"""
+        self.ensure_schema()
+        full = rebuild
+        if not self.dirty_tracking_installed():
+            print("⚠️ 변경 기록 트리거 없음 - python db_migrate.py 실행 전까지 매번 전체 비교")
+            full = True
+        if rebuild:
+            self.cursor.execute("DELETE FROM comention_post_tickers")
+            self.cursor.execute("DELETE FROM ticker_comentions")
+        self.cursor.execute("SELECT log_no FROM comention_dirty_posts")
+        dirty = [row[0] for row in self.cursor.fetchall()]
+        if full:
+            current = self.load_current()
+            stored = self.load_stored()
+            candidates = current.keys() | stored.keys()
+        else:
+            current = self.load_current(dirty)
+            stored = self.load_stored(dirty)
+            candidates = dirty
+        changed = [log_no for log_no in candidates if current.get(log_no) != stored.get(log_no)]
+        # 읽은 기록만 지움 (그 사이 다른 연결이 추가한 기록은 다음 갱신에서 처리)
+        self.cursor.executemany("DELETE FROM comention_dirty_posts WHERE log_no = ?", [(n,) for n in dirty])
+        if not changed and not rebuild:
+            self.conn.commit()
+            return 0
+
+        old_pairs, old_counts, old_weights = self.pair_deltas([stored[n] for n in changed if n in stored], -1)
+        new_pairs, new_counts, new_weights = self.pair_deltas([current[n] for n in changed if n in current], 1)
+        pairs = old_pairs + new_pairs
+        if pairs:
+            # 같은 쌍의 변화량을 합쳐 upsert 한 번으로 반영
+            keys, inverse = np.unique(np.array(pairs), axis=0, return_inverse=True)
+            inverse = inverse.reshape(-1)
+            counts = np.bincount(inverse, weights=np.concatenate([old_counts, new_counts]), minlength=len(keys))
+            weights = np.bincount(inverse, weights=np.concatenate([old_weights, new_weights]), minlength=len(keys))
+            self.cursor.executemany("""
+                INSERT INTO ticker_comentions (ticker_a, ticker_b, post_count, weight)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(ticker_a, ticker_b) DO UPDATE SET
+                    post_count = post_count + excluded.post_count,
+                    weight = weight + excluded.weight
+            """, [
+                (str(a), str(b), int(round(c)), float(w))
+                for (a, b), c, w in zip(keys, counts, weights) if round(c) != 0 or abs(w) > 1e-12
+            ])
+            self.cursor.execute("DELETE FROM ticker_comentions WHERE post_count <= 0")
+
+        self.cursor.executemany("DELETE FROM comention_post_tickers WHERE log_no = ?", [(n,) for n in changed])
+        self.cursor.executemany(
+            "INSERT INTO comention_post_tickers (log_no, ticker, post_day) VALUES (?, ?, ?)",
+            [(n, ticker, current[n][0]) for n in changed if n in current for ticker in current[n][1]]
+        )
+        if full:
+            self.build_related()
+        else:
+            # 쌍이 바뀐 종목은 양 끝 모두 바뀐 포스트의 종목 집합 안에 있음
+            affected = {ticker for posts in (stored, current) for n in changed if n in posts for ticker in posts[n][1]}
+            self.build_related(affected)
+            self.refresh_related_scores()
+        self.conn.commit()
+        return len(changed)
+
+    def ticker_post_counts(self):
+        """종목별 포스트 수 / 전체 포스트 수 (lift 계산용)"""
+        self.cursor.execute("SELECT ticker, COUNT(*) FROM comention_post_tickers GROUP BY ticker")
+        ticker_posts = dict(self.cursor.fetchall())
+        self.cursor.execute("SELECT COUNT(DISTINCT log_no) FROM comention_post_tickers")
+        return ticker_posts, self.cursor.fetchone()[0]
+
+    @staticmethod
+    def decay_today():
+        """저장 가중치 → 오늘 기준 감쇠 가중치 배수"""
+        today = np.datetime64(datetime.now(KST).date(), 'D')
+        return np.exp2(-float((today - WEIGHT_REFERENCE_DAY).astype(np.int64)) / HALF_LIFE_DAYS)
+
+    def build_related(self, tickers=None):
+        """종목별 상위 k개 이웃 (오늘 기준 감쇠 가중치 순) + lift = P(a,b) / (P(a)·P(b))
+        tickers가 있으면 그 종목들의 순위만 다시 계산"""
+        if tickers is None:
+            self.cursor.execute("SELECT ticker_a, ticker_b, post_count, weight FROM ticker_comentions")
+            rows = self.cursor.fetchall()
+            self.cursor.execute("DELETE FROM ticker_related")
+        else:
+            tickers = sorted(tickers)
+            rows = []
+            for i in range(0, len(tickers), DIRTY_QUERY_CHUNK_SIZE):
+                chunk = tickers[i:i + DIRTY_QUERY_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                self.cursor.execute(f"""
+                    SELECT ticker_a, ticker_b, post_count, weight FROM ticker_comentions
+                    WHERE ticker_a IN ({placeholders}) OR ticker_b IN ({placeholders})
+                """, chunk * 2)
+                rows.extend(self.cursor.fetchall())
+                self.cursor.execute(f"DELETE FROM ticker_related WHERE ticker IN ({placeholders})", chunk)
+            rows = list(dict.fromkeys(rows))
+        if not rows:
+            return
+
+        ticker_posts, total_posts = self.ticker_post_counts()
+        decay = self.decay_today()
+
+        # 양방향 간선으로 펼친 뒤 (종목, -가중치, -포스트 수, 이웃) 순 정렬
+        a = np.array([row[0] for row in rows])
+        b = np.array([row[1] for row in rows])
+        sources = np.concatenate([a, b])
+        targets = np.concatenate([b, a])
+        counts = np.tile(np.array([row[2] for row in rows], dtype=np.int64), 2)
+        weights = np.tile(np.array([row[3] for row in rows], dtype=np.float64), 2) * decay
+        if tickers is not None:
+            selected = np.isin(sources, tickers)
+            sources, targets, counts, weights = sources[selected], targets[selected], counts[selected], weights[selected]
+        source_posts = np.array([ticker_posts.get(t, 0) for t in sources], dtype=np.float64)
+        target_posts = np.array([ticker_posts.get(t, 0) for t in targets], dtype=np.float64)
+        lifts = np.divide(counts * float(total_posts), source_posts * target_posts,
+                          out=np.zeros(len(counts)), where=(source_posts * target_posts) > 0)
+
+        order = np.lexsort((targets, -counts, -weights, sources))
+        sources, targets, counts, weights, lifts = (x[order] for x in (sources, targets, counts, weights, lifts))
+        starts = np.concatenate([[0], np.flatnonzero(sources[1:] != sources[:-1]) + 1])
+        ranks = np.arange(len(sources)) - np.repeat(starts, np.diff(np.append(starts, len(sources))))
+        keep = ranks < self.top_k
+
+        self.cursor.executemany("""
+            INSERT INTO ticker_related (ticker, rank, related_ticker, post_count, weight, lift)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [
+            (str(s), int(r) + 1, str(t), int(c), round(float(w), 6), round(float(l), 4))
+            for s, r, t, c, w, l in zip(sources[keep], ranks[keep], targets[keep], counts[keep], weights[keep], lifts[keep])
+        ])
+
+    def refresh_related_scores(self):
+        """순위를 다시 매기지 않은 종목의 저장된 가중치(오늘 기준 감쇠) / lift(전체 포스트 수 변화)만 갱신"""
+        ticker_posts, total_posts = self.ticker_post_counts()
+        decay = self.decay_today()
+        self.cursor.execute("""
+            SELECT r.ticker, r.rank, r.related_ticker, c.post_count, c.weight
+            FROM ticker_related r
+            JOIN ticker_comentions c
+              ON c.ticker_a = MIN(r.ticker, r.related_ticker) AND c.ticker_b = MAX(r.ticker, r.related_ticker)
+        """)
+        updates = []
+        for ticker, rank, related_ticker, count, weight in self.cursor.fetchall():
+            denominator = ticker_posts.get(ticker, 0) * ticker_posts.get(related_ticker, 0)
+            lift = count * total_posts / denominator if denominator else 0.0
+            updates.append((round(weight * decay, 6), round(lift, 4), ticker, rank))
+        self.cursor.executemany("UPDATE ticker_related SET weight = ?, lift = ? WHERE ticker = ? AND rank = ?", updates)
+
+    def related(self, ticker):
+        """관련 종목 [(related_ticker, post_count, weight, lift)] 순위순"""
+        self.cursor.execute("""
+            SELECT related_ticker, post_count, weight, lift FROM ticker_related
+            WHERE ticker = ? ORDER BY rank
+        """, (ticker,))
+        return self.cursor.fetchall()
+
+    def close(self):
+        """DB 연결 종료"""
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="종목 동시 언급 그래프 / 관련 종목 사전 계산")
+    parser.add_argument('--db', default='database.db', help="SQLite DB 경로")
+    parser.add_argument('--top-k', type=int, default=DEFAULT_TOP_K, help="종목별 저장할 관련 종목 수")
+    parser.add_argument('--rebuild', action='store_true', help="전체 포스트로 다시 계산")
+    parser.add_argument('--ticker', help="관련 종목 조회")
+    args = parser.parse_args()
+
+    graph = ComentionGraph(args.db, args.top_k)
+    try:
+        print(f"동시 언급 그래프 갱신: {graph.refresh(args.rebuild)}개 포스트 반영")
+        if args.ticker:
+            for related_ticker, post_count, weight, lift in graph.related(args.ticker):
+                print(f"  {related_ticker}: {post_count}개 포스트, 가중치 {weight:.3f}, lift {lift:.2f}")
+    finally:
+        graph.close()
@@ -0,0 +1,32 @@
+-- 메르 블로그 핵심 테이블 (SQLite)
+-- 기존 database.db에 이미 있으면 건드리지 않음
+
+CREATE TABLE IF NOT EXISTS blog_posts (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  log_no TEXT UNIQUE, -- 네이버 블로그 글 번호
+  title TEXT NOT NULL,
+  content TEXT,
+  excerpt TEXT,
+  created_date DATETIME NOT NULL, -- 밀리초 타임스탬프 또는 'YYYY-MM-DD HH:MM:SS'
+  category TEXT,
+  views INTEGER DEFAULT 0,
+  blog_type TEXT DEFAULT 'merry',
+  updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 종목별 감정 분석 (log_no = blog_posts.id)
+CREATE TABLE IF NOT EXISTS sentiments (
+  id INTEGER PRIMARY KEY,
+  log_no INTEGER NOT NULL,
+  ticker TEXT NOT NULL,
+  sentiment TEXT NOT NULL CHECK (sentiment IN ('positive', 'negative', 'neutral')),
+  sentiment_score REAL,
+  key_reasoning TEXT,
+  supporting_evidence TEXT, -- JSON
+  investment_perspective TEXT, -- JSON
+  investment_timeframe TEXT,
+  conviction_level TEXT,
+  uncertainty_factors TEXT, -- JSON
+  mention_context TEXT,
+  analysis_date DATE
+);
@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+"""
+sentiments.post_id → log_no 통일
+예전 스크립트(insert_new_ids.py)가 post_id 컬럼으로 만든 DB를 분석기 스키마에 맞춤
+"""
+
+
+def upgrade(conn):
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(sentiments)")}
+    if 'post_id' in columns and 'log_no' not in columns:
+        conn.execute("ALTER TABLE sentiments RENAME COLUMN post_id TO log_no")
+    elif 'post_id' in columns:
+        conn.execute("UPDATE sentiments SET log_no = post_id WHERE log_no IS NULL")
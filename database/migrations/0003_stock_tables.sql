@@ -0,0 +1,48 @@
+-- 종목/주가/언급 테이블 (database/sqlite_stock_schema.sql 기준)
+-- 언급 테이블의 추가 컬럼과 인덱스는 기존 DB 호환을 위해 0004에서 추가
+
+CREATE TABLE IF NOT EXISTS merry_mentioned_stocks (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  ticker VARCHAR(20) NOT NULL UNIQUE,
+  name VARCHAR(200) NOT NULL,
+  market VARCHAR(20) NOT NULL,
+  currency VARCHAR(3) NOT NULL DEFAULT 'USD',
+  is_mentioned BOOLEAN DEFAULT TRUE,
+  first_mentioned_at DATETIME,
+  last_mentioned_at DATETIME,
+  mention_count INTEGER DEFAULT 1,
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS stock_daily_prices (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  ticker VARCHAR(20) NOT NULL,
+  trade_date DATE NOT NULL,
+  close_price REAL NOT NULL,
+  volume INTEGER DEFAULT 0,
+  high_price REAL,
+  low_price REAL,
+  open_price REAL,
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  FOREIGN KEY (ticker) REFERENCES merry_mentioned_stocks(ticker) ON DELETE CASCADE,
+  UNIQUE(ticker, trade_date)
+);
+
+CREATE TABLE IF NOT EXISTS merry_post_stock_mentions (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  log_no INTEGER NOT NULL,
+  ticker VARCHAR(20) NOT NULL,
+  mention_sentiment VARCHAR(10) DEFAULT 'neutral',
+  mention_context TEXT,
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  FOREIGN KEY (ticker) REFERENCES merry_mentioned_stocks(ticker) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_ticker ON merry_mentioned_stocks(ticker);
+CREATE INDEX IF NOT EXISTS idx_is_mentioned ON merry_mentioned_stocks(is_mentioned);
+CREATE INDEX IF NOT EXISTS idx_market ON merry_mentioned_stocks(market);
+CREATE INDEX IF NOT EXISTS idx_last_mentioned ON merry_mentioned_stocks(last_mentioned_at);
+CREATE INDEX IF NOT EXISTS idx_ticker_date ON stock_daily_prices(ticker, trade_date);
+CREATE INDEX IF NOT EXISTS idx_trade_date ON stock_daily_prices(trade_date);
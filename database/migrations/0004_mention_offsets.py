@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""
+merry_post_stock_mentions 감정/별칭/오프셋 컬럼과 인덱스
+(analyze_all_posts.py ensure_mention_index_schema와 같은 결과)
+"""
+
+
+def upgrade(conn):
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(merry_post_stock_mentions)")}
+    for column, definition in [
+        ('mention_sentiment', "VARCHAR(10) DEFAULT 'neutral'"),
+        ('mention_context', 'TEXT'),
+        ('alias', 'TEXT'),
+        ('start_offset', 'INTEGER'),
+        ('end_offset', 'INTEGER'),
+    ]:
+        if column not in columns:
+            conn.execute(f"ALTER TABLE merry_post_stock_mentions ADD COLUMN {column} {definition}")
+
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_post_mentions_log_no ON merry_post_stock_mentions(log_no)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_post_mentions_ticker ON merry_post_stock_mentions(ticker)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_post_mentions_sentiment ON merry_post_stock_mentions(mention_sentiment)")
+    conn.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_post_mentions_unique
+        ON merry_post_stock_mentions(log_no, ticker, start_offset)
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_post_mentions_ticker_log_no
+        ON merry_post_stock_mentions(ticker, log_no)
+    """)
@@ -0,0 +1,8 @@
+-- 분석기/웹 앱 주요 조회용 인덱스 (python db_migrate.py --audit 결과 기준)
+
+-- 분석 여부 확인 (log_no, ticker), 포스트별 조회, 종목별 감정 목록
+CREATE INDEX IF NOT EXISTS idx_sentiments_log_no_ticker ON sentiments(log_no, ticker);
+CREATE INDEX IF NOT EXISTS idx_sentiments_ticker ON sentiments(ticker, log_no);
+
+-- 최신 포스트 목록 / 기간 필터
+CREATE INDEX IF NOT EXISTS idx_blog_posts_created_date ON blog_posts(created_date);
@@ -0,0 +1,80 @@
+-- 포트폴리오 거래/성과 테이블 (database/portfolio_schema.sql의 SQLite 버전)
+-- portfolio_snapshots.py가 transactions + stock_daily_prices로 portfolio_performance 일간 스냅샷 계산
+
+CREATE TABLE IF NOT EXISTS portfolios (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  user_id INTEGER NOT NULL,
+  name VARCHAR(100) NOT NULL,
+  description TEXT,
+  investment_goal TEXT DEFAULT 'balanced',
+  target_amount DECIMAL(15,2),
+  currency VARCHAR(3) DEFAULT 'KRW',
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  is_active BOOLEAN DEFAULT TRUE
+);
+
+-- 기존 DB에 다른 형태(ticker 컬럼)의 stocks가 있으면 그대로 사용
+CREATE TABLE IF NOT EXISTS stocks (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  symbol VARCHAR(20) NOT NULL UNIQUE, -- 종목 코드 (stock_daily_prices.ticker)
+  name VARCHAR(200) NOT NULL,
+  market VARCHAR(50),
+  country VARCHAR(3) DEFAULT 'US',
+  currency VARCHAR(3) DEFAULT 'USD',
+  sector VARCHAR(100),
+  industry VARCHAR(100),
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  is_active BOOLEAN DEFAULT TRUE
+);
+
+CREATE TABLE IF NOT EXISTS portfolio_holdings (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  portfolio_id INTEGER NOT NULL,
+  stock_id INTEGER NOT NULL,
+  shares DECIMAL(20,8) NOT NULL,
+  avg_purchase_price DECIMAL(15,4) NOT NULL,
+  total_cost DECIMAL(15,2) NOT NULL,
+  first_purchase_date DATE NOT NULL,
+  last_purchase_date DATE,
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  FOREIGN KEY (portfolio_id) REFERENCES portfolios(id) ON DELETE CASCADE,
+  UNIQUE(portfolio_id, stock_id)
+);
+
+CREATE TABLE IF NOT EXISTS transactions (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  portfolio_id INTEGER NOT NULL,
+  stock_id INTEGER NOT NULL,
+  transaction_type TEXT NOT NULL CHECK (transaction_type IN ('buy', 'sell')),
+  shares DECIMAL(20,8) NOT NULL,
+  price DECIMAL(15,4) NOT NULL,
+  total_amount DECIMAL(15,2) NOT NULL,
+  commission DECIMAL(10,2) DEFAULT 0,
+  notes TEXT,
+  transaction_date DATE NOT NULL,
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  FOREIGN KEY (portfolio_id) REFERENCES portfolios(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS portfolio_performance (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  portfolio_id INTEGER NOT NULL,
+  total_value DECIMAL(15,2) NOT NULL,
+  total_cost DECIMAL(15,2) NOT NULL,
+  total_gain_loss DECIMAL(15,2) NOT NULL,
+  total_return_percent DECIMAL(8,4) NOT NULL,
+  daily_change DECIMAL(15,2),
+  daily_change_percent DECIMAL(5,2),
+  cash_balance DECIMAL(15,2) DEFAULT 0,
+  snapshot_date DATE NOT NULL,
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  FOREIGN KEY (portfolio_id) REFERENCES portfolios(id) ON DELETE CASCADE,
+  UNIQUE(portfolio_id, snapshot_date)
+);
+
+CREATE INDEX IF NOT EXISTS idx_portfolio_holdings_portfolio ON portfolio_holdings(portfolio_id);
+CREATE INDEX IF NOT EXISTS idx_transactions_portfolio_date ON transactions(portfolio_id, transaction_date);
+CREATE INDEX IF NOT EXISTS idx_portfolio_performance_date ON portfolio_performance(snapshot_date);
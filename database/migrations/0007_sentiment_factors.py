@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+sentiments JSON 요인/관점 정규화 테이블, 인덱스, 동기화 트리거 + 기존 행 백필
+(작성 시점의 sentiment_factors.py SCHEMA_STATEMENTS를 그대로 옮겨 둔 것 - 이후 모듈이 바뀌어도 이 마이그레이션은 고정)
+"""
+
+
+def upgrade(conn):
+    created = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sentiment_factors'"
+    ).fetchone() is None
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS sentiment_factors (
+            sentiment_id INTEGER NOT NULL,
+            factor_type TEXT NOT NULL,
+            factor TEXT NOT NULL,
+            PRIMARY KEY (sentiment_id, factor_type, factor)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS sentiment_perspectives (
+            sentiment_id INTEGER NOT NULL,
+            perspective TEXT NOT NULL,
+            PRIMARY KEY (sentiment_id, perspective)
+        ) WITHOUT ROWID
+    """)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_sentiment_factors_factor ON sentiment_factors(factor_type, factor, sentiment_id)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_sentiment_perspectives_perspective "
+        "ON sentiment_perspectives(perspective, sentiment_id)"
+    )
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_sentiment_factors_insert
+        AFTER INSERT ON sentiments
+        BEGIN
+            INSERT OR IGNORE INTO sentiment_factors (sentiment_id, factor_type, factor)
+            SELECT NEW.id, REPLACE(e.key, '_factors', ''), f.value
+            FROM json_each(CASE WHEN json_valid(NEW.supporting_evidence) THEN NEW.supporting_evidence ELSE '{}' END) e,
+                 json_each(e.value) f
+            WHERE e.type = 'array' AND typeof(e.key) = 'text' AND f.type = 'text'
+            UNION
+            SELECT NEW.id, 'uncertainty', u.value
+            FROM json_each(CASE WHEN json_valid(NEW.uncertainty_factors) THEN NEW.uncertainty_factors ELSE '[]' END) u
+            WHERE u.type = 'text';
+            INSERT OR IGNORE INTO sentiment_perspectives (sentiment_id, perspective)
+            SELECT NEW.id, p.value
+            FROM json_each(CASE WHEN json_valid(NEW.investment_perspective) THEN NEW.investment_perspective ELSE '[]' END) p
+            WHERE p.type = 'text';
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_sentiment_factors_update
+        AFTER UPDATE OF supporting_evidence, investment_perspective, uncertainty_factors ON sentiments
+        BEGIN
+            DELETE FROM sentiment_factors WHERE sentiment_id = OLD.id;
+            DELETE FROM sentiment_perspectives WHERE sentiment_id = OLD.id;
+            INSERT OR IGNORE INTO sentiment_factors (sentiment_id, factor_type, factor)
+            SELECT NEW.id, REPLACE(e.key, '_factors', ''), f.value
+            FROM json_each(CASE WHEN json_valid(NEW.supporting_evidence) THEN NEW.supporting_evidence ELSE '{}' END) e,
+                 json_each(e.value) f
+            WHERE e.type = 'array' AND typeof(e.key) = 'text' AND f.type = 'text'
+            UNION
+            SELECT NEW.id, 'uncertainty', u.value
+            FROM json_each(CASE WHEN json_valid(NEW.uncertainty_factors) THEN NEW.uncertainty_factors ELSE '[]' END) u
+            WHERE u.type = 'text';
+            INSERT OR IGNORE INTO sentiment_perspectives (sentiment_id, perspective)
+            SELECT NEW.id, p.value
+            FROM json_each(CASE WHEN json_valid(NEW.investment_perspective) THEN NEW.investment_perspective ELSE '[]' END) p
+            WHERE p.type = 'text';
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_sentiment_factors_delete
+        AFTER DELETE ON sentiments
+        BEGIN
+            DELETE FROM sentiment_factors WHERE sentiment_id = OLD.id;
+            DELETE FROM sentiment_perspectives WHERE sentiment_id = OLD.id;
+        END
+    """)
+
+    if not created:
+        return
+    # 처음 만들 때만 기존 sentiments 전체 백필
+    conn.execute("""
+        INSERT OR IGNORE INTO sentiment_factors (sentiment_id, factor_type, factor)
+        SELECT s.id, REPLACE(e.key, '_factors', ''), f.value
+        FROM sentiments s,
+             json_each(CASE WHEN json_valid(s.supporting_evidence) THEN s.supporting_evidence ELSE '{}' END) e,
+             json_each(e.value) f
+        WHERE e.type = 'array' AND typeof(e.key) = 'text' AND f.type = 'text'
+        UNION
+        SELECT s.id, 'uncertainty', u.value
+        FROM sentiments s,
+             json_each(CASE WHEN json_valid(s.uncertainty_factors) THEN s.uncertainty_factors ELSE '[]' END) u
+        WHERE u.type = 'text'
+    """)
+    conn.execute("""
+        INSERT OR IGNORE INTO sentiment_perspectives (sentiment_id, perspective)
+        SELECT s.id, p.value
+        FROM sentiments s,
+             json_each(CASE WHEN json_valid(s.investment_perspective) THEN s.investment_perspective ELSE '[]' END) p
+        WHERE p.type = 'text'
+    """)
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""
+post_sections 테이블 / 무효화 트리거
+(웹 목록 API / 오늘의 메르 한마디가 post_sections를 바로 조인하므로 항상 존재해야 함)
+작성 시점의 post_sections.py SCHEMA_STATEMENTS를 그대로 옮겨 둔 것 - 이후 모듈이 바뀌어도 이 마이그레이션은 고정
+본문 파싱은 파서 코드가 필요하므로 여기서 하지 않음 - 마이그레이션 후 `python post_sections.py`로 기존 포스트를 채움
+(행이 없는 포스트는 API에서 요약이 NULL로 나올 뿐이고, 수집 데몬이 새 포스트는 바로 파싱함)
+"""
+
+
+def upgrade(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS post_sections (
+            post_id INTEGER PRIMARY KEY,
+            summary TEXT NOT NULL DEFAULT '',
+            body TEXT NOT NULL DEFAULT '',
+            comment TEXT NOT NULL DEFAULT '',
+            parsed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    # 아카이브로 본문만 비우는 변경(content = NULL)은 섹션을 지우지 않음 (아카이브 포스트 섹션은 동결)
+    conn.execute("DROP TRIGGER IF EXISTS trg_post_sections_content_update")
+    conn.execute("""
+        CREATE TRIGGER trg_post_sections_content_update
+        AFTER UPDATE OF content ON blog_posts
+        WHEN NEW.content IS NOT NULL
+        BEGIN
+            DELETE FROM post_sections WHERE post_id = NEW.id;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_post_sections_delete
+        AFTER DELETE ON blog_posts
+        BEGIN
+            DELETE FROM post_sections WHERE post_id = OLD.id;
+        END
+    """)
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+blog_posts 본문 검색용 FTS5 trigram 인덱스(blog_posts_fts)와 동기화 트리거
+(--ticker / --since-alias-change 백필의 후보 검색 - 작성 시점의 analyze_all_posts.py SEARCH_INDEX_STATEMENTS를
+그대로 옮겨 둔 것, 이후 모듈이 바뀌어도 이 마이그레이션은 고정)
+
+주의: 공유 테이블 blog_posts에 트리거 3개(blog_posts_fts_ai / _ad / _au)를 설치함
+ - 웹 앱 / 크롤러 / 포맷팅 스크립트의 모든 INSERT, DELETE, title·content UPDATE가 FTS 인덱스도 갱신
+ - 아카이브(content = NULL)된 포스트는 FTS에서 빠짐
+ - 트리거를 지우면 인덱스가 원본과 어긋나므로 지울 때는 blog_posts_fts도 함께 삭제
+"""
+
+FTS_TRIGGERS = ('blog_posts_fts_ai', 'blog_posts_fts_ad', 'blog_posts_fts_au')
+
+
+def upgrade(conn):
+    row = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'blog_posts_fts'"
+    ).fetchone()
+    if row and 'trigram' in row[0]:
+        return
+    # trigram이 아닌 같은 이름의 FTS 테이블(트리거 없이 만들어진 것)은 지우고 다시 만듦
+    if row:
+        for trigger in FTS_TRIGGERS:
+            conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        conn.execute("DROP TABLE blog_posts_fts")
+
+    conn.execute("""
+        CREATE VIRTUAL TABLE blog_posts_fts USING fts5(
+            title, content, content='blog_posts', content_rowid='id', tokenize='trigram'
+        )
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS blog_posts_fts_ai AFTER INSERT ON blog_posts BEGIN
+            INSERT INTO blog_posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS blog_posts_fts_ad AFTER DELETE ON blog_posts BEGIN
+            INSERT INTO blog_posts_fts(blog_posts_fts, rowid, title, content)
+            VALUES ('delete', old.id, old.title, old.content);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS blog_posts_fts_au AFTER UPDATE OF title, content ON blog_posts BEGIN
+            INSERT INTO blog_posts_fts(blog_posts_fts, rowid, title, content)
+            VALUES ('delete', old.id, old.title, old.content);
+            INSERT INTO blog_posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+        END
+    """)
+    conn.execute("INSERT INTO blog_posts_fts(blog_posts_fts) VALUES ('rebuild')")
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+blog_posts.content NOT NULL 제거 (post_archive.py가 아카이브한 포스트는 본문을 NULL로 남김)
+운영 DB처럼 content TEXT NOT NULL로 만들어진 테이블만 다시 만듦 - 이미 NULL을 허용하면 아무것도 하지 않음
+SQLite는 컬럼 제약을 바꿀 수 없으므로 같은 정의(NOT NULL만 제거)로 새 테이블을 만들어 행을 옮기고
+blog_posts에 걸린 인덱스/트리거를 원래 SQL 그대로 다시 만듦 (id가 그대로라 FTS rowid / 다른 테이블 참조 유지)
+"""
+
+import re
+
+_CREATE_TABLE = re.compile(r'^\s*CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?["`\[]?blog_posts["`\]]?', re.IGNORECASE)
+_CONTENT_NOT_NULL = re.compile(
+    r'((?:^|[(,])\s*["`\[]?content["`\]]?\s[^,]*?)\s+NOT\s+NULL(\s+ON\s+CONFLICT\s+\w+)?', re.IGNORECASE
+)
+
+
+def upgrade(conn):
+    columns = {row[1]: row[3] for row in conn.execute("PRAGMA table_info(blog_posts)")}
+    if not columns.get('content'):
+        return
+
+    table_sql, = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'blog_posts'").fetchone()
+    rebuilt_sql, replaced = _CONTENT_NOT_NULL.subn(r'\1', table_sql, count=1)
+    if not replaced:
+        raise RuntimeError(f"blog_posts.content NOT NULL 제약을 찾지 못함: {table_sql}")
+    rebuilt_sql = _CREATE_TABLE.sub('CREATE TABLE blog_posts_rebuild', rebuilt_sql, count=1)
+
+    dependents = conn.execute("""
+        SELECT sql FROM sqlite_master
+        WHERE tbl_name = 'blog_posts' AND type IN ('index', 'trigger') AND sql IS NOT NULL
+        ORDER BY type = 'trigger', name
+    """).fetchall()
+    sequence = conn.execute(
+        "SELECT seq FROM sqlite_sequence WHERE name = 'blog_posts'"
+    ).fetchone() if conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_sequence'"
+    ).fetchone() else None
+
+    conn.execute(rebuilt_sql)
+    conn.execute("INSERT INTO blog_posts_rebuild SELECT * FROM blog_posts")
+    conn.execute("DROP TABLE blog_posts")
+    # 다른 테이블의 트리거 / 뷰가 blog_posts를 참조해도 이름 변경이 스키마 검사에 걸리지 않도록
+    conn.execute("PRAGMA legacy_alter_table = ON")
+    try:
+        conn.execute("ALTER TABLE blog_posts_rebuild RENAME TO blog_posts")
+    finally:
+        conn.execute("PRAGMA legacy_alter_table = OFF")
+    for sql, in dependents:
+        conn.execute(sql)
+    if sequence:
+        # 마지막 행이 삭제돼 있어도 AUTOINCREMENT가 예전 id를 다시 쓰지 않도록
+        conn.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'blog_posts'", sequence)
+
+    if conn.execute("PRAGMA foreign_key_check(blog_posts)").fetchall():
+        raise RuntimeError("blog_posts 재생성 후 외래 키 불일치")
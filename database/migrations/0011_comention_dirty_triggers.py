@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+동시 언급 그래프(comention_graph.py) 변경 기록 테이블과 공유 테이블 트리거
+sentiments / merry_post_stock_mentions / blog_posts / post_minhash_signatures 변경마다
+comention_dirty_posts에 포스트 ID 한 행을 남김 (웹에서 쓰는 쓰기에도 걸리므로 스크립트 실행이 아니라 여기서 관리)
+트리거 대상인 중복 서명 테이블(post_dedup.py)도 함께 만듦 - 작성 시점 정의를 그대로 옮겨 둔 것
+트리거가 없던 DB는 설치 전 변경이 기록되지 않았으므로 전체 포스트를 변경 기록에 넣어 다음 갱신이 전체 비교하게 함
+"""
+
+_DIRTY = "INSERT OR IGNORE INTO comention_dirty_posts (log_no) VALUES"
+TRIGGERS = {
+    'trg_comention_sentiments_insert': f"AFTER INSERT ON sentiments BEGIN {_DIRTY} (NEW.log_no); END",
+    'trg_comention_sentiments_delete': f"AFTER DELETE ON sentiments BEGIN {_DIRTY} (OLD.log_no); END",
+    'trg_comention_sentiments_update':
+        f"AFTER UPDATE OF log_no, ticker ON sentiments BEGIN {_DIRTY} (OLD.log_no); {_DIRTY} (NEW.log_no); END",
+    'trg_comention_mentions_insert': f"AFTER INSERT ON merry_post_stock_mentions BEGIN {_DIRTY} (NEW.log_no); END",
+    'trg_comention_mentions_delete': f"AFTER DELETE ON merry_post_stock_mentions BEGIN {_DIRTY} (OLD.log_no); END",
+    'trg_comention_mentions_update':
+        f"AFTER UPDATE OF log_no, ticker ON merry_post_stock_mentions BEGIN {_DIRTY} (OLD.log_no); {_DIRTY} (NEW.log_no); END",
+    'trg_comention_posts_update': f"AFTER UPDATE OF created_date ON blog_posts BEGIN {_DIRTY} (NEW.id); END",
+    'trg_comention_posts_delete': f"AFTER DELETE ON blog_posts BEGIN {_DIRTY} (OLD.id); END",
+    'trg_comention_duplicates_insert': f"AFTER INSERT ON post_minhash_signatures BEGIN {_DIRTY} (NEW.post_id); END",
+    'trg_comention_duplicates_update':
+        f"AFTER UPDATE OF duplicate_of ON post_minhash_signatures BEGIN {_DIRTY} (NEW.post_id); END",
+    'trg_comention_duplicates_delete': f"AFTER DELETE ON post_minhash_signatures BEGIN {_DIRTY} (OLD.post_id); END",
+}
+
+
+def upgrade(conn):
+    conn.execute("CREATE TABLE IF NOT EXISTS comention_dirty_posts (log_no INTEGER PRIMARY KEY)")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS post_minhash_signatures (
+            post_id INTEGER PRIMARY KEY,
+            content_hash TEXT NOT NULL,
+            signature BLOB NOT NULL,
+            duplicate_of INTEGER,
+            similarity REAL,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS post_lsh_buckets (
+            band INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            post_id INTEGER NOT NULL,
+            PRIMARY KEY (band, bucket, post_id)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_post_lsh_buckets_post_id ON post_lsh_buckets(post_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_post_minhash_duplicate_of ON post_minhash_signatures(duplicate_of)")
+
+    existing = {row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_comention_%'"
+    )}
+    for name, body in TRIGGERS.items():
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        conn.execute(f"CREATE TRIGGER {name} {body}")
+
+    if not existing.issuperset(TRIGGERS):
+        conn.execute("INSERT OR IGNORE INTO comention_dirty_posts (log_no) SELECT id FROM blog_posts")
+        if conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'comention_post_tickers'"
+        ).fetchone():
+            conn.execute("INSERT OR IGNORE INTO comention_dirty_posts (log_no) SELECT log_no FROM comention_post_tickers")
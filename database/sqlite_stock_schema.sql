@@ -39,6 +39,9 @@ CREATE TABLE IF NOT EXISTS merry_post_stock_mentions (
   ticker VARCHAR(20) NOT NULL, -- 종목 코드
   mention_sentiment VARCHAR(10) DEFAULT 'neutral', -- 언급 감정 (positive, negative, neutral)
   mention_context TEXT, -- 언급 맥락 (메르 글에서 해당 종목이 언급된 문단)
+  alias TEXT, -- 실제로 매칭된 종목 별칭
+  start_offset INTEGER, -- 언급 시작 위치 ("제목\n본문" 기준 글자 오프셋)
+  end_offset INTEGER, -- 언급 끝 위치
   created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
   FOREIGN KEY (ticker) REFERENCES merry_mentioned_stocks(ticker) ON DELETE CASCADE
 );
@@ -55,6 +58,8 @@ CREATE INDEX IF NOT EXISTS idx_trade_date ON stock_daily_prices(trade_date);
 CREATE INDEX IF NOT EXISTS idx_post_mentions_log_no ON merry_post_stock_mentions(log_no);
 CREATE INDEX IF NOT EXISTS idx_post_mentions_ticker ON merry_post_stock_mentions(ticker);
 CREATE INDEX IF NOT EXISTS idx_post_mentions_sentiment ON merry_post_stock_mentions(mention_sentiment);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_post_mentions_unique ON merry_post_stock_mentions(log_no, ticker, start_offset);
+CREATE INDEX IF NOT EXISTS idx_post_mentions_ticker_log_no ON merry_post_stock_mentions(ticker, log_no);
 
 -- 실제 데이터가 없을 때를 위한 빈 상태 확인용
 -- CLAUDE.md 원칙: Dummy data 절대 금지
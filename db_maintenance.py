@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+database.db WAL 체크포인트 / 증분 VACUUM / 통계 갱신 유지보수
+대량 쓰기(포맷팅, 분석, 가져오기) 후 WAL이 계속 커지면 웹 쪽 읽기가 느려지므로
+정해진 시점에 wal_checkpoint(TRUNCATE)를 실행하고, 한가한 시간에 VACUUM/ANALYZE 실행
+대량 작업 스크립트는 끝날 때 checkpoint_after_bulk()를 호출
+"""
+
+import argparse
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+
+from read_replica import publish_after_bulk
+
+# 이 크기를 넘으면 스케줄러가 즉시 체크포인트
+WAL_CHECKPOINT_BYTES = 4 * 1024 * 1024
+DEFAULT_SCHEDULE_INTERVAL = 300
+# 증분 VACUUM / ANALYZE 실행 시각 (KST)
+VACUUM_HOUR = 4
+# 한 번에 반환할 빈 페이지 수 (0이면 전부)
+INCREMENTAL_VACUUM_PAGES = 2000
+BUSY_TIMEOUT_MS = 5000
+
+KST = timezone(timedelta(hours=9))
+
+
+def wal_size(db_path):
+    path = f"{db_path}-wal"
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def checkpoint_after_bulk(db_path, conn=None, mode='TRUNCATE'):
+    """대량 쓰기 작업 종료 후 WAL을 본 DB에 반영하고 비움 - (busy, wal 페이지, 반영 페이지)
+    읽기 복제본(read_replica.py)을 사용 중이면 복제본도 다시 게시"""
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT_MS / 1000)
+    try:
+        result = DatabaseMaintenance.checkpoint_conn(conn, mode)
+    finally:
+        if own_conn:
+            conn.close()
+    publish_after_bulk(db_path)
+    return result
+
+
+class DatabaseMaintenance:
+    def __init__(self, db_path='database.db'):
+        self.db_path = db_path
+        # VACUUM은 트랜잭션 밖에서 실행해야 함
+        self.conn = sqlite3.connect(db_path, isolation_level=None, timeout=BUSY_TIMEOUT_MS / 1000)
+
+    def pragma(self, name):
+        return self.conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+    def stats(self):
+        """페이지 / 단편화 / WAL 통계"""
+        page_count = self.pragma('page_count')
+        freelist_count = self.pragma('freelist_count')
+        page_size = self.pragma('page_size')
+        return {
+            'journal_mode': self.pragma('journal_mode'),
+            'auto_vacuum': {0: 'none', 1: 'full', 2: 'incremental'}.get(self.pragma('auto_vacuum')),
+            'page_size': page_size,
+            'page_count': page_count,
+            'freelist_count': freelist_count,
+            'fragmentation': round(freelist_count / page_count, 4) if page_count else 0.0,
+            'db_bytes': page_count * page_size,
+            'wal_bytes': wal_size(self.db_path),
+        }
+
+    @staticmethod
+    def checkpoint_conn(conn, mode='TRUNCATE'):
+        return tuple(conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone())
+
+    def checkpoint(self, mode='TRUNCATE'):
+        return self.checkpoint_conn(self.conn, mode)
+
+    def enable_incremental_vacuum(self):
+        """auto_vacuum=INCREMENTAL 전환 (전체 VACUUM 1회 필요 - 실행 중 쓰기 잠금)"""
+        self.conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        self.conn.execute("VACUUM")
+
+    def incremental_vacuum(self, pages=INCREMENTAL_VACUUM_PAGES):
+        """빈 페이지 반환 - auto_vacuum이 incremental이 아니면 아무것도 하지 않음, 반환한 페이지 수"""
+        if self.pragma('auto_vacuum') != 2:
+            return 0
+        before = self.pragma('freelist_count')
+        self.conn.execute(f"PRAGMA incremental_vacuum({int(pages)})").fetchall()
+        return before - self.pragma('freelist_count')
+
+    def optimize(self, full_analyze=False):
+        """쿼리 플래너 통계 갱신"""
+        if full_analyze:
+            self.conn.execute("ANALYZE")
+        self.conn.execute("PRAGMA optimize")
+
+    def run(self, vacuum=True, full_analyze=False):
+        """체크포인트 → 증분 VACUUM → 통계 갱신 → 체크포인트, 결과 요약"""
+        before = self.stats()
+        result = {'checkpoint': self.checkpoint()}
+        if vacuum:
+            result['vacuumed_pages'] = self.incremental_vacuum()
+            self.optimize(full_analyze)
+            # VACUUM/ANALYZE로 쌓인 WAL도 비움
+            result['checkpoint'] = self.checkpoint()
+        result['before'] = before
+        result['after'] = self.stats()
+        return result
+
+    def schedule(self, interval=DEFAULT_SCHEDULE_INTERVAL, wal_limit=WAL_CHECKPOINT_BYTES, vacuum_hour=VACUUM_HOUR):
+        """interval초마다 WAL 크기 확인 후 체크포인트, 하루 한 번 vacuum_hour에 VACUUM/ANALYZE"""
+        last_vacuum_day = None
+        while True:
+            now = datetime.now(KST)
+            if now.hour == vacuum_hour and last_vacuum_day != now.date():
+                result = self.run(vacuum=True)
+                last_vacuum_day = now.date()
+                print(f"[{now:%Y-%m-%d %H:%M}] 정기 유지보수: 빈 페이지 {result['vacuumed_pages']}개 반환, "
+                      f"checkpoint {result['checkpoint']}")
+            elif wal_size(self.db_path) > wal_limit:
+                print(f"[{now:%Y-%m-%d %H:%M}] WAL {wal_size(self.db_path):,} bytes → checkpoint {self.checkpoint()}")
+            time.sleep(interval)
+
+    def close(self):
+        """DB 연결 종료"""
+        self.conn.close()
+
+
+def print_stats(stats):
+    print(f"journal_mode={stats['journal_mode']}, auto_vacuum={stats['auto_vacuum']}")
+    print(f"페이지: {stats['page_count']:,} × {stats['page_size']} bytes = {stats['db_bytes']:,} bytes")
+    print(f"빈 페이지: {stats['freelist_count']:,} (단편화 {stats['fragmentation'] * 100:.1f}%)")
+    print(f"WAL: {stats['wal_bytes']:,} bytes")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="database.db WAL/VACUUM 유지보수")
+    parser.add_argument('--db', default='database.db', help="SQLite DB 경로")
+    parser.add_argument('--stats', action='store_true', help="페이지/단편화/WAL 통계만 출력")
+    parser.add_argument('--checkpoint', action='store_true', help="wal_checkpoint(TRUNCATE)만 실행")
+    parser.add_argument('--analyze', action='store_true', help="PRAGMA optimize 대신 전체 ANALYZE 실행")
+    parser.add_argument('--enable-incremental-vacuum', action='store_true',
+                        help="auto_vacuum=INCREMENTAL로 전환 (전체 VACUUM 1회, 웹 앱 쓰기가 없는 시간에 실행)")
+    parser.add_argument('--schedule', action='store_true', help="주기적으로 유지보수 실행")
+    parser.add_argument('--interval', type=int, default=DEFAULT_SCHEDULE_INTERVAL, help="스케줄 확인 주기(초)")
+    args = parser.parse_args()
+
+    maintenance = DatabaseMaintenance(args.db)
+    try:
+        if args.stats:
+            print_stats(maintenance.stats())
+        elif args.checkpoint:
+            print(f"checkpoint (busy, wal 페이지, 반영 페이지): {maintenance.checkpoint()}")
+        elif args.schedule:
+            maintenance.schedule(args.interval)
+        else:
+            if args.enable_incremental_vacuum:
+                maintenance.enable_incremental_vacuum()
+            result = maintenance.run(full_analyze=args.analyze)
+            print(f"checkpoint (busy, wal 페이지, 반영 페이지): {result['checkpoint']}")
+            print(f"빈 페이지 반환: {result['vacuumed_pages']}개")
+            print_stats(result['after'])
+    except KeyboardInterrupt:
+        print("\n유지보수 스케줄러 종료")
+    finally:
+        maintenance.close()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+database.db SQLite 마이그레이션 실행 및 쿼리 플랜 점검
+database/migrations/NNNN_이름.sql|.py 를 버전 순서대로 한 번씩 적용하고 schema_migrations에 기록
+(database/*.sql은 MySQL 문법이라 SQLite에서 직접 실행할 수 없음)
+--audit: 분석기/웹 앱 주요 쿼리의 EXPLAIN QUERY PLAN에서 인덱스 없는 전체 스캔을 표시
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import os
+import re
+import sqlite3
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'database', 'migrations')
+
+_MIGRATION_PATTERN = re.compile(r'^(\d{4})_(\w+)\.(sql|py)$')
+
+# (이름, 쿼리, 파라미터, 전체 스캔 허용 여부)
+# 전체 스캔 허용 쿼리는 원래 테이블 전체를 읽는 배치 작업용
+HOT_QUERIES = [
+    ('analyzer: 분석 여부 확인',
+     "SELECT id FROM sentiments WHERE log_no = ? AND ticker = ?", (1, '005930'), False),
+    # analyze_all_posts.py analyze_all_posts가 실제로 실행하는 쿼리 (중복 제외 조건은 서명 테이블이 있을 때만 붙음)
+    ('analyzer: 미분석 포스트',
+     "SELECT DISTINCT bp.id, bp.title, bp.content, bp.created_date FROM blog_posts bp "
+     "WHERE bp.content IS NOT NULL AND NOT EXISTS (SELECT 1 FROM sentiments s WHERE s.log_no = bp.id) "
+     "ORDER BY bp.created_date DESC", (), True),
+    ('analyzer: 미분석 포스트 (중복 제외)',
+     "SELECT DISTINCT bp.id, bp.title, bp.content, bp.created_date FROM blog_posts bp "
+     "WHERE bp.content IS NOT NULL AND NOT EXISTS (SELECT 1 FROM sentiments s WHERE s.log_no = bp.id) "
+     "AND NOT EXISTS (SELECT 1 FROM post_minhash_signatures pms "
+     "WHERE pms.post_id = bp.id AND pms.duplicate_of IS NOT NULL) "
+     "ORDER BY bp.created_date DESC", (), True),
+    ('analyzer: 포스트 언급 교체',
+     "DELETE FROM merry_post_stock_mentions WHERE log_no = ?", (1,), False),
+    ('analyzer: 언급 감정 갱신',
+     "UPDATE merry_post_stock_mentions SET mention_sentiment = ? WHERE log_no = ? AND ticker = ?",
+     ('neutral', 1, '005930'), False),
+    ('web: 종목별 언급 포스트',
+     "SELECT m.log_no, bp.title, bp.created_date FROM merry_post_stock_mentions m "
+     "JOIN blog_posts bp ON bp.id = m.log_no WHERE m.ticker = ? ORDER BY m.log_no DESC", ('005930',), False),
+    ('web: 종목별 감정 분석',
+     "SELECT s.sentiment, s.sentiment_score, bp.title, bp.created_date FROM sentiments s "
+     "JOIN blog_posts bp ON bp.id = s.log_no WHERE s.ticker = ?", ('005930',), False),
+    ('web: 포스트 상세 (log_no)',
+     "SELECT id, log_no, title, content, created_date FROM blog_posts WHERE log_no = ?", ('223900000000',), False),
+    ('web: 최신 포스트 목록',
+     "SELECT id, title, created_date FROM blog_posts ORDER BY created_date DESC LIMIT 20", (), False),
+    ('web: 기간별 포스트',
+     "SELECT id, title FROM blog_posts WHERE created_date >= ? ORDER BY created_date DESC", ('2025-01-01',), False),
+    ('web: 종목 주가 차트',
+     "SELECT trade_date, close_price FROM stock_daily_prices WHERE ticker = ? AND trade_date >= ? "
+     "ORDER BY trade_date", ('005930', '2025-01-01'), False),
+    ('factors: 종목별 요인',
+     "SELECT f.factor, COUNT(*) FROM sentiments s JOIN sentiment_factors f "
+     "ON f.sentiment_id = s.id AND f.factor_type = ? WHERE s.ticker = ? GROUP BY f.factor",
+     ('negative', '005930'), False),
+    ('factors: 관점별 포스트',
+     "SELECT s.log_no, s.ticker FROM sentiment_perspectives p JOIN sentiments s ON s.id = p.sentiment_id "
+     "WHERE p.perspective = ?", ('조선',), False),
+    ('web: 언급 종목 목록',
+     "SELECT ticker, name FROM merry_mentioned_stocks WHERE is_mentioned = 1 ORDER BY last_mentioned_at DESC",
+     (), True),
+]
+
+
+def discover_migrations(directory=MIGRATIONS_DIR):
+    """[(version, name, path)] 버전 순"""
+    migrations = []
+    for filename in sorted(os.listdir(directory)):
+        match = _MIGRATION_PATTERN.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(directory, filename)))
+
+    versions = [version for version, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError(f"마이그레이션 버전 중복: {directory}")
+    return migrations
+
+
+def file_checksum(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def split_statements(script):
+    """SQL 스크립트 → 문장 목록 (executescript는 트랜잭션을 먼저 커밋하므로 사용하지 않음)"""
+    statements = []
+    buffer = ''
+    for line in script.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            if buffer.strip():
+                statements.append(buffer.strip())
+            buffer = ''
+    if buffer.strip() and not all(l.strip().startswith('--') or not l.strip() for l in buffer.splitlines()):
+        raise ValueError(f"끝나지 않은 SQL 문장: {buffer.strip()[:80]}")
+    return statements
+
+
+class MigrationRunner:
+    def __init__(self, db_path='database.db', directory=MIGRATIONS_DIR):
+        # 마이그레이션마다 직접 BEGIN/COMMIT
+        self.conn = sqlite3.connect(db_path, isolation_level=None)
+        self.directory = directory
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                checksum TEXT NOT NULL,
+                applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+    def applied(self):
+        """{version: (name, checksum)}"""
+        rows = self.conn.execute("SELECT version, name, checksum FROM schema_migrations").fetchall()
+        return {version: (name, checksum) for version, name, checksum in rows}
+
+    def status(self):
+        """[(version, name, 상태)] - 상태: applied / pending / modified"""
+        applied = self.applied()
+        result = []
+        for version, name, path in discover_migrations(self.directory):
+            if version not in applied:
+                result.append((version, name, 'pending'))
+            elif applied[version][1] != file_checksum(path):
+                result.append((version, name, 'modified'))
+            else:
+                result.append((version, name, 'applied'))
+        return result
+
+    def apply(self, version, name, path):
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            if path.endswith('.sql'):
+                with open(path, encoding='utf-8') as f:
+                    for statement in split_statements(f.read()):
+                        self.conn.execute(statement)
+            else:
+                spec = importlib.util.spec_from_file_location(f"migration_{version:04d}", path)
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+                module.upgrade(self.conn)
+
+            self.conn.execute(
+                "INSERT INTO schema_migrations (version, name, checksum) VALUES (?, ?, ?)",
+                (version, name, file_checksum(path))
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def migrate(self, target=None, dry_run=False):
+        """미적용 마이그레이션 순서대로 적용 - 적용한 [(version, name)]"""
+        applied = self.applied()
+        done = []
+        for version, name, path in discover_migrations(self.directory):
+            if version in applied or (target is not None and version > target):
+                continue
+            if not dry_run:
+                self.apply(version, name, path)
+            done.append((version, name))
+        return done
+
+    def audit(self, queries=HOT_QUERIES):
+        """[(이름, 상태, 플랜 상세)] - 상태: ok / full-scan / allowed-scan / skipped(테이블 없음)"""
+        results = []
+        for name, sql, params, scan_allowed in queries:
+            try:
+                plan = self.conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+            except sqlite3.OperationalError as e:
+                results.append((name, 'skipped', str(e)))
+                continue
+
+            details = [row[-1] for row in plan]
+            # 'SCAN 테이블' (인덱스 없음) → 전체 스캔, 'SCAN ... USING (COVERING) INDEX'는 인덱스 순회
+            scans = [d for d in details if d.startswith('SCAN ') and 'USING' not in d]
+            temp_sort = [d for d in details if 'USE TEMP B-TREE FOR ORDER BY' in d]
+            if scans or temp_sort:
+                results.append((name, 'allowed-scan' if scan_allowed else 'full-scan', '; '.join(details)))
+            else:
+                results.append((name, 'ok', '; '.join(details)))
+        return results
+
+    def close(self):
+        """DB 연결 종료"""
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SQLite 마이그레이션 / 쿼리 플랜 점검")
+    parser.add_argument('--db', default='database.db', help="SQLite DB 경로")
+    parser.add_argument('--status', action='store_true', help="마이그레이션 상태만 출력")
+    parser.add_argument('--target', type=int, help="이 버전까지만 적용")
+    parser.add_argument('--dry-run', action='store_true', help="적용할 마이그레이션만 출력")
+    parser.add_argument('--audit', action='store_true', help="주요 쿼리의 EXPLAIN QUERY PLAN 점검")
+    args = parser.parse_args()
+
+    runner = MigrationRunner(args.db)
+    try:
+        if args.status:
+            for version, name, state in runner.status():
+                print(f"{version:04d} {name}: {state}")
+        elif not args.audit:
+            done = runner.migrate(args.target, args.dry_run)
+            verb = "적용 예정" if args.dry_run else "적용 완료"
+            for version, name in done:
+                print(f"  - {version:04d} {name}")
+            print(f"마이그레이션 {verb}: {len(done)}개")
+            modified = [f"{v:04d}" for v, _, state in runner.status() if state == 'modified']
+            if modified:
+                print(f"⚠️ 적용 후 변경된 마이그레이션 파일: {', '.join(modified)}")
+
+        if args.audit:
+            results = runner.audit()
+            for name, state, detail in results:
+                mark = {'ok': '✅', 'full-scan': '❌', 'allowed-scan': '➖', 'skipped': '⏭️'}[state]
+                print(f"{mark} {name}: {detail}")
+            failures = sum(1 for _, state, _ in results if state == 'full-scan')
+            print(f"\n쿼리 플랜 점검: {len(results)}개 중 전체 스캔 {failures}개")
+            if failures:
+                raise SystemExit(1)
+    finally:
+        runner.close()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+과매도 / 급락 스크리너 ("과하게 빠졌을 때" 단기 매수 후보, format_post_1016.py 참고)
+stock_daily_prices 전체를 한 번에 읽어 종목 × 최근 거래일 행렬(최신 거래일이 오른쪽 끝, 앞쪽은 NaN 패딩)을 만들고
+전 종목에 대해 한 번에 계산
+- 낙폭: 최근 DRAWDOWN_WINDOW 거래일 최고 종가 대비 하락률
+- z-score: MA_WINDOW 이동평균/표준편차 대비 종가 위치
+- 거래량 배수: 직전 VOLUME_WINDOW 거래일 평균 거래량 대비
+결과는 stock_screen_daily(거래일, 종목)에 저장 - 종목별 쿼리 없음
+"""
+
+import argparse
+import sqlite3
+from datetime import date, timedelta
+
+import numpy as np
+
+from trading_calendar import to_day_numbers
+
+DRAWDOWN_WINDOW = 252
+MA_WINDOW = 20
+VOLUME_WINDOW = 20
+# 과매도: 고점 대비 20% 이상 하락 + 이동평균 대비 -2σ 이하
+OVERSOLD_DRAWDOWN = -0.20
+OVERSOLD_ZSCORE = -2.0
+VOLUME_SPIKE_RATIO = 2.0
+# 저장 구간 이전 계산에 필요한 거래일 수
+HISTORY_BARS = DRAWDOWN_WINDOW + 60
+# 증분 실행 시 마지막 스크린 날짜보다 며칠 앞부터 다시 저장 (늦게 백필된 종가 반영)
+RESCREEN_DAYS = 10
+# HISTORY_BARS 거래일을 덮는 달력 일수 (주 5거래일 + 연휴 여유)
+HISTORY_CALENDAR_DAYS = HISTORY_BARS * 7 // 5 + 30
+
+
+SCHEMA_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS stock_screen_daily (
+        trade_date DATE NOT NULL,
+        ticker TEXT NOT NULL,
+        close_price REAL NOT NULL,
+        peak_price REAL,
+        drawdown REAL,
+        zscore REAL,
+        volume_ratio REAL,
+        is_oversold INTEGER NOT NULL DEFAULT 0,
+        volume_spike INTEGER NOT NULL DEFAULT 0,
+        screened_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (trade_date, ticker)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_stock_screen_ticker ON stock_screen_daily(ticker, trade_date)",
+]
+
+
+def _shift(matrix, offset):
+    """열을 offset만큼 오른쪽으로 밀고 앞은 NaN"""
+    return np.pad(matrix, ((0, 0), (offset, 0)), constant_values=np.nan)[:, :matrix.shape[1]]
+
+
+def rolling_max(matrix, window):
+    """행마다 직전 window개(자기 포함) 최댓값 - NaN 무시, 모두 NaN이면 NaN
+    구간 길이를 두 배씩 늘려 log2(window)번의 fmax로 계산 (창 크기만큼 펼치지 않음)"""
+    result = matrix
+    span = 1
+    while span * 2 <= window:
+        result = np.fmax(result, _shift(result, span))
+        span *= 2
+    # 길이 span 구간 두 개를 겹쳐 window 전체를 덮음
+    return np.fmax(result, _shift(result, window - span)) if window > span else result
+
+
+def rolling_sums(matrix, window):
+    """행마다 직전 window개(자기 포함) (개수, 합, 제곱합) - 누적합 차로 계산"""
+    valid = ~np.isnan(matrix)
+    values = np.where(valid, matrix, 0.0)
+
+    def windowed(x):
+        cumulative = np.cumsum(np.pad(x, ((0, 0), (1, 0))), axis=1)
+        shifted = np.pad(cumulative, ((0, 0), (window, 0)))[:, :cumulative.shape[1]]
+        return (cumulative - shifted)[:, 1:]
+
+    return windowed(valid.astype(np.float64)), windowed(values), windowed(values * values)
+
+
+def screen_matrix(close, volume):
+    """종가/거래량 행렬 → 지표 행렬 dict (계산 불가 칸은 NaN)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # 고점은 DRAWDOWN_WINDOW 거래일이 모두 쌓인 뒤부터 계산 (상장 초기의 짧은 고점으로 낙폭을 내지 않음)
+        full = rolling_sums(close, DRAWDOWN_WINDOW)[0] == DRAWDOWN_WINDOW
+        peak = np.where(full, rolling_max(close, DRAWDOWN_WINDOW), np.nan)
+        drawdown = close / peak - 1.0
+
+        count, total, squares = rolling_sums(close, MA_WINDOW)
+        mean = total / count
+        std = np.sqrt(np.maximum(squares / count - mean * mean, 0.0))
+        zscore = np.where((count == MA_WINDOW) & (std > 0), (close - mean) / std, np.nan)
+
+        # 당일 제외 직전 구간 평균과 비교
+        count, total, _ = rolling_sums(volume, VOLUME_WINDOW)
+        prior_count = np.pad(count, ((0, 0), (1, 0)))[:, :-1]
+        prior_mean = np.pad(total, ((0, 0), (1, 0)))[:, :-1] / prior_count
+        volume_ratio = np.where((prior_count == VOLUME_WINDOW) & (prior_mean > 0), volume / prior_mean, np.nan)
+
+    return {
+        'peak': peak,
+        'drawdown': drawdown,
+        'zscore': zscore,
+        'volume_ratio': volume_ratio,
+        'oversold': (drawdown <= OVERSOLD_DRAWDOWN) & (zscore <= OVERSOLD_ZSCORE),
+        'volume_spike': volume_ratio >= VOLUME_SPIKE_RATIO,
+    }
+
+
+def _nullable(values, digits):
+    """반올림한 값 목록 (NaN은 None)"""
+    rounded = np.round(values, digits).astype(object)
+    rounded[np.isnan(values)] = None
+    return rounded.tolist()
+
+
+def _format(value, spec):
+    return '-' if value is None else format(value, spec)
+
+
+class DrawdownScreener:
+    def __init__(self, db_path='database.db'):
+        self.conn = sqlite3.connect(db_path)
+        self.cursor = self.conn.cursor()
+
+    def ensure_schema(self):
+        for statement in SCHEMA_STATEMENTS:
+            self.cursor.execute(statement)
+
+    def load_matrix(self, since=None):
+        """(종목 배열, 거래일 행렬(일수, 패딩 -1), 종가 행렬, 거래량 행렬) - 최신 거래일이 마지막 열
+        since가 없으면 전체 기간, 있으면 since 이전은 계산에 필요한 HISTORY_BARS 거래일만 남김"""
+        query = "SELECT ticker, trade_date, close_price, volume FROM stock_daily_prices"
+        params = []
+        if since is not None:
+            query += " WHERE trade_date >= ?"
+            params.append((since - timedelta(days=HISTORY_CALENDAR_DAYS)).isoformat())
+        self.cursor.execute(query + " ORDER BY ticker, trade_date", params)
+        rows = self.cursor.fetchall()
+        if not rows:
+            return np.array([]), np.empty((0, 0), np.int64), np.empty((0, 0)), np.empty((0, 0))
+
+        tickers, inverse, counts = np.unique([row[0] for row in rows], return_inverse=True, return_counts=True)
+        days = to_day_numbers([str(row[1])[:10] for row in rows])
+        close = np.array([row[2] for row in rows], dtype=float)
+        volume = np.array([np.nan if row[3] is None else row[3] for row in rows], dtype=float)
+
+        # 종목 안에서 뒤에서부터 센 위치 → 오른쪽 정렬 열
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        from_end = counts[inverse] - (np.arange(len(rows)) - starts[inverse])
+        width = int(counts.max())
+        if since is not None:
+            since_day = to_day_numbers(since)
+            keep_bars = HISTORY_BARS + int(np.max(np.bincount(inverse, weights=days >= since_day), initial=0))
+            width = min(width, keep_bars)
+        kept = from_end <= width
+        cols = width - from_end[kept]
+
+        day_matrix = np.full((len(tickers), width), -1, dtype=np.int64)
+        close_matrix = np.full((len(tickers), width), np.nan)
+        volume_matrix = np.full((len(tickers), width), np.nan)
+        day_matrix[inverse[kept], cols] = days[kept]
+        close_matrix[inverse[kept], cols] = close[kept]
+        volume_matrix[inverse[kept], cols] = volume[kept]
+        return tickers, day_matrix, close_matrix, volume_matrix
+
+    def last_screen_date(self):
+        self.cursor.execute("SELECT MAX(trade_date) FROM stock_screen_daily")
+        value = self.cursor.fetchone()[0]
+        return date.fromisoformat(value) if value else None
+
+    def refresh(self, since=None, rebuild=False):
+        """since 이후 거래일 스크린 결과 저장 (기본: 마지막 스크린 RESCREEN_DAYS일 전부터) - 저장한 행 수"""
+        self.ensure_schema()
+        if since is None and not rebuild:
+            last = self.last_screen_date()
+            since = last - timedelta(days=RESCREEN_DAYS) if last else None
+        if rebuild:
+            since = None
+            self.cursor.execute("DELETE FROM stock_screen_daily")
+
+        tickers, days, close, volume = self.load_matrix(since)
+        if not len(tickers):
+            self.conn.commit()
+            return 0
+        result = screen_matrix(close, volume)
+
+        target = ~np.isnan(close)
+        if since is not None:
+            target &= days >= to_day_numbers(since)
+        rows_idx, cols = np.nonzero(target)
+        trade_dates = days[rows_idx, cols].astype('datetime64[D]').astype(str).tolist()
+        records = list(zip(
+            trade_dates, tickers[rows_idx].tolist(), close[rows_idx, cols].tolist(),
+            _nullable(result['peak'][rows_idx, cols], 4), _nullable(result['drawdown'][rows_idx, cols], 4),
+            _nullable(result['zscore'][rows_idx, cols], 3), _nullable(result['volume_ratio'][rows_idx, cols], 3),
+            result['oversold'][rows_idx, cols].astype(int).tolist(),
+            result['volume_spike'][rows_idx, cols].astype(int).tolist()
+        ))
+        self.cursor.executemany("""
+            INSERT OR REPLACE INTO stock_screen_daily (
+                trade_date, ticker, close_price, peak_price, drawdown, zscore, volume_ratio,
+                is_oversold, volume_spike, screened_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, records)
+        self.conn.commit()
+        return len(records)
+
+    def latest_screen(self, oversold_only=True):
+        """종목별 마지막 거래일 스크린 결과 (낙폭 큰 순)"""
+        self.cursor.execute(f"""
+            SELECT s.ticker, s.trade_date, s.close_price, s.drawdown, s.zscore, s.volume_ratio,
+                   s.is_oversold, s.volume_spike
+            FROM stock_screen_daily s
+            JOIN (SELECT ticker, MAX(trade_date) AS trade_date FROM stock_screen_daily GROUP BY ticker) last
+              ON last.ticker = s.ticker AND last.trade_date = s.trade_date
+            {'WHERE s.is_oversold = 1' if oversold_only else ''}
+            ORDER BY s.drawdown IS NULL, s.drawdown
+        """)
+        return self.cursor.fetchall()
+
+    def close(self):
+        """DB 연결 종료"""
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="전 종목 낙폭 / 과매도 / 거래량 급증 스크리너")
+    parser.add_argument('--db', default='database.db', help="SQLite DB 경로")
+    parser.add_argument('--since', type=date.fromisoformat, help="이 날짜 이후 거래일만 저장 (YYYY-MM-DD)")
+    parser.add_argument('--rebuild', action='store_true', help="전체 기간 다시 계산")
+    parser.add_argument('--all', action='store_true', help="과매도가 아닌 종목도 출력")
+    args = parser.parse_args()
+
+    screener = DrawdownScreener(args.db)
+    try:
+        print(f"스크린 저장: {screener.refresh(args.since, args.rebuild)}행")
+        for ticker, trade_date, close_price, drawdown, zscore, volume_ratio, oversold, spike in \
+                screener.latest_screen(not args.all):
+            flags = ' '.join(flag for flag, on in (('과매도', oversold), ('거래량급증', spike)) if on)
+            print(f"  {ticker} {trade_date}: 종가 {close_price:,.2f}, 낙폭 {_format(drawdown, '.1%')}, "
+                  f"z {_format(zscore, '.2f')}, 거래량 {_format(volume_ratio, '.1f')}배 {flags}")
+    finally:
+        screener.close()
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 import sqlite3
 
+from post_sections import update_post_content
+
 # 포맷팅된 내용 (blog-post-formatting-requirements.md 규칙 적용)
 formatted_content = """메르님 한 줄 요약
 
@@ -56,8 +58,7 @@ AI 시대에 어떤 학과를 선택해야 할지에 대한 더 자세한 내용
 
 # 데이터베이스 업데이트
 conn = sqlite3.connect('database.db')
-cursor = conn.cursor()
-cursor.execute("UPDATE blog_posts SET content = ? WHERE id = ?", (formatted_content, 1014))
+update_post_content(conn, 1014, formatted_content)
 conn.commit()
 conn.close()
 
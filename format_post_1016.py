@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 import sqlite3
 
+from post_sections import update_post_content
+
 # 포맷팅된 내용 (blog-post-formatting-requirements.md 규칙 적용)
 formatted_content = """메르님 한 줄 요약
 
@@ -23,8 +25,7 @@ formatted_content = """메르님 한 줄 요약
 
 # 데이터베이스 업데이트
 conn = sqlite3.connect('database.db')
-cursor = conn.cursor()
-cursor.execute("UPDATE blog_posts SET content = ? WHERE id = ?", (formatted_content, 1016))
+update_post_content(conn, 1016, formatted_content)
 conn.commit()
 conn.close()
 
@@ -0,0 +1,433 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+크롤링 결과(data/parsed-posts/*.json)를 감시하여 blog_posts 저장 → 정리 → 종목 언급/감정 분석까지
+자동으로 수행하는 asyncio 기반 수집 데몬
+"""
+
+import argparse
+import asyncio
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from analyze_all_posts import DirectClaudeAnalyzer
+from post_archive import find_archived
+from post_batch_pipeline import add_pipeline_arguments, run_post_batch, skipped_steps
+from post_dedup import PostDeduplicator
+from post_sections import SECTION_HEADERS, PostSectionStore
+
+DEFAULT_WATCH_DIR = os.path.join('data', 'parsed-posts')
+# 파일 하나를 이 개수씩 나눠 저장 (파일 전체는 한 트랜잭션)
+INGEST_BATCH_SIZE = 500
+MAX_PENDING_BATCHES = 4
+
+# process-todays-posts.js와 같은 logNo 추출 패턴 (우선순위 순)
+LOG_NO_PATTERNS = [
+    re.compile(r'logNo=(\d+)'),
+    re.compile(r'/(\d+)\?'),
+    re.compile(r'/(\d+)$'),
+    re.compile(r'(\d{12,15})'),
+]
+
+TITLE_PATTERNS = [
+    re.compile(r'([^:]+?)\s*:\s*/\*\*/'),
+    re.compile(r'<title[^>]*>([^<]+)</title>', re.IGNORECASE),
+    re.compile(r'var\s+postTitle\s*=\s*[\'"]([^\'"]+)[\'"]'),
+    re.compile(r'property=[\'"]og:title[\'"][^>]*content=[\'"]([^\'"]+)[\'"]'),
+]
+
+CONTENT_PATTERNS = [
+    re.compile(r'\d{4}년\s+\d+월\s+\d+일.*?(?=저작자\s+명시|태그|공감|댓글)', re.DOTALL),
+    re.compile(r'(?:[\u200b\s]*[가-힣].*?[.!?][\u200b\s]*){10,}.*?(?=저작자\s+명시|태그|공감|댓글)', re.DOTALL),
+]
+
+# blog-post-formatting-requirements.md "크롤링 시 제거할 텍스트"
+CRAWL_NOISE_PATTERNS = [
+    re.compile(r'네이버\s*블로그'),
+    re.compile(r'(?<!\w)@[\w.]+'),
+    re.compile(r'^\s*출처\s*:.*$', re.MULTILINE),
+]
+
+
+def extract_log_no(url):
+    """포스트 URL에서 logNo 추출"""
+    for pattern in LOG_NO_PATTERNS:
+        match = pattern.search(url or '')
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def format_crawled_content(content):
+    """크롤링 잡음 제거와 줄바꿈 정리만 수행 (내용 자체는 변경하지 않음)"""
+    for pattern in CRAWL_NOISE_PATTERNS:
+        content = pattern.sub('', content)
+
+    lines = [line.strip() for line in content.replace('\u200b', '').splitlines()]
+    formatted = []
+    for line in lines:
+        if not line:
+            continue
+        # 특수 섹션 제목 앞뒤에만 빈 줄 하나 유지
+        if line in SECTION_HEADERS:
+            if formatted:
+                formatted.append('')
+            formatted.extend([line, ''])
+            continue
+        formatted.append(line)
+
+    return '\n'.join(formatted).strip()
+
+
+def extract_post_content(record):
+    """크롤링 레코드에서 제목/본문/요약 추출"""
+    raw_content = record.get('rawContent') or ''
+
+    title = (record.get('title') or '').strip()
+    if not title or title == 'Unknown Title':
+        title = ''
+        for pattern in TITLE_PATTERNS:
+            match = pattern.search(raw_content)
+            if match and match.group(1).strip():
+                # "... var x = ...; 실제 제목 : /**/" 형태라 마지막 스크립트 구문 뒤만 사용
+                title = match.group(1).rsplit(';', 1)[-1].strip()
+                break
+
+    # 문장 단위로 파싱된 결과가 있으면 그대로 사용 ({"number", "sentence"} 또는 문자열)
+    sentences = []
+    for item in record.get('sentences') or []:
+        sentence = item.get('sentence', '') if isinstance(item, dict) else item
+        if sentence and sentence.strip():
+            sentences.append(sentence.strip())
+    if sentences:
+        content = '\n'.join(sentences)
+    else:
+        content = ''
+        for pattern in CONTENT_PATTERNS:
+            match = pattern.search(raw_content)
+            if match and len(match.group(0)) > 500:
+                content = ' '.join(match.group(0).replace('\u200b', ' ').split())
+                break
+
+    content = format_crawled_content(content) if content else ''
+
+    excerpt = ''
+    if content:
+        parts = [s.strip() for s in re.split(r'[.!?]', content) if len(s.strip()) > 10]
+        excerpt = '. '.join(parts[:3])[:200] + '...'
+
+    return title, content, excerpt
+
+
+def parse_crawl_record(record):
+    """크롤링 레코드 1건을 blog_posts 저장용 dict로 변환 - 내용이 부족하면 None"""
+    log_no = extract_log_no(record.get('url'))
+    if log_no is None:
+        return None
+
+    title, content, excerpt = extract_post_content(record)
+    if not title or not content:
+        return None
+
+    crawled_at = record.get('timestamp')
+    try:
+        created_ms = int(datetime.fromisoformat(crawled_at.replace('Z', '+00:00')).timestamp() * 1000)
+    except (AttributeError, ValueError):
+        created_ms = int(time.time() * 1000)
+
+    return {
+        'log_no': log_no,
+        'title': title,
+        'content': content,
+        'excerpt': excerpt,
+        # process-todays-posts.js와 같이 밀리초 타임스탬프로 저장
+        'created_date': created_ms,
+    }
+
+
+def upsert_blog_posts(cursor, posts):
+    """blog_posts에 log_no 기준 upsert - [(id, post, changed)] 반환"""
+    results = []
+
+    for post in posts:
+        # 연도별 아카이브로 옮긴 글이 다시 수집된 경우 핫 DB에 되살리지 않음
+        if find_archived(cursor, post['log_no']) is not None:
+            continue
+        cursor.execute(
+            "SELECT id, title, content FROM blog_posts WHERE log_no = ?",
+            (str(post['log_no']),)
+        )
+        existing = cursor.fetchone()
+
+        if existing:
+            post_id, old_title, old_content = existing
+            changed = (old_title, old_content) != (post['title'], post['content'])
+            if changed:
+                cursor.execute("""
+                    UPDATE blog_posts SET
+                        title = ?, content = ?, excerpt = ?, updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                """, (post['title'], post['content'], post['excerpt'], post_id))
+        else:
+            cursor.execute("""
+                INSERT INTO blog_posts (
+                    log_no, title, content, excerpt,
+                    created_date, category, views, comments_count
+                ) VALUES (?, ?, ?, ?, ?, ?, 0, 0)
+            """, (
+                str(post['log_no']), post['title'], post['content'], post['excerpt'],
+                post['created_date'], '주절주절'
+            ))
+            post_id = cursor.lastrowid
+            changed = True
+
+        results.append((post_id, post, changed))
+
+    return results
+
+
+def iter_crawl_batches(path, stats, batch_size=INGEST_BATCH_SIZE):
+    """크롤링 결과 JSON 파일(리스트 또는 posts 키를 가진 객체)을 스트리밍으로 읽어 batch_size개씩 반환
+    파일 전체를 메모리에 올리지 않고 레코드 단위로 변환 - 잘못된 레코드는 건너뛰고 stats에 집계"""
+    # stream_import_posts가 이 모듈의 parse_crawl_record를 가져오므로 순환 import를 피해 지연 import
+    from stream_import_posts import detect_prefix, iter_crawl_posts
+
+    with open(path, encoding='utf-8') as f:
+        batch = []
+        for post in iter_crawl_posts(f, detect_prefix(path), stats):
+            batch.append(post)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def _put_until_stopped(batches, item, stop):
+    """큐가 가득 차 있으면 소비 측이 멈췄는지(stop) 확인하며 대기 - 넣었으면 True"""
+    while not stop.is_set():
+        try:
+            batches.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def produce_crawl_batches(path, batches, stats, stop):
+    """작업 스레드: 파싱한 배치를 큐에 넣고 끝나면 None, 실패하면 예외 객체를 넣음
+    큐 크기가 제한돼 있어 DB 쓰기보다 파싱이 빨라도 메모리에는 MAX_PENDING_BATCHES개까지만 쌓임"""
+    try:
+        for batch in iter_crawl_batches(path, stats):
+            if not _put_until_stopped(batches, batch, stop):
+                return
+        last = None
+    except Exception as e:
+        last = e
+    _put_until_stopped(batches, last, stop)
+
+
+class ParsedPostIngestor:
+    def __init__(self, db_path='database.db', watch_dir=DEFAULT_WATCH_DIR, concurrency=4, poll_interval=2.0,
+                 skip_steps=()):
+        self.db_path = db_path
+        self.watch_dir = watch_dir
+        self.poll_interval = poll_interval
+        self.skip_steps = set(skip_steps)
+        self.semaphore = asyncio.Semaphore(concurrency)
+        # sqlite3 연결은 생성한 스레드에서만 쓸 수 있으므로 DB 작업은 전용 스레드 하나로 직렬화
+        self.db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ingest-db')
+        self.analyzer = None
+        self.dedup = None
+        self.sections = None
+
+    async def run_db(self, func, *args):
+        """DB 전용 스레드에서 실행"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.db_executor, func, *args)
+
+    def _open(self):
+        self.analyzer = DirectClaudeAnalyzer(self.db_path)
+        self.analyzer.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS ingested_crawl_files (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                post_count INTEGER DEFAULT 0,
+                ingested_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        # 처리에 실패한 파일 - 크기/수정 시각이 바뀌기 전까지 다시 시도하지 않음
+        self.analyzer.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS failed_crawl_files (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                error TEXT,
+                failed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        self.dedup = PostDeduplicator(self.analyzer.conn)
+        self.sections = PostSectionStore(self.analyzer.conn)
+        # 파일 처리 중 롤백돼도 스키마 준비 상태가 어긋나지 않도록 미리 만들어 커밋
+        self.analyzer.ensure_mention_index_schema()
+        self.analyzer.ensure_artifact_schema()
+        self.analyzer.conn.commit()
+
+    def _pending_files(self):
+        """아직 처리하지 않았거나 처리 후 변경된 JSON 파일 목록"""
+        self.analyzer.cursor.execute("""
+            SELECT path, size, mtime FROM ingested_crawl_files
+            UNION ALL
+            SELECT path, size, mtime FROM failed_crawl_files
+        """)
+        seen = {}
+        for path, size, mtime in self.analyzer.cursor.fetchall():
+            seen.setdefault(path, set()).add((size, mtime))
+
+        pending = []
+        for name in sorted(os.listdir(self.watch_dir)):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.watch_dir, name)
+            stat = os.stat(path)
+            if (stat.st_size, stat.st_mtime) not in seen.get(path, ()):
+                pending.append((path, stat.st_size, stat.st_mtime))
+        return pending
+
+    def _store_batch(self, posts):
+        """포스트 저장 → 종목 언급 인덱스 → 감정 분석 (커밋은 _store_and_analyze에서 파일 단위로)"""
+        analyzer = self.analyzer
+        total_analyses = 0
+
+        results = upsert_blog_posts(analyzer.cursor, posts)
+        # 새 포스트 / 본문이 바뀐 포스트의 요약·코멘트 섹션 파싱
+        self.sections.sync([post_id for post_id, _, changed in results if changed])
+        for post_id, post, changed in results:
+            if not changed:
+                continue
+            duplicate_of = self.dedup.register(post_id, post['title'], post['content'])
+            if duplicate_of is not None:
+                # 같은 글이 다른 log_no로 다시 들어온 경우 원본만 분석해 언급 수 중복 방지
+                print(f"  - #{post_id}는 #{duplicate_of}와 중복: 분석 생략")
+                continue
+            analyzer.save_mentions(post_id, post['title'], post['content'])
+            mentioned_stocks = analyzer.find_mentioned_stocks(f"{post['title']} {post['content']}")
+            total_analyses += analyzer.analyze_post(post_id, post['title'], post['content'], mentioned_stocks)
+        return total_analyses
+
+    def _store_and_analyze(self, path, size, mtime, batches, stop):
+        """큐로 받은 배치를 차례로 저장/분석 후 파일 단위로 커밋 (DB 스레드)
+        중간에 실패하면 이 파일에서 쓴 내용을 모두 롤백 - 다음 파일의 커밋에 반쯤 쓴 행이 섞이지 않음"""
+        analyzer = self.analyzer
+        post_count = 0
+        total_analyses = 0
+        try:
+            while True:
+                batch = batches.get()
+                if batch is None:
+                    break
+                if isinstance(batch, Exception):
+                    raise batch
+                post_count += len(batch)
+                total_analyses += self._store_batch(batch)
+
+            analyzer.cursor.execute("""
+                INSERT OR REPLACE INTO ingested_crawl_files (path, size, mtime, post_count, ingested_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+            """, (path, size, mtime, post_count))
+            analyzer.cursor.execute("DELETE FROM failed_crawl_files WHERE path = ?", (path,))
+            analyzer.conn.commit()
+        except Exception:
+            analyzer.conn.rollback()
+            raise
+        finally:
+            # 파싱 스레드가 가득 찬 큐 앞에서 기다리지 않도록
+            stop.set()
+        return post_count, total_analyses
+
+    def _record_failure(self, path, size, mtime, error):
+        """실패한 파일 기록 (DB 스레드) - 같은 크기/수정 시각이면 다음 스캔에서 건너뜀"""
+        self.analyzer.conn.rollback()
+        self.analyzer.cursor.execute("""
+            INSERT OR REPLACE INTO failed_crawl_files (path, size, mtime, error, failed_at)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, (path, size, mtime, f"{type(error).__name__}: {error}"))
+        self.analyzer.conn.commit()
+
+    def _post_batch(self):
+        """배치 후처리 파이프라인 (DB 스레드) - 새 포스트로 바뀐 본문/감정/언급에 의존하는 단계만"""
+        return run_post_batch(
+            self.db_path, {'content', 'sentiments', 'mentions'}, self.skip_steps,
+            conn=self.analyzer.conn, theme_matcher=self.analyzer.theme_matcher
+        )
+
+    async def ingest_file(self, path, size, mtime):
+        """파일 1개 처리 - 파싱은 작업 스레드, DB 쓰기는 DB 스레드에서 배치 단위로 수행
+        어떤 예외든 이 파일의 쓰기를 롤백하고 실패로 기록한 뒤 False 반환 (다른 파일 처리는 계속)"""
+        async with self.semaphore:
+            name = os.path.basename(path)
+            stats = {'records': 0, 'skipped': 0, 'invalid': 0}
+            batches = queue.Queue(MAX_PENDING_BATCHES)
+            stop = threading.Event()
+            producer = asyncio.ensure_future(asyncio.to_thread(produce_crawl_batches, path, batches, stats, stop))
+            try:
+                post_count, total_analyses = await self.run_db(
+                    self._store_and_analyze, path, size, mtime, batches, stop
+                )
+            except Exception as e:
+                await self.run_db(self._record_failure, path, size, mtime, e)
+                print(f"❌ {name} 처리 실패: {e}")
+                return False
+            finally:
+                stop.set()
+                await producer
+            invalid = f", 변환 실패 {stats['invalid']}건" if stats['invalid'] else ""
+            print(f"✅ {name}: 포스트 {post_count}개, 분석 {total_analyses}건{invalid}")
+            return True
+
+    async def scan_once(self):
+        """대기 중인 파일을 동시 처리 한도 내에서 모두 처리 - 한 파일의 예외가 나머지 파일을 중단시키지 않음"""
+        pending = await self.run_db(self._pending_files)
+        results = await asyncio.gather(*(self.ingest_file(*item) for item in pending), return_exceptions=True)
+        for (path, _, _), result in zip(pending, results):
+            if isinstance(result, BaseException):
+                print(f"❌ {os.path.basename(path)} 처리 중 예외: {result!r}")
+        if any(result is True for result in results):
+            await self.run_db(self._post_batch)
+        return len(pending)
+
+    async def run(self, once=False):
+        await self.run_db(self._open)
+        print(f"👀 감시 시작: {self.watch_dir}")
+        try:
+            while True:
+                await self.scan_once()
+                if once:
+                    break
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            await self.run_db(self.analyzer.close)
+            self.db_executor.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="크롤링 결과 자동 수집/분석 데몬")
+    parser.add_argument('--db', default='database.db', help="SQLite DB 경로")
+    parser.add_argument('--watch-dir', default=DEFAULT_WATCH_DIR, help="감시할 크롤링 결과 디렉토리")
+    parser.add_argument('--concurrency', type=int, default=4, help="동시에 처리할 파일 수")
+    parser.add_argument('--interval', type=float, default=2.0, help="디렉토리 확인 주기(초)")
+    parser.add_argument('--once', action='store_true', help="대기 중인 파일만 처리하고 종료")
+    add_pipeline_arguments(parser)
+    args = parser.parse_args()
+
+    ingestor = ParsedPostIngestor(args.db, args.watch_dir, args.concurrency, args.interval, skipped_steps(args))
+    try:
+        asyncio.run(ingestor.run(once=args.once))
+    except KeyboardInterrupt:
+        print("\n수집 데몬 종료")
@@ -6,7 +6,7 @@ cursor = conn.cursor()
 
 # ID 53: 포스트 512 분석 (원래 ID 268)
 cursor.execute("""
-    INSERT INTO sentiments (id, post_id, ticker, sentiment, sentiment_score, key_reasoning,
+    INSERT INTO sentiments (id, log_no, ticker, sentiment, sentiment_score, key_reasoning,
         supporting_evidence, investment_perspective, investment_timeframe,
         conviction_level, uncertainty_factors, mention_context, analysis_date)
     VALUES (53, 512, '005930', 'negative', -0.35, 
@@ -20,7 +20,7 @@ cursor.execute("""
 
 # ID 54: 포스트 5 분석 (원래 ID 270)
 cursor.execute("""
-    INSERT INTO sentiments (id, post_id, ticker, sentiment, sentiment_score, key_reasoning,
+    INSERT INTO sentiments (id, log_no, ticker, sentiment, sentiment_score, key_reasoning,
         supporting_evidence, investment_perspective, investment_timeframe,
         conviction_level, uncertainty_factors, mention_context, analysis_date)
     VALUES (54, 5, '005930', 'positive', 0.45,
@@ -34,7 +34,7 @@ cursor.execute("""
 
 # ID 55: 포스트 12 분석 (원래 ID 271)
 cursor.execute("""
-    INSERT INTO sentiments (id, post_id, ticker, sentiment, sentiment_score, key_reasoning,
+    INSERT INTO sentiments (id, log_no, ticker, sentiment, sentiment_score, key_reasoning,
         supporting_evidence, investment_perspective, investment_timeframe,
         conviction_level, uncertainty_factors, mention_context, analysis_date)
     VALUES (55, 12, '005930', 'positive', 0.55,
@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+portfolio_performance 일간 스냅샷 계산
+transactions 전체를 (포트폴리오, 종목) × 날짜 배열로 펼쳐 cumsum으로 보유 수량/매수 금액을 만들고
+종가 행렬(전일 종가로 채움)과 곱한 뒤 포트폴리오 소속 행렬 곱으로 포트폴리오별 평가 금액을 한 번에 계산
+현금: 매도 대금(수수료 차감)은 포트폴리오 현금으로 쌓이고 이후 매수는 현금에서 먼저 지불
+- total_value = 보유 종목 평가 금액 + 현금 (cash_balance에 현금 저장)
+- total_cost = 외부에서 들어온 투자 원금 (현금으로 부족한 매수 금액 + 수수료의 누적)
+  → 매도로 실현한 손익도 total_gain_loss에 남음
+기존 스냅샷과 비교해 값이 바뀐 날짜만 upsert
+평가 금액은 종목별 거래 통화 기준으로 합산 (환율 미반영 - 웹 앱 포트폴리오 화면과 동일)
+"""
+
+import argparse
+import sqlite3
+from datetime import date
+
+import numpy as np
+
+from db_maintenance import checkpoint_after_bulk
+from trading_calendar import KRX_CALENDAR, US_CALENDAR, to_day_numbers
+
+
+def forward_fill(matrix):
+    """행마다 NaN을 직전 값으로 채움 - 첫 값 이전은 0"""
+    columns = np.arange(matrix.shape[1])
+    last = np.where(np.isnan(matrix), -1, columns)
+    last = np.maximum.accumulate(last, axis=1)
+    filled = np.take_along_axis(matrix, np.maximum(last, 0), axis=1)
+    return np.where(last < 0, 0.0, filled)
+
+
+class PortfolioSnapshotEngine:
+    def __init__(self, db_path='database.db'):
+        self.conn = sqlite3.connect(db_path)
+        self.cursor = self.conn.cursor()
+
+    def table_exists(self, name):
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,))
+        return self.cursor.fetchone() is not None
+
+    def symbol_column(self):
+        """stocks 종목 코드 컬럼 - portfolio_schema.sql은 symbol, 예전 SQLite 스키마는 ticker"""
+        columns = {row[1] for row in self.cursor.execute("PRAGMA table_info(stocks)")}
+        return 'symbol' if 'symbol' in columns else 'ticker'
+
+    def load_transactions(self, portfolio_ids=None):
+        """[(portfolio_id, stock_id, symbol, market, type, shares, price, commission, date)] 날짜순"""
+        sql = f"""
+            SELECT t.portfolio_id, t.stock_id, s.{self.symbol_column()}, COALESCE(s.market, ''),
+                   t.transaction_type, t.shares, t.price, COALESCE(t.commission, 0), t.transaction_date
+            FROM transactions t
+            JOIN stocks s ON s.id = t.stock_id
+        """
+        params = []
+        if portfolio_ids:
+            sql += f" WHERE t.portfolio_id IN ({','.join('?' * len(portfolio_ids))})"
+            params = list(portfolio_ids)
+        self.cursor.execute(sql + " ORDER BY t.transaction_date, t.id", params)
+        return self.cursor.fetchall()
+
+    def load_price_matrix(self, symbols, days):
+        """종목 × 날짜 종가 행렬 (거래가 없는 날은 NaN)"""
+        prices = np.full((len(symbols), len(days)), np.nan)
+        if not symbols:
+            return prices
+        self.cursor.execute(f"""
+            SELECT ticker, trade_date, close_price FROM stock_daily_prices
+            WHERE ticker IN ({','.join('?' * len(symbols))}) AND trade_date >= ?
+        """, [*symbols, str(days[0].astype('datetime64[D]'))])
+        rows = self.cursor.fetchall()
+        if not rows:
+            return prices
+
+        symbol_ids = {symbol: i for i, symbol in enumerate(symbols)}
+        rows_idx = np.array([symbol_ids[row[0]] for row in rows])
+        day_numbers = to_day_numbers([str(row[1])[:10] for row in rows])
+        cols = np.minimum(np.searchsorted(days, day_numbers), len(days) - 1)
+        matched = days[cols] == day_numbers
+        prices[rows_idx[matched], cols[matched]] = np.array([row[2] for row in rows], dtype=float)[matched]
+        return prices
+
+    @staticmethod
+    def cash_flows(transactions):
+        """거래별 (현금 변화, 투자 원금 변화) - 매도 대금은 현금에 적립, 매수는 현금에서 먼저 지불하고 부족분만 원금 투입"""
+        cash = {}
+        cash_deltas = np.zeros(len(transactions))
+        capital_deltas = np.zeros(len(transactions))
+        for i, (portfolio_id, _, _, _, kind, shares, price, commission, _) in enumerate(transactions):
+            available = cash.get(portfolio_id, 0.0)
+            if kind == 'buy':
+                amount = shares * price + commission
+                cash_deltas[i] = -min(available, amount)
+                capital_deltas[i] = amount + cash_deltas[i]
+            else:
+                cash_deltas[i] = shares * price - commission
+            cash[portfolio_id] = available + cash_deltas[i]
+        return cash_deltas, capital_deltas
+
+    def compute(self, transactions, end=None):
+        """포트폴리오별 일간 스냅샷 {(portfolio_id, 'YYYY-MM-DD'): (평가, 원금, 손익, 수익률, 일간 변동, 변동률, 현금)}"""
+        if not transactions:
+            return {}
+
+        end = end or date.today()
+        tx_days = to_day_numbers([str(t[8])[:10] for t in transactions])
+        start = np.datetime64(int(tx_days.min()), 'D')
+        # 국내/미국 종목이 섞여 있으므로 두 거래소 거래일의 합집합을 날짜 축으로 사용
+        days = np.union1d(
+            KRX_CALENDAR.trading_days(start, end).astype(np.int64),
+            US_CALENDAR.trading_days(start, end).astype(np.int64),
+        )
+        if len(days) == 0:
+            return {}
+        # 휴장일 거래는 다음 거래일에 반영 (마지막 날 이후 거래는 마지막 날)
+        tx_cols = np.minimum(np.searchsorted(days, tx_days), len(days) - 1)
+
+        pair_ids = {}
+        symbols = {}
+        portfolio_ids = {}
+        for t in transactions:
+            pair_ids.setdefault((t[0], t[1]), len(pair_ids))
+            symbols.setdefault(t[2], len(symbols))
+            portfolio_ids.setdefault(t[0], len(portfolio_ids))
+        pair_rows = np.array([pair_ids[(t[0], t[1])] for t in transactions])
+        signed_shares = np.array([t[5] if t[4] == 'buy' else -t[5] for t in transactions], dtype=float)
+
+        portfolio_rows = np.array([portfolio_ids[t[0]] for t in transactions])
+
+        # (포트폴리오, 종목) × 날짜: 거래일에 변화량을 넣고 cumsum
+        positions = np.zeros((len(pair_ids), len(days)))
+        np.add.at(positions, (pair_rows, tx_cols), signed_shares)
+        positions = np.maximum(np.cumsum(positions, axis=1), 0.0)
+
+        # 포트폴리오 × 날짜: 현금 / 투자 원금
+        cash_deltas, capital_deltas = self.cash_flows(transactions)
+        cash = np.zeros((len(portfolio_ids), len(days)))
+        total_costs = np.zeros((len(portfolio_ids), len(days)))
+        np.add.at(cash, (portfolio_rows, tx_cols), cash_deltas)
+        np.add.at(total_costs, (portfolio_rows, tx_cols), capital_deltas)
+        cash = np.cumsum(cash, axis=1)
+        total_costs = np.cumsum(total_costs, axis=1)
+
+        # 종가가 없으면 체결가로 보충한 뒤 직전 값으로 채움
+        symbol_list = list(symbols)
+        prices = self.load_price_matrix(symbol_list, days)
+        symbol_rows = np.array([symbols[t[2]] for t in transactions])
+        missing = np.isnan(prices[symbol_rows, tx_cols])
+        prices[symbol_rows[missing], tx_cols[missing]] = np.array([t[6] for t in transactions], dtype=float)[missing]
+        prices = forward_fill(prices)
+
+        pair_symbol = np.zeros(len(pair_ids), dtype=np.int64)
+        membership = np.zeros((len(portfolio_ids), len(pair_ids)))
+        for (portfolio_id, _), row in pair_ids.items():
+            membership[portfolio_ids[portfolio_id], row] = 1.0
+        for t in transactions:
+            pair_symbol[pair_ids[(t[0], t[1])]] = symbols[t[2]]
+
+        # 포트폴리오 × 날짜 = 소속 행렬 @ (보유 수량 × 종가) + 현금
+        values = membership @ (positions * prices[pair_symbol]) + cash
+        gains = values - total_costs
+        returns = np.divide(gains * 100, total_costs, out=np.zeros_like(gains), where=total_costs > 0)
+        previous = np.concatenate([np.zeros((len(portfolio_ids), 1)), values[:, :-1]], axis=1)
+        changes = values - previous
+        change_percents = np.divide(changes * 100, previous, out=np.zeros_like(changes), where=previous > 0)
+
+        first_cols = np.full(len(portfolio_ids), len(days), dtype=np.int64)
+        np.minimum.at(first_cols, portfolio_rows, tx_cols)
+
+        day_strings = days.astype('datetime64[D]').astype(str)
+        snapshots = {}
+        for portfolio_id, row in portfolio_ids.items():
+            first = first_cols[row]
+            for col in range(first, len(days)):
+                snapshots[(portfolio_id, day_strings[col])] = (
+                    round(float(values[row, col]), 2),
+                    round(float(total_costs[row, col]), 2),
+                    round(float(gains[row, col]), 2),
+                    round(float(returns[row, col]), 4),
+                    None if col == first else round(float(changes[row, col]), 2),
+                    None if col == first else round(float(change_percents[row, col]), 2),
+                    round(float(cash[row, col]), 2),
+                )
+        return snapshots
+
+    def load_snapshots(self, portfolio_ids=None):
+        sql = """
+            SELECT portfolio_id, snapshot_date, total_value, total_cost, total_gain_loss,
+                   total_return_percent, daily_change, daily_change_percent, cash_balance
+            FROM portfolio_performance
+        """
+        params = []
+        if portfolio_ids:
+            sql += f" WHERE portfolio_id IN ({','.join('?' * len(portfolio_ids))})"
+            params = list(portfolio_ids)
+        self.cursor.execute(sql, params)
+        return {(row[0], str(row[1])[:10]): tuple(row[2:]) for row in self.cursor.fetchall()}
+
+    def refresh(self, portfolio_ids=None, end=None, dry_run=False):
+        """값이 바뀐 스냅샷만 upsert, 거래가 있는 포트폴리오에서 범위를 벗어난 날짜는 삭제 - (저장 행 수, 삭제 행 수)
+        (거래가 없는 포트폴리오의 스냅샷은 다른 경로로 기록된 것일 수 있으므로 건드리지 않음)"""
+        if not (self.table_exists('transactions') and self.table_exists('portfolio_performance')):
+            return 0, 0
+
+        computed = self.compute(self.load_transactions(portfolio_ids), end)
+        stored = self.load_snapshots(portfolio_ids)
+        changed = [key for key, row in computed.items() if stored.get(key) != row]
+        computed_portfolios = {key[0] for key in computed}
+        removed = [key for key in stored if key[0] in computed_portfolios and key not in computed]
+        if dry_run:
+            return len(changed), len(removed)
+
+        self.cursor.executemany("""
+            INSERT INTO portfolio_performance
+                (portfolio_id, snapshot_date, total_value, total_cost, total_gain_loss,
+                 total_return_percent, daily_change, daily_change_percent, cash_balance)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(portfolio_id, snapshot_date) DO UPDATE SET
+                total_value = excluded.total_value,
+                total_cost = excluded.total_cost,
+                total_gain_loss = excluded.total_gain_loss,
+                total_return_percent = excluded.total_return_percent,
+                daily_change = excluded.daily_change,
+                daily_change_percent = excluded.daily_change_percent,
+                cash_balance = excluded.cash_balance
+        """, [(*key, *computed[key]) for key in changed])
+        self.cursor.executemany(
+            "DELETE FROM portfolio_performance WHERE portfolio_id = ? AND snapshot_date = ?", removed
+        )
+        self.conn.commit()
+        return len(changed), len(removed)
+
+    def close(self):
+        """DB 연결 종료"""
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="포트폴리오 일간 성과 스냅샷 계산")
+    parser.add_argument('--db', default='database.db', help="SQLite DB 경로")
+    parser.add_argument('--portfolio', type=int, action='append', help="대상 포트폴리오 ID (여러 번 지정 가능)")
+    parser.add_argument('--end', help="마지막 스냅샷 날짜 (YYYY-MM-DD, 기본: 오늘)")
+    parser.add_argument('--dry-run', action='store_true', help="바뀔 행 수만 출력")
+    args = parser.parse_args()
+
+    engine = PortfolioSnapshotEngine(args.db)
+    try:
+        end = date.fromisoformat(args.end) if args.end else None
+        written, deleted = engine.refresh(args.portfolio, end, args.dry_run)
+        print(f"스냅샷 {'변경 예정' if args.dry_run else '갱신'}: {written}행 저장, {deleted}행 삭제")
+        if not args.dry_run and (written or deleted):
+            checkpoint_after_bulk(args.db, engine.conn)
+    finally:
+        engine.close()
@@ -0,0 +1,415 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+연도별 포스트 본문 아카이브 (archive/posts-YYYY.db)
+오래된 포스트의 content만 연도별 파일로 옮기고 핫 DB(database.db)의 blog_posts 행은 content = NULL로 남김
+(blog_posts.content가 NOT NULL인 DB는 database/migrations/0010으로 제약을 먼저 풀어야 함)
+제목/날짜/조회수/log_no는 그대로 남지만 본문을 읽는 곳은 아카이브를 함께 봐야 함
+- 웹: src/lib/post-archive.ts의 fillArchivedContent(본문 채우기) / searchArchivedLogNos(본문 검색)
+- Python: load_archived_contents (shard_export.py 포스트 샤드), PostArchive.query / map_partitions (전체 기간 스캔)
+최근 포스트 조회 / 일일 분석은 핫 DB만 읽고, 전체 기간 작업은 PostArchive가 날짜 범위에 맞는
+아카이브만 ATTACH 하거나 파티션별 연결로 병렬 스캔
+핫 DB의 archived_posts(id, log_no, year)로 아카이브 여부를 판단 (재수집된 글을 다시 넣지 않음)
+
+아카이브된 포스트는 '동결' 상태 - 옮기기 전에 섹션/테마를 최신으로 맞추고, 이후에는 본문이 필요한 작업이 건너뜀
+- sentiments / sentiment_factors: 그대로 유지, --rescore / 별칭 백필 대상에서 제외 (마지막 채점 결과 유지)
+- merry_post_stock_mentions: 그대로 유지, --index-mentions 재생성 대상에서 제외
+- post_minhash_signatures / post_lsh_buckets: 그대로 유지 (새 글의 중복 비교 대상으로 계속 사용), build_all에서 제외
+- post_sections / post_themes: 그대로 유지 (content = NULL 변경은 무효화 트리거에서 제외)
+- blog_posts_fts: 본문이 빠지므로 아카이브 포스트는 제목으로만 검색됨
+--compress로 옮기면 아카이브 본문은 post_content_blobs에만 저장 (읽기는 PostContentStore)
+"""
+
+import argparse
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+from db_maintenance import DatabaseMaintenance, checkpoint_after_bulk
+from post_content_store import ARCHIVE_APPLICATION_ID, PostContentStore
+from post_dates import KST, parse_created_date
+from post_sections import PostSectionStore
+from theme_taxonomy import ThemeIndexer
+
+DEFAULT_ARCHIVE_DIR = 'archive'
+# 핫 DB에 남길 최근 연도 수 (올해 포함)
+DEFAULT_HOT_YEARS = 2
+HOT = 'main'
+ID_QUERY_CHUNK_SIZE = 500
+# 아카이브 파일의 본문 테이블 (blog_posts의 본문 열 부분만)
+ARCHIVE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS blog_posts (
+        id INTEGER PRIMARY KEY,
+        log_no TEXT,
+        created_date TEXT,
+        content TEXT
+    )
+"""
+
+
+def table_exists(conn, name, schema=HOT):
+    return conn.execute(
+        f"SELECT 1 FROM {schema}.sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone() is not None
+
+
+def table_columns(conn, name, schema=HOT):
+    return [row[1] for row in conn.execute(f"PRAGMA {schema}.table_info({name})")]
+
+
+def load_archived_contents(conn, post_ids):
+    """아카이브로 옮겨진 포스트의 본문 {id: 본문} - 아카이브 파일마다 읽기 전용으로 한 번씩 엶 (압축 blob도 해제)"""
+    if not post_ids or not table_exists(conn, 'archived_posts'):
+        return {}
+    by_path = {}
+    for start in range(0, len(post_ids), ID_QUERY_CHUNK_SIZE):
+        chunk = list(post_ids[start:start + ID_QUERY_CHUNK_SIZE])
+        rows = conn.execute(f"""
+            SELECT ap.id, pap.path FROM archived_posts ap
+            JOIN post_archive_partitions pap ON pap.year = ap.year
+            WHERE ap.id IN ({','.join('?' * len(chunk))})
+        """, chunk).fetchall()
+        for post_id, path in rows:
+            by_path.setdefault(path, []).append(post_id)
+
+    contents = {}
+    for path, ids in by_path.items():
+        if not os.path.exists(path):
+            continue
+        archive = sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True)
+        try:
+            store = PostContentStore(archive)
+            for post_id in ids:
+                content = store.get(post_id)
+                if content is not None:
+                    contents[post_id] = content
+        finally:
+            archive.close()
+    return contents
+
+
+def find_archived(cursor, log_no):
+    """아카이브로 옮겨진 log_no면 연도, 아니면 None"""
+    if not table_exists(cursor.connection, 'archived_posts'):
+        return None
+    cursor.execute("SELECT year FROM archived_posts WHERE log_no = ?", (str(log_no),))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+class PostArchive:
+    def __init__(self, db_path='database.db', archive_dir=None):
+        self.db_path = db_path
+        self.archive_dir = archive_dir or os.path.join(os.path.dirname(os.path.abspath(db_path)), DEFAULT_ARCHIVE_DIR)
+        self.conn = sqlite3.connect(db_path)
+        self.cursor = self.conn.cursor()
+        self.attached = set()
+        self.ensure_schema()
+
+    def ensure_schema(self):
+        self.cursor.executescript("""
+            CREATE TABLE IF NOT EXISTS post_archive_partitions (
+                year INTEGER PRIMARY KEY,
+                path TEXT NOT NULL,
+                post_count INTEGER NOT NULL,
+                min_date TEXT,
+                max_date TEXT,
+                archived_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE TABLE IF NOT EXISTS archived_posts (
+                id INTEGER PRIMARY KEY,
+                log_no TEXT,
+                year INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_archived_posts_log_no ON archived_posts(log_no);
+        """)
+
+    def archive_path(self, year):
+        return os.path.join(self.archive_dir, f"posts-{year}.db")
+
+    def partition_years(self):
+        self.cursor.execute("SELECT year FROM post_archive_partitions ORDER BY year")
+        return [row[0] for row in self.cursor.fetchall()]
+
+    def hot_post_years(self):
+        """본문이 핫 DB에 있는 포스트의 KST 연도별 ID 목록 (날짜 해석 불가 포스트는 핫 DB에 남김)"""
+        self.cursor.execute("SELECT id, created_date FROM blog_posts WHERE content IS NOT NULL")
+        years = {}
+        for post_id, created_date in self.cursor.fetchall():
+            parsed = parse_created_date(created_date)
+            if parsed:
+                years.setdefault(parsed.year, []).append(post_id)
+        return years
+
+    def prepare_partition(self, year):
+        """아카이브 파일에 본문 테이블 생성 (application_id로 아카이브 파일 표시)"""
+        os.makedirs(self.archive_dir, exist_ok=True)
+        archive = sqlite3.connect(self.archive_path(year))
+        try:
+            archive.execute(f"PRAGMA application_id = {ARCHIVE_APPLICATION_ID}")
+            archive.execute(ARCHIVE_SCHEMA)
+            archive.commit()
+        finally:
+            archive.close()
+
+    def freeze_derived(self):
+        """본문을 빼기 전에 본문에서 만드는 파생 테이블(섹션, 테마)을 최신으로 맞춤"""
+        PostSectionStore(self.conn).sync()
+        self.conn.commit()
+        indexer = ThemeIndexer(self.db_path)
+        try:
+            indexer.refresh()
+        finally:
+            indexer.close()
+
+    def schema_for(self, year):
+        return f"archive_{int(year)}"
+
+    def attach(self, years):
+        """아카이브 파일 ATTACH (트랜잭션 밖에서 호출) - 스키마 이름 목록"""
+        schemas = []
+        for year in years:
+            schema = self.schema_for(year)
+            if schema not in self.attached:
+                self.conn.execute("ATTACH DATABASE ? AS " + schema, (self.archive_path(year),))
+                self.attached.add(schema)
+            schemas.append(schema)
+        return schemas
+
+    def detach_all(self):
+        for schema in sorted(self.attached):
+            self.conn.execute(f"DETACH DATABASE {schema}")
+        self.attached.clear()
+
+    def require_nullable_content(self):
+        """본문을 NULL로 비우려면 blog_posts.content가 NULL을 허용해야 함 (database/migrations/0010)"""
+        not_null = {row[1]: row[3] for row in self.conn.execute("PRAGMA main.table_info(blog_posts)")}
+        if not_null.get('content'):
+            raise RuntimeError("blog_posts.content가 NOT NULL - db_migrate.py로 마이그레이션을 먼저 적용하세요")
+
+    def archive_year(self, year, post_ids):
+        """한 연도 포스트 본문을 아카이브로 이동 - 옮긴 포스트 수
+        복사와 본문 비우기는 한 단위로 처리: 아카이브 복사를 먼저 커밋(본문이 어느 쪽에도 없는 순간이 없도록)한 뒤
+        archived_posts 기록 + 본문 비우기를 핫 DB 한 트랜잭션으로 커밋하고, 이 단계가 실패하면 핫 DB를 롤백하고
+        이번에 복사한 아카이브 행도 지워 두 DB를 실행 전 상태로 되돌림
+        (WAL 모드에서는 ATTACH한 DB 간 커밋이 원자적이지 않아 하나의 트랜잭션으로 묶을 수 없음)"""
+        self.prepare_partition(year)
+        schema, = self.attach([year])
+        self.cursor.execute("CREATE TEMP TABLE IF NOT EXISTS archive_ids (id INTEGER PRIMARY KEY)")
+        self.cursor.execute("DELETE FROM temp.archive_ids")
+        self.cursor.executemany("INSERT INTO temp.archive_ids (id) VALUES (?)", [(i,) for i in post_ids])
+
+        self.cursor.execute(f"""
+            INSERT OR REPLACE INTO {schema}.blog_posts (id, log_no, created_date, content)
+            SELECT id, log_no, created_date, content FROM {HOT}.blog_posts
+            WHERE id IN (SELECT id FROM temp.archive_ids) AND content IS NOT NULL
+        """)
+        self.conn.commit()
+
+        try:
+            self.cursor.execute(f"""
+                SELECT COUNT(*) FROM {schema}.blog_posts WHERE id IN (SELECT id FROM temp.archive_ids)
+            """)
+            copied = self.cursor.fetchone()[0]
+            if copied != len(post_ids):
+                raise RuntimeError(f"{year}년 아카이브 복사 불일치: {copied}/{len(post_ids)}")
+
+            self.cursor.execute("""
+                INSERT OR REPLACE INTO archived_posts (id, log_no, year)
+                SELECT id, log_no, ? FROM blog_posts WHERE id IN (SELECT id FROM temp.archive_ids)
+            """, (year,))
+            # 행은 남기고 본문만 비움 (섹션/테마 무효화 트리거는 content = NULL 변경을 무시)
+            self.cursor.execute("UPDATE blog_posts SET content = NULL WHERE id IN (SELECT id FROM temp.archive_ids)")
+            self.update_partition(year, schema)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            # 핫 DB에 본문이 그대로 남았으므로 이번에 복사한 아카이브 행 제거
+            self.cursor.execute(f"""
+                DELETE FROM {schema}.blog_posts WHERE id IN (
+                    SELECT id FROM {HOT}.blog_posts WHERE id IN (SELECT id FROM temp.archive_ids) AND content IS NOT NULL
+                )
+            """)
+            self.conn.commit()
+            raise
+        return len(post_ids)
+
+    def update_partition(self, year, schema):
+        self.cursor.execute(f"SELECT created_date FROM {schema}.blog_posts")
+        dates = sorted(d for d in map(parse_created_date, (row[0] for row in self.cursor.fetchall())) if d)
+        self.cursor.execute("""
+            INSERT OR REPLACE INTO post_archive_partitions (year, path, post_count, min_date, max_date, archived_at)
+            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, (
+            year, self.archive_path(year), len(dates),
+            dates[0].isoformat() if dates else None, dates[-1].isoformat() if dates else None
+        ))
+
+    def compress_partition(self, year):
+        """아카이브 본문을 사전 압축 blob으로 옮기고 파일 크기 축소 - 압축한 포스트 수"""
+        self.prepare_partition(year)
+        archive = sqlite3.connect(self.archive_path(year))
+        try:
+            count = PostContentStore(archive).compress()
+            archive.commit()
+            archive.execute("VACUUM")
+        finally:
+            archive.close()
+        return count
+
+    def archive(self, before_year=None, dry_run=False, compress=False):
+        """before_year 이전 연도 포스트를 연도별 아카이브로 이동 - {연도: 포스트 수}
+        compress: 옮긴 뒤 아카이브 본문을 압축 blob으로 저장"""
+        if before_year is None:
+            before_year = datetime.now(KST).year - DEFAULT_HOT_YEARS + 1
+        targets = {year: ids for year, ids in self.hot_post_years().items() if year < before_year}
+        moved = {}
+        if targets and not dry_run:
+            self.require_nullable_content()
+            self.freeze_derived()
+        try:
+            for year in sorted(targets):
+                moved[year] = len(targets[year]) if dry_run else self.archive_year(year, targets[year])
+        finally:
+            self.detach_all()
+        if compress and not dry_run:
+            for year in moved:
+                self.compress_partition(year)
+        return moved
+
+    def restore(self, year):
+        """아카이브 연도 본문을 핫 DB로 되돌리고 파일 삭제 - 되돌린 포스트 수
+        (이전 형식처럼 핫 DB에서 행이 삭제된 아카이브는 공통 컬럼으로 행을 다시 만듦)"""
+        if year not in self.partition_years():
+            return 0
+        # 압축 저장된 본문은 먼저 풀어서 blog_posts.content로 되돌림
+        archive = sqlite3.connect(self.archive_path(year))
+        try:
+            PostContentStore(archive).inflate()
+            archive.commit()
+        finally:
+            archive.close()
+        schema, = self.attach([year])
+        try:
+            hot_columns = set(table_columns(self.conn, 'blog_posts'))
+            columns = ', '.join(c for c in table_columns(self.conn, 'blog_posts', schema) if c in hot_columns)
+            self.cursor.execute(f"""
+                INSERT OR IGNORE INTO {HOT}.blog_posts ({columns}) SELECT {columns} FROM {schema}.blog_posts
+            """)
+            self.cursor.execute(f"""
+                UPDATE {HOT}.blog_posts
+                SET content = (SELECT a.content FROM {schema}.blog_posts a WHERE a.id = {HOT}.blog_posts.id)
+                WHERE content IS NULL AND id IN (SELECT id FROM {schema}.blog_posts)
+            """)
+            self.cursor.execute(f"SELECT COUNT(*) FROM {schema}.blog_posts")
+            restored = self.cursor.fetchone()[0]
+            self.cursor.execute("DELETE FROM archived_posts WHERE year = ?", (year,))
+            self.cursor.execute("DELETE FROM post_archive_partitions WHERE year = ?", (year,))
+            self.conn.commit()
+        finally:
+            self.detach_all()
+        os.remove(self.archive_path(year))
+        return restored
+
+    def years_for_range(self, start=None, end=None):
+        """날짜 범위(date, 양끝 포함)와 겹치는 아카이브 연도"""
+        self.cursor.execute("SELECT year, min_date, max_date FROM post_archive_partitions ORDER BY year")
+        return [
+            year for year, min_date, max_date in self.cursor.fetchall()
+            if (end is None or min_date is None or min_date <= end.isoformat())
+            and (start is None or max_date is None or max_date >= start.isoformat())
+        ]
+
+    def partitions(self, start=None, end=None):
+        """날짜 범위를 담은 파티션 [(연도 또는 None(핫 DB), 파일 경로)] - 핫 DB는 항상 포함"""
+        return [(None, self.db_path)] + [(year, self.archive_path(year)) for year in self.years_for_range(start, end)]
+
+    def posts_source(self, start=None, end=None):
+        """날짜 범위에 맞는 아카이브만 ATTACH해 본문을 채운 blog_posts 서브쿼리 (트랜잭션 밖에서 호출)"""
+        years = self.years_for_range(start, end)
+        schemas = self.attach(years)
+        columns = [c for c in table_columns(self.conn, 'blog_posts') if c != 'content']
+        joins = ''.join(f" LEFT JOIN {schema}.blog_posts {schema} ON {schema}.id = bp.id" for schema in schemas)
+        content = f"COALESCE(bp.content, {', '.join(f'{schema}.content' for schema in schemas)})" if schemas else 'bp.content'
+        return f"(SELECT {', '.join(f'bp.{c}' for c in columns)}, {content} AS content FROM {HOT}.blog_posts bp{joins})"
+
+    def query(self, sql, params=(), start=None, end=None):
+        """{posts} 자리에 본문을 아카이브에서 채운 blog_posts를 넣어 실행
+        예: query("SELECT id, title FROM {posts} WHERE content LIKE ?", ('%반도체%',), date(2024, 1, 1))"""
+        self.cursor.execute(sql.format(posts=self.posts_source(start, end)), params)
+        return self.cursor.fetchall()
+
+    def posts_between(self, start=None, end=None, columns=('id', 'title', 'created_date')):
+        """created_date(KST)가 범위 안인 포스트 - 밀리초/문자열 혼합 형식이라 날짜 비교는 Python에서
+        (압축 아카이브의 content는 비어 있으므로 본문은 map_partitions + PostContentStore.iter_contents로 읽음)"""
+        column_list = ', '.join(('created_date',) + tuple(columns))
+        return [
+            row[1:] for row in self.query(f"SELECT {column_list} FROM {{posts}}", (), start, end)
+            if (parsed := parse_created_date(row[0]))
+            and (start is None or parsed >= start) and (end is None or parsed <= end)
+        ]
+
+    def map_partitions(self, func, start=None, end=None, max_workers=None):
+        """파티션마다 읽기 전용 연결로 func(conn, year) 병렬 실행 - [(year, 결과)]
+        핫 DB(year=None)와 아카이브 모두 blog_posts(id, log_no, created_date, content)를 가지며
+        본문 스캔은 content IS NOT NULL 행만 읽으면 각 포스트를 한 번씩 봄
+        (sqlite3는 쿼리 실행 중 GIL을 놓으므로 파일별 스캔이 동시에 진행됨)"""
+        def run(partition):
+            year, path = partition
+            conn = sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True, check_same_thread=False)
+            try:
+                return year, func(conn, year)
+            finally:
+                conn.close()
+
+        partitions = self.partitions(start, end)
+        with ThreadPoolExecutor(max_workers=max_workers or len(partitions)) as executor:
+            return list(executor.map(run, partitions))
+
+    def close(self):
+        """DB 연결 종료"""
+        self.detach_all()
+        self.conn.close()
+
+
+def _parse_date(value):
+    return date.fromisoformat(value) if value else None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="연도별 포스트 본문 아카이브 (오래된 본문을 archive/posts-YYYY.db로 이동)")
+    parser.add_argument('--db', default='database.db', help="SQLite DB 경로")
+    parser.add_argument('--archive-dir', help="아카이브 디렉터리 (기본: DB 옆 archive/)")
+    parser.add_argument('--before', type=int, help=f"이 연도 이전 포스트를 이동 (기본: 최근 {DEFAULT_HOT_YEARS}년만 핫 DB에 유지)")
+    parser.add_argument('--dry-run', action='store_true', help="옮길 포스트 수만 출력")
+    parser.add_argument('--compress', action='store_true', help="아카이브 본문을 사전 압축 blob으로 저장")
+    parser.add_argument('--restore', type=int, help="아카이브 연도를 핫 DB로 되돌리기")
+    parser.add_argument('--from', dest='start', help="기간 포스트 수 조회 시작일 (YYYY-MM-DD)")
+    parser.add_argument('--to', dest='end', help="기간 포스트 수 조회 종료일 (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    archive = PostArchive(args.db, args.archive_dir)
+    try:
+        if args.restore:
+            print(f"{args.restore}년 복원: {archive.restore(args.restore)}개 포스트")
+        elif args.start or args.end:
+            start, end = _parse_date(args.start), _parse_date(args.end)
+            years = archive.years_for_range(start, end)
+            print(f"파티션: 핫 DB + {years or '아카이브 없음'}, 포스트 {len(archive.posts_between(start, end))}개")
+        else:
+            moved = archive.archive(args.before, args.dry_run, args.compress)
+            for year, count in moved.items():
+                print(f"  {year}년: {count}개 포스트{' (dry-run)' if args.dry_run else ''}")
+            print(f"아카이브 {'대상' if args.dry_run else '완료'}: {sum(moved.values())}개 포스트")
+    finally:
+        archive.close()
+
+    if not args.dry_run and not (args.start or args.end):
+        # 본문을 비워 생긴 빈 페이지 반환 + WAL 정리
+        maintenance = DatabaseMaintenance(args.db)
+        try:
+            print(f"빈 페이지 반환: {maintenance.run()['vacuumed_pages']}개")
+        finally:
+            maintenance.close()
+        checkpoint_after_bulk(args.db)
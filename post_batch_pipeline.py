@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+배치 후처리 파이프라인
+포스트 분석/수집 배치(analyze_all_posts.py, ingest_parsed_posts.py)와 주가 백필(price_backfill.py)이
+끝난 뒤 파생 테이블을 한 곳에서 정해진 순서로 갱신
+
+각 단계는 입력(content / sentiments / mentions / prices) 중 배치가 바꾼 것이 있을 때만 실행
+  themes      본문        → post_themes / theme_aggregates
+  markers     감정/언급/가격 → chart markers
+  comentions  언급        → 동시 언급 그래프 / 관련 종목
+  snapshots   가격        → 포트폴리오 일별 스냅샷
+  screener    가격        → 낙폭 / 과매도 스크린
+  similarity  본문        → TF-IDF 행렬 / 관련 포스트
+  weekly      전부        → 주간보고 정량 데이터 (입력이 바뀐 주만)
+  shards      전부        → data/shards JSON 샤드
+  checkpoint  전부        → WAL 정리 + 읽기 복제본 게시
+
+--skip <단계>(여러 번 지정 가능) 또는 --no-post-batch로 끌 수 있고, numpy 등 선택 의존성이 없는
+단계는 건너뛰고 나머지를 계속 실행
+"""
+
+import argparse
+
+CHANGES = ('content', 'sentiments', 'mentions', 'prices')
+
+
+def _refresh_themes(db_path, conn, theme_matcher):
+    from theme_taxonomy import ThemeIndexer
+    indexer = ThemeIndexer(db_path, theme_matcher)
+    try:
+        count = indexer.refresh()
+    finally:
+        indexer.close()
+    return count, f"{count}개 포스트 분류"
+
+
+def _refresh_markers(db_path, conn, theme_matcher):
+    from chart_markers import ChartMarkerBuilder
+    builder = ChartMarkerBuilder(db_path)
+    try:
+        count = builder.refresh()
+    finally:
+        builder.close()
+    return count, f"{count}개 종목 재계산"
+
+
+def _refresh_comentions(db_path, conn, theme_matcher):
+    from comention_graph import ComentionGraph
+    graph = ComentionGraph(db_path)
+    try:
+        count = graph.refresh()
+    finally:
+        graph.close()
+    return count, f"{count}개 포스트 반영"
+
+
+def _refresh_snapshots(db_path, conn, theme_matcher):
+    from portfolio_snapshots import PortfolioSnapshotEngine
+    engine = PortfolioSnapshotEngine(db_path)
+    try:
+        written, deleted = engine.refresh()
+    finally:
+        engine.close()
+    return (written, deleted), f"{written}행 저장, {deleted}행 삭제"
+
+
+def _refresh_screener(db_path, conn, theme_matcher):
+    from drawdown_screener import DrawdownScreener
+    screener = DrawdownScreener(db_path)
+    try:
+        count = screener.refresh()
+    finally:
+        screener.close()
+    return count, f"{count}행"
+
+
+def _refresh_similarity(db_path, conn, theme_matcher):
+    from post_similarity import PostSimilarityIndex
+    index = PostSimilarityIndex(db_path)
+    try:
+        changed, removed = index.update()
+        count = index.store_similar_posts()
+    finally:
+        index.close()
+    return (changed, removed, count), f"{changed}개 추가/갱신, {removed}개 삭제, 관련 포스트 {count}건"
+
+
+def _build_weekly_reports(db_path, conn, theme_matcher):
+    from weekly_report_builder import WeeklyReportBuilder
+    builder = WeeklyReportBuilder(db_path)
+    try:
+        count = builder.build()
+    finally:
+        builder.close()
+    return count, f"{count}주 다시 계산"
+
+
+def _export_shards(db_path, conn, theme_matcher):
+    from shard_export import export_after_bulk
+    rebuilt, total, removed = export_after_bulk(db_path)
+    return (rebuilt, total, removed), f"{rebuilt}/{total}개 갱신, 만료 파일 {removed}개 삭제"
+
+
+def _checkpoint(db_path, conn, theme_matcher):
+    from db_maintenance import checkpoint_after_bulk
+    result = checkpoint_after_bulk(db_path, conn)
+    return result, f"{result}"
+
+
+# (이름, 입력, 표시 이름, 실행 함수) - 목록 순서대로 실행
+STEPS = [
+    ('themes', {'content'}, "테마 분류", _refresh_themes),
+    ('markers', {'sentiments', 'mentions', 'prices'}, "차트 마커", _refresh_markers),
+    ('comentions', {'mentions'}, "동시 언급 그래프", _refresh_comentions),
+    ('snapshots', {'prices'}, "포트폴리오 스냅샷", _refresh_snapshots),
+    ('screener', {'prices'}, "과매도 스크린", _refresh_screener),
+    ('similarity', {'content'}, "관련 포스트", _refresh_similarity),
+    ('weekly', set(CHANGES), "주간보고", _build_weekly_reports),
+    ('shards', set(CHANGES), "샤드 내보내기", _export_shards),
+    ('checkpoint', set(CHANGES), "WAL 체크포인트", _checkpoint),
+]
+STEP_NAMES = [name for name, _, _, _ in STEPS]
+
+
+def run_post_batch(db_path, changes, skip=(), conn=None, theme_matcher=None):
+    """배치가 바꾼 입력(changes)에 해당하는 후처리 단계를 순서대로 실행 - {단계: 결과}
+    conn은 checkpoint 단계에서 재사용할 연결 (없으면 새로 엶)"""
+    changes = set(changes)
+    unknown = changes.difference(CHANGES)
+    if unknown:
+        raise ValueError(f"알 수 없는 변경 종류: {', '.join(sorted(unknown))}")
+
+    results = {}
+    for name, inputs, label, run in STEPS:
+        if name in skip or not inputs & changes:
+            continue
+        try:
+            result, summary = run(db_path, conn, theme_matcher)
+        except ImportError as e:
+            print(f"⏭️ {label}: 건너뜀 ({e}) - 의존성 설치 후 해당 스크립트를 별도 실행")
+            continue
+        print(f"🔁 {label}: {summary}")
+        results[name] = result
+    return results
+
+
+def add_pipeline_arguments(parser):
+    """후처리 단계 끄기 옵션 추가 (--skip, --no-post-batch)"""
+    group = parser.add_argument_group("배치 후처리 (post_batch_pipeline.py)")
+    group.add_argument('--skip', action='append', choices=STEP_NAMES, default=[], metavar='STEP',
+                       help=f"건너뛸 후처리 단계 (여러 번 지정 가능: {', '.join(STEP_NAMES)})")
+    group.add_argument('--no-post-batch', action='store_true', help="배치 후처리 전체 건너뛰기")
+    return group
+
+
+def skipped_steps(args):
+    """add_pipeline_arguments로 파싱한 인자 → 건너뛸 단계 집합"""
+    return set(STEP_NAMES) if args.no_post_batch else set(args.skip)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="배치 후처리 파이프라인 수동 실행")
+    parser.add_argument('--db', default='database.db', help="SQLite DB 경로")
+    parser.add_argument('--changes', action='append', choices=CHANGES,
+                        help="바뀐 입력 (여러 번 지정 가능, 기본: 전부)")
+    add_pipeline_arguments(parser)
+    args = parser.parse_args()
+
+    run_post_batch(args.db, args.changes or CHANGES, skipped_steps(args))
@@ -0,0 +1,346 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+포스트 본문 압축 저장소 (post_content_blobs)
+포스트 본문으로 사전을 학습해 짧은 한국어 글도 높은 압축률로 저장
+- zstandard 패키지가 있으면 zstd 학습 사전, 없으면 zlib(raw deflate) + 빈출 문구로 만든 zdict
+- 사전은 content_dictionaries에 저장되고 blob마다 사용한 사전 ID를 기록 (사전을 다시 학습해도 기존 blob 해석 가능)
+PostContentStore.get/iter_contents가 blob과 blog_posts.content를 구분 없이 읽음
+쓰기(학습/압축/저장)는 아카이브 파일(archive/posts-YYYY.db)에서만 허용 - 본문을 blob으로만 두고 content 컬럼을 비움
+(핫 DB에 blob을 함께 두면 본문이 두 번 저장되어 DB만 커지므로 거부)
+"""
+
+import argparse
+import sqlite3
+import zlib
+from collections import Counter
+
+try:
+    import zstandard
+except ImportError:  # zlib 사전으로 대체
+    zstandard = None
+
+# zstd 사전 크기 / zlib zdict는 창 크기(32KB)까지만 사용됨
+ZSTD_DICT_SIZE = 64 * 1024
+ZSTD_LEVEL = 10
+ZLIB_DICT_SIZE = 32 * 1024
+ZLIB_LEVEL = 9
+TRAIN_SAMPLE_LIMIT = 2000
+# zlib 사전 후보 문구 최소 길이 (UTF-8 바이트)
+ZLIB_MIN_PHRASE_BYTES = 6
+COMPRESS_BATCH_SIZE = 200
+# 아카이브 파일 표시 (PRAGMA application_id, post_archive.prepare_partition에서 설정)
+ARCHIVE_APPLICATION_ID = 0x4D455252
+
+
+def is_archive(conn):
+    return conn.execute("PRAGMA application_id").fetchone()[0] == ARCHIVE_APPLICATION_ID
+
+
+def table_exists(conn, name):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone() is not None
+
+
+def build_zlib_dictionary(samples, size=ZLIB_DICT_SIZE):
+    """여러 포스트에 반복되는 줄/어절로 zdict 생성 - deflate는 가까운 위치를 짧게 인코딩하므로 빈출 문구를 뒤쪽에 배치"""
+    counts = Counter()
+    for text in samples:
+        phrases = {line.strip() for line in text.splitlines()} | set(text.split())
+        counts.update(p for p in phrases if len(p.encode('utf-8')) >= ZLIB_MIN_PHRASE_BYTES)
+
+    ranked = sorted(
+        ((count * len(phrase.encode('utf-8')), phrase) for phrase, count in counts.items() if count > 1),
+        reverse=True
+    )
+    chosen, total = [], 0
+    for _, phrase in ranked:
+        encoded = phrase.encode('utf-8') + b'\n'
+        if total + len(encoded) > size:
+            continue
+        chosen.append(encoded)
+        total += len(encoded)
+    return b''.join(reversed(chosen))
+
+
+class ZstdCodec:
+    name = 'zstd'
+
+    def __init__(self, dictionary):
+        if zstandard is None:
+            raise RuntimeError("zstd 사전으로 압축된 본문입니다 - pip install zstandard 필요")
+        data = zstandard.ZstdCompressionDict(dictionary)
+        self.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=data)
+        self.decompressor = zstandard.ZstdDecompressor(dict_data=data)
+
+    @staticmethod
+    def train(samples):
+        return zstandard.train_dictionary(ZSTD_DICT_SIZE, samples).as_bytes()
+
+    def compress(self, raw):
+        return self.compressor.compress(raw)
+
+    def decompress(self, blob):
+        return self.decompressor.decompress(blob)
+
+
+class ZlibCodec:
+    name = 'zlib'
+
+    def __init__(self, dictionary):
+        self.dictionary = dictionary
+
+    @staticmethod
+    def train(samples):
+        return build_zlib_dictionary([sample.decode('utf-8') for sample in samples])
+
+    def compress(self, raw):
+        compressor = zlib.compressobj(ZLIB_LEVEL, zlib.DEFLATED, -15, 9, zlib.Z_DEFAULT_STRATEGY, self.dictionary)
+        return compressor.compress(raw) + compressor.flush()
+
+    def decompress(self, blob):
+        decompressor = zlib.decompressobj(-15, zdict=self.dictionary)
+        return decompressor.decompress(blob) + decompressor.flush()
+
+
+CODECS = {codec.name: codec for codec in (ZstdCodec, ZlibCodec)}
+
+
+class PostContentStore:
+    def __init__(self, conn):
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self._codecs = {}
+
+    def ensure_schema(self):
+        """쓰기 전에 호출 - 아카이브 파일이 아니면 거부"""
+        if not is_archive(self.conn):
+            raise RuntimeError("본문 압축 저장은 아카이브 파일 전용입니다 (post_archive.py --compress 사용)")
+        self.cursor.executescript("""
+            CREATE TABLE IF NOT EXISTS content_dictionaries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                codec TEXT NOT NULL,
+                dictionary BLOB NOT NULL,
+                sample_count INTEGER NOT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE TABLE IF NOT EXISTS post_content_blobs (
+                post_id INTEGER PRIMARY KEY,
+                dict_id INTEGER NOT NULL,
+                raw_size INTEGER NOT NULL,
+                content BLOB NOT NULL
+            );
+            -- 본문이 바뀌면 blob은 낡은 값 (본문을 비우는 offload는 제외)
+            CREATE TRIGGER IF NOT EXISTS trg_post_content_blobs_update
+            AFTER UPDATE OF content ON blog_posts
+            WHEN NEW.content IS NOT NULL
+            BEGIN
+                DELETE FROM post_content_blobs WHERE post_id = NEW.id;
+            END;
+            CREATE TRIGGER IF NOT EXISTS trg_post_content_blobs_delete
+            AFTER DELETE ON blog_posts
+            BEGIN
+                DELETE FROM post_content_blobs WHERE post_id = OLD.id;
+            END;
+        """)
+
+    def codec(self, dict_id):
+        if dict_id not in self._codecs:
+            self.cursor.execute("SELECT codec, dictionary FROM content_dictionaries WHERE id = ?", (dict_id,))
+            name, dictionary = self.cursor.fetchone()
+            self._codecs[dict_id] = CODECS[name](dictionary)
+        return self._codecs[dict_id]
+
+    def current_dictionary(self):
+        self.cursor.execute("SELECT MAX(id) FROM content_dictionaries")
+        return self.cursor.fetchone()[0]
+
+    def train(self, sample_limit=TRAIN_SAMPLE_LIMIT):
+        """최근 본문(blob으로 옮긴 본문 포함)으로 사전 학습 - 사전 ID (zstd 학습이 표본 부족으로 실패하면 zlib 사전)"""
+        self.ensure_schema()
+        self.cursor.execute("""
+            SELECT bp.content, b.dict_id, b.content FROM blog_posts bp
+            LEFT JOIN post_content_blobs b ON b.post_id = bp.id
+            WHERE bp.content IS NOT NULL OR b.post_id IS NOT NULL
+            ORDER BY bp.id DESC LIMIT ?
+        """, (sample_limit,))
+        samples = [
+            (self.decode(dict_id, blob) if blob is not None else content).encode('utf-8')
+            for content, dict_id, blob in self.cursor.fetchall()
+        ]
+        samples = [sample for sample in samples if sample]
+        codec = ZlibCodec
+        if zstandard is not None:
+            try:
+                dictionary = ZstdCodec.train(samples)
+                codec = ZstdCodec
+            except zstandard.ZstdError:
+                pass
+        if codec is ZlibCodec:
+            dictionary = ZlibCodec.train(samples)
+        self.cursor.execute(
+            "INSERT INTO content_dictionaries (codec, dictionary, sample_count) VALUES (?, ?, ?)",
+            (codec.name, dictionary, len(samples))
+        )
+        return self.cursor.lastrowid
+
+    def _store_blobs(self, rows, dict_id):
+        """[(post_id, 본문)] blob 저장 후 blog_posts.content 비움"""
+        codec = self.codec(dict_id)
+        records = []
+        for post_id, content in rows:
+            raw = content.encode('utf-8')
+            records.append((post_id, dict_id, len(raw), codec.compress(raw)))
+        self.cursor.executemany("""
+            INSERT OR REPLACE INTO post_content_blobs (post_id, dict_id, raw_size, content)
+            VALUES (?, ?, ?, ?)
+        """, records)
+        self.cursor.executemany("UPDATE blog_posts SET content = NULL WHERE id = ?", [(row[0],) for row in rows])
+
+    def compress(self, post_ids=None):
+        """content가 남아 있는 포스트(또는 지정 포스트)를 blob으로 옮김 - 옮긴 포스트 수 (커밋은 호출한 쪽에서)"""
+        self.ensure_schema()
+        dict_id = self.current_dictionary() or self.train()
+        reader = self.conn.cursor()
+        if post_ids is None:
+            reader.execute("SELECT id, content FROM blog_posts WHERE content IS NOT NULL")
+            batches = iter(lambda: reader.fetchmany(COMPRESS_BATCH_SIZE), [])
+        else:
+            ids = list(post_ids)
+            batches = (
+                reader.execute(
+                    f"SELECT id, content FROM blog_posts WHERE content IS NOT NULL AND id IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                for chunk in (ids[i:i + COMPRESS_BATCH_SIZE] for i in range(0, len(ids), COMPRESS_BATCH_SIZE))
+            )
+        total = 0
+        for rows in batches:
+            self._store_blobs(rows, dict_id)
+            total += len(rows)
+        return total
+
+    def recompress(self, dict_id=None):
+        """이전 사전으로 압축된 blob을 새 사전(기본: 최신)으로 다시 압축 - 다시 압축한 포스트 수"""
+        self.ensure_schema()
+        dict_id = dict_id or self.current_dictionary()
+        reader = self.conn.cursor()
+        reader.execute("SELECT post_id, dict_id, content FROM post_content_blobs WHERE dict_id != ?", (dict_id,))
+        total = 0
+        while True:
+            rows = reader.fetchmany(COMPRESS_BATCH_SIZE)
+            if not rows:
+                break
+            self._store_blobs([(post_id, self.decode(old_id, blob)) for post_id, old_id, blob in rows], dict_id)
+            total += len(rows)
+        return total
+
+    def decode(self, dict_id, blob):
+        return self.codec(dict_id).decompress(blob).decode('utf-8')
+
+    def get(self, post_id):
+        """본문 - blob이 있으면 해제, 없으면 blog_posts.content"""
+        if not table_exists(self.conn, 'post_content_blobs'):
+            self.cursor.execute("SELECT content FROM blog_posts WHERE id = ?", (post_id,))
+            row = self.cursor.fetchone()
+            return row[0] if row else None
+        self.cursor.execute("""
+            SELECT bp.content, b.dict_id, b.content FROM blog_posts bp
+            LEFT JOIN post_content_blobs b ON b.post_id = bp.id
+            WHERE bp.id = ?
+        """, (post_id,))
+        row = self.cursor.fetchone()
+        if row is None:
+            return None
+        content, dict_id, blob = row
+        return self.decode(dict_id, blob) if blob is not None else content
+
+    def put(self, post_id, content):
+        """본문 저장 (blob으로 저장하고 blog_posts.content는 비움)"""
+        self.ensure_schema()
+        self.cursor.execute("SELECT 1 FROM blog_posts WHERE id = ?", (post_id,))
+        if self.cursor.fetchone() is None:
+            raise KeyError(post_id)
+        self._store_blobs([(post_id, content)], self.current_dictionary() or self.train())
+
+    def iter_contents(self, batch_size=COMPRESS_BATCH_SIZE):
+        """전체 포스트 (id, 본문) - 전체 기간 스캔용 (읽기 전용 연결에서도 사용 가능)"""
+        if not table_exists(self.conn, 'post_content_blobs'):
+            query = "SELECT id, content, NULL, NULL FROM blog_posts ORDER BY id"
+        else:
+            query = """
+                SELECT bp.id, bp.content, b.dict_id, b.content FROM blog_posts bp
+                LEFT JOIN post_content_blobs b ON b.post_id = bp.id
+                ORDER BY bp.id
+            """
+        reader = self.conn.cursor()
+        reader.execute(query)
+        while True:
+            rows = reader.fetchmany(batch_size)
+            if not rows:
+                break
+            for post_id, content, dict_id, blob in rows:
+                yield post_id, self.decode(dict_id, blob) if blob is not None else content
+
+    def inflate(self):
+        """offload된 본문을 blog_posts.content로 되돌림 - 되돌린 포스트 수 (아카이브 복원 전에 사용)"""
+        if not table_exists(self.conn, 'post_content_blobs'):
+            return 0
+        self.cursor.execute("""
+            SELECT b.post_id, b.dict_id, b.content FROM post_content_blobs b
+            JOIN blog_posts bp ON bp.id = b.post_id
+            WHERE bp.content IS NULL
+        """)
+        rows = [(self.decode(dict_id, blob), post_id) for post_id, dict_id, blob in self.cursor.fetchall()]
+        self.cursor.executemany("UPDATE blog_posts SET content = ? WHERE id = ?", rows)
+        return len(rows)
+
+    def stats(self):
+        """(blob 수, 원문 바이트, 압축 바이트)"""
+        if not table_exists(self.conn, 'post_content_blobs'):
+            return 0, 0, 0
+        self.cursor.execute("SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(LENGTH(content)), 0) FROM post_content_blobs")
+        return self.cursor.fetchone()
+
+
+if __name__ == "__main__":
+    from post_archive import PostArchive
+
+    parser = argparse.ArgumentParser(description="아카이브 포스트 본문 사전 압축 (archive/posts-YYYY.db)")
+    parser.add_argument('--db', default='database.db', help="핫 SQLite DB 경로 (아카이브 목록 조회용, 직접 압축하지 않음)")
+    parser.add_argument('--archive-dir', help="아카이브 디렉터리 (기본: DB 옆 archive/)")
+    parser.add_argument('--year', type=int, action='append', help="대상 아카이브 연도 (여러 번 지정 가능, 기본: 전체)")
+    parser.add_argument('--train', action='store_true', help="사전 다시 학습 후 기존 blob 다시 압축")
+    parser.add_argument('--samples', type=int, default=TRAIN_SAMPLE_LIMIT, help="사전 학습 표본 포스트 수")
+    args = parser.parse_args()
+
+    archive = PostArchive(args.db, args.archive_dir)
+    try:
+        years = args.year or archive.partition_years()
+        if not years:
+            print("아카이브 파티션 없음 - 먼저 post_archive.py로 본문을 옮기세요")
+        for year in years:
+            if year not in archive.partition_years():
+                print(f"  {year}년: 아카이브 없음")
+                continue
+            archive.prepare_partition(year)
+            conn = sqlite3.connect(archive.archive_path(year))
+            try:
+                store = PostContentStore(conn)
+                recompressed = 0
+                if args.train:
+                    dict_id = store.train(args.samples)
+                    recompressed = store.recompress(dict_id)
+                count = store.compress()
+                conn.commit()
+                if count or recompressed:
+                    conn.execute("VACUUM")
+                blobs, raw_bytes, packed_bytes = store.stats()
+                ratio = raw_bytes / packed_bytes if packed_bytes else 0
+                print(f"  {year}년: {count}개 압축, {recompressed}개 재압축 "
+                      f"(전체 {blobs}개, {raw_bytes:,} → {packed_bytes:,} bytes, {ratio:.1f}배)")
+            finally:
+                conn.close()
+    finally:
+        archive.close()
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+blog_posts.created_date 정규화
+크롤러마다 밀리초 타임스탬프(Date.now())와 'YYYY-MM-DD HH:MM:SS' 문자열을 섞어서 저장하므로
+분석 스크립트는 모두 이 함수로 한국 시간 기준 날짜로 변환해서 사용
+"""
+
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+
+KST = timezone(timedelta(hours=9))
+
+
+def parse_created_date(value):
+    """created_date 값 → KST 기준 date (해석 불가면 None)"""
+    if value is None or value == '':
+        return None
+
+    if isinstance(value, (int, float)) or (isinstance(value, str) and value.strip().isdigit()):
+        timestamp = float(value)
+        # 초 단위로 저장된 값도 허용
+        if timestamp < 1e11:
+            timestamp *= 1000
+        return datetime.fromtimestamp(timestamp / 1000, KST).date()
+
+    text = str(value).strip().replace('Z', '+00:00')
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        try:
+            return date.fromisoformat(text[:10])
+        except ValueError:
+            return None
+
+    # 시간대 없는 문자열은 KST로 간주
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(KST)
+    return parsed.date()
+
+
+def created_dates_array(values):
+    """created_date 목록 → datetime64[D] 배열 (해석 불가 값은 NaT)"""
+    return np.array(
+        [np.datetime64(d, 'D') if d else np.datetime64('NaT') for d in map(parse_created_date, values)],
+        dtype='datetime64[D]'
+    )
@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+MinHash + LSH 기반 중복/유사 포스트 탐지
+크롤링 재실행이나 모바일/PC 파서 차이로 같은 글이 blog_posts에 두 번 들어가는 것을 막기 위해
+포스트별 서명을 post_minhash_signatures에, 밴드 버킷을 post_lsh_buckets에 저장하고
+후보만 골라 비교 (전체 쌍 비교 없음)
+정규화 후 SHINGLE_SIZE 글자보다 짧은 글은 서명이 의미 없으므로(모두 같은 서명) 중복 판정에서 제외
+중복으로 판정된 포스트의 감정 분석 / 종목 언급은 지우지 않고 duplicate_of 표시만 남김
+읽는 쪽(분석 대상 선정, 테마/요인/공동 언급 집계, 차트 마커, 주간 리포트, 샤드)이 표시된 포스트를 제외하므로
+본문이 바뀌어 중복이 풀리면 분석이 그대로 다시 쓰임
+"""
+
+import argparse
+import hashlib
+import re
+import sqlite3
+
+import numpy as np
+
+from db_maintenance import checkpoint_after_bulk
+
+NUM_PERM = 128
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERM // LSH_BANDS
+SHINGLE_SIZE = 5
+# 추정 자카드 유사도가 이 값 이상이면 중복으로 판단
+DUPLICATE_THRESHOLD = 0.85
+
+_SHINGLE_BASE = np.uint64(1_000_003)
+_rng = np.random.default_rng(20250828)
+# multiply-shift 해시용 계수 (a는 홀수) - 서명 호환을 위해 고정 시드 사용
+_PERM_A = _rng.integers(1, 2**63, NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_PERM_B = _rng.integers(0, 2**63, NUM_PERM, dtype=np.uint64)
+
+# 포맷 차이(공백, 줄바꿈, 문장부호)는 무시
+_NORMALIZE_PATTERN = re.compile(r'[^0-9a-z가-힣]+')
+
+
+# 중복 판정 결과 - 읽는 쪽은 duplicate_of IS NOT NULL인 포스트를 제외
+SCHEMA_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS post_minhash_signatures (
+        post_id INTEGER PRIMARY KEY,
+        content_hash TEXT NOT NULL,
+        signature BLOB NOT NULL,
+        duplicate_of INTEGER,
+        similarity REAL,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS post_lsh_buckets (
+        band INTEGER NOT NULL,
+        bucket INTEGER NOT NULL,
+        post_id INTEGER NOT NULL,
+        PRIMARY KEY (band, bucket, post_id)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_post_lsh_buckets_post_id ON post_lsh_buckets(post_id)",
+    "CREATE INDEX IF NOT EXISTS idx_post_minhash_duplicate_of ON post_minhash_signatures(duplicate_of)",
+]
+
+
+def normalize_text(text):
+    return _NORMALIZE_PATTERN.sub('', (text or '').lower())
+
+
+def shingle_hashes(text):
+    """정규화된 텍스트의 글자 단위 shingle 해시 배열 (벡터 연산 rolling hash)"""
+    codes = np.frombuffer(normalize_text(text).encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    if len(codes) < SHINGLE_SIZE:
+        return np.unique(codes) if len(codes) else codes
+
+    count = len(codes) - SHINGLE_SIZE + 1
+    hashes = np.zeros(count, dtype=np.uint64)
+    for offset in range(SHINGLE_SIZE):
+        hashes = hashes * _SHINGLE_BASE + codes[offset:offset + count]
+    return np.unique(hashes)
+
+
+def minhash_signature(text):
+    """NUM_PERM개의 최소 해시값으로 이루어진 서명 - shingle을 만들 수 없는 짧은 글은 None"""
+    if len(normalize_text(text)) < SHINGLE_SIZE:
+        return None
+    hashes = shingle_hashes(text)
+
+    signature = np.full(NUM_PERM, np.iinfo(np.uint64).max, dtype=np.uint64)
+    # 긴 글도 메모리가 일정하도록 shingle을 나눠서 처리
+    for start in range(0, len(hashes), 8192):
+        block = hashes[start:start + 8192]
+        permuted = (_PERM_A[:, None] * block[None, :] + _PERM_B[:, None]) >> np.uint64(32)
+        signature = np.minimum(signature, permuted.min(axis=1))
+    return signature.astype(np.uint32)
+
+
+def lsh_buckets(signature):
+    """밴드별 버킷 키 [(band, bucket)]"""
+    bands = signature.reshape(LSH_BANDS, LSH_ROWS)
+    return [
+        (band, int.from_bytes(hashlib.blake2b(rows.tobytes(), digest_size=8).digest(), 'little', signed=True))
+        for band, rows in enumerate(bands)
+    ]
+
+
+def estimate_similarity(signature, other):
+    return float(np.mean(signature == other))
+
+
+class PostDeduplicator:
+    def __init__(self, conn, threshold=DUPLICATE_THRESHOLD):
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.threshold = threshold
+        self.ensure_schema()
+
+    def ensure_schema(self):
+        """테이블/인덱스 생성 - 수집 데몬/임포터가 배치 도중 공유 연결을 넘기므로 executescript(암묵 커밋)를 쓰지 않음"""
+        for statement in SCHEMA_STATEMENTS:
+            self.cursor.execute(statement)
+
+    def find_duplicate(self, signature, buckets, exclude_post_id=None):
+        """같은 버킷을 공유하는 후보 중 가장 유사한 원본 포스트 (없으면 None)"""
+        values = ','.join('(?, ?)' for _ in buckets)
+        params = [v for pair in buckets for v in pair]
+        self.cursor.execute(f"""
+            SELECT s.post_id, s.signature, s.duplicate_of
+            FROM post_minhash_signatures s
+            WHERE s.post_id IN (
+                SELECT DISTINCT post_id FROM post_lsh_buckets WHERE (band, bucket) IN (VALUES {values})
+            ) AND s.post_id != ?
+        """, (*params, exclude_post_id if exclude_post_id is not None else -1))
+
+        best = None
+        for post_id, blob, duplicate_of in self.cursor.fetchall():
+            similarity = estimate_similarity(signature, np.frombuffer(blob, dtype=np.uint32))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                # 중복의 중복은 최초 원본으로 연결
+                best = (duplicate_of or post_id, similarity)
+        return best
+
+    def register(self, post_id, title, content):
+        """포스트 서명 저장 후 중복이면 원본 포스트 ID 반환 (내용이 같으면 재계산 생략)"""
+        text = f"{title}\n{content}"
+        content_hash = hashlib.sha1(normalize_text(text).encode('utf-8')).hexdigest()
+
+        self.cursor.execute(
+            "SELECT content_hash, duplicate_of FROM post_minhash_signatures WHERE post_id = ?", (post_id,)
+        )
+        existing = self.cursor.fetchone()
+        if existing and existing[0] == content_hash:
+            return existing[1]
+
+        signature = minhash_signature(text)
+        if signature is None:
+            # 너무 짧은 글은 서명/버킷을 남기지 않음 (다른 짧은 글과 모두 중복으로 묶이지 않도록)
+            self.cursor.execute("DELETE FROM post_minhash_signatures WHERE post_id = ?", (post_id,))
+            self.cursor.execute("DELETE FROM post_lsh_buckets WHERE post_id = ?", (post_id,))
+            return None
+        buckets = lsh_buckets(signature)
+        match = self.find_duplicate(signature, buckets, exclude_post_id=post_id)
+        # 먼저 들어온 글을 원본으로 유지
+        duplicate_of, similarity = match if match and match[0] < post_id else (None, None)
+
+        self.cursor.execute("""
+            INSERT OR REPLACE INTO post_minhash_signatures
+                (post_id, content_hash, signature, duplicate_of, similarity, updated_at)
+            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, (post_id, content_hash, signature.tobytes(), duplicate_of, similarity))
+        self.cursor.execute("DELETE FROM post_lsh_buckets WHERE post_id = ?", (post_id,))
+        self.cursor.executemany(
+            "INSERT OR IGNORE INTO post_lsh_buckets (band, bucket, post_id) VALUES (?, ?, ?)",
+            [(band, bucket, post_id) for band, bucket in buckets]
+        )
+        return duplicate_of
+
+    def build_all(self):
+        """전체 포스트 서명 생성 (id 순서대로 처리해 먼저 들어온 글이 원본)"""
+        read_cursor = self.conn.cursor()
+        # 본문이 아카이브된 포스트는 저장된 서명을 그대로 사용
+        read_cursor.execute("SELECT id, title, content FROM blog_posts WHERE content IS NOT NULL ORDER BY id")
+
+        total = 0
+        duplicates = 0
+        while True:
+            rows = read_cursor.fetchmany(500)
+            if not rows:
+                break
+            for post_id, title, content in rows:
+                if self.register(post_id, title or '', content or '') is not None:
+                    duplicates += 1
+            total += len(rows)
+            self.conn.commit()
+            print(f"  - {total} posts signed ({duplicates} duplicates)")
+        return total, duplicates
+
+    def report(self):
+        self.cursor.execute("""
+            SELECT s.post_id, s.duplicate_of, s.similarity, bp.title
+            FROM post_minhash_signatures s
+            JOIN blog_posts bp ON bp.id = s.post_id
+            WHERE s.duplicate_of IS NOT NULL
+            ORDER BY s.duplicate_of, s.post_id
+        """)
+        return self.cursor.fetchall()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MinHash/LSH 중복 포스트 탐지")
+    parser.add_argument('--db', default='database.db', help="SQLite DB 경로")
+    parser.add_argument('--threshold', type=float, default=DUPLICATE_THRESHOLD, help="중복 판단 유사도")
+    parser.add_argument('--report', action='store_true', help="서명 생성 없이 중복 목록만 출력")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    try:
+        dedup = PostDeduplicator(conn, args.threshold)
+        if not args.report:
+            total, duplicates = dedup.build_all()
+            print(f"\nSignature build complete: {total} posts, {duplicates} duplicates")
+            checkpoint_after_bulk(args.db, conn)
+        for post_id, duplicate_of, similarity, title in dedup.report():
+            print(f"  #{post_id} → #{duplicate_of} ({similarity:.2f}) {title[:50]}")
+    finally:
+        conn.close()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+포스트 본문을 '메르님 한 줄 요약' / 본문 / '한줄 코멘트' 섹션으로 한 번만 나눠 post_sections에 저장
+src/lib/text-utils.ts extractContentParts와 같은 규칙 (removeNaverMetadata → extractMerryAnalysis → extractOneLineComment)
+- summary: "📝 **메르님 한 줄 요약**: 내용" 의 내용
+- comment: "한줄 코멘트. 내용" 의 내용 (코멘트 패턴이 들어 있는 줄은 같은 줄 앞 문장까지 본문에서 빠짐)
+- body: extractContentParts의 mainContent (요약이 있으면 코멘트 줄은 본문에 남음, 요약 뒤 "---"도 TS처럼 남을 수 있음)
+두 구현의 일치는 tests/fixtures/content-parts.json을 jest와 pytest가 함께 검사
+blog_posts.content가 바뀌거나 포스트가 삭제되면 트리거가 해당 행을 지우고, sync()가 없는 행만 다시 파싱
+목록 API / 오늘의 메르 한마디는 본문 전체 대신 summary / comment 컬럼만 읽음
+"""
+
+import argparse
+import re
+import sqlite3
+
+SUMMARY_HEADER = '메르님 한 줄 요약'
+COMMENT_HEADER = '한줄 코멘트'
+SECTION_HEADERS = (SUMMARY_HEADER, COMMENT_HEADER)
+
+# removeNaverMetadata: "제목 : 네이버블로그" 줄머리 제거 ([^:]는 줄바꿈도 포함 - JS와 동일)
+NAVER_METADATA_PATTERN = re.compile(r'^[^:]+\s*:\s*네이버블로그', re.M)
+# extractMerryAnalysis: JS /s 플래그, $는 문자열 끝
+SUMMARY_PATTERN = re.compile(r'📝\s*\*\*메르님 한 줄 요약\*\*:\s*(.+?)(?=\n\n|\n---|\n📝|\Z)', re.S)
+SUMMARY_RULE_PATTERN = re.compile(r'^---\s*\n+')
+# extractOneLineComment: 우선순위 순, JS /m 플래그 (JS의 .과 $는 \r/\u2028/\u2029도 줄 끝으로 봄)
+JS_LINE_END = '\n\r\u2028\u2029'
+COMMENT_PATTERNS = [
+    re.compile(rf'한줄\s*코멘트\.\s*([^{JS_LINE_END}]+?)(?=[{JS_LINE_END}]|\Z)'),
+    re.compile(rf'한\s*줄\s*코멘트\.\s*([^{JS_LINE_END}]+?)(?=[{JS_LINE_END}]|\Z)'),
+]
+# String.prototype.trim이 지우는 공백
+JS_WHITESPACE = '\t\n\v\f\r \u00a0\u1680\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000\ufeff'
+SYNC_BATCH_SIZE = 500
+
+SCHEMA_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS post_sections (
+        post_id INTEGER PRIMARY KEY,
+        summary TEXT NOT NULL DEFAULT '',
+        body TEXT NOT NULL DEFAULT '',
+        comment TEXT NOT NULL DEFAULT '',
+        parsed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    # 아카이브로 본문만 비우는 변경(content = NULL)은 섹션을 지우지 않음 (아카이브 포스트 섹션은 동결)
+    "DROP TRIGGER IF EXISTS trg_post_sections_content_update",
+    """
+    CREATE TRIGGER trg_post_sections_content_update
+    AFTER UPDATE OF content ON blog_posts
+    WHEN NEW.content IS NOT NULL
+    BEGIN
+        DELETE FROM post_sections WHERE post_id = NEW.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_post_sections_delete
+    AFTER DELETE ON blog_posts
+    BEGIN
+        DELETE FROM post_sections WHERE post_id = OLD.id;
+    END
+    """,
+]
+
+
+def js_trim(text):
+    return text.strip(JS_WHITESPACE)
+
+
+def remove_naver_metadata(content):
+    """removeNaverMetadata"""
+    if not content:
+        return ''
+    return js_trim(NAVER_METADATA_PATTERN.sub('', content).replace('\u200b', ''))
+
+
+def extract_merry_analysis(content):
+    """extractMerryAnalysis - (요약, 나머지 본문)"""
+    match = SUMMARY_PATTERN.search(content or '')
+    if match and match.group(1):
+        # TS와 같이 앞쪽 공백을 정리하기 전에 ^---를 찾음 (요약 바로 뒤가 빈 줄이면 구분선이 남음)
+        main = SUMMARY_RULE_PATTERN.sub('', SUMMARY_PATTERN.sub('', content, count=1), count=1)
+        return js_trim(match.group(1)), js_trim(main)
+    return '', content
+
+
+def extract_one_line_comment(content):
+    """extractOneLineComment - (코멘트, 코멘트를 뺀 본문)"""
+    if not content:
+        return '', content
+    for pattern in COMMENT_PATTERNS:
+        match = pattern.search(content)
+        if match and match.group(1):
+            # TS와 같이 패턴이 들어 있는 줄을 통째로 제거
+            lines = [line for line in content.split('\n') if not pattern.search(line)]
+            return js_trim(match.group(1)), js_trim('\n'.join(lines))
+    return '', content
+
+
+def split_sections(content):
+    """본문 → (summary, body, comment) - 섹션이 없으면 summary/comment는 빈 문자열"""
+    summary, main = extract_merry_analysis(remove_naver_metadata(content))
+    comment, rest = extract_one_line_comment(main)
+    return summary, main if summary else rest, comment
+
+
+def content_parts(content):
+    """extractContentParts와 같은 (summary, mainContent)"""
+    summary, body, comment = split_sections(content)
+    return summary or comment, body
+
+
+def ensure_section_schema(conn):
+    """테이블/트리거 생성 - executescript를 쓰지 않으므로 진행 중인 트랜잭션을 커밋하지 않음"""
+    for statement in SCHEMA_STATEMENTS:
+        conn.execute(statement)
+
+
+def update_post_content(conn, post_id, content):
+    """포스트 본문 수정 + 섹션 다시 파싱 (같은 트랜잭션, 커밋은 호출한 쪽에서)"""
+    conn.execute("UPDATE blog_posts SET content = ? WHERE id = ?", (content, post_id))
+    PostSectionStore(conn).sync([post_id])
+
+
+class PostSectionStore:
+    def __init__(self, conn):
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.ensure_schema()
+
+    def ensure_schema(self):
+        ensure_section_schema(self.conn)
+
+    def sync(self, post_ids=None):
+        """섹션이 없는(새 포스트 또는 본문 변경) 포스트만 파싱해 저장 - post_ids를 주면 해당 포스트는 다시 파싱
+        본문이 아카이브된(content IS NULL) 포스트는 건너뜀, 저장한 포스트 수 반환 (커밋은 호출한 쪽에서)"""
+        if post_ids:
+            ids = list(post_ids)
+            query = f"SELECT id, content FROM blog_posts WHERE content IS NOT NULL AND id IN ({','.join('?' * len(ids))})"
+            params = ids
+        else:
+            query = """
+                SELECT bp.id, bp.content FROM blog_posts bp
+                LEFT JOIN post_sections ps ON ps.post_id = bp.id
+                WHERE ps.post_id IS NULL AND bp.content IS NOT NULL
+            """
+            params = []
+
+        reader = self.conn.cursor()
+        reader.execute(query, params)
+        total = 0
+        while True:
+            rows = reader.fetchmany(SYNC_BATCH_SIZE)
+            if not rows:
+                break
+            self.cursor.executemany("""
+                INSERT OR REPLACE INTO post_sections (post_id, summary, body, comment, parsed_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+            """, [(post_id, *split_sections(content)) for post_id, content in rows])
+            total += len(rows)
+        return total
+
+    def get(self, post_id):
+        """{'summary', 'body', 'comment'} - 없으면 파싱 후 반환"""
+        self.cursor.execute("SELECT summary, body, comment FROM post_sections WHERE post_id = ?", (post_id,))
+        row = self.cursor.fetchone()
+        if row is None and self.sync([post_id]):
+            return self.get(post_id)
+        return dict(zip(('summary', 'body', 'comment'), row)) if row else None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="포스트 요약/본문/코멘트 섹션 사전 파싱")
+    parser.add_argument('--db', default='database.db', help="SQLite DB 경로")
+    parser.add_argument('--post', type=int, action='append', help="다시 파싱할 포스트 ID (여러 번 지정 가능)")
+    parser.add_argument('--rebuild', action='store_true', help="전체 포스트 다시 파싱")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    try:
+        store = PostSectionStore(conn)
+        if args.rebuild:
+            conn.execute("DELETE FROM post_sections")
+        count = store.sync(args.post)
+        conn.commit()
+        summarized = conn.execute("SELECT COUNT(*) FROM post_sections WHERE summary != ''").fetchone()[0]
+        commented = conn.execute("SELECT COUNT(*) FROM post_sections WHERE comment != ''").fetchone()[0]
+        print(f"섹션 파싱 완료: {count}개 포스트 (요약 있음 {summarized}개, 코멘트 있음 {commented}개)")
+    finally:
+        conn.close()
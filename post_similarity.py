@@ -0,0 +1,257 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+blog_posts 전체에 대한 희소 TF-IDF 행렬(한국어 글자 n-gram) 생성 및 "관련 포스트" 사전 계산
+TF 행렬은 CSR 형태로 data/post-tfidf.npz에 저장하고, 새 글/수정된 글만 증분 갱신
+(blog_posts 트리거가 추가/수정/삭제된 id를 post_similarity_dirty에 기록하므로 갱신 시 그 포스트 본문만 읽음)
+유사 포스트 top-k는 희소 행렬 곱으로 한 번에 계산해 post_similar_posts 테이블에 저장
+"""
+
+import argparse
+import hashlib
+import os
+import sqlite3
+
+import numpy as np
+from scipy import sparse
+
+from sentiment_scorers import hash_ngrams
+
+DEFAULT_MATRIX_PATH = os.path.join('data', 'post-tfidf.npz')
+SIMILARITY_FEATURES = 2 ** 20
+DEFAULT_TOP_K = 10
+# 유사도 계산 시 한 번에 곱할 행 수 (메모리 상한)
+SIMILARITY_CHUNK_ROWS = 512
+DIRTY_QUERY_CHUNK_SIZE = 500
+
+# 제목/본문이 바뀐 포스트를 post_similarity_dirty에 기록하는 트리거 {이름: 본문}
+_DIRTY = "INSERT OR IGNORE INTO post_similarity_dirty (post_id) VALUES"
+DIRTY_TRIGGERS = {
+    'trg_similarity_posts_insert': f"AFTER INSERT ON blog_posts BEGIN {_DIRTY} (NEW.id); END",
+    'trg_similarity_posts_update': f"AFTER UPDATE OF title, content ON blog_posts BEGIN {_DIRTY} (NEW.id); END",
+    'trg_similarity_posts_delete': f"AFTER DELETE ON blog_posts BEGIN {_DIRTY} (OLD.id); END",
+}
+
+
+def content_hash(title, content):
+    return hashlib.sha1(f"{title}\n{content}".encode('utf-8')).hexdigest()
+
+
+def tf_rows(texts):
+    """텍스트 목록 → 원시 TF CSR 행렬"""
+    indptr = [0]
+    indices = []
+    data = []
+    for text in texts:
+        counts = hash_ngrams(text, SIMILARITY_FEATURES)
+        buckets = sorted(counts)
+        indices.extend(buckets)
+        data.extend(counts[b] for b in buckets)
+        indptr.append(len(indices))
+    return sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(texts), SIMILARITY_FEATURES)
+    )
+
+
+class PostSimilarityIndex:
+    def __init__(self, db_path='database.db', matrix_path=DEFAULT_MATRIX_PATH):
+        self.conn = sqlite3.connect(db_path)
+        self.cursor = self.conn.cursor()
+        self.matrix_path = matrix_path
+        self.post_ids = np.zeros(0, dtype=np.int64)
+        self.hashes = np.zeros(0, dtype='S40')
+        self.tf = sparse.csr_matrix((0, SIMILARITY_FEATURES), dtype=np.float32)
+        if os.path.exists(matrix_path):
+            self.load()
+
+    def load(self):
+        saved = np.load(self.matrix_path)
+        self.post_ids = saved['post_ids']
+        self.hashes = saved['hashes']
+        self.tf = sparse.csr_matrix(
+            (saved['data'], saved['indices'], saved['indptr']), shape=tuple(saved['shape'])
+        )
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.matrix_path) or '.', exist_ok=True)
+        np.savez_compressed(
+            self.matrix_path,
+            post_ids=self.post_ids, hashes=self.hashes,
+            data=self.tf.data, indices=self.tf.indices, indptr=self.tf.indptr,
+            shape=np.asarray(self.tf.shape)
+        )
+
+    def ensure_schema(self):
+        """변경 기록 테이블/트리거 설치 - 새로 설치한 트리거가 있으면 True
+        (설치 전 변경은 기록되지 않았으므로 이번 갱신은 전체 비교로 수행)"""
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS post_similarity_dirty (
+                post_id INTEGER PRIMARY KEY
+            )
+        """)
+        self.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_similarity_%'")
+        existing = {row[0] for row in self.cursor.fetchall()}
+        created = False
+        for name, body in DIRTY_TRIGGERS.items():
+            if name not in existing:
+                self.cursor.execute(f"CREATE TRIGGER {name} {body}")
+                created = True
+        self.conn.commit()
+        return created
+
+    def load_posts(self, post_ids=None):
+        """[(id, title, content)] - post_ids가 있으면 해당 포스트만 (청크 단위 조회)"""
+        if post_ids is None:
+            self.cursor.execute("SELECT id, title, content FROM blog_posts ORDER BY id")
+            return self.cursor.fetchall()
+        rows = []
+        for i in range(0, len(post_ids), DIRTY_QUERY_CHUNK_SIZE):
+            chunk = post_ids[i:i + DIRTY_QUERY_CHUNK_SIZE]
+            self.cursor.execute(
+                f"SELECT id, title, content FROM blog_posts WHERE id IN ({','.join('?' * len(chunk))}) ORDER BY id",
+                chunk
+            )
+            rows.extend(self.cursor.fetchall())
+        return rows
+
+    def update(self, rebuild=False):
+        """새 글/수정된 글만 TF 행 재계산, 삭제된 글은 제거 - (추가/갱신 수, 삭제 수)
+        post_similarity_dirty에 기록된 포스트만 읽음 (처음 실행 / 행렬 파일이 없을 때 / rebuild는 전체 비교)"""
+        full = self.ensure_schema() or rebuild or not os.path.exists(self.matrix_path)
+        self.cursor.execute("SELECT post_id FROM post_similarity_dirty")
+        dirty = [row[0] for row in self.cursor.fetchall()]
+        rows = self.load_posts(None if full else dirty)
+
+        stored = {int(post_id): i for i, post_id in enumerate(self.post_ids)}
+        current_ids = set()
+        changed_ids = []
+        changed_texts = []
+        changed_hashes = []
+        for post_id, title, content in rows:
+            current_ids.add(post_id)
+            # 본문이 아카이브된 포스트는 저장된 행 유지 (새로 들어온 경우만 제목으로 계산)
+            if content is None and post_id in stored:
+                continue
+            digest = content_hash(title or '', content or '').encode('ascii')
+            index = stored.get(post_id)
+            if index is None or self.hashes[index] != digest:
+                changed_ids.append(post_id)
+                changed_texts.append(f"{title or ''}\n{content or ''}")
+                changed_hashes.append(digest)
+
+        # 전체 비교가 아니면 변경 기록에 있으면서 blog_posts에 없는 포스트만 삭제 대상
+        checked = None if full else set(dirty)
+        changed_set = set(changed_ids)
+        keep = np.asarray([
+            int(post_id) not in changed_set
+            and (int(post_id) in current_ids or (checked is not None and int(post_id) not in checked))
+            for post_id in self.post_ids
+        ], dtype=bool)
+        removed = int(len(self.post_ids) - keep.sum() - len(changed_set & stored.keys()))
+
+        if changed_ids or not keep.all():
+            self.tf = sparse.vstack([self.tf[keep], tf_rows(changed_texts)], format='csr')
+            self.post_ids = np.concatenate([self.post_ids[keep], np.asarray(changed_ids, dtype=np.int64)])
+            self.hashes = np.concatenate([self.hashes[keep], np.asarray(changed_hashes, dtype='S40')])
+            self.save()
+
+        # 행렬을 저장한 뒤 읽은 기록만 지움 (그 사이 다른 연결이 추가한 기록은 다음 갱신에서 처리)
+        self.cursor.executemany("DELETE FROM post_similarity_dirty WHERE post_id = ?", [(n,) for n in dirty])
+        self.conn.commit()
+        return len(changed_ids), removed
+
+    def tfidf(self, rows=None):
+        """sublinear TF × IDF 후 행 L2 정규화한 행렬 (rows: 포함할 행 마스크 - IDF도 이 행들로만 계산)"""
+        matrix = self.tf.copy() if rows is None else self.tf[rows]
+        matrix.data = 1.0 + np.log(matrix.data)
+        df = np.bincount(matrix.indices, minlength=SIMILARITY_FEATURES)
+        idf = (np.log((1 + matrix.shape[0]) / (1 + df)) + 1.0).astype(np.float32)
+        matrix = matrix @ sparse.diags(idf)
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.csr_matrix(sparse.diags(1.0 / norms) @ matrix, dtype=np.float32)
+
+    def excluded_post_ids(self):
+        """중복 포스트(post_dedup.py)는 관련 포스트 후보에서 제외"""
+        self.cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'post_minhash_signatures'"
+        )
+        if not self.cursor.fetchone():
+            return set()
+        self.cursor.execute("SELECT post_id FROM post_minhash_signatures WHERE duplicate_of IS NOT NULL")
+        return {row[0] for row in self.cursor.fetchall()}
+
+    def top_k(self, k=DEFAULT_TOP_K):
+        """전체 포스트의 유사 포스트 top-k [(post_id, similar_post_id, score, rank)]"""
+        # 중복 포스트는 행/후보/IDF 문서 수 모두에서 제외 (같은 글이 두 번 세지지 않도록)
+        included = ~np.isin(self.post_ids, list(self.excluded_post_ids()))
+        post_ids = self.post_ids[included]
+        matrix = self.tfidf(included)
+        transposed = matrix.T.tocsc()
+
+        results = []
+        for start in range(0, matrix.shape[0], SIMILARITY_CHUNK_ROWS):
+            scores = (matrix[start:start + SIMILARITY_CHUNK_ROWS] @ transposed).toarray()
+            rows = np.arange(scores.shape[0])
+            scores[rows, start + rows] = 0.0
+
+            count = min(k, scores.shape[1] - 1)
+            if count <= 0:
+                break
+            best = np.argpartition(-scores, count - 1, axis=1)[:, :count]
+            best_scores = np.take_along_axis(scores, best, axis=1)
+            order = np.argsort(-best_scores, axis=1)
+            best = np.take_along_axis(best, order, axis=1)
+            best_scores = np.take_along_axis(best_scores, order, axis=1)
+
+            for row in rows:
+                for rank, (column, score) in enumerate(zip(best[row], best_scores[row]), 1):
+                    if score <= 0:
+                        break
+                    results.append((
+                        int(post_ids[start + row]), int(post_ids[column]), round(float(score), 4), rank
+                    ))
+        return results
+
+    def store_similar_posts(self, k=DEFAULT_TOP_K):
+        """post_similar_posts 테이블 전체 교체"""
+        similar = self.top_k(k)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS post_similar_posts (
+                post_id INTEGER NOT NULL,
+                similar_post_id INTEGER NOT NULL,
+                score REAL NOT NULL,
+                rank INTEGER NOT NULL,
+                PRIMARY KEY (post_id, rank)
+            ) WITHOUT ROWID
+        """)
+        self.cursor.execute("DELETE FROM post_similar_posts")
+        self.cursor.executemany(
+            "INSERT INTO post_similar_posts (post_id, similar_post_id, score, rank) VALUES (?, ?, ?, ?)",
+            similar
+        )
+        self.conn.commit()
+        return len(similar)
+
+    def close(self):
+        """DB 연결 종료"""
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="포스트 TF-IDF 행렬 및 관련 포스트 계산")
+    parser.add_argument('--db', default='database.db', help="SQLite DB 경로")
+    parser.add_argument('--matrix', default=DEFAULT_MATRIX_PATH, help="TF 행렬 저장 경로")
+    parser.add_argument('--top-k', type=int, default=DEFAULT_TOP_K, help="포스트별 관련 포스트 수")
+    parser.add_argument('--rebuild', action='store_true', help="변경 기록과 무관하게 전체 포스트 비교")
+    args = parser.parse_args()
+
+    index = PostSimilarityIndex(args.db, args.matrix)
+    try:
+        changed, removed = index.update(args.rebuild)
+        print(f"TF 행렬 갱신: {changed}개 추가/갱신, {removed}개 삭제 (전체 {len(index.post_ids)}개)")
+        count = index.store_similar_posts(args.top_k)
+        print(f"관련 포스트 저장 완료: {count}건")
+    finally:
+        index.close()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+stock_daily_prices 누락 구간 증분 백필
+언급 종목별로 저장된 거래일과 거래일 캘린더를 배열 집합 연산으로 비교해
+필요한 최소 날짜 구간만 가격 공급자(price_cache.py)에 요청하고 한 번에 upsert
+요청했지만 공급자가 돌려주지 않은 거래일(상장 전, 거래 정지 등)은 price_backfill_empty_days에 기록해
+다음 계획에서 다시 요청하지 않음 (--retry-empty로 초기화)
+"""
+
+import argparse
+import sqlite3
+import sys
+from datetime import date, timedelta
+
+import numpy as np
+
+from post_batch_pipeline import add_pipeline_arguments, run_post_batch, skipped_steps
+from price_cache import PRICE_PROVIDERS, CachedPriceProvider, TwoTierCache
+from trading_calendar import KRX_CALENDAR, US_CALENDAR, calendar_for
+
+DEFAULT_WINDOW_DAYS = 365
+# 누락 구간 사이 거래일 간격이 이 이하면 한 번의 요청으로 합침
+DEFAULT_MERGE_GAP = 5
+# 이 일수보다 최근인 거래일은 공급자가 아직 반영하지 않았을 수 있으므로 빈 날로 기록하지 않음
+EMPTY_SETTLE_DAYS = 7
+
+
+def missing_ranges(calendar, stored, merge_gap=DEFAULT_MERGE_GAP):
+    """캘린더에 있지만 저장되지 않은 거래일을 연속 구간 [(시작일, 종료일)]으로 묶음
+    merge_gap 이하 거래일만큼 떨어진 구간은 요청 수를 줄이기 위해 하나로 합침"""
+    missing = np.setdiff1d(calendar, stored, assume_unique=True)
+    if len(missing) == 0:
+        return []
+
+    positions = np.searchsorted(calendar, missing)
+    breaks = np.flatnonzero(np.diff(positions) > merge_gap + 1)
+    starts = np.concatenate([[0], breaks + 1])
+    ends = np.concatenate([breaks, [len(missing) - 1]])
+    return [
+        (missing[s].astype(object), missing[e].astype(object))
+        for s, e in zip(starts, ends)
+    ]
+
+
+class PriceBackfillPlanner:
+    def __init__(self, db_path='database.db', provider=None):
+        self.conn = sqlite3.connect(db_path)
+        self.cursor = self.conn.cursor()
+        self.provider = provider
+
+    def ensure_schema(self):
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS price_backfill_empty_days (
+                ticker TEXT NOT NULL,
+                trade_date DATE NOT NULL,
+                checked_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (ticker, trade_date)
+            ) WITHOUT ROWID
+        """)
+
+    def load_tickers(self, tickers=None):
+        """백필 대상 종목 [(ticker, market)] - 언급 중인 종목만"""
+        self.cursor.execute("""
+            SELECT ticker, market FROM merry_mentioned_stocks
+            WHERE is_mentioned = 1
+            ORDER BY ticker
+        """)
+        rows = self.cursor.fetchall()
+        if tickers:
+            rows = [row for row in rows if row[0] in tickers]
+        return rows
+
+    def load_stored_dates(self, start):
+        """종목별 저장된 거래일 배열 (정렬됨)"""
+        self.cursor.execute("""
+            SELECT ticker, trade_date FROM stock_daily_prices
+            WHERE trade_date >= ?
+            ORDER BY ticker, trade_date
+        """, (str(start),))
+        rows = self.cursor.fetchall()
+        if not rows:
+            return {}
+
+        tickers = np.array([row[0] for row in rows])
+        dates = np.array([str(row[1])[:10] for row in rows], dtype='datetime64[D]')
+        boundaries = np.flatnonzero(tickers[1:] != tickers[:-1]) + 1
+        return {
+            str(group_tickers[0]): np.unique(group_dates)
+            for group_tickers, group_dates in zip(np.split(tickers, boundaries), np.split(dates, boundaries))
+        }
+
+    def load_empty_days(self, start):
+        """종목별 이미 요청했지만 가격이 없었던 거래일 배열"""
+        self.cursor.execute("""
+            SELECT ticker, trade_date FROM price_backfill_empty_days
+            WHERE trade_date >= ?
+            ORDER BY ticker, trade_date
+        """, (str(start),))
+        empty = {}
+        for ticker, trade_date in self.cursor.fetchall():
+            empty.setdefault(ticker, []).append(trade_date)
+        return {ticker: np.array(days, dtype='datetime64[D]') for ticker, days in empty.items()}
+
+    def plan(self, start, end, tickers=None, merge_gap=DEFAULT_MERGE_GAP):
+        """종목별 요청할 날짜 구간 {ticker: [(시작일, 종료일)]} - 저장된 날과 빈 날로 기록된 날은 제외"""
+        self.ensure_schema()
+        stored = self.load_stored_dates(start)
+        empty = self.load_empty_days(start)
+        none = np.zeros(0, dtype='datetime64[D]')
+        calendars = {}
+        plan = {}
+        for ticker, market in self.load_tickers(tickers):
+            if market not in calendars:
+                calendars[market] = calendar_for(market).trading_days(start, end)
+            known = np.union1d(stored.get(ticker, none), empty.get(ticker, none))
+            ranges = missing_ranges(calendars[market], known, merge_gap)
+            if ranges:
+                plan[ticker] = ranges
+        return plan
+
+    def upsert_prices(self, ticker, prices):
+        self.cursor.executemany("""
+            INSERT INTO stock_daily_prices
+                (ticker, trade_date, open_price, high_price, low_price, close_price, volume)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(ticker, trade_date) DO UPDATE SET
+                open_price = excluded.open_price,
+                high_price = excluded.high_price,
+                low_price = excluded.low_price,
+                close_price = excluded.close_price,
+                volume = excluded.volume,
+                updated_at = CURRENT_TIMESTAMP
+        """, [
+            (ticker, p['trade_date'], p['open_price'], p['high_price'], p['low_price'], p['close_price'], p['volume'])
+            for p in prices
+        ])
+        return len(prices)
+
+    def record_empty_days(self, ticker, start, end, prices, market=None):
+        """요청 구간의 거래일 중 공급자가 돌려주지 않은 날 기록 (최근 EMPTY_SETTLE_DAYS일은 제외)"""
+        settled = min(end, date.today() - timedelta(days=EMPTY_SETTLE_DAYS))
+        if settled < start:
+            return 0
+        days = calendar_for(market, ticker).trading_days(start, settled)
+        returned = np.array([str(p['trade_date'])[:10] for p in prices], dtype='datetime64[D]')
+        empty = np.setdiff1d(days, returned)
+        self.cursor.executemany(
+            "INSERT OR IGNORE INTO price_backfill_empty_days (ticker, trade_date) VALUES (?, ?)",
+            [(ticker, str(day)) for day in empty]
+        )
+        return len(empty)
+
+    def clear_empty_days(self, tickers=None):
+        """빈 날 기록 초기화 - 다음 계획에서 다시 요청"""
+        self.ensure_schema()
+        if tickers:
+            self.cursor.executemany("DELETE FROM price_backfill_empty_days WHERE ticker = ?", [(t,) for t in tickers])
+        else:
+            self.cursor.execute("DELETE FROM price_backfill_empty_days")
+        self.conn.commit()
+
+    def run(self, plan):
+        """계획된 구간만 요청해서 저장 - (요청 수, 저장 행 수, 실패 종목 {ticker: 오류})
+        공급자 오류는 종목 단위로 기록하고 나머지 종목은 계속 처리"""
+        self.ensure_schema()
+        markets = dict(self.load_tickers(set(plan)))
+        requests = 0
+        stored = 0
+        failed = {}
+        for ticker, ranges in plan.items():
+            for start, end in ranges:
+                try:
+                    prices = self.provider.fetch_daily_prices(ticker, start, end) or []
+                except Exception as e:  # 공급자 구현마다 네트워크/파싱 오류 종류가 다름
+                    failed[ticker] = e
+                    break
+                requests += 1
+                stored += self.upsert_prices(ticker, prices)
+                self.record_empty_days(ticker, start, end, prices, markets.get(ticker))
+            # 실패 전까지 받은 구간은 저장 (남은 구간은 다음 계획에 다시 포함됨)
+            self.conn.commit()
+        return requests, stored, failed
+
+    def close(self):
+        """DB 연결 종료"""
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="주가 누락 구간 증분 백필")
+    parser.add_argument('--db', default='database.db', help="SQLite DB 경로")
+    parser.add_argument('--ticker', action='append', help="대상 종목 (여러 번 지정 가능, 기본: 전체 언급 종목)")
+    parser.add_argument('--days', type=int, default=DEFAULT_WINDOW_DAYS, help="백필 기간 (일)")
+    parser.add_argument('--merge-gap', type=int, default=DEFAULT_MERGE_GAP, help="합칠 누락 구간 간격 (거래일)")
+    parser.add_argument('--provider', choices=sorted(PRICE_PROVIDERS), default='yahoo', help="가격 공급자")
+    parser.add_argument('--no-cache', action='store_true', help="external_stock_data_cache 사용 안 함")
+    parser.add_argument('--dry-run', action='store_true', help="요청 계획만 출력")
+    parser.add_argument('--retry-empty', action='store_true', help="가격이 없었던 날 기록을 지우고 다시 요청")
+    add_pipeline_arguments(parser)
+    args = parser.parse_args()
+
+    end = date.today()
+    start = end - timedelta(days=args.days)
+    for calendar in (KRX_CALENDAR, US_CALENDAR):
+        if not (calendar.covers(start) and calendar.covers(end)):
+            print(f"⚠️ {calendar.name} 휴장일 목록 범위({calendar.start}~{calendar.end}) 밖 날짜는 백필하지 않음 "
+                  f"(trading_calendar.py에 휴장일 추가 필요)")
+
+    planner = PriceBackfillPlanner(args.db)
+    try:
+        if args.retry_empty:
+            planner.clear_empty_days(args.ticker)
+        plan = planner.plan(start, end, set(args.ticker or []) or None, args.merge_gap)
+        total = sum(len(ranges) for ranges in plan.values())
+        print(f"누락 구간: {len(plan)}개 종목, {total}개 요청")
+        if args.dry_run:
+            for ticker, ranges in plan.items():
+                print(f"  {ticker}: " + ', '.join(f"{s}~{e}" for s, e in ranges))
+        else:
+            provider = PRICE_PROVIDERS[args.provider]()
+            cache = None
+            if not args.no_cache:
+                cache = TwoTierCache(planner.conn)
+                provider = CachedPriceProvider(provider, cache)
+            planner.provider = provider
+            requests, stored, failed = planner.run(plan)
+            if cache:
+                cache.flush()
+            print(f"백필 완료: {requests}개 요청, {stored}행 저장")
+            for ticker, error in failed.items():
+                print(f"❌ {ticker} 요청 실패: {error}")
+            # 새 종가에 의존하는 단계만 (차트 마커, 포트폴리오 스냅샷, 과매도 스크린, 샤드, WAL 정리)
+            run_post_batch(args.db, {'prices'}, skipped_steps(args), conn=planner.conn)
+            if failed:
+                sys.exit(1)
+    finally:
+        planner.close()
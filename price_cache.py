@@ -0,0 +1,347 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+외부 주가 조회용 2단 캐시 (프로세스 내 LRU → SQLite TTL 저장소)
+external_stock_data_cache / cache_settings 스키마(database/external_data_schema.sql)를 SQLite로 사용하고
+TTL은 cache_settings의 키 패턴(예: stock_price:* 300초)을 따름
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import sqlite3
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+
+DEFAULT_TTL_SECONDS = 300
+DEFAULT_LRU_CAPACITY = 1024
+
+# external_data_schema.sql의 초기 캐시 설정
+DEFAULT_CACHE_SETTINGS = [
+    ('nps_investment:*', 3600, '국민연금 투자 데이터 - 1시간 캐시'),
+    ('krx_market:daily:*', 1800, '한국거래소 일일 데이터 - 30분 캐시'),
+    ('stock_price:*', 300, '주식 가격 데이터 - 5분 캐시'),
+    ('company_financials:*', 86400, '기업 재무제표 - 1일 캐시'),
+    ('financial_news:*', 900, '금융 뉴스 - 15분 캐시'),
+    ('fss_disclosure:*', 1800, '공시 정보 - 30분 캐시'),
+]
+
+SQLITE_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS external_stock_data_cache (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  data_source TEXT NOT NULL CHECK (data_source IN ('yahoo_finance', 'alpha_vantage', 'finnhub', 'polygon', 'stub')),
+  symbol TEXT NOT NULL,
+  data_type TEXT NOT NULL CHECK (data_type IN ('price', 'financials', 'news', 'fundamentals', 'technicals')),
+  data_content TEXT NOT NULL,
+  request_params TEXT,
+  cache_key TEXT NOT NULL UNIQUE,
+  expires_at DATETIME NOT NULL,
+  hit_count INTEGER DEFAULT 0,
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  last_accessed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_external_cache_symbol ON external_stock_data_cache(symbol);
+CREATE INDEX IF NOT EXISTS idx_external_cache_expires_at ON external_stock_data_cache(expires_at);
+CREATE INDEX IF NOT EXISTS idx_external_cache_last_accessed_at ON external_stock_data_cache(last_accessed_at);
+
+CREATE TABLE IF NOT EXISTS cache_settings (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  cache_key_pattern TEXT NOT NULL UNIQUE,
+  cache_duration_seconds INTEGER NOT NULL,
+  description TEXT,
+  is_active BOOLEAN DEFAULT 1,
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+
+def _utc_text(epoch):
+    """SQLite DATETIME 비교용 UTC 문자열 (datetime('now')와 같은 형식)"""
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _parse_utc_text(text):
+    return datetime.strptime(text, '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc).timestamp()
+
+
+class TwoTierCache:
+    def __init__(self, conn, capacity=DEFAULT_LRU_CAPACITY):
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.capacity = capacity
+        # key → (value, expires_epoch)
+        self.lru = OrderedDict()
+        self.pending_hits = {}
+        self.stats = {'l1_hits': 0, 'l2_hits': 0, 'misses': 0, 'evictions': 0}
+        self.cursor.executescript(SQLITE_CACHE_SCHEMA)
+        self.cursor.executemany("""
+            INSERT OR IGNORE INTO cache_settings (cache_key_pattern, cache_duration_seconds, description)
+            VALUES (?, ?, ?)
+        """, DEFAULT_CACHE_SETTINGS)
+        self.conn.commit()
+        self.load_settings()
+
+    def load_settings(self):
+        """cache_settings 키 패턴 (구체적인 패턴 우선)"""
+        self.cursor.execute(
+            "SELECT cache_key_pattern, cache_duration_seconds FROM cache_settings WHERE is_active = 1"
+        )
+        self.settings = sorted(self.cursor.fetchall(), key=lambda row: len(row[0]), reverse=True)
+
+    def ttl_for(self, key):
+        for pattern, seconds in self.settings:
+            if fnmatch.fnmatchcase(key, pattern):
+                return seconds
+        return DEFAULT_TTL_SECONDS
+
+    def _remember(self, key, value, expires_at):
+        self.lru[key] = (value, expires_at)
+        self.lru.move_to_end(key)
+        while len(self.lru) > self.capacity:
+            self.lru.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def get(self, key):
+        """캐시 조회 - 만료됐거나 없으면 None"""
+        now = time.time()
+        entry = self.lru.get(key)
+        if entry is not None:
+            if entry[1] > now:
+                self.lru.move_to_end(key)
+                self.stats['l1_hits'] += 1
+                self.pending_hits[key] = self.pending_hits.get(key, 0) + 1
+                return entry[0]
+            del self.lru[key]
+
+        self.cursor.execute("""
+            SELECT data_content, expires_at FROM external_stock_data_cache
+            WHERE cache_key = ? AND expires_at > ?
+        """, (key, _utc_text(now)))
+        row = self.cursor.fetchone()
+        if row is None:
+            self.stats['misses'] += 1
+            return None
+
+        value = json.loads(row[0])
+        self._remember(key, value, _parse_utc_text(row[1]))
+        self.stats['l2_hits'] += 1
+        self.cursor.execute("""
+            UPDATE external_stock_data_cache
+            SET hit_count = hit_count + 1, last_accessed_at = CURRENT_TIMESTAMP
+            WHERE cache_key = ?
+        """, (key,))
+        return value
+
+    def set(self, key, value, data_source, symbol, data_type='price', request_params=None, ttl=None):
+        expires_at = time.time() + (ttl if ttl is not None else self.ttl_for(key))
+        self.cursor.execute("""
+            INSERT INTO external_stock_data_cache
+                (data_source, symbol, data_type, data_content, request_params, cache_key, expires_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(cache_key) DO UPDATE SET
+                data_content = excluded.data_content,
+                request_params = excluded.request_params,
+                expires_at = excluded.expires_at,
+                last_accessed_at = CURRENT_TIMESTAMP
+        """, (
+            data_source, symbol, data_type,
+            json.dumps(value, ensure_ascii=False, separators=(',', ':')),
+            json.dumps(request_params, ensure_ascii=False) if request_params is not None else None,
+            key, _utc_text(expires_at)
+        ))
+        self._remember(key, value, expires_at)
+
+    def get_or_fetch(self, key, fetch, data_source, symbol, data_type='price', request_params=None):
+        value = self.get(key)
+        if value is None:
+            value = fetch()
+            if value is not None:
+                self.set(key, value, data_source, symbol, data_type, request_params)
+        return value
+
+    def flush(self):
+        """LRU 히트 수를 SQLite hit_count에 한 번에 반영 후 커밋"""
+        if self.pending_hits:
+            self.cursor.executemany("""
+                UPDATE external_stock_data_cache
+                SET hit_count = hit_count + ?, last_accessed_at = CURRENT_TIMESTAMP
+                WHERE cache_key = ?
+            """, [(count, key) for key, count in self.pending_hits.items()])
+            self.pending_hits = {}
+        self.conn.commit()
+
+    def evict(self, max_rows=None):
+        """만료된 행 삭제 후, max_rows를 넘으면 가장 오래 사용하지 않은 행부터 삭제"""
+        self.flush()
+        self.cursor.execute("DELETE FROM external_stock_data_cache WHERE expires_at <= ?", (_utc_text(time.time()),))
+        expired = self.cursor.rowcount
+        evicted = 0
+        if max_rows is not None:
+            self.cursor.execute("""
+                DELETE FROM external_stock_data_cache WHERE id IN (
+                    SELECT id FROM external_stock_data_cache
+                    ORDER BY last_accessed_at DESC, id DESC
+                    LIMIT -1 OFFSET ?
+                )
+            """, (max_rows,))
+            evicted = self.cursor.rowcount
+        self.lru = OrderedDict((k, v) for k, v in self.lru.items() if v[1] > time.time())
+        self.conn.commit()
+        return expired, evicted
+
+
+class PriceProvider(ABC):
+    """일별 주가 조회 인터페이스"""
+
+    data_source = None
+
+    @abstractmethod
+    def fetch_daily_prices(self, ticker, start, end):
+        """start~end(date, 양 끝 포함) 일별 주가
+        반환: [{'trade_date', 'open_price', 'high_price', 'low_price', 'close_price', 'volume'}]"""
+
+
+class YahooFinancePriceProvider(PriceProvider):
+    """Yahoo Finance chart API (웹 앱의 stock-price-service.ts와 같은 엔드포인트)"""
+
+    data_source = 'yahoo_finance'
+    base_url = 'https://query1.finance.yahoo.com/v8/finance/chart'
+
+    @staticmethod
+    def symbol(ticker):
+        # 한국 종목은 6자리 코드 + .KS
+        return f"{ticker}.KS" if ticker.isdigit() and len(ticker) == 6 else ticker
+
+    def fetch_daily_prices(self, ticker, start, end):
+        period1 = int(datetime(start.year, start.month, start.day, tzinfo=timezone.utc).timestamp())
+        period2 = int(datetime(end.year, end.month, end.day, tzinfo=timezone.utc).timestamp()) + 86400
+        url = f"{self.base_url}/{self.symbol(ticker)}?period1={period1}&period2={period2}&interval=1d"
+        request = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
+        with urllib.request.urlopen(request, timeout=15) as response:
+            data = json.load(response)
+
+        result = (data.get('chart', {}).get('result') or [None])[0]
+        if not result or not result.get('timestamp'):
+            return []
+
+        offset = result.get('meta', {}).get('gmtoffset', 0)
+        quote = result['indicators']['quote'][0]
+        prices = []
+        for i, stamp in enumerate(result['timestamp']):
+            if quote['close'][i] is None:
+                continue
+            prices.append({
+                'trade_date': datetime.fromtimestamp(stamp + offset, timezone.utc).date().isoformat(),
+                'open_price': quote['open'][i],
+                'high_price': quote['high'][i],
+                'low_price': quote['low'][i],
+                'close_price': quote['close'][i],
+                'volume': quote['volume'][i] or 0,
+            })
+        return prices
+
+
+class StubPriceProvider(PriceProvider):
+    """오프라인 테스트용 결정적 가격 생성기 (같은 종목/날짜면 항상 같은 값, 평일만 생성)"""
+
+    data_source = 'stub'
+
+    def __init__(self):
+        self.calls = 0
+
+    def fetch_daily_prices(self, ticker, start, end):
+        self.calls += 1
+        prices = []
+        day = start
+        while day <= end:
+            if day.weekday() < 5:
+                seed = int(hashlib.md5(f"{ticker}:{day}".encode('utf-8')).hexdigest()[:8], 16)
+                close = round(100 + (seed % 10000) / 100, 2)
+                prices.append({
+                    'trade_date': day.isoformat(),
+                    'open_price': close, 'high_price': close, 'low_price': close,
+                    'close_price': close, 'volume': seed % 100000,
+                })
+            day += timedelta(days=1)
+        return prices
+
+
+class CachedPriceProvider(PriceProvider):
+    """PriceProvider 앞에 2단 캐시를 두는 래퍼 (키: stock_price:{ticker})
+    종목별로 조회한 날짜 범위와 가격을 하나의 항목에 보관하고, 요청 범위가 그 안이면 잘라서 반환
+    범위가 겹치거나 맞닿으면 모자란 앞/뒤 구간만 조회해 항목을 넓히고, 떨어져 있으면 새 범위로 교체"""
+
+    def __init__(self, provider, cache):
+        self.provider = provider
+        self.cache = cache
+        self.data_source = provider.data_source
+
+    @staticmethod
+    def _slice(prices, start, end):
+        return [p for p in prices if str(start) <= str(p['trade_date'])[:10] <= str(end)]
+
+    def fetch_daily_prices(self, ticker, start, end):
+        key = f"stock_price:{ticker}"
+        cached = self.cache.get(key)
+        if cached is not None:
+            cached_start = date.fromisoformat(cached['start'])
+            cached_end = date.fromisoformat(cached['end'])
+            if cached_start <= start and end <= cached_end:
+                return self._slice(cached['prices'], start, end)
+
+        if cached is not None and start <= cached_end + timedelta(days=1) and cached_start <= end + timedelta(days=1):
+            prices = {p['trade_date']: p for p in cached['prices']}
+            if start < cached_start:
+                for p in self.provider.fetch_daily_prices(ticker, start, cached_start - timedelta(days=1)) or []:
+                    prices[p['trade_date']] = p
+            if end > cached_end:
+                for p in self.provider.fetch_daily_prices(ticker, cached_end + timedelta(days=1), end) or []:
+                    prices[p['trade_date']] = p
+            covered = (min(start, cached_start), max(end, cached_end))
+            prices = [prices[day] for day in sorted(prices)]
+        else:
+            covered = (start, end)
+            prices = self.provider.fetch_daily_prices(ticker, start, end) or []
+
+        self.cache.set(
+            key, {'start': str(covered[0]), 'end': str(covered[1]), 'prices': prices},
+            self.provider.data_source, ticker, 'price',
+            {'start': str(covered[0]), 'end': str(covered[1])}
+        )
+        return self._slice(prices, start, end)
+
+
+PRICE_PROVIDERS = {
+    'yahoo': YahooFinancePriceProvider,
+    'stub': StubPriceProvider,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="외부 주가 캐시 관리")
+    parser.add_argument('--db', default='database.db', help="SQLite DB 경로")
+    parser.add_argument('--evict', action='store_true', help="만료된 캐시 삭제")
+    parser.add_argument('--max-rows', type=int, help="캐시 최대 행 수 (초과분은 오래 안 쓴 순서로 삭제)")
+    parser.add_argument('--stats', action='store_true', help="캐시 통계 출력")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    try:
+        cache = TwoTierCache(conn)
+        if args.evict or args.max_rows:
+            expired, evicted = cache.evict(args.max_rows)
+            print(f"만료 삭제 {expired}건, 용량 초과 삭제 {evicted}건")
+        if args.stats or not (args.evict or args.max_rows):
+            cache.cursor.execute("""
+                SELECT data_source, COUNT(*), SUM(hit_count), SUM(expires_at > datetime('now'))
+                FROM external_stock_data_cache GROUP BY data_source
+            """)
+            for data_source, count, hits, active in cache.cursor.fetchall():
+                print(f"{data_source}: {count}건 (유효 {active}건, 누적 히트 {hits})")
+    finally:
+        conn.close()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+웹 앱 읽기 전용 복제본(database.read.db) 게시
+VACUUM INTO로 database.db의 한 읽기 트랜잭션 시점 스냅샷을 임시 파일에 만들고
+임시 파일 → os.replace로 원자적으로 교체 (src/lib/read-replica.ts가 교체를 감지해 다시 연결)
+대량 Python 작업은 database.db에 쓰고, 웹 읽기는 교체 전까지 안정된 파일을 사용
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime
+
+DEFAULT_REPLICA_PATH = 'database.read.db'
+DEFAULT_WATCH_INTERVAL = 60
+
+
+def replica_path_for(db_path):
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), DEFAULT_REPLICA_PATH)
+
+
+def _fsync(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class ReadReplicaManager:
+    def __init__(self, db_path='database.db', replica_path=None):
+        self.db_path = db_path
+        self.replica_path = replica_path or replica_path_for(db_path)
+        self.manifest_path = f"{self.replica_path}.json"
+
+    def source_signature(self):
+        """원본 DB + WAL 파일의 (크기, 수정 시각) - 바뀌었으면 다시 게시"""
+        signature = []
+        for path in (self.db_path, f"{self.db_path}-wal"):
+            if os.path.exists(path):
+                stat = os.stat(path)
+                signature.append([stat.st_size, stat.st_mtime_ns])
+            else:
+                signature.append(None)
+        return signature
+
+    def load_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return None
+        with open(self.manifest_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def is_stale(self):
+        manifest = self.load_manifest()
+        return (
+            manifest is None
+            or not os.path.exists(self.replica_path)
+            or manifest.get('sourceSignature') != self.source_signature()
+        )
+
+    def publish(self):
+        """스냅샷 생성 후 원자적 교체 - 게시 정보(manifest) 반환
+        VACUUM INTO는 읽기 트랜잭션 하나로 복사하므로 도중에 원본에 쓰기가 있어도
+        (WAL 모드에서 쓰기를 막지 않고) 처음부터 다시 시작하지 않음 - 단계별 backup()은 쓰기마다 재시작됨"""
+        started = time.time()
+        signature = self.source_signature()
+        temp_path = f"{self.replica_path}.tmp"
+        for path in (temp_path, f"{temp_path}-journal", f"{temp_path}-wal", f"{temp_path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+
+        source = sqlite3.connect(f"file:{os.path.abspath(self.db_path)}?mode=ro", uri=True)
+        try:
+            source.execute("VACUUM INTO ?", (temp_path,))
+        finally:
+            source.close()
+
+        target = sqlite3.connect(temp_path)
+        try:
+            # 복제본은 -wal/-shm 없이 단일 파일이어야 교체가 안전함
+            target.execute("PRAGMA journal_mode = DELETE")
+            check = target.execute("PRAGMA quick_check").fetchone()[0]
+            page_count = target.execute("PRAGMA page_count").fetchone()[0]
+        finally:
+            target.close()
+
+        if check != 'ok':
+            os.remove(temp_path)
+            raise RuntimeError(f"복제본 무결성 검사 실패: {check}")
+
+        _fsync(temp_path)
+        os.replace(temp_path, self.replica_path)
+        if hasattr(os, 'O_DIRECTORY'):
+            fd = os.open(os.path.dirname(os.path.abspath(self.replica_path)), os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+        manifest = {
+            'replica': os.path.basename(self.replica_path),
+            'publishedAt': datetime.now().isoformat(timespec='seconds'),
+            'pageCount': page_count,
+            'durationMs': int((time.time() - started) * 1000),
+            'sourceSignature': signature,
+        }
+        manifest_temp = f"{self.manifest_path}.tmp"
+        with open(manifest_temp, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(manifest_temp, self.manifest_path)
+        return manifest
+
+    def publish_if_stale(self):
+        return self.publish() if self.is_stale() else None
+
+    def watch(self, interval=DEFAULT_WATCH_INTERVAL):
+        """interval초마다 원본이 바뀌었으면 다시 게시"""
+        while True:
+            manifest = self.publish_if_stale()
+            if manifest:
+                print(f"[{manifest['publishedAt']}] 복제본 게시: {manifest['pageCount']:,} 페이지, {manifest['durationMs']}ms")
+            time.sleep(interval)
+
+
+def publish_after_bulk(db_path):
+    """대량 작업 종료 후 복제본 갱신 - 복제본을 사용 중일 때(파일이 있을 때)만"""
+    manager = ReadReplicaManager(db_path)
+    if not os.path.exists(manager.replica_path):
+        return None
+    return manager.publish_if_stale()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="웹 앱 읽기 전용 복제본 게시")
+    parser.add_argument('--db', default='database.db', help="원본 SQLite DB 경로")
+    parser.add_argument('--replica', help=f"복제본 경로 (기본: 원본과 같은 디렉토리의 {DEFAULT_REPLICA_PATH})")
+    parser.add_argument('--watch', action='store_true', help="원본 변경 시 주기적으로 다시 게시")
+    parser.add_argument('--interval', type=int, default=DEFAULT_WATCH_INTERVAL, help="변경 확인 주기(초)")
+    parser.add_argument('--force', action='store_true', help="변경 여부와 관계없이 게시")
+    args = parser.parse_args()
+
+    manager = ReadReplicaManager(args.db, args.replica)
+    try:
+        if args.watch:
+            manager.watch(args.interval)
+        else:
+            manifest = manager.publish() if args.force else manager.publish_if_stale()
+            if manifest:
+                print(f"복제본 게시 완료: {manager.replica_path} ({manifest['pageCount']:,} 페이지, {manifest['durationMs']}ms)")
+            else:
+                print(f"복제본 최신 상태: {manager.replica_path}")
+    except KeyboardInterrupt:
+        print("\n복제본 감시 종료")
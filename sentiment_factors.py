@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+sentiments JSON 컬럼(supporting_evidence, investment_perspective, uncertainty_factors)의 정규화 인덱스 테이블
+- sentiment_factors(sentiment_id, factor_type, factor): positive / negative / neutral / uncertainty 요인
+- sentiment_perspectives(sentiment_id, perspective): 투자 관점
+sentiments INSERT/UPDATE/DELETE 트리거가 JSON을 json_each로 펼쳐 자식 테이블을 맞춤
+(분석기뿐 아니라 analyze_samsung_post*.py, insert_new_ids.py처럼 직접 INSERT하는 스크립트도 반영됨)
+"""
+
+import argparse
+import sqlite3
+
+# 자식 행 생성 SELECT - {row}: 감정 행 이름 (트리거는 NEW), {source}: 행을 공급하는 FROM 앞부분
+# 잘못된 JSON은 json_each가 오류를 내므로 json_valid로 걸러 빈 값으로 취급
+_FACTOR_SELECT = """
+    SELECT {row}.id, REPLACE(e.key, '_factors', ''), f.value
+    FROM {source}json_each(CASE WHEN json_valid({row}.supporting_evidence) THEN {row}.supporting_evidence ELSE '{{}}' END) e,
+         json_each(e.value) f
+    WHERE e.type = 'array' AND typeof(e.key) = 'text' AND f.type = 'text'
+    UNION
+    SELECT {row}.id, 'uncertainty', u.value
+    FROM {source}json_each(CASE WHEN json_valid({row}.uncertainty_factors) THEN {row}.uncertainty_factors ELSE '[]' END) u
+    WHERE u.type = 'text'
+"""
+_PERSPECTIVE_SELECT = """
+    SELECT {row}.id, p.value
+    FROM {source}json_each(CASE WHEN json_valid({row}.investment_perspective) THEN {row}.investment_perspective ELSE '[]' END) p
+    WHERE p.type = 'text'
+"""
+
+
+def _insert_children(row, source=''):
+    return [
+        f"INSERT OR IGNORE INTO sentiment_factors (sentiment_id, factor_type, factor) "
+        f"{_FACTOR_SELECT.format(row=row, source=source)}",
+        f"INSERT OR IGNORE INTO sentiment_perspectives (sentiment_id, perspective) "
+        f"{_PERSPECTIVE_SELECT.format(row=row, source=source)}",
+    ]
+
+
+_NEW_ROW = ';\n'.join(_insert_children('NEW')) + ';'
+
+SCHEMA_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS sentiment_factors (
+        sentiment_id INTEGER NOT NULL,
+        factor_type TEXT NOT NULL,
+        factor TEXT NOT NULL,
+        PRIMARY KEY (sentiment_id, factor_type, factor)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS sentiment_perspectives (
+        sentiment_id INTEGER NOT NULL,
+        perspective TEXT NOT NULL,
+        PRIMARY KEY (sentiment_id, perspective)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_sentiment_factors_factor ON sentiment_factors(factor_type, factor, sentiment_id)",
+    "CREATE INDEX IF NOT EXISTS idx_sentiment_perspectives_perspective ON sentiment_perspectives(perspective, sentiment_id)",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_sentiment_factors_insert
+    AFTER INSERT ON sentiments
+    BEGIN
+        {_NEW_ROW}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_sentiment_factors_update
+    AFTER UPDATE OF supporting_evidence, investment_perspective, uncertainty_factors ON sentiments
+    BEGIN
+        DELETE FROM sentiment_factors WHERE sentiment_id = OLD.id;
+        DELETE FROM sentiment_perspectives WHERE sentiment_id = OLD.id;
+        {_NEW_ROW}
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_sentiment_factors_delete
+    AFTER DELETE ON sentiments
+    BEGIN
+        DELETE FROM sentiment_factors WHERE sentiment_id = OLD.id;
+        DELETE FROM sentiment_perspectives WHERE sentiment_id = OLD.id;
+    END
+    """,
+]
+
+
+def table_exists(conn, name):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone() is not None
+
+
+def duplicate_filter_sql(conn):
+    """post_dedup.py가 중복으로 표시한 포스트의 감정 행 제외 (자식 테이블은 그대로 두고 조회에서 거름)"""
+    if not table_exists(conn, 'post_minhash_signatures'):
+        return ''
+    return " AND s.log_no NOT IN (SELECT post_id FROM post_minhash_signatures WHERE duplicate_of IS NOT NULL)"
+
+
+def backfill_factors(conn):
+    """기존 sentiments 전체로 자식 테이블 재생성 - (요인 행 수, 관점 행 수)"""
+    conn.execute("DELETE FROM sentiment_factors")
+    conn.execute("DELETE FROM sentiment_perspectives")
+    for statement in _insert_children('s', 'sentiments s, '):
+        conn.execute(statement)
+    factors = conn.execute("SELECT COUNT(*) FROM sentiment_factors").fetchone()[0]
+    perspectives = conn.execute("SELECT COUNT(*) FROM sentiment_perspectives").fetchone()[0]
+    return factors, perspectives
+
+
+def ensure_factor_schema(conn):
+    """테이블/인덱스/트리거 생성 - 처음 만들 때는 기존 행 백필 (트랜잭션 안에서도 호출 가능)"""
+    created = not table_exists(conn, 'sentiment_factors')
+    for statement in SCHEMA_STATEMENTS:
+        conn.execute(statement)
+    if created and table_exists(conn, 'sentiments'):
+        backfill_factors(conn)
+    return created
+
+
+def factors_for_ticker(conn, ticker, factor_type, since=None):
+    """종목의 요인 빈도 [(factor, 건수)] - since: analysis_date 하한 (YYYY-MM-DD)"""
+    sql = f"""
+        SELECT f.factor, COUNT(*) FROM sentiments s
+        JOIN sentiment_factors f ON f.sentiment_id = s.id AND f.factor_type = ?
+        WHERE s.ticker = ?{duplicate_filter_sql(conn)}
+    """
+    params = [factor_type, ticker]
+    if since:
+        sql += " AND s.analysis_date >= ?"
+        params.append(since)
+    return conn.execute(sql + " GROUP BY f.factor ORDER BY COUNT(*) DESC, f.factor", params).fetchall()
+
+
+def posts_with_perspective(conn, perspective):
+    """투자 관점이 붙은 포스트 [(log_no, ticker)]"""
+    return conn.execute(f"""
+        SELECT s.log_no, s.ticker FROM sentiment_perspectives p
+        JOIN sentiments s ON s.id = p.sentiment_id
+        WHERE p.perspective = ?{duplicate_filter_sql(conn)}
+        ORDER BY s.log_no DESC
+    """, (perspective,)).fetchall()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="sentiments 요인/관점 정규화 테이블")
+    parser.add_argument('--db', default='database.db', help="SQLite DB 경로")
+    parser.add_argument('--backfill', action='store_true', help="기존 sentiments 전체로 다시 생성")
+    parser.add_argument('--ticker', help="종목 요인 빈도 조회")
+    parser.add_argument('--type', default='negative', help="요인 종류 (positive/negative/neutral/uncertainty)")
+    parser.add_argument('--since', help="analysis_date 하한 (YYYY-MM-DD)")
+    parser.add_argument('--perspective', help="투자 관점이 붙은 포스트 조회")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    try:
+        ensure_factor_schema(conn)
+        if args.backfill:
+            factors, perspectives = backfill_factors(conn)
+            print(f"백필 완료: 요인 {factors}행, 관점 {perspectives}행")
+        conn.commit()
+        if args.ticker:
+            for factor, count in factors_for_ticker(conn, args.ticker, args.type, args.since):
+                print(f"  {factor}: {count}")
+        if args.perspective:
+            for log_no, ticker in posts_with_perspective(conn, args.perspective):
+                print(f"  #{log_no} {ticker}")
+    finally:
+        conn.close()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+감정 점수 계산 백엔드 (플러그인)
+(종목, 문맥 문장) 묶음을 배치로 받아 한 번에 채점 - 기존 키워드 방식과
+기존 sentiments로 학습하는 CPU 전용 TF-IDF + 로지스틱 회귀 모델 제공
+"""
+
+import argparse
+import os
+import re
+import zlib
+from abc import ABC, abstractmethod
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # 키워드 백엔드는 numpy/scipy 없이 동작
+    np = None
+    sparse = None
+
+DEFAULT_MODEL_PATH = os.path.join('data', 'models', 'sentiment-tfidf-logreg.npz')
+
+SENTIMENT_CLASSES = ['negative', 'neutral', 'positive']
+
+# 해시 특성 공간 크기와 한국어 글자 n-gram 범위
+HASH_FEATURES = 2 ** 18
+NGRAM_SIZES = (2, 3)
+
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def char_ngrams(text, sizes=NGRAM_SIZES):
+    """공백을 정리한 소문자 텍스트의 글자 n-gram 목록"""
+    text = _WHITESPACE_PATTERN.sub(' ', (text or '').lower()).strip()
+    return [text[i:i + n] for n in sizes for i in range(len(text) - n + 1)]
+
+
+def hash_ngrams(text, n_features=HASH_FEATURES):
+    """n-gram별 해시 버킷 번호와 등장 횟수"""
+    counts = {}
+    for gram in char_ngrams(text):
+        bucket = zlib.crc32(gram.encode('utf-8')) % n_features
+        counts[bucket] = counts.get(bucket, 0) + 1
+    return counts
+
+
+def tf_matrix(docs, n_features=HASH_FEATURES):
+    """문서-특성 CSR 행렬 (해시 n-gram, sublinear tf)"""
+    indptr = [0]
+    indices = []
+    data = []
+    for doc in docs:
+        counts = hash_ngrams(doc, n_features)
+        indices.extend(counts.keys())
+        data.extend(counts.values())
+        indptr.append(len(indices))
+
+    matrix = sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(docs), n_features)
+    )
+    matrix.data = 1.0 + np.log(matrix.data)
+    return matrix
+
+
+def apply_idf(matrix, idf):
+    """idf 가중 후 행 단위 L2 정규화"""
+    weighted = matrix.multiply(idf).tocsr()
+    norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ weighted
+
+
+class SentimentScorer(ABC):
+    """채점 백엔드 공통 인터페이스"""
+
+    name = None
+
+    @abstractmethod
+    def score_batch(self, items):
+        """items: [{'ticker', 'company_name', 'context_windows', 'artifacts'}]
+        반환: [(sentiment, sentiment_score)] (items와 같은 순서)"""
+
+
+class KeywordScorer(SentimentScorer):
+    """기존 키워드 개수 기반 채점 (DirectClaudeAnalyzer 규칙 그대로 사용)"""
+
+    name = 'keyword'
+
+    def __init__(self, analyzer):
+        self.analyzer = analyzer
+
+    def score_batch(self, items):
+        return [self.analyzer.keyword_sentiment(item['artifacts']) for item in items]
+
+
+class ContextKeywordScorer(KeywordScorer):
+    """종목 문맥 문장 안의 키워드만 세는 키워드 채점 (--scorer keyword-context로 선택)
+    한 포스트에 여러 종목이 나오면 종목마다 다른 감정이 나올 수 있음 - 문맥 문장이 없으면 포스트 전체로 채점"""
+
+    name = 'keyword-context'
+
+    def score_batch(self, items):
+        return [
+            self.analyzer.count_keyword_sentiment(' '.join(item['context_windows']).lower())
+            if item['context_windows'] else self.analyzer.keyword_sentiment(item['artifacts'])
+            for item in items
+        ]
+
+
+class TfidfLogisticScorer(SentimentScorer):
+    """글자 n-gram 해시 TF-IDF + 다항 로지스틱 회귀 (CPU 전용, numpy + scipy.sparse)"""
+
+    name = 'tfidf-logreg'
+
+    def __init__(self, model_path=DEFAULT_MODEL_PATH):
+        if np is None:
+            raise RuntimeError("tfidf-logreg 백엔드는 numpy와 scipy가 필요합니다 (pip install numpy scipy)")
+        self.model_path = model_path
+        self.weights = None
+        self.bias = None
+        self.idf = None
+        if os.path.exists(model_path):
+            self.load()
+
+    def load(self):
+        model = np.load(self.model_path)
+        self.weights = model['weights']
+        self.bias = model['bias']
+        self.idf = model['idf']
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.model_path) or '.', exist_ok=True)
+        np.savez_compressed(self.model_path, weights=self.weights, bias=self.bias, idf=self.idf)
+
+    @staticmethod
+    def document(item):
+        return f"{item['ticker']} {' '.join(item['context_windows'])}"
+
+    def fit(self, docs, labels, epochs=300, learning_rate=2.0, l2=1e-4):
+        """전체 배치 경사하강법으로 학습"""
+        rows = tf_matrix(docs)
+        n_rows = rows.shape[0]
+        # CSR 행 안의 특성 번호는 중복이 없으므로 등장 횟수 = 문서 빈도
+        df = np.bincount(rows.indices, minlength=HASH_FEATURES)
+        self.idf = np.log((1 + n_rows) / (1 + df)) + 1.0
+        rows = apply_idf(rows, self.idf)
+        rows_t = rows.T.tocsr()
+
+        targets = np.zeros((n_rows, len(SENTIMENT_CLASSES)))
+        targets[np.arange(n_rows), [SENTIMENT_CLASSES.index(label) for label in labels]] = 1.0
+
+        self.weights = np.zeros((HASH_FEATURES, len(SENTIMENT_CLASSES)))
+        self.bias = np.zeros(len(SENTIMENT_CLASSES))
+        for _ in range(epochs):
+            errors = (self._softmax(rows @ self.weights + self.bias) - targets) / n_rows
+            self.weights -= learning_rate * (rows_t @ errors + l2 * self.weights)
+            self.bias -= learning_rate * errors.sum(axis=0)
+
+        predictions = self._softmax(rows @ self.weights + self.bias).argmax(axis=1)
+        return float(np.mean(predictions == targets.argmax(axis=1)))
+
+    @staticmethod
+    def _softmax(logits):
+        logits = logits - logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def score_batch(self, items):
+        if self.weights is None:
+            raise RuntimeError(f"학습된 모델이 없습니다: {self.model_path} (--train 먼저 실행)")
+        if not items:
+            return []
+
+        rows = apply_idf(tf_matrix([self.document(item) for item in items]), self.idf)
+        probabilities = self._softmax(rows @ self.weights + self.bias)
+
+        negative, positive = SENTIMENT_CLASSES.index('negative'), SENTIMENT_CLASSES.index('positive')
+        scores = probabilities[:, positive] - probabilities[:, negative]
+        labels = probabilities.argmax(axis=1)
+        return [
+            (SENTIMENT_CLASSES[label], float(score) if SENTIMENT_CLASSES[label] != 'neutral' else 0.0)
+            for label, score in zip(labels, scores)
+        ]
+
+    def train_from_db(self, analyzer):
+        """기존 sentiments 행과 포스트 문맥으로 학습 후 저장 (중복 포스트는 같은 문서가 두 번 들어가므로 제외)"""
+        analyzer.cursor.execute(f"""
+            SELECT s.ticker, s.sentiment, bp.title, bp.content
+            FROM sentiments s
+            JOIN blog_posts bp ON bp.id = s.log_no
+            WHERE s.sentiment IN ('positive', 'negative', 'neutral'){analyzer.duplicate_filter_sql()}
+            ORDER BY s.log_no
+        """)
+        docs = []
+        labels = []
+        for ticker, sentiment, title, content in analyzer.cursor.fetchall():
+            item = analyzer.scoring_item(ticker, analyzer.get_artifacts(title or '', content or ''))
+            docs.append(self.document(item))
+            labels.append(sentiment)
+
+        if len(set(labels)) < 2:
+            raise RuntimeError("학습하려면 두 종류 이상의 감정 라벨이 필요합니다")
+
+        accuracy = self.fit(docs, labels)
+        self.save()
+        return len(docs), accuracy
+
+
+SCORER_BACKENDS = {
+    KeywordScorer.name: lambda analyzer: KeywordScorer(analyzer),
+    ContextKeywordScorer.name: lambda analyzer: ContextKeywordScorer(analyzer),
+    TfidfLogisticScorer.name: lambda analyzer: TfidfLogisticScorer(),
+}
+
+
+def create_scorer(name, analyzer):
+    """이름으로 채점 백엔드 생성"""
+    if name not in SCORER_BACKENDS:
+        raise ValueError(f"알 수 없는 채점 백엔드: {name} (사용 가능: {', '.join(SCORER_BACKENDS)})")
+    return SCORER_BACKENDS[name](analyzer)
+
+
+if __name__ == "__main__":
+    from analyze_all_posts import DirectClaudeAnalyzer
+
+    parser = argparse.ArgumentParser(description="감정 채점 백엔드 관리")
+    parser.add_argument('--train', action='store_true', help="기존 sentiments로 tfidf-logreg 모델 학습")
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH, help="모델 파일 경로")
+    parser.add_argument('--db', default='database.db', help="SQLite DB 경로")
+    args = parser.parse_args()
+
+    if args.train:
+        analyzer = DirectClaudeAnalyzer(args.db)
+        try:
+            count, accuracy = TfidfLogisticScorer(args.model).train_from_db(analyzer)
+            analyzer.conn.commit()
+            print(f"모델 학습 완료: {count}개 샘플, 학습 정확도 {accuracy:.3f} → {args.model}")
+        finally:
+            analyzer.close()
+    else:
+        print(f"사용 가능한 백엔드: {', '.join(SCORER_BACKENDS)}")
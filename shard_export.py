@@ -0,0 +1,345 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+엣지 캐시용 정적 JSON 샤드 내보내기 (docs/performance-requirements.md 3초 로딩)
+종목 페이지 / 포스트 페이지 / 목록 페이지 데이터를 data/shards/ 아래에
+내용 해시가 들어간 파일명(content-addressed)으로 쓰고 manifest.json에 논리 이름 → 파일 경로 기록
+public/은 빌드 시점 파일만 서빙되므로 웹은 src/app/shards/[...path]/route.ts가 요청 시 디렉토리에서 읽어 서빙
+(웹 쪽 읽기는 src/lib/shards.ts, 경로는 SHARD_DIR 환경 변수로 변경 가능)
+입력 지문이 바뀐 샤드만 다시 만들고, 더 이상 참조되지 않는 파일은 유예 기간(SHARD_GRACE_SECONDS) 뒤 삭제
+(CDN이 이전 manifest를 최대 s-maxage + stale-while-revalidate = 330초까지 줄 수 있으므로 그동안 파일 유지)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections import defaultdict
+from datetime import datetime
+
+DEFAULT_SHARD_DIR = os.path.join('data', 'shards')
+MANIFEST_NAME = 'manifest.json'
+# manifest 캐시 수명(30초 + stale 300초)보다 충분히 길게
+SHARD_GRACE_SECONDS = 3600
+LIST_PAGE_SIZE = 20
+STOCK_RECENT_POSTS = 20
+EXCERPT_LENGTH = 200
+
+
+def compact_json(payload):
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+
+
+def digest(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class ShardExporter:
+    def __init__(self, db_path='database.db', shard_dir=DEFAULT_SHARD_DIR):
+        self.conn = sqlite3.connect(db_path)
+        self.conn.create_function('sha1', 1, lambda text: hashlib.sha1((text or '').encode('utf-8')).hexdigest(),
+                                  deterministic=True)
+        self.cursor = self.conn.cursor()
+        self.shard_dir = shard_dir
+        self.manifest_path = os.path.join(shard_dir, MANIFEST_NAME)
+
+    def table_exists(self, name):
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,))
+        return self.cursor.fetchone() is not None
+
+    def load_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return {'shards': {}}
+        with open(self.manifest_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def is_current(self, previous, name, input_digest):
+        """이전 manifest의 입력 지문이 같고 파일도 남아 있으면 다시 만들 필요 없음"""
+        entry = previous.get(name)
+        return bool(entry) and entry.get('input') == input_digest \
+            and os.path.exists(os.path.join(self.shard_dir, entry['path']))
+
+    def duplicate_filter_sql(self):
+        """post_dedup.py가 중복으로 표시한 포스트 제외"""
+        if not self.table_exists('post_minhash_signatures'):
+            return ''
+        return " AND bp.id NOT IN (SELECT post_id FROM post_minhash_signatures WHERE duplicate_of IS NOT NULL)"
+
+    def sentiments_by_post(self):
+        self.cursor.execute("""
+            SELECT log_no, ticker, sentiment, sentiment_score, key_reasoning
+            FROM sentiments ORDER BY log_no, ticker
+        """)
+        grouped = defaultdict(list)
+        for log_no, ticker, sentiment, score, reasoning in self.cursor.fetchall():
+            grouped[log_no].append({
+                'ticker': ticker, 'sentiment': sentiment, 'score': score, 'reasoning': reasoning
+            })
+        return grouped
+
+    def similar_by_post(self):
+        if not self.table_exists('post_similar_posts'):
+            return {}
+        self.cursor.execute("SELECT post_id, similar_post_id, score FROM post_similar_posts ORDER BY post_id, rank")
+        grouped = defaultdict(list)
+        for post_id, similar_id, score in self.cursor.fetchall():
+            grouped[post_id].append({'id': similar_id, 'score': score})
+        return grouped
+
+    def archived_contents(self, post_ids):
+        """본문이 연도별 아카이브로 옮겨진(content = NULL) 포스트의 본문 {id: 본문}"""
+        if not post_ids:
+            return {}
+        # post_archive는 numpy(post_dates)를 가져오므로 아카이브된 포스트가 있을 때만 import
+        from post_archive import load_archived_contents
+        return load_archived_contents(self.conn, post_ids)
+
+    def post_inputs(self):
+        """포스트별 입력 (본문은 SQL 안에서 해시) - {id: (본문 해시, created_date, category, log_no)}"""
+        self.cursor.execute(f"""
+            SELECT bp.id, sha1(COALESCE(bp.title, '') || char(10) || COALESCE(bp.content, '')),
+                   bp.created_date, bp.category, bp.log_no
+            FROM blog_posts bp
+            WHERE 1 = 1{self.duplicate_filter_sql()}
+        """)
+        return {row[0]: row[1:] for row in self.cursor.fetchall()}
+
+    def build_post_shards(self, previous):
+        """입력이 바뀐 포스트만 페이로드 생성 - {name: (input digest, payload 또는 None)}"""
+        inputs = self.post_inputs()
+        sentiments = self.sentiments_by_post()
+        similar = self.similar_by_post()
+
+        shards = {}
+        changed_ids = []
+        for post_id, row in inputs.items():
+            name = f"posts/{post_id}"
+            input_digest = digest(compact_json([list(row), sentiments.get(post_id, []), similar.get(post_id, [])]))
+            if self.is_current(previous, name, input_digest):
+                shards[name] = (input_digest, None)
+            else:
+                changed_ids.append(post_id)
+                shards[name] = (input_digest, {})
+
+        for start in range(0, len(changed_ids), 500):
+            batch = changed_ids[start:start + 500]
+            self.cursor.execute(f"""
+                SELECT id, log_no, title, content, excerpt, created_date, category
+                FROM blog_posts WHERE id IN ({','.join('?' * len(batch))})
+            """, batch)
+            rows = self.cursor.fetchall()
+            archived = self.archived_contents([row[0] for row in rows if row[3] is None])
+            for post_id, log_no, title, content, excerpt, created_date, category in rows:
+                if content is None:
+                    content = archived.get(post_id, '')
+                name = f"posts/{post_id}"
+                shards[name] = (shards[name][0], {
+                    'id': post_id,
+                    'logNo': log_no,
+                    'title': title,
+                    'content': content,
+                    'excerpt': excerpt,
+                    'createdDate': created_date,
+                    'category': category,
+                    'sentiments': sentiments.get(post_id, []),
+                    'similarPosts': similar.get(post_id, []),
+                })
+        return shards
+
+    def build_list_shards(self):
+        """최신순 포스트 목록 페이지 + 언급 종목 목록
+        post_sections.py로 파싱한 요약/코멘트가 있으면 본문 대신 그 컬럼만 읽음"""
+        if self.table_exists('post_sections'):
+            sections_join = "LEFT JOIN post_sections ps ON ps.post_id = bp.id"
+            sections_columns = "COALESCE(ps.summary, ''), COALESCE(ps.comment, '')"
+        else:
+            sections_join = ''
+            sections_columns = "'', ''"
+        self.cursor.execute(f"""
+            SELECT bp.id, bp.title, COALESCE(bp.excerpt, SUBSTR(bp.content, 1, {EXCERPT_LENGTH})), bp.created_date, bp.category,
+                   {sections_columns}
+            FROM blog_posts bp
+            {sections_join}
+            WHERE 1 = 1{self.duplicate_filter_sql()}
+            ORDER BY bp.created_date DESC, bp.id DESC
+        """)
+        posts = [
+            {'id': post_id, 'title': title, 'excerpt': excerpt, 'createdDate': created_date, 'category': category,
+             'summary': summary, 'comment': comment}
+            for post_id, title, excerpt, created_date, category, summary, comment in self.cursor.fetchall()
+        ]
+        total_pages = max(1, -(-len(posts) // LIST_PAGE_SIZE))
+        shards = {}
+        for page in range(total_pages):
+            shards[f"lists/posts-{page + 1}"] = {
+                'page': page + 1,
+                'totalPages': total_pages,
+                'totalPosts': len(posts),
+                'posts': posts[page * LIST_PAGE_SIZE:(page + 1) * LIST_PAGE_SIZE],
+            }
+
+        if self.table_exists('merry_mentioned_stocks'):
+            self.cursor.execute("""
+                SELECT ticker, name, market, currency, mention_count, last_mentioned_at
+                FROM merry_mentioned_stocks
+                WHERE is_mentioned = 1
+                ORDER BY last_mentioned_at DESC, ticker
+            """)
+            shards['lists/stocks'] = {'stocks': [
+                {'ticker': ticker, 'name': name, 'market': market, 'currency': currency,
+                 'mentionCount': mention_count, 'lastMentionedAt': last_mentioned_at}
+                for ticker, name, market, currency, mention_count, last_mentioned_at in self.cursor.fetchall()
+            ]}
+        return shards
+
+    def build_stock_shards(self):
+        """종목 페이지: 종목 정보 + 감정 요약 + 최근 언급 포스트 + 차트 마커(chart_markers.py) + 관련 종목(comention_graph.py)"""
+        stocks = {}
+        if self.table_exists('merry_mentioned_stocks'):
+            self.cursor.execute("SELECT ticker, name, market, currency, first_mentioned_at, last_mentioned_at FROM merry_mentioned_stocks")
+            for ticker, name, market, currency, first_at, last_at in self.cursor.fetchall():
+                stocks[ticker] = {'ticker': ticker, 'name': name, 'market': market, 'currency': currency,
+                                  'firstMentionedAt': first_at, 'lastMentionedAt': last_at}
+
+        summary = defaultdict(lambda: {'positive': 0, 'negative': 0, 'neutral': 0, 'total': 0})
+        recent = defaultdict(list)
+        self.cursor.execute(f"""
+            SELECT s.ticker, s.sentiment, bp.id, bp.title, bp.created_date
+            FROM sentiments s
+            JOIN blog_posts bp ON bp.id = s.log_no
+            WHERE 1 = 1{self.duplicate_filter_sql()}
+            ORDER BY s.ticker, bp.created_date DESC, bp.id DESC
+        """)
+        for ticker, sentiment, post_id, title, created_date in self.cursor.fetchall():
+            if sentiment in summary[ticker]:
+                summary[ticker][sentiment] += 1
+            summary[ticker]['total'] += 1
+            if len(recent[ticker]) < STOCK_RECENT_POSTS:
+                recent[ticker].append({'id': post_id, 'title': title, 'createdDate': created_date, 'sentiment': sentiment})
+
+        # 전체 마커 - 기간(1M/3M/6M/1Y) 구간은 읽는 쪽에서 요청 시점 기준으로 자름 (샤드가 날짜만으로 바뀌지 않음)
+        markers = {}
+        if self.table_exists('chart_markers'):
+            self.cursor.execute("SELECT ticker, payload FROM chart_markers")
+            for ticker, payload in self.cursor.fetchall():
+                markers[ticker] = json.loads(payload)
+
+        related = defaultdict(list)
+        if self.table_exists('ticker_related'):
+            self.cursor.execute("SELECT ticker, related_ticker, post_count, lift FROM ticker_related ORDER BY ticker, rank")
+            for ticker, related_ticker, post_count, lift in self.cursor.fetchall():
+                related[ticker].append({'ticker': related_ticker, 'postCount': post_count, 'lift': lift})
+
+        shards = {}
+        for ticker in sorted(set(stocks) | set(summary)):
+            shards[f"stocks/{ticker}"] = {
+                'stock': stocks.get(ticker, {'ticker': ticker}),
+                'sentimentSummary': summary.get(ticker, {'positive': 0, 'negative': 0, 'neutral': 0, 'total': 0}),
+                'recentPosts': recent.get(ticker, []),
+                'chartMarkers': markers.get(ticker, []),
+                'relatedStocks': related.get(ticker, []),
+            }
+        return shards
+
+    def write_shard(self, name, payload):
+        """내용 해시 파일명으로 저장 (이미 있으면 쓰지 않음) - 상대 경로"""
+        text = compact_json(payload)
+        relative = f"{name}.{digest(text)[:16]}.json"
+        path = os.path.join(self.shard_dir, relative)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(temp_path, path)
+        return relative
+
+    def export(self, force=False):
+        """샤드 내보내기 - (다시 만든 샤드 수, 전체 샤드 수, 삭제한 파일 수)"""
+        manifest = self.load_manifest()
+        previous = {} if force else manifest.get('shards', {})
+        entries = {}
+        rebuilt = 0
+
+        for name, (input_digest, payload) in self.build_post_shards(previous).items():
+            if payload is None:
+                entries[name] = previous[name]
+            else:
+                entries[name] = {'path': self.write_shard(name, payload), 'input': input_digest}
+                rebuilt += 1
+
+        # 목록/종목 샤드는 작으므로 페이로드 자체를 입력 지문으로 사용
+        for name, payload in {**self.build_list_shards(), **self.build_stock_shards()}.items():
+            input_digest = digest(compact_json(payload))
+            if self.is_current(previous, name, input_digest):
+                entries[name] = previous[name]
+            else:
+                entries[name] = {'path': self.write_shard(name, payload), 'input': input_digest}
+                rebuilt += 1
+
+        retired, expired = self.plan_unreferenced(entries, manifest.get('retired', {}))
+        manifest = {
+            'generatedAt': datetime.now().isoformat(timespec='seconds'),
+            'basePath': '/shards/',
+            'shards': dict(sorted(entries.items())),
+            'retired': dict(sorted(retired.items())),
+        }
+        temp_path = f"{self.manifest_path}.tmp"
+        os.makedirs(self.shard_dir, exist_ok=True)
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, self.manifest_path)
+
+        for relative in expired:
+            os.remove(os.path.join(self.shard_dir, relative))
+        return rebuilt, len(entries), len(expired)
+
+    def plan_unreferenced(self, entries, retired, now=None):
+        """manifest에서 빠진 샤드 파일 정리 계획 - ({경로: 빠진 시각}, 유예 기간이 지나 삭제할 경로)
+        캐시된 이전 manifest가 아직 가리킬 수 있으므로 빠진 시각부터 SHARD_GRACE_SECONDS 동안은 유지"""
+        now = now or time.time()
+        referenced = {os.path.normpath(entry['path']) for entry in entries.values()}
+        kept, expired = {}, []
+        for root, _, files in os.walk(self.shard_dir):
+            for filename in files:
+                path = os.path.join(root, filename)
+                relative = os.path.normpath(os.path.relpath(path, self.shard_dir))
+                if relative == MANIFEST_NAME or relative in referenced or filename.endswith('.tmp'):
+                    continue
+                retired_at = retired.get(relative, now)
+                if now - retired_at >= SHARD_GRACE_SECONDS:
+                    expired.append(relative)
+                else:
+                    kept[relative] = retired_at
+        return kept, expired
+
+    def close(self):
+        """DB 연결 종료"""
+        self.conn.close()
+
+
+def export_after_bulk(db_path, shard_dir=None):
+    """분석/포맷팅 배치 후 바뀐 샤드만 다시 내보내기 (기본: DB와 같은 프로젝트의 data/shards)"""
+    shard_dir = shard_dir or os.path.join(os.path.dirname(os.path.abspath(db_path)), DEFAULT_SHARD_DIR)
+    exporter = ShardExporter(db_path, shard_dir)
+    try:
+        return exporter.export()
+    finally:
+        exporter.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="엣지 캐시용 JSON 샤드 내보내기")
+    parser.add_argument('--db', default='database.db', help="SQLite DB 경로")
+    parser.add_argument('--out', default=DEFAULT_SHARD_DIR, help="샤드 출력 디렉토리")
+    parser.add_argument('--force', action='store_true', help="전체 샤드 다시 생성")
+    args = parser.parse_args()
+
+    exporter = ShardExporter(args.db, args.out)
+    try:
+        rebuilt, total, removed = exporter.export(args.force)
+        print(f"샤드 내보내기 완료: {rebuilt}/{total}개 갱신, 유예 기간이 지난 파일 {removed}개 삭제 → {exporter.manifest_path}")
+    finally:
+        exporter.close()
@@ -1,6 +1,7 @@
 import { NextRequest, NextResponse } from 'next/server';
 import StockMentionExtractor from '@/lib/stock-mention-extractor';
 import CompanyDescriptionGenerator from '@/lib/company-description-generator';
+import { fillArchivedContent } from '@/lib/post-archive';
 
 /**
  * 관리자용 종목 언급 및 설명 자동 업데이트 API
@@ -82,7 +83,8 @@ async function processSinglePost(extractor: StockMentionExtractor, postId: strin
     throw new Error(`포스트 ID ${postId}를 찾을 수 없습니다`);
   }
 
-  const post = posts[0];
+  // 연도별 아카이브로 옮겨진 포스트는 content가 NULL
+  const [post] = await fillArchivedContent(posts, 'id');
   const mentionCount = await extractor.processPost(
     post.id,
     post.title,
@@ -134,7 +136,7 @@ async function processRecentPosts(extractor: StockMentionExtractor, generator: C
   let totalMentions = 0;
   const processedPosts = [];
 
-  for (const post of recentPosts) {
+  for (const post of await fillArchivedContent(recentPosts, 'id')) {
     try {
       const mentionCount = await extractor.processPost(
         post.id,
@@ -1,11 +1,39 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { query } from '@/lib/database';
+import { loadArchivedContent } from '@/lib/post-archive';
 import { BlogPost } from '@/types';
 
 interface RouteParams {
   params: Promise<{ id: string }>;
 }
 
+interface SimilarPost {
+  id: string;
+  title: string;
+  created_date: string;
+  score: number;
+}
+
+// post_similarity.py가 미리 계산한 관련 포스트 (TF-IDF 코사인 유사도 순)
+async function getSimilarPosts(logNo: string): Promise<SimilarPost[]> {
+  try {
+    return await query<SimilarPost>(`
+      SELECT bp.log_no as id, bp.title, bp.created_date, sp.score
+      FROM blog_posts src
+      JOIN post_similar_posts sp ON sp.post_id = src.id
+      JOIN blog_posts bp ON bp.id = sp.similar_post_id
+      WHERE src.log_no = ?
+      ORDER BY sp.rank
+    `, [logNo]);
+  } catch (error) {
+    // 관련 포스트를 아직 계산하지 않은 DB
+    if (error instanceof Error && error.message.includes('no such table')) {
+      return [];
+    }
+    throw error;
+  }
+}
+
 export async function GET(request: NextRequest, { params }: RouteParams): Promise<NextResponse> {
   try {
     const { id } = await params;
@@ -44,6 +72,11 @@ export async function GET(request: NextRequest, { params }: RouteParams): Promis
     }
 
     const firstPost = posts[0];
+
+    // 오래된 포스트는 본문만 연도별 아카이브로 옮겨져 content가 NULL
+    if (firstPost.content == null) {
+      firstPost.content = (await loadArchivedContent(id)) ?? '';
+    }
     
     // post_analysis 테이블에서 분석 데이터 조회
     const analysisQuery = `
@@ -66,6 +99,7 @@ export async function GET(request: NextRequest, { params }: RouteParams): Promis
       likes: 0, // 기본값
       comments: 0, // 기본값  
       tags: [], // 태그는 추후 구현
+      similarPosts: await getSimilarPosts(id),
       analysis: analysis ? {
         summary: analysis.summary,
         explanation: analysis.explanation,
@@ -1,5 +1,6 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { query } from '@/lib/database';
+import { fillArchivedContent } from '@/lib/post-archive';
 
 /**
  * 메르 추천 패턴 학습 API
@@ -46,18 +47,19 @@ export async function GET(request: NextRequest) {
 async function analyzeRecommendationPatterns() {
   try {
     // 늦생시 포스트들 조회
-    const lateStartPosts = await query<{
+    // 연도별 아카이브로 옮겨진 포스트(content = NULL)는 아카이브에서 본문을 채움
+    const lateStartPosts = await fillArchivedContent(await query<{
       id: number;
       log_no: string;
       title: string;
-      content: string;
+      content: string | null;
       created_date: string;
     }>(`
       SELECT id, log_no, title, content, created_date
       FROM blog_posts 
       WHERE title LIKE '%늦생시%' 
       ORDER BY created_date DESC
-    `);
+    `));
 
     const patterns: any[] = [];
     const stockMentions: any[] = [];
@@ -107,13 +109,13 @@ async function analyzeRecommendationPatterns() {
  */
 async function predictRecommendationProbability(logNo: string) {
   try {
-    const post = await query<{
+    const post = await fillArchivedContent(await query<{
       id: number;
       log_no: string;
       title: string;
-      content: string;
+      content: string | null;
       created_date: string;
-    }>('SELECT id, log_no, title, content, created_date FROM blog_posts WHERE log_no = ?', [logNo]);
+    }>('SELECT id, log_no, title, content, created_date FROM blog_posts WHERE log_no = ?', [logNo]));
 
     if (post.length === 0) {
       return NextResponse.json(
@@ -1,9 +1,29 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { Database } from 'sqlite3';
 import path from 'path';
+import { archivedContentCondition } from '@/lib/post-archive';
 
 const dbPath = path.resolve(process.cwd(), 'database.db');
 
+// 주식 종목명 매핑 (ticker -> 한글명)
+const STOCK_NAME_MAP: { [key: string]: string } = {
+  'TSLA': '테슬라',
+  '005930': '삼성전자',
+  'INTC': '인텔',
+  'LLY': '일라이릴리',
+  'UNH': '유나이티드헬스케어',
+  'NVDA': '엔비디아',
+  'AAPL': '애플',
+  'GOOGL': '구글',
+  'MSFT': '마이크로소프트',
+  'META': '매타',
+  'AMD': 'AMD',
+  '042660': '한화오션',
+  '267250': 'HD현대중공업',
+  '010620': '현대미포조선',
+  'HD': 'HD현대중공업'
+};
+
 export async function GET(request: NextRequest): Promise<NextResponse> {
   try {
     const { searchParams } = new URL(request.url);
@@ -20,6 +40,15 @@ export async function GET(request: NextRequest): Promise<NextResponse> {
 
     console.log('🚀 Loading Merry posts from database...');
 
+    // 검색어 (종목 코드로 검색하면 한글 종목명도 함께 검색)
+    const searchTerm = searchQuery?.trim() || '';
+    const koreanName = searchTerm ? STOCK_NAME_MAP[searchTerm.toUpperCase()] : undefined;
+    const searchTerms = koreanName ? [searchTerm, koreanName] : searchTerm ? [searchTerm] : [];
+    // 연도별 아카이브로 옮겨진 포스트는 bp.content가 NULL이므로 아카이브 본문 검색 결과를 함께 포함
+    const [archivedCondition, archivedParams] = searchTerms.length > 0
+      ? await archivedContentCondition(searchTerms)
+      : ['', []] as [string, string[]];
+
     const db = new Database(dbPath);
     
     return new Promise((resolve) => {
@@ -28,8 +57,10 @@ export async function GET(request: NextRequest): Promise<NextResponse> {
           bp.id, 
           bp.log_no,
           bp.title, 
-          bp.content, 
+          ${slug ? 'bp.content,' : ''}
           bp.excerpt, 
+          -- 목록은 본문 전체를 읽지 않음 (요약이 없는 글만 앞부분으로 대체)
+          CASE WHEN COALESCE(bp.excerpt, '') = '' THEN SUBSTR(bp.content, 1, 200) END as contentPreview,
           bp.category, 
           bp.author,
           bp.created_date as createdAt,
@@ -40,9 +71,12 @@ export async function GET(request: NextRequest): Promise<NextResponse> {
           bp.mentioned_stocks,
           bp.investment_theme,
           bp.sentiment_tone,
-          pa.summary as claudeSummary
+          pa.summary as claudeSummary,
+          COALESCE(NULLIF(ps.summary, ''), ps.comment) as summary
         FROM blog_posts bp
         LEFT JOIN post_analysis pa ON bp.log_no = pa.log_no
+        -- post_sections.py가 미리 파싱한 한 줄 요약/코멘트 (extractContentParts의 summary와 같음)
+        LEFT JOIN post_sections ps ON ps.post_id = bp.id
       `;
       
       const params: any[] = [];
@@ -100,43 +134,10 @@ export async function GET(request: NextRequest): Promise<NextResponse> {
       }
 
       // 검색 쉽어 필터링 (제목, 내용, 종목명에서 검색)
-      if (searchQuery && searchQuery.trim()) {
-        const searchTerm = searchQuery.trim();
-        
-        // 주식 종목명 매핑 (ticker -> 한글명)
-        const stockNameMap: { [key: string]: string } = {
-          'TSLA': '테슬라',
-          '005930': '삼성전자',
-          'INTC': '인텔',
-          'LLY': '일라이릴리',
-          'UNH': '유나이티드헬스케어',
-          'NVDA': '엔비디아',
-          'AAPL': '애플',
-          'GOOGL': '구글',
-          'MSFT': '마이크로소프트',
-          'META': '매타',
-          'AMD': 'AMD',
-          '042660': '한화오션',
-          '267250': 'HD현대중공업',
-          '010620': '현대미포조선',
-          'HD': 'HD현대중공업'
-        };
-        
-        // 검색어가 종목 코드인지 확인
-        const koreanName = stockNameMap[searchTerm.toUpperCase()];
-        
-        if (koreanName) {
-          // 종목 코드로 검색한 경우: 코드와 한글명 둘 다 검색
-          conditions.push(`(
-            bp.title LIKE ? OR bp.content LIKE ? OR 
-            bp.title LIKE ? OR bp.content LIKE ?
-          )`);
-          params.push(`%${searchTerm}%`, `%${searchTerm}%`, `%${koreanName}%`, `%${koreanName}%`);
-        } else {
-          // 일반 검색어인 경우: 제목과 내용에서 검색
-          conditions.push('(bp.title LIKE ? OR bp.content LIKE ?)');
-          params.push(`%${searchTerm}%`, `%${searchTerm}%`);
-        }
+      if (searchTerms.length > 0) {
+        conditions.push(`(${searchTerms.map(() => 'bp.title LIKE ? OR bp.content LIKE ?').join(' OR ')}${archivedCondition})`);
+        searchTerms.forEach(term => params.push(`%${term}%`, `%${term}%`));
+        params.push(...archivedParams);
       }
 
       if (conditions.length > 0) {
@@ -202,7 +203,7 @@ export async function GET(request: NextRequest): Promise<NextResponse> {
               log_no: post.log_no, // log_no 명시적 포함
               category: post.category === 'general' ? '주절주절' : (post.category || '주절주절'),
               tags: finalTags,
-              excerpt: post.excerpt || post.content?.substring(0, 200) + '...',
+              excerpt: post.excerpt || (post.contentPreview ? post.contentPreview + '...' : ''),
               mentionedStocks,
               investmentTheme,
               sentimentTone,
@@ -273,8 +274,7 @@ export async function GET(request: NextRequest): Promise<NextResponse> {
               id: post.id,
               log_no: post.log_no, // log_no 필드 추가
               title: post.title,
-              content: post.content,
-              excerpt: post.excerpt || post.content?.substring(0, 200) + '...',
+              excerpt: post.excerpt || (post.contentPreview ? post.contentPreview + '...' : ''),
               category: post.category === 'general' ? '주절주절' : (post.category || '주절주절'),
               author: post.author || '메르',
               createdAt: post.createdAt,
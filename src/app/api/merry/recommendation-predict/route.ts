@@ -1,5 +1,6 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { query } from '@/lib/database';
+import { fillArchivedContent } from '@/lib/post-archive';
 
 /**
  * 신규 포스트 추천 가능성 실시간 예측 API
@@ -67,8 +68,8 @@ export async function POST(request: NextRequest) {
  */
 async function predictRecentPosts(limit: number) {
   try {
-    // 최근 포스트들 조회 (늦생시 제외하고 일반 포스트만)
-    const recentPosts = await query<{
+    // 최근 포스트들 조회 (늦생시 제외하고 일반 포스트만) - 아카이브된 포스트(content = NULL)는 본문을 채움
+    const recentPosts = await fillArchivedContent(await query<{
       id: number;
       title: string;
       content: string;
@@ -81,7 +82,7 @@ async function predictRecentPosts(limit: number) {
         AND title NOT LIKE '%늦생시%'
       ORDER BY created_date DESC 
       LIMIT ?
-    `, [limit]);
+    `, [limit]));
 
     const predictions: any[] = [];
 
@@ -120,7 +121,7 @@ async function predictRecentPosts(limit: number) {
 async function getHighProbabilityPosts() {
   try {
     // 지난 30일간의 포스트들 분석
-    const recentPosts = await query<{
+    const recentPosts = await fillArchivedContent(await query<{
       id: number;
       title: string;
       content: string;
@@ -133,7 +134,7 @@ async function getHighProbabilityPosts() {
         AND created_date >= datetime('now', '-30 days')
         AND title NOT LIKE '%늦생시%'
       ORDER BY created_date DESC
-    `);
+    `));
 
     const highProbabilityPosts: any[] = [];
 
@@ -177,14 +178,14 @@ async function predictSpecificPosts(logNos: string[]) {
     const predictions: any[] = [];
 
     for (const logNo of logNos) {
-      const post = await query<{
+      const post = await fillArchivedContent(await query<{
         id: number;
         log_no: string;
         title: string;
         content: string;
         created_date: string;
         views: number;
-      }>('SELECT id, log_no, title, content, created_date, views FROM blog_posts WHERE log_no = ?', [logNo]);
+      }>('SELECT id, log_no, title, content, created_date, views FROM blog_posts WHERE log_no = ?', [logNo]));
 
       if (post.length > 0) {
         const prediction = await analyzePostForRecommendation(post[0]);
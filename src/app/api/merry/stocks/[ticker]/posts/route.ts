@@ -2,6 +2,7 @@ import { NextRequest, NextResponse } from 'next/server';
 import fs from 'fs';
 import path from 'path';
 import { performantDb } from '@/lib/db-performance';
+import { archivedContentCondition } from '@/lib/post-archive';
 
 // 티커 매핑 테이블 - 잘못된 티커를 올바른 티커로 수정
 const TICKER_MAPPING: Record<string, string> = {
@@ -94,14 +95,17 @@ async function findPostsByTickerFromDB(ticker: string, limit: number, offset: nu
     };
     
     const searchTerms = tickerNameMap[ticker] || [ticker];
+    // 연도별 아카이브로 옮겨진 포스트는 bp.content가 NULL이므로 아카이브 본문 검색 결과를 함께 포함
+    const [archivedCondition, archivedParams] = await archivedContentCondition(searchTerms);
     const likeConditions = searchTerms.map(() => 
       '(bp.title LIKE ? OR bp.content LIKE ? OR bp.excerpt LIKE ?)'
-    ).join(' OR ');
+    ).join(' OR ') + archivedCondition;
     
     const searchParams: any[] = [];
     searchTerms.forEach(term => {
       searchParams.push(`%${term}%`, `%${term}%`, `%${term}%`);
     });
+    searchParams.push(...archivedParams);
     
     // 개수 조회 - blog_posts에서 직접
     const countQuery = `
@@ -1,4 +1,6 @@
 import { NextRequest, NextResponse } from 'next/server';
+import { loadShard } from '@/lib/shards';
+import { archivedContentCondition } from '@/lib/post-archive';
 const StockDB = require('../../../../../lib/stock-db-sqlite3.js');
 
 // 티커 매핑 테이블 - 잘못된 티커를 올바른 티커로 수정
@@ -6,6 +8,31 @@ const TICKER_MAPPING: Record<string, string> = {
   'OCLR': 'OKLO', // Oklo Inc - 잘못된 티커 OCLR을 올바른 OKLO로 매핑
 };
 
+// chart_markers.py CHART_PERIODS와 같은 기간 (일)
+const CHART_PERIODS: Record<string, number> = { '1M': 30, '3M': 90, '6M': 180, '1Y': 365 };
+const KST_OFFSET_MS = 9 * 60 * 60 * 1000;
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+interface ChartMarker {
+  date: string;
+  postDates: string[];
+  price: number | null;
+  postIds: number[];
+  sentiment: string | null;
+  sentimentScore: number | null;
+}
+
+// 샤드에는 전체 마커만 있으므로 기간 구간은 요청 시점(KST 오늘) 기준으로 자름 (chart_markers.py markers_for_period와 같은 규칙)
+function chartMarkersByPeriod(markers: ChartMarker[]): Record<string, ChartMarker[]> {
+  const today = Date.now() + KST_OFFSET_MS;
+  const result: Record<string, ChartMarker[]> = {};
+  for (const [period, days] of Object.entries(CHART_PERIODS)) {
+    const start = new Date(today - days * DAY_MS).toISOString().slice(0, 10);
+    result[period] = markers.filter(marker => marker.postDates[marker.postDates.length - 1] >= start);
+  }
+  return result;
+}
+
 export async function GET(
   request: NextRequest,
   { params }: { params: Promise<{ ticker: string }> }
@@ -208,17 +235,19 @@ export async function GET(
         // 검색 쿼리 생성
         const titleConditions = searchTerms.map(term => `title LIKE '%${term}%'`).join(' OR ');
         const contentConditions = searchTerms.map(term => `content LIKE '%${term}%'`).join(' OR ');
+        // 연도별 아카이브로 옮겨진 포스트는 content가 NULL이므로 아카이브 본문 검색 결과를 함께 포함
+        const [archivedCondition, archivedParams] = await archivedContentCondition(searchTerms, 'log_no');
         
         const earliestPostQuery = `
           SELECT MIN(created_date) as earliest_date 
           FROM blog_posts 
-          WHERE (${titleConditions}) OR (${contentConditions})
+          WHERE (${titleConditions}) OR (${contentConditions})${archivedCondition}
           ORDER BY created_date 
           LIMIT 1
         `;
         
         const earliestPostResult = await new Promise<any>((resolve, reject) => {
-          stockDB.db.get(earliestPostQuery, (err: any, row: any) => {
+          stockDB.db.get(earliestPostQuery, archivedParams, (err: any, row: any) => {
             if (err) {
               console.error('Earliest post query error:', err);
               reject(err);
@@ -240,6 +269,13 @@ export async function GET(
       }
     }
 
+    // shard_export.py 종목 샤드 - 감정 요약 / 관련 종목(동시 언급) / 차트 마커
+    const stockShard = await loadShard<{
+      sentimentSummary: Record<string, number>;
+      relatedStocks: { ticker: string; postCount: number; lift: number }[];
+      chartMarkers: ChartMarker[];
+    }>(`stocks/${ticker}`);
+
     // 응답 데이터 구성 - 실시간 가격 포함
     const responseData = {
       success: true,
@@ -266,6 +302,11 @@ export async function GET(
         
         // 관련 포스트
         relatedPosts: relatedPosts.posts,
+
+        // 샤드가 아직 없으면 빈 값
+        sentimentSummary: stockShard?.sentimentSummary || null,
+        relatedStocks: stockShard?.relatedStocks || [],
+        chartMarkers: chartMarkersByPeriod(Array.isArray(stockShard?.chartMarkers) ? stockShard.chartMarkers : []),
         
         // 통계
         stats: {
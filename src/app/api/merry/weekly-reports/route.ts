@@ -0,0 +1,68 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { query } from '@/lib/database';
+
+// weekly_report_builder.py가 미리 계산한 주간보고 정량 데이터 조회
+// ?week=2025-W34 → 해당 주 전체 payload, 없으면 최근 주 목록 (?limit=, 기본 12주)
+
+interface WeeklyReportRow {
+  week_key: string;
+  period_start: string;
+  period_end: string;
+  total_posts: number;
+  payload?: string;
+  built_at: string;
+}
+
+const WEEK_KEY_PATTERN = /^\d{4}-W\d{2}$/;
+const MAX_LIMIT = 52;
+
+export async function GET(request: NextRequest) {
+  const { searchParams } = new URL(request.url);
+  const week = searchParams.get('week');
+
+  try {
+    if (week) {
+      if (!WEEK_KEY_PATTERN.test(week)) {
+        return NextResponse.json({ success: false, error: '주차 형식은 YYYY-Www 입니다 (예: 2025-W34)' }, { status: 400 });
+      }
+      const rows = await query<WeeklyReportRow>(
+        `SELECT week_key, period_start, period_end, total_posts, payload, built_at
+         FROM weekly_reports WHERE week_key = ?`,
+        [week]
+      );
+      if (rows.length === 0) {
+        return NextResponse.json({ success: false, error: '해당 주차 보고서가 없습니다' }, { status: 404 });
+      }
+      return NextResponse.json({
+        success: true,
+        data: { ...JSON.parse(rows[0].payload || '{}'), builtAt: rows[0].built_at }
+      });
+    }
+
+    const limit = Math.min(Math.max(parseInt(searchParams.get('limit') || '12') || 12, 1), MAX_LIMIT);
+    const rows = await query<WeeklyReportRow>(
+      `SELECT week_key, period_start, period_end, total_posts, built_at
+       FROM weekly_reports ORDER BY period_start DESC LIMIT ?`,
+      [limit]
+    );
+    return NextResponse.json({
+      success: true,
+      data: rows.map(row => ({
+        week: row.week_key,
+        periodStart: row.period_start,
+        periodEnd: row.period_end,
+        totalPosts: row.total_posts,
+        builtAt: row.built_at
+      }))
+    });
+  } catch (error) {
+    // 빌더를 아직 한 번도 실행하지 않은 DB
+    if (error instanceof Error && error.message.includes('no such table')) {
+      return week
+        ? NextResponse.json({ success: false, error: '해당 주차 보고서가 없습니다' }, { status: 404 })
+        : NextResponse.json({ success: true, data: [] });
+    }
+    console.error('주간보고 조회 오류:', error);
+    return NextResponse.json({ success: false, error: '주간보고를 불러오는데 실패했습니다' }, { status: 500 });
+  }
+}
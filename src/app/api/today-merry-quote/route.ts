@@ -2,9 +2,11 @@ import { NextRequest, NextResponse } from 'next/server';
 import { Database } from 'sqlite3';
 import path from 'path';
 import { performanceMonitor } from '@/lib/monitoring/performance-monitor';
+import { fillArchivedContent } from '@/lib/post-archive';
 
 const dbPath = path.join(process.cwd(), 'database.db');
 
+// 요약/코멘트는 post_sections(database/migrations/0008)에서 미리 파싱된 값을 읽음
 // ⚡ 메모리 캐시 (5분 TTL)
 let cachedQuoteData: any = null;
 let cacheTimestamp: number = 0;
@@ -40,8 +42,9 @@ function getDbConnection(): Promise<Database> {
 interface BlogPost {
   log_no: number;
   title: string;
-  content: string;
+  content: string | null;  // 연도별 아카이브로 옮겨진 포스트는 NULL (fillArchivedContent로 채움)
   created_date: string;  // DATETIME 형식 (YYYY-MM-DD HH:MM:SS)
+  section_quote: string | null;  // post_sections의 한 줄 요약/코멘트 (메르 원문)
 }
 
 function getTodayKoreaDate(): string {
@@ -83,10 +86,10 @@ function extractTickersFromContent(content: string): string[] {
 }
 
 async function createTodayQuoteFromPost(post: BlogPost, db: any): Promise<any> {
-  const { log_no, title, content, created_date } = post;
+  const { log_no, title, content, created_date, section_quote } = post;
   
   // ✅ CLAUDE.md 준수: DB에서 Claude 직접 분석 결과 조회 (post_analysis 테이블)
-  const relatedTickers = extractTickersFromContent(content);
+  const relatedTickers = extractTickersFromContent(content ?? '');
   
   return new Promise((resolve) => {
     // 테이블 존재 확인 후 Claude 분석 결과 조회
@@ -99,7 +102,7 @@ async function createTodayQuoteFromPost(post: BlogPost, db: any): Promise<any> {
           resolve({
             log_no: log_no.toString(),
             title,
-            quote: "Claude 직접 분석이 아직 수행되지 않았습니다",
+            quote: section_quote || "Claude 직접 분석이 아직 수행되지 않았습니다",
             insight: `포스트 "${title}"에 대한 Claude 수동 분석이 필요합니다. CLAUDE.md 원칙에 따라 가짜 한줄 코멘트는 생성하지 않습니다.`,
             relatedTickers,
             date: new Date(created_date + 'Z').toISOString(), // DATETIME을 ISO로 변환
@@ -143,7 +146,7 @@ async function createTodayQuoteFromPost(post: BlogPost, db: any): Promise<any> {
               resolve({
                 log_no: log_no.toString(),
                 title,
-                quote: "Claude 직접 분석이 아직 완료되지 않았습니다",
+                quote: section_quote || "Claude 직접 분석이 아직 완료되지 않았습니다",
                 insight: `포스트 "${title}"에 대한 Claude 수동 분석이 필요합니다. 실제 분석 완료 전까지는 내용을 표시하지 않습니다.`,
                 relatedTickers,
                 date: new Date(created_date + 'Z').toISOString(), // DATETIME을 ISO로 변환
@@ -188,10 +191,12 @@ export async function GET(request: NextRequest) {
     const result = await new Promise<any>((resolve, reject) => {
       // 오늘 날짜의 모든 포스트 찾기 (인덱스 활용)
       db.all(
-        `SELECT log_no, title, content, created_date 
-         FROM blog_posts 
-         WHERE DATE(created_date) = ? 
-         ORDER BY created_date DESC LIMIT 5`,
+        `SELECT bp.log_no, bp.title, bp.content, bp.created_date,
+                COALESCE(NULLIF(ps.summary, ''), ps.comment) AS section_quote
+         FROM blog_posts bp
+         LEFT JOIN post_sections ps ON ps.post_id = bp.id
+         WHERE DATE(bp.created_date) = ? 
+         ORDER BY bp.created_date DESC LIMIT 5`,
         [today],
         async (err, todayPosts: BlogPost[]) => {
           if (err) {
@@ -201,6 +206,7 @@ export async function GET(request: NextRequest) {
 
           try {
             if (todayPosts && todayPosts.length > 0) {
+              await fillArchivedContent(todayPosts);
               // 병렬 처리로 성능 최적화
               const todayQuotes = await Promise.all(
                 todayPosts.map(post => createTodayQuoteFromPost(post, db))
@@ -210,9 +216,11 @@ export async function GET(request: NextRequest) {
             } else {
               // 캐시된 최신 포스트 조회
               db.get(
-                `SELECT log_no, title, content, created_date 
-                 FROM blog_posts 
-                 ORDER BY created_date DESC 
+                `SELECT bp.log_no, bp.title, bp.content, bp.created_date,
+                        COALESCE(NULLIF(ps.summary, ''), ps.comment) AS section_quote
+                 FROM blog_posts bp
+                 LEFT JOIN post_sections ps ON ps.post_id = bp.id
+                 ORDER BY bp.created_date DESC 
                  LIMIT 1`,
                 [],
                 async (err, latestPost: BlogPost | undefined) => {
@@ -227,6 +235,7 @@ export async function GET(request: NextRequest) {
                   }
 
                   try {
+                    await fillArchivedContent([latestPost]);
                     const todayQuote = await createTodayQuoteFromPost(latestPost, db);
                     resolve({ quotes: [todayQuote], isToday: false });
                   } catch (error) {
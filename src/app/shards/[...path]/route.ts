@@ -0,0 +1,32 @@
+import fs from 'fs';
+import { NextRequest, NextResponse } from 'next/server';
+import { MANIFEST_CACHE_CONTROL, SHARD_CACHE_CONTROL, resolveShardFile } from '@/lib/shards';
+
+interface RouteParams {
+  params: Promise<{ path: string[] }>;
+}
+
+// shard_export.py 결과를 요청 시 디스크에서 서빙 (배포 후 생성된 샤드도 바로 제공)
+export const dynamic = 'force-dynamic';
+
+export async function GET(request: NextRequest, { params }: RouteParams): Promise<NextResponse> {
+  const { path: segments } = await params;
+  const relative = segments.join('/');
+  const filePath = relative.endsWith('.json') ? resolveShardFile(relative) : null;
+
+  if (!filePath) {
+    return NextResponse.json({ error: 'Shard not found' }, { status: 404 });
+  }
+
+  try {
+    const body = await fs.promises.readFile(filePath);
+    return new NextResponse(body, {
+      headers: {
+        'Content-Type': 'application/json; charset=utf-8',
+        'Cache-Control': relative === 'manifest.json' ? MANIFEST_CACHE_CONTROL : SHARD_CACHE_CONTROL,
+      },
+    });
+  } catch {
+    return NextResponse.json({ error: 'Shard not found' }, { status: 404, headers: { 'Cache-Control': 'no-store' } });
+  }
+}
@@ -4,6 +4,7 @@
  */
 
 import { query } from './database';
+import { fillArchivedContent } from './post-archive';
 
 interface CompanyContext {
   ticker: string;
@@ -33,8 +34,10 @@ export class CompanyDescriptionGenerator {
     console.log(`🔍 ${ticker} 회사 맥락 정보 수집 시작`);
 
     // 해당 종목의 모든 언급 정보 가져오기
-    const mentions = await query(`
+    // 연도별 아카이브로 옮겨진 포스트(content = NULL)는 아카이브에서 본문을 채움
+    const mentions = await fillArchivedContent(await query(`
       SELECT 
+        bp.id,
         bp.title,
         bp.content,
         mms.context,
@@ -45,7 +48,7 @@ export class CompanyDescriptionGenerator {
       WHERE mms.ticker = ?
       ORDER BY mms.mentioned_date DESC
       LIMIT 10
-    `, [ticker]);
+    `, [ticker]), 'id');
 
     if (mentions.length === 0) {
       console.log(`❌ ${ticker} 언급 정보 없음`);
@@ -1,5 +1,5 @@
 import sqlite3 from 'sqlite3';
-import path from 'path';
+import { getReadDatabasePath, getReadReplicaVersion, isReadReplica } from './read-replica';
 
 // Enhanced database performance utilities
 export interface DatabaseConfig {
@@ -10,9 +10,16 @@ export interface DatabaseConfig {
   pragmaSettings: Record<string, string>;
 }
 
+// 교체된 복제본 연결을 닫기 전 유예 시간 - getConnection()으로 받아간 호출자가 진행 중인 쿼리를 마칠 시간
+const RETIRED_CONNECTION_GRACE_MS = 30000;
+
 export class PerformantDatabase {
   private db: sqlite3.Database | null = null;
   private connectionPromise: Promise<sqlite3.Database> | null = null;
+  private replicaVersion: string | null = null;
+  // 연결별 진행 중인 query() 수 / 교체되어 닫힐 연결의 교체 시각
+  private inFlight = new Map<sqlite3.Database, number>();
+  private retiredAt = new Map<sqlite3.Database, number>();
   private queryCache = new Map<string, { data: any; timestamp: number; ttl: number }>();
   
   private config: DatabaseConfig = {
@@ -40,21 +47,31 @@ export class PerformantDatabase {
     }
 
     this.connectionPromise = new Promise((resolve, reject) => {
-      const dbPath = path.join(process.cwd(), 'database.db');
+      // 📖 읽기 복제본이 있으면 읽기 전용으로 연결 (교체되면 query()에서 다시 연결)
+      const dbPath = getReadDatabasePath();
+      const readOnly = isReadReplica(dbPath);
+      this.replicaVersion = getReadReplicaVersion();
       
-      const db = new sqlite3.Database(dbPath, sqlite3.OPEN_READWRITE, async (err) => {
+      const db = new sqlite3.Database(dbPath, readOnly ? sqlite3.OPEN_READONLY : sqlite3.OPEN_READWRITE, async (err) => {
         if (err) {
           console.error('💥 Database connection failed:', err);
+          this.connectionPromise = null;
           reject(err);
           return;
         }
 
-        console.log('🚀 SQLite3 고성능 모드 활성화 시작');
+        console.log(`🚀 SQLite3 고성능 모드 활성화 시작${readOnly ? ' (읽기 복제본)' : ''}`);
         
         // Apply performance optimizations
         try {
-          await this.applyPragmaSettings(db);
-          await this.createIndexes(db);
+          if (readOnly) {
+            // 복제본은 단일 파일 스냅샷 - journal_mode/인덱스 변경 없이 읽기 설정만 적용
+            await this.applyPragmaSettings(db, ['cache_size', 'temp_store', 'mmap_size', 'busy_timeout', 'threads']);
+          } else {
+            await this.applyPragmaSettings(db);
+            await this.createIndexes(db);
+          }
+          this.db = db;
           console.log('✅ SQLite3 고성능 모드 활성화 완료');
           resolve(db);
         } catch (error) {
@@ -67,11 +84,11 @@ export class PerformantDatabase {
     return this.connectionPromise;
   }
 
-  private async applyPragmaSettings(db: sqlite3.Database): Promise<void> {
+  private async applyPragmaSettings(db: sqlite3.Database, only?: string[]): Promise<void> {
     return new Promise((resolve, reject) => {
-      const pragmaQueries = Object.entries(this.config.pragmaSettings).map(
-        ([key, value]) => `PRAGMA ${key} = ${value};`
-      );
+      const pragmaQueries = Object.entries(this.config.pragmaSettings)
+        .filter(([key]) => !only || only.includes(key))
+        .map(([key, value]) => `PRAGMA ${key} = ${value};`);
 
       let completed = 0;
       const total = pragmaQueries.length;
@@ -107,10 +124,8 @@ export class PerformantDatabase {
       'CREATE INDEX IF NOT EXISTS idx_post_stock_analysis_ticker_analyzed ON post_stock_analysis(ticker, analyzed_at DESC);',
       
       // Supporting indexes
-      'CREATE INDEX IF NOT EXISTS idx_merry_stocks_mention_count ON merry_mentioned_stocks(mention_count DESC);',
-      
-      // FTS index for content search (if needed)
-      'CREATE VIRTUAL TABLE IF NOT EXISTS blog_posts_fts USING fts5(title, content, content=blog_posts, content_rowid=id);'
+      'CREATE INDEX IF NOT EXISTS idx_merry_stocks_mention_count ON merry_mentioned_stocks(mention_count DESC);'
+      // 본문 검색 FTS(blog_posts_fts)는 동기화 트리거와 함께 database/migrations/0009_blog_posts_fts.py에서 생성
     ];
 
     return new Promise((resolve, reject) => {
@@ -148,7 +163,15 @@ export class PerformantDatabase {
       }
     }
 
+    // 📖 읽기 복제본이 교체됐으면 캐시 비우고 새 스냅샷으로 다시 연결
+    // (기존 연결은 바로 닫지 않고 사용 중인 쿼리가 끝난 뒤 닫음)
+    if (this.connectionPromise && getReadReplicaVersion() !== this.replicaVersion) {
+      this.retireConnection();
+      this.queryCache.clear();
+    }
+
     const db = await this.getConnection();
+    this.inFlight.set(db, (this.inFlight.get(db) || 0) + 1);
     
     return new Promise((resolve, reject) => {
       const startTime = Date.now();
@@ -160,6 +183,8 @@ export class PerformantDatabase {
 
       db.all(sql, params, (err, rows) => {
         clearTimeout(timeout);
+        this.inFlight.set(db, (this.inFlight.get(db) || 1) - 1);
+        this.closeIfDrained(db);
         const duration = Date.now() - startTime;
         
         if (err) {
@@ -186,6 +211,38 @@ export class PerformantDatabase {
     });
   }
 
+  // 현재 연결을 교체 대상으로 표시 - 이후 getConnection()은 새 복제본으로 연결
+  private retireConnection(): void {
+    const previous = this.connectionPromise;
+    this.db = null;
+    this.connectionPromise = null;
+    previous?.then((db) => {
+      this.retiredAt.set(db, Date.now());
+      setTimeout(() => this.closeIfDrained(db), RETIRED_CONNECTION_GRACE_MS).unref?.();
+    }).catch(() => {
+      // 연결 실패한 핸들은 닫을 것이 없음
+    });
+  }
+
+  // 교체된 연결은 유예 시간이 지나고 진행 중인 쿼리가 없을 때만 닫음
+  private closeIfDrained(db: sqlite3.Database): void {
+    const retiredAt = this.retiredAt.get(db);
+    if (retiredAt === undefined || (this.inFlight.get(db) || 0) > 0) {
+      return;
+    }
+    if (Date.now() - retiredAt < RETIRED_CONNECTION_GRACE_MS) {
+      return;
+    }
+    this.retiredAt.delete(db);
+    this.inFlight.delete(db);
+    db.close((err) => {
+      if (err) {
+        console.error('Retired database close error:', err);
+      }
+      console.log('🔌 교체된 읽기 복제본 연결 종료');
+    });
+  }
+
   private getFromCache<T>(key: string): T | null {
     const cached = this.queryCache.get(key);
     if (!cached) return null;
@@ -0,0 +1,262 @@
+import fs from 'fs';
+import path from 'path';
+import zlib from 'zlib';
+import sqlite3 from 'sqlite3';
+import { open } from 'sqlite';
+import { query } from '@/lib/database';
+
+// 🗄️ 연도별 포스트 본문 아카이브 (post_archive.py가 archive/posts-YYYY.db로 이동)
+// 아카이브된 포스트는 blog_posts 행은 그대로 두고 content만 NULL이므로 본문이 필요할 때만 아카이브 파일에서 읽음
+// --compress 아카이브는 본문이 post_content_blobs에만 있으므로 사전으로 해제
+const ARCHIVE_DIR = 'archive';
+const ID_QUERY_CHUNK_SIZE = 500;
+
+interface ArchivedPostLocation {
+  year: number;
+  path: string | null;
+}
+
+function resolveArchivePath(location: ArchivedPostLocation): string {
+  const stored = location.path;
+  if (stored && path.isAbsolute(stored) && fs.existsSync(stored)) {
+    return stored;
+  }
+  if (stored && fs.existsSync(path.join(process.cwd(), stored))) {
+    return path.join(process.cwd(), stored);
+  }
+  return path.join(process.cwd(), ARCHIVE_DIR, `posts-${location.year}.db`);
+}
+
+async function findArchivedPost(logNo: number | string): Promise<ArchivedPostLocation | null> {
+  try {
+    const rows = await query<ArchivedPostLocation>(`
+      SELECT ap.year, pap.path
+      FROM archived_posts ap
+      LEFT JOIN post_archive_partitions pap ON pap.year = ap.year
+      WHERE ap.log_no = ?
+    `, [String(logNo)]);
+    return rows[0] || null;
+  } catch (error) {
+    // 아카이브를 한 번도 실행하지 않은 DB (테이블 없음)
+    if (error instanceof Error && error.message.includes('no such table')) {
+      return null;
+    }
+    throw error;
+  }
+}
+
+interface ArchivedContentRow {
+  content: string | null;
+  blob: Buffer | null;
+  codec: string | null;
+  dictionary: Buffer | null;
+}
+
+// post_content_store.py가 압축한 본문 해제 (zlib: raw deflate + 사전)
+function decodeBlob(row: ArchivedContentRow): string | null {
+  if (!row.blob) {
+    return null;
+  }
+  if (row.codec !== 'zlib' || !row.dictionary) {
+    console.warn(`지원하지 않는 아카이브 압축 형식: ${row.codec}`);
+    return null;
+  }
+  return zlib.inflateRawSync(row.blob, { dictionary: row.dictionary }).toString('utf-8');
+}
+
+async function openArchive(archivePath: string) {
+  return open({
+    filename: archivePath,
+    driver: sqlite3.Database,
+    mode: sqlite3.OPEN_READONLY
+  });
+}
+
+// 아카이브 파일에서 본문 읽기 {id: 본문} - ids가 없으면 파일 전체
+async function readArchiveContents(archivePath: string, ids?: number[]): Promise<Map<number, string>> {
+  const archive = await openArchive(archivePath);
+  try {
+    const compressed = await archive.get(
+      "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'post_content_blobs'"
+    );
+    const contents = new Map<number, string>();
+    // SQLite 바인딩 변수 수 제한 때문에 ID는 청크 단위로 조회
+    const chunks = ids
+      ? Array.from({ length: Math.ceil(ids.length / ID_QUERY_CHUNK_SIZE) },
+          (_, i) => ids.slice(i * ID_QUERY_CHUNK_SIZE, (i + 1) * ID_QUERY_CHUNK_SIZE))
+      : [null];
+    for (const chunk of chunks) {
+      const where = chunk ? `WHERE bp.id IN (${chunk.map(() => '?').join(',')})` : '';
+      const rows = await archive.all<Array<ArchivedContentRow & { id: number }>>(compressed ? `
+        SELECT bp.id, bp.content, b.content AS blob, d.codec, d.dictionary
+        FROM blog_posts bp
+        LEFT JOIN post_content_blobs b ON b.post_id = bp.id
+        LEFT JOIN content_dictionaries d ON d.id = b.dict_id
+        ${where}
+      ` : `SELECT bp.id, bp.content, NULL AS blob, NULL AS codec, NULL AS dictionary FROM blog_posts bp ${where}`, chunk || []);
+      for (const row of rows) {
+        const content = row.content ?? decodeBlob(row);
+        if (content != null) {
+          contents.set(row.id, content);
+        }
+      }
+    }
+    return contents;
+  } finally {
+    await archive.close();
+  }
+}
+
+// 아카이브된 포스트 본문 - 아카이브되지 않았거나 파일이 없으면 null
+export async function loadArchivedContent(logNo: number | string): Promise<string | null> {
+  const location = await findArchivedPost(logNo);
+  if (!location) {
+    return null;
+  }
+
+  const archivePath = resolveArchivePath(location);
+  if (!fs.existsSync(archivePath)) {
+    console.warn(`아카이브 파일 없음: ${archivePath}`);
+    return null;
+  }
+
+  const archive = await openArchive(archivePath);
+  try {
+    const compressed = await archive.get(
+      "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'post_content_blobs'"
+    );
+    const row = await archive.get<ArchivedContentRow>(compressed ? `
+      SELECT bp.content, b.content AS blob, d.codec, d.dictionary
+      FROM blog_posts bp
+      LEFT JOIN post_content_blobs b ON b.post_id = bp.id
+      LEFT JOIN content_dictionaries d ON d.id = b.dict_id
+      WHERE bp.log_no = ?
+    ` : 'SELECT content, NULL AS blob, NULL AS codec, NULL AS dictionary FROM blog_posts WHERE log_no = ?', [String(logNo)]);
+    if (!row) {
+      return null;
+    }
+    return row.content ?? decodeBlob(row);
+  } finally {
+    await archive.close();
+  }
+}
+
+interface ArchivedPostRow extends ArchivedPostLocation {
+  id: number;
+  log_no: string;
+}
+
+async function queryArchivedPosts(sql: string, params: any[]): Promise<ArchivedPostRow[]> {
+  try {
+    return await query<ArchivedPostRow>(sql, params);
+  } catch (error) {
+    if (error instanceof Error && error.message.includes('no such table')) {
+      return [];
+    }
+    throw error;
+  }
+}
+
+// 목록 조회 결과 중 본문이 아카이브로 옮겨진(content = NULL) 포스트의 본문을 채움
+// key: 행을 archived_posts와 맞출 컬럼 (blog_posts.id 또는 log_no) - 아카이브 파일마다 한 번씩만 엶
+export async function fillArchivedContent<T extends { content: string | null }>(
+  posts: T[],
+  key: 'id' | 'log_no' = 'log_no'
+): Promise<Array<T & { content: string }>> {
+  const missing = posts.filter(post => post.content == null);
+  if (missing.length > 0) {
+    const keys = missing.map(post => String((post as any)[key]));
+    const located: ArchivedPostRow[] = [];
+    for (let start = 0; start < keys.length; start += ID_QUERY_CHUNK_SIZE) {
+      const chunk = keys.slice(start, start + ID_QUERY_CHUNK_SIZE);
+      located.push(...await queryArchivedPosts(`
+        SELECT ap.id, ap.log_no, ap.year, pap.path
+        FROM archived_posts ap
+        LEFT JOIN post_archive_partitions pap ON pap.year = ap.year
+        WHERE ap.${key} IN (${chunk.map(() => '?').join(',')})
+      `, chunk));
+    }
+
+    const byArchive = new Map<string, ArchivedPostRow[]>();
+    for (const row of located) {
+      const archivePath = resolveArchivePath(row);
+      byArchive.set(archivePath, [...(byArchive.get(archivePath) || []), row]);
+    }
+
+    const contents = new Map<string, string>();
+    for (const [archivePath, rows] of byArchive) {
+      if (!fs.existsSync(archivePath)) {
+        console.warn(`아카이브 파일 없음: ${archivePath}`);
+        continue;
+      }
+      const byId = await readArchiveContents(archivePath, rows.map(row => row.id));
+      for (const row of rows) {
+        const content = byId.get(row.id);
+        if (content != null) {
+          contents.set(String(row[key]), content);
+        }
+      }
+    }
+
+    for (const post of missing) {
+      post.content = contents.get(String((post as any)[key])) ?? '';
+    }
+  }
+  return posts as Array<T & { content: string }>;
+}
+
+// 아카이브 본문 검색용 캐시 - 아카이브 파일은 옮긴 뒤 바뀌지 않으므로 mtime이 같으면 재사용
+const archiveTextCache = new Map<string, { mtimeMs: number; posts: Array<{ logNo: string; text: string }> }>();
+
+// 본문 LIKE 검색에서 빠지는 아카이브 포스트 중 terms 중 하나를 본문에 포함한 log_no 목록
+// (SQLite LIKE처럼 대소문자 무시)
+export async function searchArchivedLogNos(terms: string[]): Promise<string[]> {
+  const partitions = await queryArchivedPosts('SELECT year, path FROM post_archive_partitions', []);
+  if (partitions.length === 0) {
+    return [];
+  }
+
+  const needles = terms.map(term => term.toLowerCase());
+  const matches: string[] = [];
+  for (const partition of partitions) {
+    const archivePath = resolveArchivePath(partition);
+    let stat: fs.Stats;
+    try {
+      stat = fs.statSync(archivePath);
+    } catch {
+      continue;
+    }
+
+    let cached = archiveTextCache.get(archivePath);
+    if (!cached || cached.mtimeMs !== stat.mtimeMs) {
+      const [contents, logNos] = await Promise.all([
+        readArchiveContents(archivePath),
+        queryArchivedPosts('SELECT id, log_no FROM archived_posts WHERE year = ?', [partition.year])
+      ]);
+      cached = {
+        mtimeMs: stat.mtimeMs,
+        posts: logNos
+          .filter(row => contents.has(row.id))
+          .map(row => ({ logNo: String(row.log_no), text: contents.get(row.id)!.toLowerCase() }))
+      };
+      archiveTextCache.set(archivePath, cached);
+    }
+
+    for (const post of cached.posts) {
+      if (needles.some(needle => post.text.includes(needle))) {
+        matches.push(post.logNo);
+      }
+    }
+  }
+  return matches;
+}
+
+// 본문 LIKE 조건 뒤에 붙일 아카이브 포스트 조건 - [SQL 조각, 파라미터] (일치하는 아카이브 포스트가 없으면 빈 조건)
+// log_no 목록은 JSON 파라미터 하나로 넘겨 바인딩 변수 수 제한을 피함
+export async function archivedContentCondition(terms: string[], column = 'bp.log_no'): Promise<[string, string[]]> {
+  const logNos = await searchArchivedLogNos(terms);
+  if (logNos.length === 0) {
+    return ['', []];
+  }
+  return [` OR ${column} IN (SELECT value FROM json_each(?))`, [JSON.stringify(logNos)]];
+}
@@ -0,0 +1,37 @@
+import fs from 'fs';
+import path from 'path';
+
+// 📖 읽기 전용 복제본 (read_replica.py가 database.db에서 게시)
+// 대량 Python 작업이 database.db에 쓰는 동안 웹 읽기는 교체 전까지 안정된 스냅샷 사용
+const PRIMARY_DB_FILE = 'database.db';
+const READ_REPLICA_FILE = 'database.read.db';
+
+export function getPrimaryDatabasePath(): string {
+  return path.join(process.cwd(), PRIMARY_DB_FILE);
+}
+
+function getReplicaPath(): string {
+  return path.join(process.cwd(), READ_REPLICA_FILE);
+}
+
+// 복제본이 있고 비활성화(USE_READ_REPLICA=false)되지 않았으면 복제본 경로
+export function getReadDatabasePath(): string {
+  if (process.env.USE_READ_REPLICA !== 'false' && fs.existsSync(getReplicaPath())) {
+    return getReplicaPath();
+  }
+  return getPrimaryDatabasePath();
+}
+
+export function isReadReplica(dbPath: string): boolean {
+  return dbPath === getReplicaPath();
+}
+
+// 복제본 버전 (원자적 교체 시 inode/수정 시각이 바뀜) - 없으면 null
+export function getReadReplicaVersion(): string | null {
+  try {
+    const stat = fs.statSync(getReplicaPath());
+    return `${stat.ino}:${stat.mtimeMs}`;
+  } catch {
+    return null;
+  }
+}
@@ -0,0 +1,74 @@
+import fs from 'fs';
+import path from 'path';
+
+// 📦 정적 JSON 샤드 (shard_export.py가 data/shards/에 내용 해시 파일명으로 기록)
+// public/은 빌드 시점 파일만 서빙되므로 배포 후 생성된 샤드는 이 모듈로 요청 시 읽음
+const DEFAULT_SHARD_DIR = path.join('data', 'shards');
+const MANIFEST_NAME = 'manifest.json';
+
+// manifest 응답 캐시 - CDN이 이전 manifest를 최대 330초 줄 수 있으므로
+// shard_export.py는 빠진 파일을 SHARD_GRACE_SECONDS(1시간) 동안 남겨둠
+export const MANIFEST_CACHE_CONTROL = 'public, max-age=30, s-maxage=30, stale-while-revalidate=300';
+// 파일명에 내용 해시가 있으므로 영구 캐시
+export const SHARD_CACHE_CONTROL = 'public, max-age=31536000, immutable';
+
+interface ShardEntry {
+  path: string;
+  input: string;
+}
+
+interface ShardManifest {
+  generatedAt: string;
+  basePath: string;
+  shards: Record<string, ShardEntry>;
+}
+
+let cachedManifest: { mtimeMs: number; manifest: ShardManifest } | null = null;
+
+export function getShardDir(): string {
+  return path.resolve(process.cwd(), process.env.SHARD_DIR || DEFAULT_SHARD_DIR);
+}
+
+// 샤드 디렉토리 안의 파일 경로 (디렉토리 밖을 가리키면 null)
+export function resolveShardFile(relative: string): string | null {
+  const shardDir = getShardDir();
+  const resolved = path.resolve(shardDir, relative);
+  if (!resolved.startsWith(shardDir + path.sep)) {
+    return null;
+  }
+  return resolved;
+}
+
+// manifest (파일이 바뀌었을 때만 다시 읽음) - 아직 내보내지 않았으면 null
+export function getShardManifest(): ShardManifest | null {
+  const manifestPath = path.join(getShardDir(), MANIFEST_NAME);
+  let stat: fs.Stats;
+  try {
+    stat = fs.statSync(manifestPath);
+  } catch {
+    return null;
+  }
+  if (!cachedManifest || cachedManifest.mtimeMs !== stat.mtimeMs) {
+    cachedManifest = {
+      mtimeMs: stat.mtimeMs,
+      manifest: JSON.parse(fs.readFileSync(manifestPath, 'utf-8'))
+    };
+  }
+  return cachedManifest.manifest;
+}
+
+// 논리 이름(stocks/TSLA, posts/123, lists/posts-1)의 샤드 - 없으면 null
+export async function loadShard<T = any>(name: string): Promise<T | null> {
+  const entry = getShardManifest()?.shards[name];
+  const shardPath = entry ? resolveShardFile(entry.path) : null;
+  if (!shardPath) {
+    return null;
+  }
+  try {
+    return JSON.parse(await fs.promises.readFile(shardPath, 'utf-8')) as T;
+  } catch (error) {
+    // manifest 교체와 파일 정리 사이의 경합 - DB 경로로 폴백
+    console.warn(`샤드 읽기 실패: ${name}`, error);
+    return null;
+  }
+}
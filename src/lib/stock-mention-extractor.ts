@@ -4,6 +4,7 @@
  */
 
 import { query } from './database';
+import { fillArchivedContent } from './post-archive';
 
 interface StockMention {
   ticker: string;
@@ -316,14 +317,15 @@ export class StockMentionExtractor {
     console.log('🔄 미처리 포스트 일괄 처리 시작...');
 
     // 아직 종목 언급이 추출되지 않은 포스트들 찾기
-    const unprocessedPosts = await query(`
+    // 연도별 아카이브로 옮겨진 포스트(content = NULL)는 아카이브에서 본문을 채움
+    const unprocessedPosts = await fillArchivedContent(await query(`
       SELECT bp.id, bp.title, bp.content, bp.created_date
       FROM blog_posts bp
       LEFT JOIN merry_mentioned_stocks mms ON bp.id = mms.log_no
       WHERE mms.log_no IS NULL
       ORDER BY bp.created_date DESC
       LIMIT 50
-    `);
+    `), 'id');
 
     console.log(`📝 처리할 포스트: ${unprocessedPosts.length}개`);
 
@@ -0,0 +1,14 @@
+/**
+ * extractContentParts ↔ post_sections.py split_sections 일치 검사
+ * 같은 케이스를 tests/python/test_post_sections.py가 Python 쪽에서 검사
+ */
+import { extractContentParts } from './text-utils';
+import cases from '../../tests/fixtures/content-parts.json';
+
+describe('extractContentParts 파이썬 파서 일치', () => {
+  test.each(cases.map(c => [c.name, c] as const))('%s', (_, c) => {
+    const result = extractContentParts(c.input);
+    expect(result.summary).toBe(c.summary);
+    expect(result.mainContent).toBe(c.mainContent);
+  });
+});
@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+대용량 크롤링 결과 JSON을 요소 단위로 스트리밍 파싱하여 blog_posts에 일괄 upsert
+파일 전체를 메모리에 올리지 않고, 파싱(작업 스레드)과 DB 쓰기(메인 스레드)를 겹쳐서 수행
+"""
+
+import argparse
+import json
+import queue
+import sqlite3
+import sys
+import threading
+
+from db_maintenance import checkpoint_after_bulk
+from ingest_parsed_posts import parse_crawl_record, upsert_blog_posts
+from post_dedup import PostDeduplicator
+from post_sections import PostSectionStore
+
+READ_CHUNK_SIZE = 64 * 1024
+DEFAULT_BATCH_SIZE = 500
+# 파싱 스레드가 DB 쓰기보다 앞서 나갈 수 있는 배치 수 (메모리 상한)
+MAX_PENDING_BATCHES = 4
+
+_WHITESPACE = ' \t\n\r'
+# 숫자 값 뒤에 이어질 수 있는 문자 (청크 경계에서 잘린 숫자 판단용)
+_NUMBER_CHARS = '0123456789.eE+-'
+
+# 형식이 잘못된 레코드 하나(숫자 url, 중첩 객체 본문 등)가 파일 전체를 중단시키지 않도록 레코드 단위로 잡는 예외
+RECORD_ERRORS = (TypeError, ValueError, AttributeError, KeyError)
+
+
+class _JsonStreamReader:
+    """파일을 청크 단위로 읽으면서 JSON 토큰/값을 하나씩 꺼내는 리더"""
+
+    def __init__(self, fp, chunk_size=READ_CHUNK_SIZE):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # 이미 소비한 앞부분은 버려서 버퍼 크기를 요소 하나 수준으로 유지
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """공백을 건너뛴 다음 문자 (파일 끝이면 '')"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"JSON 형식 오류: '{char}' 필요, '{found}' 발견 (offset {self.pos})")
+        self.pos += 1
+
+    def value(self):
+        """다음 JSON 값 하나를 통째로 디코딩"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # 버퍼 끝에서 끝난 값, 또는 '2.' / '1e'처럼 청크 경계에서 잘려 앞부분만 디코딩된 숫자는 더 읽어서 확인
+                truncated = end == len(self.buffer) or (
+                    isinstance(value, (int, float)) and not isinstance(value, bool)
+                    and self.buffer[end] in _NUMBER_CHARS
+                )
+                if not truncated or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            if not self._fill():
+                value, self.pos = self.decoder.raw_decode(self.buffer, self.pos)
+                return value
+
+
+def _iter_path(reader, path):
+    if not path:
+        yield reader.value()
+        return
+
+    head, rest = path[0], path[1:]
+    if head == 'item':
+        reader.expect('[')
+        if reader.peek() == ']':
+            reader.pos += 1
+            return
+        while True:
+            yield from _iter_path(reader, rest)
+            if reader.peek() == ',':
+                reader.pos += 1
+                continue
+            reader.expect(']')
+            return
+    else:
+        reader.expect('{')
+        if reader.peek() == '}':
+            reader.pos += 1
+            return
+        while True:
+            key = reader.value()
+            reader.expect(':')
+            if key == head:
+                yield from _iter_path(reader, rest)
+            else:
+                reader.value()
+            if reader.peek() == ',':
+                reader.pos += 1
+                continue
+            reader.expect('}')
+            return
+
+
+def iter_json_items(fp, prefix='item', chunk_size=READ_CHUNK_SIZE):
+    """ijson 방식 prefix 경로의 요소를 하나씩 생성 (예: 'item', 'posts.item', 'stocks.item.mentions.item')"""
+    reader = _JsonStreamReader(fp, chunk_size)
+    path = prefix.split('.') if prefix else []
+    yield from _iter_path(reader, path)
+
+
+def detect_prefix(path):
+    """크롤링 결과 파일의 포스트 배열 경로 - 최상위가 객체면 'posts.item', 배열이면 'item'"""
+    with open(path, encoding='utf-8') as f:
+        reader = _JsonStreamReader(f, 1024)
+        return 'posts.item' if reader.peek() == '{' else 'item'
+
+
+def iter_crawl_posts(fp, prefix, stats):
+    """스트림의 레코드를 하나씩 검증/변환해 저장할 포스트만 생성 (stats의 records/skipped/invalid 집계)
+    레코드 변환 오류는 건너뛰고, JSON 자체가 깨진 경우의 ValueError는 그대로 전달"""
+    for record in iter_json_items(fp, prefix):
+        stats['records'] += 1
+        try:
+            post = parse_crawl_record(record) if isinstance(record, dict) else None
+        except RECORD_ERRORS as e:
+            stats['invalid'] += 1
+            print(f"  ⚠️ 레코드 #{stats['records']} 변환 실패: {type(e).__name__}: {e}")
+            continue
+        if post is None:
+            stats['skipped'] += 1
+            continue
+        yield post
+
+
+class StreamingPostImporter:
+    def __init__(self, db_path='database.db', batch_size=DEFAULT_BATCH_SIZE):
+        self.conn = sqlite3.connect(db_path)
+        self.cursor = self.conn.cursor()
+        self.batch_size = batch_size
+        self.dedup = PostDeduplicator(self.conn)
+        self.sections = PostSectionStore(self.conn)
+
+    def _produce(self, path, prefix, batches, stats):
+        """파싱 스레드: 요소 검증 후 배치 단위로 큐에 전달"""
+        try:
+            batch = []
+            with open(path, encoding='utf-8') as f:
+                for post in iter_crawl_posts(f, prefix, stats):
+                    batch.append(post)
+                    if len(batch) >= self.batch_size:
+                        batches.put(batch)
+                        batch = []
+            if batch:
+                batches.put(batch)
+        except (OSError, ValueError) as e:
+            stats['error'] = e
+        finally:
+            batches.put(None)
+
+    def import_file(self, path, prefix=None):
+        """파일 하나를 스트리밍으로 가져오기 (prefix가 없으면 파일 최상위 형태로 판단)"""
+        prefix = prefix or detect_prefix(path)
+        print(f"📥 스트리밍 가져오기: {path} (prefix={prefix})")
+        batches = queue.Queue(maxsize=MAX_PENDING_BATCHES)
+        stats = {'records': 0, 'skipped': 0, 'invalid': 0, 'saved': 0, 'changed': 0, 'duplicates': 0, 'error': None}
+
+        producer = threading.Thread(
+            target=self._produce, args=(path, prefix, batches, stats), daemon=True
+        )
+        producer.start()
+
+        while True:
+            batch = batches.get()
+            if batch is None:
+                break
+            results = upsert_blog_posts(self.cursor, batch)
+            for post_id, post, changed in results:
+                if changed and self.dedup.register(post_id, post['title'], post['content']) is not None:
+                    stats['duplicates'] += 1
+            self.sections.sync([post_id for post_id, _, changed in results if changed])
+            self.conn.commit()
+            stats['saved'] += len(results)
+            stats['changed'] += sum(1 for _, _, changed in results if changed)
+            print(f"  - {stats['saved']}개 저장 (변경 {stats['changed']}개)")
+
+        producer.join()
+        if stats['error']:
+            print(f"❌ 파싱 중단: {stats['error']}")
+
+        print(f"✅ 완료: 레코드 {stats['records']}개, 저장 {stats['saved']}개, "
+              f"건너뜀 {stats['skipped']}개, 변환 실패 {stats['invalid']}개, 중복 {stats['duplicates']}개")
+        return stats
+
+    def close(self):
+        """DB 연결 종료"""
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="크롤링 결과 JSON 스트리밍 가져오기")
+    parser.add_argument('files', nargs='+', help="가져올 JSON 파일")
+    parser.add_argument('--prefix',
+                        help="포스트 배열 경로 (ijson prefix 형식, 예: item, posts.item - 기본: 파일 형태로 자동 판단)")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="upsert 배치 크기")
+    parser.add_argument('--db', default='database.db', help="SQLite DB 경로")
+    args = parser.parse_args()
+
+    importer = StreamingPostImporter(args.db, args.batch_size)
+    failed = []
+    try:
+        for file_path in args.files:
+            try:
+                stats = importer.import_file(file_path, args.prefix)
+            except OSError as e:
+                print(f"❌ {file_path} 열기 실패: {e}")
+                failed.append(file_path)
+                continue
+            if stats['error']:
+                failed.append(file_path)
+    finally:
+        importer.close()
+    print(f"WAL checkpoint: {checkpoint_after_bulk(args.db)}")
+
+    if failed:
+        # 중간에 파싱이 끊긴 파일은 일부만 저장되었으므로 호출한 스케줄러가 알 수 있게 실패로 종료
+        print(f"❌ 파싱 실패 파일 {len(failed)}개: {', '.join(failed)}")
+        sys.exit(1)
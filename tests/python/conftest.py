@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 루트 스크립트(portfolio_snapshots.py 등)를 모듈로 import
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
@@ -0,0 +1,79 @@
+import sqlite3
+
+import pytest
+
+import analyze_all_posts
+from analyze_all_posts import DirectClaudeAnalyzer
+from test_post_archive import production_db
+
+BACKFILL_POSTS = [
+    (10, '223000000010', '전기차 이야기', '테슬라 판매가 증가하고 삼성전자 실적도 개선되었습니다.', '2025-06-02 09:00:00'),
+    (11, '223000000011', '미국 주식', 'Tesla 신차 발표가 기대됩니다.', '2025-06-03 09:00:00'),
+    (12, '223000000012', '새 종목', '리비안 생산이 늘어 성장이 기대됩니다.', '2025-06-04 09:00:00'),
+    # 10번과 같은 글 (post_dedup.py가 중복으로 표시)
+    (13, '223000000013', '전기차 이야기', '테슬라 판매가 증가하고 삼성전자 실적도 개선되었습니다.', '2025-06-02 09:00:00'),
+    (14, '223000000014', '이미 분석한 글', '테슬라 주가가 하락하여 우려됩니다.', '2025-06-05 09:00:00'),
+]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = production_db(str(tmp_path / 'database.db'))
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO blog_posts (id, log_no, title, content, created_date) VALUES (?, ?, ?, ?, ?)", BACKFILL_POSTS
+    )
+    conn.execute(
+        "INSERT INTO post_minhash_signatures (post_id, content_hash, signature, duplicate_of, similarity) "
+        "VALUES (13, '', x'', 10, 1.0)"
+    )
+    conn.execute("INSERT INTO sentiments (id, log_no, ticker, sentiment) VALUES (1, 14, 'TSLA', 'negative')")
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def analyzer(db_path):
+    analyzer = DirectClaudeAnalyzer(db_path)
+    yield analyzer
+    analyzer.close()
+
+
+def sentiment_pairs(analyzer):
+    return sorted(analyzer.conn.execute("SELECT log_no, ticker FROM sentiments").fetchall())
+
+
+def test_ticker_backfill_analyses_only_candidate_pairs(analyzer):
+    assert analyzer.backfill_ticker('TSLA') == 2
+
+    # 별칭이 나온 원본 포스트의 TSLA만 - 같은 글의 삼성전자, 중복 포스트, 이미 분석된 쌍은 건드리지 않음
+    assert sentiment_pairs(analyzer) == [(10, 'TSLA'), (11, 'TSLA'), (14, 'TSLA')]
+    assert analyzer.conn.execute(
+        "SELECT DISTINCT log_no FROM merry_post_stock_mentions ORDER BY log_no"
+    ).fetchall() == [(10,), (11,)]
+    assert analyzer.backfill_ticker('TSLA') == 0
+
+
+def test_candidate_lookup_is_chunked(analyzer, monkeypatch):
+    monkeypatch.setattr(analyze_all_posts, 'ID_QUERY_CHUNK_SIZE', 1)
+
+    assert analyzer.backfill_ticker('TSLA') == 2
+    assert sentiment_pairs(analyzer) == [(10, 'TSLA'), (11, 'TSLA'), (14, 'TSLA')]
+
+
+def test_unknown_ticker_is_rejected(analyzer):
+    with pytest.raises(ValueError):
+        analyzer.backfill_ticker('RIVN')
+
+
+def test_alias_change_backfills_only_new_aliases(analyzer):
+    # 첫 실행은 기준 스냅샷만 저장 (전체 재분석이 되지 않도록)
+    assert analyzer.backfill_since_alias_change() == 0
+    assert sentiment_pairs(analyzer) == [(14, 'TSLA')]
+
+    analyzer.ticker_to_name_map['RIVN'] = ['리비안', 'Rivian']
+    assert analyzer.backfill_since_alias_change() == 1
+    assert sentiment_pairs(analyzer) == [(12, 'RIVN'), (14, 'TSLA')]
+
+    assert analyzer.backfill_since_alias_change() == 0
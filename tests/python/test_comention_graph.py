@@ -0,0 +1,62 @@
+import sqlite3
+
+import pytest
+
+from comention_graph import ComentionGraph
+from test_post_archive import production_db
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return production_db(str(tmp_path / 'database.db'))
+
+
+def execute(db_path, sql, params=()):
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executemany(sql, params) if params else conn.execute(sql)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def refresh(db_path, **kwargs):
+    graph = ComentionGraph(db_path)
+    try:
+        count = graph.refresh(**kwargs)
+        pairs = graph.conn.execute("SELECT ticker_a, ticker_b, post_count FROM ticker_comentions ORDER BY 1, 2").fetchall()
+        return count, pairs
+    finally:
+        graph.close()
+
+
+def test_migration_installs_triggers_on_shared_tables(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        tables = dict(conn.execute(
+            "SELECT name, tbl_name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_comention_%'"
+        ))
+    finally:
+        conn.close()
+    assert len(tables) == 11
+    assert set(tables.values()) == {'sentiments', 'merry_post_stock_mentions', 'blog_posts', 'post_minhash_signatures'}
+
+
+def test_refresh_applies_only_changed_posts(db_path):
+    execute(db_path, "INSERT INTO sentiments (log_no, ticker, sentiment) VALUES (?, ?, ?)", [
+        (1, '005930', 'positive'), (1, '000660', 'positive'),
+        (2, '005930', 'neutral'), (2, '000660', 'negative'), (2, '042660', 'neutral'),
+    ])
+    # 마이그레이션이 기록한 기존 포스트 3개 + 감정 트리거 기록 중 언급이 있는 2개만 반영
+    assert refresh(db_path) == (2, [('000660', '005930', 2), ('000660', '042660', 1), ('005930', '042660', 1)])
+    assert refresh(db_path) == (0, [('000660', '005930', 2), ('000660', '042660', 1), ('005930', '042660', 1)])
+
+    execute(db_path, "DELETE FROM sentiments WHERE log_no = 2 AND ticker = '042660'")
+    assert refresh(db_path) == (1, [('000660', '005930', 2)])
+
+    # 중복 표시도 변경으로 기록됨
+    execute(db_path, """
+        INSERT INTO post_minhash_signatures (post_id, content_hash, signature, duplicate_of) VALUES (2, '', x'', 1)
+    """)
+    assert refresh(db_path) == (1, [('000660', '005930', 1)])
+    assert refresh(db_path, rebuild=True)[1] == [('000660', '005930', 1)]
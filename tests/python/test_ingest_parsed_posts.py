@@ -0,0 +1,152 @@
+import asyncio
+import json
+import os
+import sqlite3
+
+import pytest
+
+from db_migrate import MigrationRunner
+from ingest_parsed_posts import ParsedPostIngestor
+from post_batch_pipeline import STEP_NAMES
+from test_post_archive import PRODUCTION_BLOG_POSTS
+
+
+def crawl_record(log_no, title, *sentences):
+    return {
+        'url': f'https://blog.naver.com/ranto28/{log_no}',
+        'title': title,
+        'sentences': list(sentences),
+        'timestamp': '2025-06-01T09:00:00Z',
+    }
+
+
+GOOD_RECORDS = [
+    crawl_record(223900000001, '삼성전자 실적 이야기', '삼성전자 실적이 개선되어 성장이 기대됩니다.'),
+    crawl_record(223900000002, '조선업 전망', '한화오션 수주가 증가하고 있습니다.'),
+]
+FAILING_RECORDS = [
+    crawl_record(223900000011, '실패할 글', '테슬라 판매가 감소하고 있습니다.'),
+]
+
+
+def write_json(path, records):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(records, f, ensure_ascii=False)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'database.db')
+    conn = sqlite3.connect(path)
+    conn.execute(PRODUCTION_BLOG_POSTS)
+    conn.close()
+    runner = MigrationRunner(path)
+    try:
+        runner.migrate()
+    finally:
+        runner.close()
+    return path
+
+
+@pytest.fixture
+def watch_dir(tmp_path):
+    path = tmp_path / 'parsed-posts'
+    path.mkdir()
+    return path
+
+
+def run_once(db_path, watch_dir, setup=None):
+    ingestor = ParsedPostIngestor(db_path, str(watch_dir), skip_steps=STEP_NAMES)
+    if setup:
+        original_open = ingestor._open
+
+        def _open():
+            original_open()
+            setup(ingestor)
+
+        ingestor._open = _open
+    asyncio.run(ingestor.run(once=True))
+
+
+def query(db_path, sql):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+def fail_on_tesla(ingestor):
+    original = ingestor.analyzer.analyze_post
+
+    def analyze_post(log_no, title, content, stocks):
+        if any(stock['ticker'] == 'TSLA' for stock in stocks):
+            raise KeyError('분석 중간 실패')
+        return original(log_no, title, content, stocks)
+
+    ingestor.analyzer.analyze_post = analyze_post
+
+
+def test_ingests_posts_and_marks_file(db_path, watch_dir):
+    write_json(watch_dir / 'good.json', GOOD_RECORDS)
+
+    run_once(db_path, watch_dir)
+
+    assert sorted(log_no for log_no, in query(db_path, "SELECT log_no FROM blog_posts")) == [
+        '223900000001', '223900000002'
+    ]
+    assert query(db_path, "SELECT post_count FROM ingested_crawl_files") == [(2,)]
+    assert ('005930',) in query(db_path, "SELECT ticker FROM sentiments")
+
+
+def test_failure_rolls_back_only_that_file_and_is_not_retried(db_path, watch_dir):
+    write_json(watch_dir / 'a-good.json', GOOD_RECORDS)
+    write_json(watch_dir / 'b-failing.json', FAILING_RECORDS)
+
+    # 처리에 실패해도 예외가 데몬 밖으로 나가지 않음
+    run_once(db_path, watch_dir, setup=fail_on_tesla)
+
+    # 실패한 파일의 포스트/언급은 롤백, 앞 파일은 그대로 커밋
+    log_nos = {log_no for log_no, in query(db_path, "SELECT log_no FROM blog_posts")}
+    assert log_nos == {'223900000001', '223900000002'}
+    assert query(db_path, "SELECT COUNT(*) FROM merry_post_stock_mentions WHERE ticker = 'TSLA'") == [(0,)]
+    assert [os.path.basename(path) for path, in query(db_path, "SELECT path FROM ingested_crawl_files")] == [
+        'a-good.json'
+    ]
+    failures = query(db_path, "SELECT path, error FROM failed_crawl_files")
+    assert len(failures) == 1
+    assert os.path.basename(failures[0][0]) == 'b-failing.json'
+    assert failures[0][1].startswith('KeyError')
+
+    # 파일이 바뀌지 않았으면 다음 스캔에서 건너뜀
+    ingestor = ParsedPostIngestor(db_path, str(watch_dir), skip_steps=STEP_NAMES)
+    ingestor._open()
+    try:
+        assert ingestor._pending_files() == []
+    finally:
+        ingestor.analyzer.close()
+
+
+def test_fixed_file_is_retried_and_failure_cleared(db_path, watch_dir):
+    path = watch_dir / 'failing.json'
+    write_json(path, FAILING_RECORDS)
+    run_once(db_path, watch_dir, setup=fail_on_tesla)
+    assert len(query(db_path, "SELECT path FROM failed_crawl_files")) == 1
+
+    # 크기/수정 시각이 바뀌면 다시 처리
+    write_json(path, FAILING_RECORDS + GOOD_RECORDS[:1])
+    run_once(db_path, watch_dir)
+
+    assert query(db_path, "SELECT COUNT(*) FROM failed_crawl_files") == [(0,)]
+    assert query(db_path, "SELECT post_count FROM ingested_crawl_files") == [(2,)]
+    assert query(db_path, "SELECT COUNT(*) FROM blog_posts") == [(2,)]
+
+
+def test_broken_json_is_recorded_as_failure(db_path, watch_dir):
+    (watch_dir / 'broken.json').write_text(json.dumps(GOOD_RECORDS, ensure_ascii=False)[:-20], encoding='utf-8')
+
+    run_once(db_path, watch_dir)
+
+    assert query(db_path, "SELECT COUNT(*) FROM blog_posts") == [(0,)]
+    assert query(db_path, "SELECT COUNT(*) FROM ingested_crawl_files") == [(0,)]
+    assert query(db_path, "SELECT COUNT(*) FROM failed_crawl_files") == [(1,)]
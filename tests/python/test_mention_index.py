@@ -0,0 +1,76 @@
+import sqlite3
+
+import pytest
+
+from analyze_all_posts import DirectClaudeAnalyzer
+from test_post_archive import production_db
+
+TITLE = '반도체 전망'
+CONTENT = '삼성전자와 한화오션이 좋습니다. 다시 말하지만 삼성전자 실적이 개선되었습니다.'
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    path = production_db(str(tmp_path / 'database.db'))
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "INSERT INTO blog_posts (id, log_no, title, content, created_date) VALUES (10, '223000000010', ?, ?, ?)",
+        (TITLE, CONTENT, '2025-06-02 09:00:00')
+    )
+    conn.commit()
+    conn.close()
+    analyzer = DirectClaudeAnalyzer(path)
+    yield analyzer
+    analyzer.close()
+
+
+def mentions(analyzer, log_no=10):
+    return analyzer.conn.execute("""
+        SELECT ticker, alias, start_offset, end_offset, mention_sentiment FROM merry_post_stock_mentions
+        WHERE log_no = ? ORDER BY start_offset
+    """, (log_no,)).fetchall()
+
+
+def test_offsets_index_the_title_plus_content_text(analyzer):
+    assert analyzer.save_mentions(10, TITLE, CONTENT) == 3
+
+    text = f"{TITLE}\n{CONTENT}"
+    saved = mentions(analyzer)
+    assert [(ticker, alias) for ticker, alias, *_ in saved] == [
+        ('005930', '삼성전자'), ('042660', '한화오션'), ('005930', '삼성전자')
+    ]
+    assert all(text[start:end] == alias for _, alias, start, end, _ in saved)
+
+
+def test_save_is_idempotent_and_replaces_removed_mentions(analyzer):
+    analyzer.save_mentions(10, TITLE, CONTENT)
+    analyzer.save_mentions(10, TITLE, CONTENT)
+    assert len(mentions(analyzer)) == 3
+
+    analyzer.save_mentions(10, TITLE, '삼성전자만 남았습니다.')
+    assert [row[0] for row in mentions(analyzer)] == ['005930']
+
+
+def test_mentions_follow_stored_sentiment(analyzer):
+    analyzer.save_mentions(10, TITLE, CONTENT)
+    stocks = analyzer.find_mentioned_stocks(f"{TITLE} {CONTENT}")
+    analyzer.analyze_post(10, TITLE, CONTENT, stocks)
+
+    sentiments = dict(analyzer.conn.execute("SELECT ticker, sentiment FROM sentiments WHERE log_no = 10"))
+    assert {ticker: sentiment for ticker, _, _, _, sentiment in mentions(analyzer)} == sentiments
+
+    # 다시 색인해도 저장된 감정 유지
+    analyzer.save_mentions(10, TITLE, CONTENT)
+    assert {ticker: sentiment for ticker, _, _, _, sentiment in mentions(analyzer)} == sentiments
+
+
+def test_rebuild_keeps_mentions_of_archived_posts(analyzer):
+    analyzer.save_mentions(10, TITLE, CONTENT)
+    analyzer.conn.execute("UPDATE blog_posts SET content = NULL WHERE id = 10")
+    analyzer.conn.commit()
+
+    analyzer.index_all_mentions()
+
+    assert len(mentions(analyzer)) == 3
+    # 본문이 남아 있는 포스트는 다시 색인 (기본 포스트에는 종목 언급이 없음)
+    assert analyzer.conn.execute("SELECT COUNT(*) FROM merry_post_stock_mentions").fetchone()[0] == 3
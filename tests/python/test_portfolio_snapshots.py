@@ -0,0 +1,120 @@
+import os
+import sqlite3
+from datetime import date
+
+import pytest
+
+from portfolio_snapshots import PortfolioSnapshotEngine
+
+MIGRATION = os.path.join(os.path.dirname(__file__), '..', '..', 'database', 'migrations', '0006_portfolio_tables.sql')
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'database.db')
+    conn = sqlite3.connect(path)
+    with open(MIGRATION, encoding='utf-8') as f:
+        conn.executescript(f.read())
+    conn.executescript("""
+        CREATE TABLE stock_daily_prices (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ticker TEXT NOT NULL,
+            trade_date DATE NOT NULL,
+            close_price REAL NOT NULL,
+            UNIQUE(ticker, trade_date)
+        );
+        INSERT INTO portfolios (id, user_id, name) VALUES (1, 1, '테스트'), (2, 1, '거래 없음');
+        INSERT INTO stocks (id, symbol, name, market) VALUES (1, 'AAPL', 'Apple', 'NASDAQ');
+    """)
+    conn.executemany(
+        "INSERT INTO stock_daily_prices (ticker, trade_date, close_price) VALUES ('AAPL', ?, ?)",
+        [('2025-03-03', 100.0), ('2025-03-04', 110.0), ('2025-03-05', 120.0), ('2025-03-06', 130.0)]
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+def add_transaction(db_path, kind, shares, price, day, commission=0.0):
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        INSERT INTO transactions
+            (portfolio_id, stock_id, transaction_type, shares, price, total_amount, commission, transaction_date)
+        VALUES (1, 1, ?, ?, ?, ?, ?, ?)
+    """, (kind, shares, price, shares * price, commission, day))
+    conn.commit()
+    conn.close()
+
+
+def snapshots(db_path, end):
+    engine = PortfolioSnapshotEngine(db_path)
+    try:
+        engine.refresh(end=end)
+        return engine.load_snapshots([1])
+    finally:
+        engine.close()
+
+
+def test_buy_values_position_at_close(db_path):
+    add_transaction(db_path, 'buy', 10, 100.0, '2025-03-03', commission=1.0)
+    rows = snapshots(db_path, date(2025, 3, 4))
+
+    value, cost, gain, _, change, _, cash = rows[(1, '2025-03-04')]
+    assert (value, cost, gain, cash) == (1100.0, 1001.0, 99.0, 0.0)
+    assert change == 100.0
+    # 첫 스냅샷은 일간 변동 없음
+    assert rows[(1, '2025-03-03')][4] is None
+
+
+def test_sell_keeps_realized_gain_in_cash(db_path):
+    add_transaction(db_path, 'buy', 10, 100.0, '2025-03-03')
+    add_transaction(db_path, 'sell', 10, 120.0, '2025-03-05', commission=5.0)
+    rows = snapshots(db_path, date(2025, 3, 6))
+
+    value, cost, gain, return_percent, change, _, cash = rows[(1, '2025-03-05')]
+    assert (value, cost, gain, cash) == (1195.0, 1000.0, 195.0, 1195.0)
+    assert return_percent == 19.5
+    assert change == 95.0
+    # 매도 후에는 주가가 움직여도 평가 금액은 현금 그대로
+    assert rows[(1, '2025-03-06')][:3] == (1195.0, 1000.0, 195.0)
+
+
+def test_buy_after_sell_spends_cash_first(db_path):
+    add_transaction(db_path, 'buy', 10, 100.0, '2025-03-03')
+    add_transaction(db_path, 'sell', 10, 110.0, '2025-03-04')
+    add_transaction(db_path, 'buy', 10, 120.0, '2025-03-05')
+    rows = snapshots(db_path, date(2025, 3, 5))
+
+    value, cost, gain, _, _, _, cash = rows[(1, '2025-03-05')]
+    # 현금 1100 + 추가 원금 100으로 매수
+    assert (value, cost, gain, cash) == (1200.0, 1100.0, 100.0, 0.0)
+
+
+def test_holiday_transactions_align_to_next_trading_day(db_path):
+    # 2025-03-01(토) 거래는 다음 거래일 2025-03-03 스냅샷부터 반영
+    add_transaction(db_path, 'buy', 10, 100.0, '2025-03-01')
+    rows = snapshots(db_path, date(2025, 3, 4))
+
+    assert min(day for _, day in rows) == '2025-03-03'
+    assert (1, '2025-03-01') not in rows
+    assert rows[(1, '2025-03-03')][0] == 1000.0
+
+
+def test_refresh_keeps_snapshots_of_portfolios_without_transactions(db_path):
+    add_transaction(db_path, 'buy', 10, 100.0, '2025-03-03')
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        INSERT INTO portfolio_performance
+            (portfolio_id, snapshot_date, total_value, total_cost, total_gain_loss, total_return_percent)
+        VALUES (2, '2025-03-03', 500, 500, 0, 0)
+    """)
+    conn.commit()
+    conn.close()
+
+    engine = PortfolioSnapshotEngine(db_path)
+    try:
+        _, deleted = engine.refresh(end=date(2025, 3, 4))
+        assert deleted == 0
+        assert (2, '2025-03-03') in engine.load_snapshots([2])
+    finally:
+        engine.close()
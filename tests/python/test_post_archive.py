@@ -0,0 +1,135 @@
+import os
+import sqlite3
+
+import pytest
+
+from db_migrate import MigrationRunner
+from post_archive import PostArchive, load_archived_contents
+
+# 운영 DB와 같은 content NOT NULL 정의 (0001의 CREATE TABLE IF NOT EXISTS보다 먼저 만듦)
+PRODUCTION_BLOG_POSTS = """
+    CREATE TABLE blog_posts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        log_no TEXT UNIQUE,
+        title TEXT NOT NULL,
+        content TEXT NOT NULL,
+        excerpt TEXT,
+        created_date DATETIME NOT NULL,
+        category TEXT,
+        views INTEGER DEFAULT 0,
+        comments_count INTEGER DEFAULT 0,
+        blog_type TEXT DEFAULT 'merry',
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+POSTS = [
+    (1, '223000000001', '2023년 글', '2023년 본문입니다. 반도체 이야기', '2023-03-02 09:00:00'),
+    (2, '223000000002', '2023년 두 번째 글', '조선업 이야기를 적었습니다', '2023-11-20 21:00:00'),
+    (3, '223000000003', '2025년 글', '최근 본문은 핫 DB에 남습니다', '2025-06-01 08:00:00'),
+]
+
+
+def production_db(path, migrate=True):
+    conn = sqlite3.connect(path)
+    conn.execute(PRODUCTION_BLOG_POSTS)
+    conn.executemany(
+        "INSERT INTO blog_posts (id, log_no, title, content, created_date) VALUES (?, ?, ?, ?, ?)", POSTS
+    )
+    conn.commit()
+    conn.close()
+    if migrate:
+        runner = MigrationRunner(path)
+        try:
+            runner.migrate()
+        finally:
+            runner.close()
+    return path
+
+
+def contents(path):
+    conn = sqlite3.connect(path)
+    try:
+        return dict(conn.execute("SELECT id, content FROM blog_posts"))
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return production_db(str(tmp_path / 'database.db'))
+
+
+def test_migration_drops_content_not_null_and_keeps_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        not_null = {row[1]: row[3] for row in conn.execute("PRAGMA table_info(blog_posts)")}
+        assert not_null['content'] == 0
+        assert not_null['title'] == 1
+        # 다시 만든 테이블에도 FTS 동기화 트리거가 걸려 있음
+        triggers = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'blog_posts'"
+        )}
+        assert {'blog_posts_fts_ai', 'blog_posts_fts_ad', 'blog_posts_fts_au'} <= triggers
+    finally:
+        conn.close()
+    assert contents(db_path) == {post_id: content for post_id, _, _, content, _ in POSTS}
+
+
+def test_archive_moves_old_content_and_reads_it_back(db_path, tmp_path):
+    archive = PostArchive(db_path, str(tmp_path / 'archive'))
+    try:
+        assert archive.archive(before_year=2024) == {2023: 2}
+        assert archive.partition_years() == [2023]
+        archived = load_archived_contents(archive.conn, [1, 2, 3])
+    finally:
+        archive.close()
+
+    assert contents(db_path) == {1: None, 2: None, 3: POSTS[2][3]}
+    assert archived == {1: POSTS[0][3], 2: POSTS[1][3]}
+
+
+def test_archive_refuses_not_null_content_before_copying(tmp_path):
+    db_path = production_db(str(tmp_path / 'database.db'), migrate=False)
+    archive = PostArchive(db_path, str(tmp_path / 'archive'))
+    try:
+        with pytest.raises(RuntimeError, match='NOT NULL'):
+            archive.archive(before_year=2024)
+        assert archive.partition_years() == []
+    finally:
+        archive.close()
+
+    assert not os.path.exists(tmp_path / 'archive' / 'posts-2023.db')
+    assert contents(db_path)[1] == POSTS[0][3]
+
+
+def test_failed_blanking_leaves_both_databases_unchanged(db_path, tmp_path, monkeypatch):
+    archive = PostArchive(db_path, str(tmp_path / 'archive'))
+
+    def fail(year, schema):
+        raise sqlite3.IntegrityError('중간 실패')
+
+    monkeypatch.setattr(archive, 'update_partition', fail)
+    try:
+        with pytest.raises(sqlite3.IntegrityError):
+            archive.archive(before_year=2024)
+        assert archive.conn.execute("SELECT COUNT(*) FROM archived_posts").fetchone()[0] == 0
+    finally:
+        archive.close()
+
+    assert contents(db_path)[1] == POSTS[0][3]
+    copy = sqlite3.connect(str(tmp_path / 'archive' / 'posts-2023.db'))
+    try:
+        assert copy.execute("SELECT COUNT(*) FROM blog_posts").fetchone()[0] == 0
+    finally:
+        copy.close()
+
+
+def test_restore_returns_content_to_hot_db(db_path, tmp_path):
+    archive = PostArchive(db_path, str(tmp_path / 'archive'))
+    try:
+        archive.archive(before_year=2024)
+        assert archive.restore(2023) == 2
+    finally:
+        archive.close()
+
+    assert contents(db_path) == {post_id: content for post_id, _, _, content, _ in POSTS}
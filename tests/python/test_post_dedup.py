@@ -0,0 +1,67 @@
+import sqlite3
+
+import pytest
+
+from post_dedup import PostDeduplicator
+from sentiment_factors import posts_with_perspective
+from test_post_archive import production_db
+
+BODY = '반도체 업황이 바닥을 지나고 있습니다. 삼성전자는 메모리 가격 반등으로 실적이 개선될 것으로 봅니다.'
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(production_db(str(tmp_path / 'database.db')))
+    conn.executemany(
+        "INSERT INTO blog_posts (id, log_no, title, content, created_date) VALUES (?, ?, ?, ?, ?)", [
+            (10, '223000000010', '반도체 이야기', BODY, '2025-06-02 09:00:00'),
+            # 모바일 파서로 다시 들어온 같은 글 (공백/문장부호만 다름)
+            (11, '223000000011', '반도체 이야기', BODY.replace('. ', '.\n\n'), '2025-06-02 09:00:00'),
+        ]
+    )
+    conn.executemany(
+        "INSERT INTO sentiments (log_no, ticker, sentiment, investment_perspective) VALUES (?, ?, ?, ?)",
+        [(post_id, '005930', 'positive', '["장기 투자"]') for post_id in (10, 11)]
+    )
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def test_duplicate_is_marked_and_analysis_kept(conn):
+    dedup = PostDeduplicator(conn)
+    total, duplicates = dedup.build_all()
+
+    assert (total, duplicates) == (5, 1)
+    assert [row[:2] for row in dedup.report()] == [(11, 10)]
+    # 중복 포스트의 분석 행은 지우지 않고 읽는 쪽에서 제외
+    assert conn.execute("SELECT COUNT(*) FROM sentiments").fetchone()[0] == 2
+    assert posts_with_perspective(conn, '장기 투자') == [(10, '005930')]
+
+
+def test_edited_duplicate_is_unmarked(conn):
+    dedup = PostDeduplicator(conn)
+    dedup.build_all()
+
+    assert dedup.register(11, '다른 글', '조선업 수주 잔고가 역대 최고 수준으로 늘어나고 있습니다.') is None
+    assert dedup.report() == []
+    assert sorted(posts_with_perspective(conn, '장기 투자')) == [(10, '005930'), (11, '005930')]
+
+
+def test_short_posts_are_not_grouped(conn):
+    dedup = PostDeduplicator(conn)
+
+    assert dedup.register(20, '', '네') is None
+    assert dedup.register(21, '', '네!') is None
+    assert conn.execute(
+        "SELECT COUNT(*) FROM post_minhash_signatures WHERE post_id IN (20, 21)"
+    ).fetchone()[0] == 0
+
+
+def test_schema_setup_does_not_commit_callers_transaction(conn):
+    conn.execute("UPDATE blog_posts SET title = '배치 도중' WHERE id = 10")
+
+    PostDeduplicator(conn)
+    conn.rollback()
+
+    assert conn.execute("SELECT title FROM blog_posts WHERE id = 10").fetchone()[0] == '반도체 이야기'
@@ -0,0 +1,34 @@
+import json
+import os
+import sqlite3
+
+import pytest
+
+from post_sections import PostSectionStore, content_parts, split_sections, update_post_content
+
+FIXTURE = os.path.join(os.path.dirname(__file__), '..', 'fixtures', 'content-parts.json')
+with open(FIXTURE, encoding='utf-8') as f:
+    CASES = json.load(f)
+
+
+@pytest.mark.parametrize('case', CASES, ids=[case['name'] for case in CASES])
+def test_matches_extract_content_parts(case):
+    # src/lib/text-utils.parity.test.ts가 같은 케이스로 extractContentParts를 검사
+    assert content_parts(case['input']) == (case['summary'], case['mainContent'])
+    assert split_sections(case['input'])[2] == case['comment']
+
+
+def test_update_post_content_keeps_transaction_open():
+    conn = sqlite3.connect(':memory:')
+    conn.execute("CREATE TABLE blog_posts (id INTEGER PRIMARY KEY, content TEXT)")
+    conn.execute("INSERT INTO blog_posts (id, content) VALUES (1, '원본')")
+    PostSectionStore(conn).sync()
+    conn.commit()
+
+    update_post_content(conn, 1, '본문입니다.\n한줄 코멘트. 코멘트입니다.')
+    assert conn.in_transaction
+    assert PostSectionStore(conn).get(1) == {'summary': '', 'body': '본문입니다.', 'comment': '코멘트입니다.'}
+
+    conn.rollback()
+    assert conn.execute("SELECT content FROM blog_posts WHERE id = 1").fetchone() == ('원본',)
+    assert PostSectionStore(conn).get(1) == {'summary': '', 'body': '원본', 'comment': ''}
@@ -0,0 +1,91 @@
+import json
+import sqlite3
+
+import pytest
+
+from sentiment_factors import backfill_factors, ensure_factor_schema, factors_for_ticker, posts_with_perspective
+from test_post_archive import production_db
+
+
+def evidence(positive=(), negative=()):
+    return json.dumps({'positive_factors': list(positive), 'negative_factors': list(negative), 'neutral_factors': []},
+                      ensure_ascii=False)
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(production_db(str(tmp_path / 'database.db')))
+    conn.executemany("""
+        INSERT INTO sentiments (id, log_no, ticker, sentiment, supporting_evidence, investment_perspective,
+                                uncertainty_factors, analysis_date)
+        VALUES (?, ?, '005930', ?, ?, ?, ?, ?)
+    """, [
+        (1, 1, 'negative', evidence(negative=['하락', '우려']), '["반도체"]', '["리스크"]', '2023-03-02'),
+        (2, 2, 'positive', evidence(positive=['성장'], negative=['우려']), '["반도체", "조선"]', '[]', '2025-06-01'),
+        # 깨진 JSON은 자식 행 없이 저장
+        (3, 3, 'neutral', '{not json', 'null', '', '2025-06-02'),
+    ])
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def children(conn):
+    factors = conn.execute(
+        "SELECT sentiment_id, factor_type, factor FROM sentiment_factors ORDER BY 1, 2, 3"
+    ).fetchall()
+    perspectives = conn.execute("SELECT sentiment_id, perspective FROM sentiment_perspectives ORDER BY 1, 2").fetchall()
+    return factors, perspectives
+
+
+def test_insert_trigger_fills_child_tables(conn):
+    factors, perspectives = children(conn)
+
+    assert factors == [
+        (1, 'negative', '우려'), (1, 'negative', '하락'), (1, 'uncertainty', '리스크'),
+        (2, 'negative', '우려'), (2, 'positive', '성장'),
+    ]
+    assert perspectives == [(1, '반도체'), (2, '반도체'), (2, '조선')]
+    assert factors_for_ticker(conn, '005930', 'negative') == [('우려', 2), ('하락', 1)]
+    assert factors_for_ticker(conn, '005930', 'negative', since='2024-01-01') == [('우려', 1)]
+    assert posts_with_perspective(conn, '조선') == [(2, '005930')]
+
+
+def test_queries_exclude_duplicate_posts(conn):
+    conn.execute(
+        "INSERT INTO post_minhash_signatures (post_id, content_hash, signature, duplicate_of, similarity) "
+        "VALUES (2, '', x'', 1, 1.0)"
+    )
+
+    assert factors_for_ticker(conn, '005930', 'negative') == [('우려', 1), ('하락', 1)]
+    assert posts_with_perspective(conn, '조선') == []
+    assert posts_with_perspective(conn, '반도체') == [(1, '005930')]
+
+
+def test_update_and_delete_keep_children_in_sync(conn):
+    conn.execute("UPDATE sentiments SET supporting_evidence = ?, investment_perspective = '[]' WHERE id = 1",
+                 (evidence(positive=['개선']),))
+    conn.execute("DELETE FROM sentiments WHERE id = 2")
+    conn.commit()
+
+    factors, perspectives = children(conn)
+    assert factors == [(1, 'positive', '개선'), (1, 'uncertainty', '리스크')]
+    assert perspectives == []
+
+
+def test_backfill_rebuilds_from_json_columns(conn):
+    before = children(conn)
+    conn.execute("DELETE FROM sentiment_factors")
+    conn.execute("INSERT INTO sentiment_perspectives (sentiment_id, perspective) VALUES (99, '잘못된 행')")
+
+    assert backfill_factors(conn) == (5, 3)
+    assert children(conn) == before
+
+
+def test_schema_setup_is_idempotent_inside_a_transaction(conn):
+    conn.execute("UPDATE sentiments SET ticker = 'TSLA' WHERE id = 3")
+
+    assert ensure_factor_schema(conn) is False
+    conn.rollback()
+
+    assert conn.execute("SELECT ticker FROM sentiments WHERE id = 3").fetchone()[0] == '005930'
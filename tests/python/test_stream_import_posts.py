@@ -0,0 +1,55 @@
+import io
+import json
+
+import pytest
+
+from stream_import_posts import iter_crawl_posts, iter_json_items
+
+DOCUMENTS = [
+    ('[2.5]', 'item'),
+    ('[1, -20, 3.25, 4e2, 5E-1, -6.5e+3, 0]', 'item'),
+    ('[true, false, null, "", []]', 'item'),
+    ('[ "a\\"b", "한글 \\u00e9 \\\\", {"k": [1, {"n": 12.5}]} ]', 'item'),
+    ('{"meta": {"count": 2.75}, "posts": [{"id": 1.5, "t": "x"}, {"id": 22, "t": "y"}], "tail": 3.0}', 'posts.item'),
+    ('{"posts": []}', 'posts.item'),
+    ('{"stocks": [{"mentions": [10.5, 20]}, {"mentions": []}, {"mentions": [3e1]}]}', 'stocks.item.mentions.item'),
+]
+
+
+def expected_items(document, prefix):
+    values = [json.loads(document)]
+    for key in prefix.split('.'):
+        values = [item for value in values for item in value] if key == 'item' else [v[key] for v in values]
+    return values
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 4, 5, 7, 64])
+@pytest.mark.parametrize('document, prefix', DOCUMENTS)
+def test_items_match_json_loads_at_every_chunk_boundary(document, prefix, chunk_size):
+    items = list(iter_json_items(io.StringIO(document), prefix, chunk_size))
+
+    assert items == expected_items(document, prefix)
+    # 잘린 숫자가 int로 디코딩되지 않았는지 (2.5 → 2 등)
+    assert [type(item) for item in items] == [type(item) for item in expected_items(document, prefix)]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 64])
+@pytest.mark.parametrize('document', ['[1, 2', '[1 2]', '[2.]', '{"posts": [1,]}'])
+def test_broken_json_raises(document, chunk_size):
+    with pytest.raises(ValueError):
+        list(iter_json_items(io.StringIO(document), 'posts.item' if document.startswith('{') else 'item', chunk_size))
+
+
+def test_malformed_records_are_skipped_individually():
+    records = [
+        {'url': 'https://blog.naver.com/ranto28/223900000001', 'title': '정상 글', 'sentences': ['본문입니다.']},
+        {'url': 223900000002, 'title': '숫자 url', 'sentences': ['본문입니다.']},
+        'not a record',
+        {'url': 'https://blog.naver.com/ranto28/223900000003', 'title': '두 번째 정상 글', 'sentences': ['본문.']},
+    ]
+    stats = {'records': 0, 'skipped': 0, 'invalid': 0}
+
+    posts = list(iter_crawl_posts(io.StringIO(json.dumps(records, ensure_ascii=False)), 'item', stats))
+
+    assert [post['title'] for post in posts] == ['정상 글', '두 번째 정상 글']
+    assert stats == {'records': 4, 'skipped': 1, 'invalid': 1}
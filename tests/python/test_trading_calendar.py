@@ -0,0 +1,20 @@
+import numpy as np
+
+from trading_calendar import KRX_CALENDAR, US_CALENDAR
+
+
+def test_next_trading_day_inside_range():
+    # 2025-10-04(토)~10-09 연휴 → 10-10
+    assert str(KRX_CALENDAR.next_trading_day('2025-10-04')) == '2025-10-10'
+    assert str(US_CALENDAR.next_trading_day('2025-07-04')) == '2025-07-07'
+
+
+def test_out_of_range_dates_are_not_clamped():
+    assert np.isnat(US_CALENDAR.next_trading_day('2027-01-04'))
+    assert np.isnat(KRX_CALENDAR.next_trading_day('2022-05-02'))
+    # 범위 마지막 날이 휴장일이면 다음 거래일은 캘린더 밖
+    assert np.isnat(KRX_CALENDAR.next_trading_day('2026-12-31'))
+
+    indices = KRX_CALENDAR.index_on_or_after(['2022-05-02', '2026-12-30', '2026-12-31', '2027-01-04'])
+    assert indices.tolist() == [-1, len(KRX_CALENDAR) - 1, -1, -1]
+    assert [str(day) for day in KRX_CALENDAR.day_at(indices)] == ['NaT', '2026-12-30', 'NaT', 'NaT']
@@ -0,0 +1,77 @@
+import json
+import sqlite3
+
+import pytest
+
+from test_post_archive import production_db
+from weekly_report_builder import WeeklyReportBuilder
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = production_db(str(tmp_path / 'database.db'))
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO sentiments (log_no, ticker, sentiment, sentiment_score) VALUES (?, ?, ?, ?)",
+        [(1, '005930', 'positive', 0.6), (3, '005930', 'negative', -0.4)]
+    )
+    conn.executemany(
+        "INSERT INTO stock_daily_prices (ticker, trade_date, close_price) VALUES (?, ?, ?)",
+        [('005930', '2025-06-02', 100.0), ('005930', '2025-06-05', 110.0)]
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+def build(db_path, **kwargs):
+    builder = WeeklyReportBuilder(db_path)
+    try:
+        return builder.build(**kwargs)
+    finally:
+        builder.close()
+
+
+def reports(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return {key: json.loads(payload) for key, payload in conn.execute("SELECT week_key, payload FROM weekly_reports")}
+    finally:
+        conn.close()
+
+
+def test_unchanged_weeks_are_not_rebuilt(db_path):
+    assert build(db_path) == 3
+    assert build(db_path) == 0
+    assert build(db_path, force=True) == 3
+
+    stock = reports(db_path)['2025-W22']['stockAnalysis'][0]
+    # 2025-06-01(일) 글 → 다음 거래일 6/2 종가 기준, 주말(6/1)까지 거래일이 없어 주간 변화율 없음
+    assert stock['priceAtFirstMention'] == 100.0
+    assert stock['priceChangeToLatest'] == 10.0
+
+
+def test_moved_post_rebuilds_old_and_new_week_only(db_path):
+    build(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE blog_posts SET created_date = '2023-11-21 09:00:00' WHERE id = 1")
+    conn.commit()
+    conn.close()
+
+    # 옮겨 간 주만 다시 만들고, 포스트가 모두 빠진 주는 삭제
+    assert build(db_path) == 1
+    saved = reports(db_path)
+    assert sorted(saved) == ['2023-W47', '2025-W22']
+    assert [post['id'] for post in saved['2023-W47']['sourcePosts']] == [1, 2]
+    assert saved['2023-W47']['newTickers'] == ['005930']
+
+
+def test_price_backfill_rebuilds_that_week(db_path):
+    build(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT INTO stock_daily_prices (ticker, trade_date, close_price) VALUES ('005930', '2023-03-03', 90.0)")
+    conn.commit()
+    conn.close()
+
+    assert build(db_path) == 1
+    assert reports(db_path)['2023-W09']['stockAnalysis'][0]['priceAtFirstMention'] == 90.0
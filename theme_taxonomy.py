@@ -0,0 +1,269 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+투자 테마 분류 (config/theme-taxonomy.json: 테마 → 키워드)
+전체 키워드를 접두사 트리 정규식 하나로 컴파일해 본문을 한 번만 훑고 테마별 적중 수를 셈
+(키워드/테마가 늘어도 키워드마다 본문을 다시 스캔하지 않음)
+영문 키워드는 대소문자 무시 + 영문/숫자 경계 확인 ('AI'가 'said'에 걸리지 않도록)
+포스트별 테마 가중치(post_themes)와 테마별 집계(theme_aggregates)를 저장해 테마 페이지는 조회만 하면 됨
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+from collections import Counter, defaultdict
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config', 'theme-taxonomy.json')
+THEME_TOP_TICKERS = 5
+REFRESH_BATCH_SIZE = 200
+
+
+SCHEMA_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS post_themes (
+        post_id INTEGER NOT NULL,
+        theme TEXT NOT NULL,
+        hits INTEGER NOT NULL,
+        weight REAL NOT NULL,
+        PRIMARY KEY (post_id, theme)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_post_themes_theme ON post_themes(theme, weight)",
+    """
+    CREATE TABLE IF NOT EXISTS post_theme_state (
+        post_id INTEGER PRIMARY KEY,
+        taxonomy_hash TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS theme_aggregates (
+        theme TEXT PRIMARY KEY,
+        post_count INTEGER NOT NULL,
+        total_hits INTEGER NOT NULL,
+        weight_sum REAL NOT NULL,
+        latest_post_id INTEGER,
+        top_tickers TEXT NOT NULL,
+        built_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    # 아카이브로 본문만 비우는 변경(content = NULL)은 무효화하지 않음 (아카이브 포스트 테마는 동결)
+    "DROP TRIGGER IF EXISTS trg_post_themes_content_update",
+    """
+    CREATE TRIGGER trg_post_themes_content_update
+    AFTER UPDATE OF title, content ON blog_posts
+    WHEN NEW.content IS NOT NULL
+    BEGIN
+        DELETE FROM post_theme_state WHERE post_id = NEW.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_post_themes_delete
+    AFTER DELETE ON blog_posts
+    BEGIN
+        DELETE FROM post_themes WHERE post_id = OLD.id;
+        DELETE FROM post_theme_state WHERE post_id = OLD.id;
+    END
+    """,
+]
+
+
+def _is_ascii_word_char(char):
+    return char.isascii() and char.isalnum()
+
+
+def trie_pattern(words):
+    """키워드 목록 → 공통 접두사를 묶은 정규식 (긴 키워드 우선)"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        alternatives = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not alternatives:
+            return ''
+        body = alternatives[0] if len(alternatives) == 1 else f"(?:{'|'.join(alternatives)})"
+        # 여기서 끝나는 키워드가 있으면 나머지는 선택 (탐욕적이라 더 긴 키워드 먼저)
+        return f"(?:{body})?" if '' in node else body
+
+    return build(trie)
+
+
+class ThemeMatcher:
+    def __init__(self, themes, max_themes=3, default_theme='일반'):
+        """themes: {테마: [키워드]}"""
+        self.themes = themes
+        self.max_themes = max_themes
+        self.default_theme = default_theme
+        self.keyword_themes = defaultdict(list)
+        for theme, keywords in themes.items():
+            for keyword in keywords:
+                self.keyword_themes[keyword.casefold()].append(theme)
+        self.pattern = re.compile(trie_pattern(self.keyword_themes), re.IGNORECASE)
+        payload = json.dumps([themes, max_themes, default_theme], ensure_ascii=False, sort_keys=True)
+        self.hash = hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def match(self, text):
+        """본문 한 번 스캔 - {테마: 적중 수}"""
+        hits = Counter()
+        for found in self.pattern.finditer(text or ''):
+            keyword = found.group(0)
+            start, end = found.span()
+            # 영문 키워드는 앞뒤가 영문/숫자면 단어 일부이므로 제외
+            if _is_ascii_word_char(keyword[0]) and start > 0 and _is_ascii_word_char(text[start - 1]):
+                continue
+            if _is_ascii_word_char(keyword[-1]) and end < len(text) and _is_ascii_word_char(text[end]):
+                continue
+            for theme in self.keyword_themes[keyword.casefold()]:
+                hits[theme] += 1
+        return dict(hits)
+
+    @staticmethod
+    def weights(theme_hits):
+        """적중 수 → 포스트 안 테마 비중 (합계 1)"""
+        total = sum(theme_hits.values())
+        return {theme: count / total for theme, count in theme_hits.items()} if total else {}
+
+    def top_themes(self, theme_hits):
+        """적중 수 순 상위 테마 (없으면 기본 테마)"""
+        ranked = sorted(theme_hits.items(), key=lambda item: (-item[1], item[0]))
+        return [theme for theme, _ in ranked[:self.max_themes]] or [self.default_theme]
+
+
+def load_taxonomy(path=DEFAULT_TAXONOMY_PATH):
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+    themes = {theme['name']: theme['keywords'] for theme in config['themes']}
+    return ThemeMatcher(themes, config.get('maxThemesPerPost', 3), config.get('defaultTheme', '일반'))
+
+
+class ThemeIndexer:
+    def __init__(self, db_path='database.db', matcher=None):
+        self.conn = sqlite3.connect(db_path)
+        self.cursor = self.conn.cursor()
+        self.matcher = matcher or load_taxonomy()
+
+    def ensure_schema(self):
+        """테이블/트리거 생성 (executescript는 진행 중인 트랜잭션을 커밋하므로 문장별로 실행)"""
+        for statement in SCHEMA_STATEMENTS:
+            self.cursor.execute(statement)
+
+    def refresh(self, force=False):
+        """새 포스트 / 본문이 바뀐 포스트 / 분류표가 바뀐 경우만 다시 분류하고 테마 집계 갱신 - 분류한 포스트 수
+        (본문이 아카이브된 포스트는 기존 분류 유지)"""
+        self.ensure_schema()
+        if force:
+            self.cursor.execute(
+                "DELETE FROM post_theme_state WHERE post_id IN (SELECT id FROM blog_posts WHERE content IS NOT NULL)"
+            )
+
+        reader = self.conn.cursor()
+        reader.execute("""
+            SELECT bp.id, bp.title, bp.content FROM blog_posts bp
+            LEFT JOIN post_theme_state st ON st.post_id = bp.id
+            WHERE bp.content IS NOT NULL AND (st.post_id IS NULL OR st.taxonomy_hash != ?)
+        """, (self.matcher.hash,))
+        total = 0
+        while True:
+            rows = reader.fetchmany(REFRESH_BATCH_SIZE)
+            if not rows:
+                break
+            records = []
+            for post_id, title, content in rows:
+                hits = self.matcher.match(f"{title or ''}\n{content or ''}")
+                weights = self.matcher.weights(hits)
+                records.extend((post_id, theme, count, round(weights[theme], 4)) for theme, count in hits.items())
+            ids = [(row[0],) for row in rows]
+            self.cursor.executemany("DELETE FROM post_themes WHERE post_id = ?", ids)
+            self.cursor.executemany(
+                "INSERT INTO post_themes (post_id, theme, hits, weight) VALUES (?, ?, ?, ?)", records
+            )
+            self.cursor.executemany(
+                "INSERT OR REPLACE INTO post_theme_state (post_id, taxonomy_hash) VALUES (?, ?)",
+                [(row[0], self.matcher.hash) for row in rows]
+            )
+            total += len(rows)
+
+        if total or force:
+            self.build_aggregates()
+        self.conn.commit()
+        return total
+
+    def build_aggregates(self):
+        """테마별 포스트 수 / 적중 수 / 가중치 합 / 최신 포스트 / 많이 언급된 종목 (중복 포스트 제외)"""
+        duplicate_filter = self.duplicate_filter_sql()
+        self.cursor.execute(f"""
+            SELECT theme, COUNT(*), SUM(hits), SUM(weight), MAX(post_id)
+            FROM post_themes pt WHERE 1 = 1{duplicate_filter} GROUP BY theme
+        """)
+        aggregates = self.cursor.fetchall()
+
+        tickers = defaultdict(list)
+        if self.table_exists('sentiments'):
+            self.cursor.execute(f"""
+                SELECT pt.theme, s.ticker, COUNT(*) AS cnt
+                FROM post_themes pt
+                JOIN sentiments s ON s.log_no = pt.post_id
+                WHERE 1 = 1{duplicate_filter}
+                GROUP BY pt.theme, s.ticker
+                ORDER BY pt.theme, cnt DESC, s.ticker
+            """)
+            for theme, ticker, count in self.cursor.fetchall():
+                if len(tickers[theme]) < THEME_TOP_TICKERS:
+                    tickers[theme].append({'ticker': ticker, 'count': count})
+
+        self.cursor.execute("DELETE FROM theme_aggregates")
+        self.cursor.executemany("""
+            INSERT INTO theme_aggregates (theme, post_count, total_hits, weight_sum, latest_post_id, top_tickers)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [
+            (theme, post_count, total_hits, round(weight_sum, 4), latest,
+             json.dumps(tickers.get(theme, []), ensure_ascii=False))
+            for theme, post_count, total_hits, weight_sum, latest in aggregates
+        ])
+
+    def table_exists(self, name):
+        return self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        ).fetchone() is not None
+
+    def duplicate_filter_sql(self):
+        """post_dedup.py가 중복으로 표시한 포스트 제외 (분석 행은 남아 있으므로 집계에서 거름)"""
+        if not self.table_exists('post_minhash_signatures'):
+            return ''
+        return " AND pt.post_id NOT IN (SELECT post_id FROM post_minhash_signatures WHERE duplicate_of IS NOT NULL)"
+
+    def posts_for_theme(self, theme, limit=20):
+        """테마 비중 순 포스트 [(post_id, hits, weight)]"""
+        self.cursor.execute(f"""
+            SELECT post_id, hits, weight FROM post_themes pt
+            WHERE theme = ?{self.duplicate_filter_sql()} ORDER BY weight DESC, post_id DESC LIMIT ?
+        """, (theme, limit))
+        return self.cursor.fetchall()
+
+    def close(self):
+        """DB 연결 종료"""
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="포스트 투자 테마 분류 / 테마별 집계")
+    parser.add_argument('--db', default='database.db', help="SQLite DB 경로")
+    parser.add_argument('--taxonomy', default=DEFAULT_TAXONOMY_PATH, help="테마 분류표 JSON 경로")
+    parser.add_argument('--force', action='store_true', help="전체 포스트 다시 분류")
+    parser.add_argument('--theme', help="테마 비중 순 포스트 조회")
+    args = parser.parse_args()
+
+    indexer = ThemeIndexer(args.db, load_taxonomy(args.taxonomy))
+    try:
+        print(f"테마 분류 완료: {indexer.refresh(args.force)}개 포스트 ({len(indexer.matcher.themes)}개 테마)")
+        if args.theme:
+            for post_id, hits, weight in indexer.posts_for_theme(args.theme):
+                print(f"  #{post_id}: 적중 {hits}회, 비중 {weight:.2f}")
+    finally:
+        indexer.close()
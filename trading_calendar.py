@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+KRX / 미국(NYSE·NASDAQ) 거래일 캘린더
+거래일을 1970-01-01 기준 일수의 정렬된 int32 배열로 보관하고 searchsorted로
+임의 날짜 → 거래일 인덱스(당일 또는 다음 거래일)를 벡터 연산으로 변환
+포스트 작성일(주말/휴일 포함)과 주가(거래일만 존재)를 맞출 때 사용
+캘린더 범위는 휴장일 목록이 있는 연도로 한정 - 목록이 없는 연도의 평일을 거래일로 추측하지 않음
+(새 연도는 휴장일을 추가해야 범위가 늘어남)
+"""
+
+import argparse
+import sqlite3
+import sys
+
+import numpy as np
+
+from post_dates import created_dates_array
+
+# 휴장일 (주말 제외) - 연도별로 빠짐없이 기록 (기록된 연도가 곧 캘린더 범위)
+KRX_HOLIDAYS = [
+    '2023-01-23', '2023-01-24', '2023-03-01', '2023-05-01', '2023-05-05', '2023-05-29',
+    '2023-06-06', '2023-08-15', '2023-09-28', '2023-09-29', '2023-10-02', '2023-10-03',
+    '2023-10-09', '2023-12-25', '2023-12-29',
+    '2024-01-01', '2024-02-09', '2024-02-12', '2024-03-01', '2024-04-10', '2024-05-01',
+    '2024-05-06', '2024-05-15', '2024-06-06', '2024-08-15', '2024-09-16', '2024-09-17',
+    '2024-09-18', '2024-10-01', '2024-10-03', '2024-10-09', '2024-12-25', '2024-12-31',
+    '2025-01-01', '2025-01-27', '2025-01-28', '2025-01-29', '2025-01-30', '2025-03-03',
+    '2025-05-01', '2025-05-05', '2025-05-06', '2025-06-03', '2025-06-06', '2025-08-15',
+    '2025-10-03', '2025-10-06', '2025-10-07', '2025-10-08', '2025-10-09', '2025-12-25',
+    '2025-12-31',
+    '2026-01-01', '2026-02-16', '2026-02-17', '2026-02-18', '2026-03-02', '2026-05-01',
+    '2026-05-05', '2026-05-25', '2026-06-03', '2026-08-17', '2026-09-24', '2026-09-25',
+    '2026-10-05', '2026-10-09', '2026-12-25', '2026-12-31',
+]
+
+US_HOLIDAYS = [
+    '2023-01-02', '2023-01-16', '2023-02-20', '2023-04-07', '2023-05-29', '2023-06-19',
+    '2023-07-04', '2023-09-04', '2023-11-23', '2023-12-25',
+    '2024-01-01', '2024-01-15', '2024-02-19', '2024-03-29', '2024-05-27', '2024-06-19',
+    '2024-07-04', '2024-09-02', '2024-11-28', '2024-12-25',
+    '2025-01-01', '2025-01-09', '2025-01-20', '2025-02-17', '2025-04-18', '2025-05-26',
+    '2025-06-19', '2025-07-04', '2025-09-01', '2025-11-27', '2025-12-25',
+    '2026-01-01', '2026-01-19', '2026-02-16', '2026-04-03', '2026-05-25', '2026-06-19',
+    '2026-07-03', '2026-09-07', '2026-11-26', '2026-12-25',
+]
+
+KRX_MARKETS = {'KRX', 'KOSPI', 'KOSDAQ', 'KONEX'}
+
+
+def to_day_numbers(dates):
+    """date / 문자열 / datetime64 (배열) → 1970-01-01 기준 일수 int64 배열"""
+    return np.asarray(dates, dtype='datetime64[D]').astype(np.int64)
+
+
+def holiday_years(holidays):
+    """휴장일 목록이 있는 연도 범위 (첫 연도, 마지막 연도) - 중간에 빠진 연도가 있으면 ValueError"""
+    years = sorted({int(day[:4]) for day in holidays})
+    if years != list(range(years[0], years[-1] + 1)):
+        raise ValueError(f"휴장일 목록에 빠진 연도가 있습니다: {years}")
+    return years[0], years[-1]
+
+
+class TradingCalendar:
+    def __init__(self, name, holidays):
+        self.name = name
+        first_year, last_year = holiday_years(holidays)
+        self.start = np.datetime64(f"{first_year}-01-01", 'D')
+        self.end = np.datetime64(f"{last_year}-12-31", 'D')
+        days = np.arange(self.start, self.end + 1)
+        self.days = days[np.is_busday(days, holidays=holidays)].astype(np.int64).astype(np.int32)
+
+    def __len__(self):
+        return len(self.days)
+
+    def covers(self, dates):
+        """휴장일 목록이 있는 범위 안의 날짜인지"""
+        numbers = to_day_numbers(dates)
+        return (numbers >= self.start.astype(np.int64)) & (numbers <= self.end.astype(np.int64))
+
+    def index_on_or_after(self, dates):
+        """해당 날짜 또는 다음 거래일의 인덱스
+        캘린더 범위 밖이거나 범위 안에 다음 거래일이 없으면(마지막 휴장일 이후) -1 - 마지막 거래일로 당기지 않음"""
+        indices = np.searchsorted(self.days, to_day_numbers(dates), side='left')
+        return np.where(self.covers(dates) & (indices < len(self.days)), indices, -1)
+
+    def index_on_or_before(self, dates):
+        """해당 날짜 또는 직전 거래일의 인덱스 (범위 이전이면 -1)"""
+        return np.searchsorted(self.days, to_day_numbers(dates), side='right') - 1
+
+    def day_at(self, indices):
+        """거래일 인덱스 → datetime64[D] (-1은 NaT)"""
+        indices = np.asarray(indices)
+        days = self.days[np.maximum(indices, 0)].astype('datetime64[D]')
+        return np.where(indices >= 0, days, np.datetime64('NaT', 'D'))
+
+    def next_trading_day(self, dates):
+        """해당 날짜 또는 다음 거래일 (캘린더로 알 수 없으면 NaT)"""
+        return self.day_at(self.index_on_or_after(dates))
+
+    def is_trading_day(self, dates):
+        numbers = to_day_numbers(dates)
+        indices = np.minimum(np.searchsorted(self.days, numbers), len(self.days) - 1)
+        return self.days[indices] == numbers
+
+    def trading_days(self, start, end):
+        """start~end 사이 거래일 배열 (datetime64[D]) - 캘린더 범위 밖 구간은 제외"""
+        first = np.searchsorted(self.days, to_day_numbers(start), side='left')
+        return self.day_at(np.arange(first, self.index_on_or_before(end) + 1))
+
+    def count_between(self, start_dates, end_dates):
+        """두 날짜 사이 거래일 수 (end 포함, start 제외)"""
+        return self.index_on_or_before(end_dates) - self.index_on_or_before(start_dates)
+
+
+KRX_CALENDAR = TradingCalendar('KRX', KRX_HOLIDAYS)
+US_CALENDAR = TradingCalendar('US', US_HOLIDAYS)
+
+
+def calendar_for(market=None, ticker=None):
+    """거래소(merry_mentioned_stocks.market) 또는 종목 코드로 캘린더 선택 - 6자리 숫자 코드는 KRX"""
+    if market:
+        return KRX_CALENDAR if market.upper() in KRX_MARKETS else US_CALENDAR
+    if ticker and ticker.isdigit() and len(ticker) == 6:
+        return KRX_CALENDAR
+    return US_CALENDAR
+
+
+def align_sentiments(conn):
+    """sentiments 전체(중복 포스트 제외)를 '작성일 당일 또는 다음 거래일' 종가에 맞춤
+    (종목 번호, 일수)를 하나의 정수 키로 합쳐 전체 행을 searchsorted 한 번으로 조회
+    반환: [(sentiment id, ticker, post_date, trade_date, close_price)] - 가격이 없으면 trade_date/close_price는 None"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'post_minhash_signatures'")
+    # post_dedup.py가 중복으로 표시한 포스트의 감정 행은 제외
+    duplicate_filter = (
+        "WHERE bp.id NOT IN (SELECT post_id FROM post_minhash_signatures WHERE duplicate_of IS NOT NULL)"
+        if cursor.fetchone() else ''
+    )
+    cursor.execute(f"""
+        SELECT s.id, s.ticker, bp.created_date, COALESCE(ms.market, '')
+        FROM sentiments s
+        JOIN blog_posts bp ON bp.id = s.log_no
+        LEFT JOIN merry_mentioned_stocks ms ON ms.ticker = s.ticker
+        {duplicate_filter}
+        ORDER BY s.id
+    """)
+    rows = cursor.fetchall()
+    cursor.execute("SELECT ticker, trade_date, close_price FROM stock_daily_prices")
+    price_rows = cursor.fetchall()
+    if not rows:
+        return []
+
+    tickers = sorted({row[1] for row in rows} | {row[0] for row in price_rows})
+    ticker_ids = {ticker: i for i, ticker in enumerate(tickers)}
+    post_dates = created_dates_array([row[2] for row in rows])
+    valid = ~np.isnat(post_dates)
+
+    # 거래소 캘린더 기준 당일/다음 거래일 (시장별로 한 번씩)
+    # 캘린더 범위 밖 작성일은 작성일 그대로 두고 그 이후 첫 가격 행에 맞춤 (가격은 거래일에만 있음)
+    trade_days = np.full(len(rows), np.iinfo(np.int64).max, dtype=np.int64)
+    markets = np.array([calendar_for(row[3] or None, row[1]).name for row in rows])
+    for calendar in (KRX_CALENDAR, US_CALENDAR):
+        selected = valid & (markets == calendar.name)
+        if selected.any():
+            indices = calendar.index_on_or_after(post_dates[selected])
+            in_range = indices >= 0
+            days = np.where(
+                calendar.covers(post_dates[selected]), np.iinfo(np.int64).max, to_day_numbers(post_dates[selected])
+            )
+            days[in_range] = calendar.days[indices[in_range]]
+            trade_days[selected] = days
+
+    shift = np.int64(1) << 32
+    price_keys = np.array(
+        [ticker_ids[ticker] * shift + int(np.datetime64(str(trade_date)[:10], 'D').astype(np.int64))
+         for ticker, trade_date, _ in price_rows],
+        dtype=np.int64
+    )
+    closes = np.array([row[2] for row in price_rows], dtype=np.float64)
+    order = np.argsort(price_keys)
+    price_keys, closes = price_keys[order], closes[order]
+
+    row_ticker_ids = np.array([ticker_ids[row[1]] for row in rows], dtype=np.int64)
+    query_keys = row_ticker_ids * shift + np.minimum(trade_days, shift - 1)
+    positions = np.searchsorted(price_keys, query_keys, side='left')
+    found = valid & (positions < len(price_keys))
+    found[found] &= (price_keys[positions[found]] // shift) == row_ticker_ids[found]
+
+    results = []
+    for i, row in enumerate(rows):
+        post_date = str(post_dates[i]) if valid[i] else None
+        if found[i]:
+            key = price_keys[positions[i]]
+            trade_date = str(np.int64(key % shift).astype('datetime64[D]'))
+            results.append((row[0], row[1], post_date, trade_date, float(closes[positions[i]])))
+        else:
+            results.append((row[0], row[1], post_date, None, None))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="거래일 캘린더 / 감정-주가 정렬")
+    parser.add_argument('--db', default='database.db', help="SQLite DB 경로")
+    parser.add_argument('--next', metavar='DATE', help="해당 날짜의 다음 거래일 출력")
+    parser.add_argument('--market', default='KRX', help="--next에 사용할 거래소 (KRX, KOSPI, NASDAQ 등)")
+    args = parser.parse_args()
+
+    if args.next:
+        calendar = calendar_for(args.market)
+        next_day = calendar.next_trading_day(args.next)
+        if np.isnat(next_day):
+            print(f"❌ {calendar.name} {args.next}: 휴장일 목록 범위({calendar.start}~{calendar.end}) 안에 "
+                  f"다음 거래일이 없음 (trading_calendar.py에 휴장일 추가 필요)")
+            sys.exit(1)
+        print(f"{calendar.name} {args.next} → {next_day}")
+    else:
+        conn = sqlite3.connect(args.db)
+        try:
+            aligned = align_sentiments(conn)
+            matched = sum(1 for row in aligned if row[3] is not None)
+            print(f"감정-주가 정렬: {len(aligned)}건 중 {matched}건 가격 매칭")
+        finally:
+            conn.close()
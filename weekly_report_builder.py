@@ -0,0 +1,347 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+메르 주간보고 정량 데이터 사전 계산 (docs/weekly-report-requirements.md)
+주간(월~일) 단위로 언급 상위 종목, 감정 변화, 언급 이후 주가 변화, 신규 언급 종목을
+SQL 집계 + NumPy 가격 배열 연산으로 한 번에 계산하여 weekly_reports에 주당 1행으로 저장
+주마다 입력(포스트 작성일/제목, 감정/언급 집계, 그 주 종가) 지문을 source_hash로 남겨 바뀐 주만 다시 계산
+(수집 배치는 보통 최근 주만 바꿈 - 작성일이 바뀐 포스트는 옮겨 간 주와 빠져나온 주가 모두 다시 계산됨)
+'최신 종가 대비 변화율'은 지문에 넣지 않으므로 해당 주를 다시 만든 시점 기준 - 전체 갱신은 --force
+요약/인사이트 문장은 Claude 직접 분석 영역이므로 여기서 만들지 않음
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from post_dates import created_dates_array
+
+TOP_TICKERS = 10
+# 종가 조회 시 IN (...) 한 번에 넘기는 종목 수
+PRICE_QUERY_CHUNK_SIZE = 500
+
+SCHEMA_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS weekly_reports (
+        week_key TEXT PRIMARY KEY,
+        period_start DATE NOT NULL,
+        period_end DATE NOT NULL,
+        total_posts INTEGER NOT NULL,
+        payload TEXT NOT NULL,
+        source_hash TEXT,
+        built_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+]
+
+
+def week_key(week_start):
+    """주 시작일(월요일) → '2025-W34' 형식 ISO 주차"""
+    year, week, _ = week_start.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def week_label(week_start):
+    """'2025년 8월 3주차' 형식 (목요일이 속한 달 기준)"""
+    thursday = week_start + timedelta(days=3)
+    return f"{thursday.year}년 {thursday.month}월 {(thursday.day - 1) // 7 + 1}주차"
+
+
+def monday_of(dates):
+    """datetime64[D] 배열의 주 시작일(월요일) - 1970-01-01은 목요일"""
+    days = dates.astype('int64')
+    return (days - (days + 3) % 7).astype('datetime64[D]')
+
+
+class WeeklyReportBuilder:
+    def __init__(self, db_path='database.db'):
+        self.conn = sqlite3.connect(db_path)
+        self.cursor = self.conn.cursor()
+
+    def table_exists(self, name):
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,))
+        return self.cursor.fetchone() is not None
+
+    def ensure_schema(self):
+        for statement in SCHEMA_STATEMENTS:
+            self.cursor.execute(statement)
+        # source_hash 이전에 만들어진 테이블 - 지문이 없으므로 다음 실행에서 모든 주를 한 번 다시 계산
+        self.cursor.execute("PRAGMA table_info(weekly_reports)")
+        if 'source_hash' not in {row[1] for row in self.cursor.fetchall()}:
+            self.cursor.execute("ALTER TABLE weekly_reports ADD COLUMN source_hash TEXT")
+
+    def stored_hashes(self):
+        self.cursor.execute("SELECT week_key, source_hash FROM weekly_reports")
+        return dict(self.cursor.fetchall())
+
+    def load_post_weeks(self):
+        """포스트별 작성일/주 시작일을 임시 테이블로 만들어 SQL 집계에 사용
+        (post_dedup.py가 중복으로 표시한 포스트는 포스트 수 / 종목 집계에서 제외)"""
+        duplicate_filter = ''
+        if self.table_exists('post_minhash_signatures'):
+            duplicate_filter = """
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM post_minhash_signatures pms
+                    WHERE pms.post_id = bp.id AND pms.duplicate_of IS NOT NULL
+                )"""
+        self.cursor.execute(f"SELECT bp.id, bp.title, bp.created_date FROM blog_posts bp{duplicate_filter}")
+        rows = self.cursor.fetchall()
+        post_ids = np.array([row[0] for row in rows], dtype=np.int64)
+        titles = [row[1] for row in rows]
+        dates = created_dates_array([row[2] for row in rows])
+
+        valid = ~np.isnat(dates)
+        post_ids, dates = post_ids[valid], dates[valid]
+        titles = [title for title, ok in zip(titles, valid) if ok]
+        weeks = monday_of(dates)
+
+        self.cursor.execute("DROP TABLE IF EXISTS temp.post_weeks")
+        self.cursor.execute("""
+            CREATE TEMP TABLE post_weeks (
+                post_id INTEGER PRIMARY KEY,
+                post_date TEXT NOT NULL,
+                week_start TEXT NOT NULL
+            )
+        """)
+        self.cursor.executemany(
+            "INSERT INTO temp.post_weeks (post_id, post_date, week_start) VALUES (?, ?, ?)",
+            zip(post_ids.tolist(), dates.astype(str).tolist(), weeks.astype(str).tolist())
+        )
+        return post_ids, titles, dates, weeks
+
+    def aggregate_mentions(self):
+        """(주, 종목)별 포스트 수/감정 분포/최초 언급일 - SQL 집계"""
+        self.cursor.execute("""
+            SELECT pw.week_start, s.ticker,
+                   COUNT(DISTINCT s.log_no),
+                   AVG(s.sentiment_score),
+                   SUM(s.sentiment = 'positive'),
+                   SUM(s.sentiment = 'negative'),
+                   SUM(s.sentiment = 'neutral'),
+                   MIN(pw.post_date)
+            FROM sentiments s
+            JOIN temp.post_weeks pw ON pw.post_id = s.log_no
+            GROUP BY pw.week_start, s.ticker
+        """)
+        aggregates = self.cursor.fetchall()
+
+        occurrences = {}
+        if self.table_exists('merry_post_stock_mentions'):
+            self.cursor.execute("""
+                SELECT pw.week_start, m.ticker, COUNT(*)
+                FROM merry_post_stock_mentions m
+                JOIN temp.post_weeks pw ON pw.post_id = m.log_no
+                GROUP BY pw.week_start, m.ticker
+            """)
+            occurrences = {(week, ticker): count for week, ticker, count in self.cursor.fetchall()}
+
+        return aggregates, occurrences
+
+    def load_price_arrays(self, tickers):
+        """종목별 (거래일 배열, 종가 배열) - 다시 계산할 주에 나온 종목만"""
+        if not tickers or not self.table_exists('stock_daily_prices'):
+            return {}
+        tickers = sorted(tickers)
+        grouped = defaultdict(lambda: ([], []))
+        for start in range(0, len(tickers), PRICE_QUERY_CHUNK_SIZE):
+            chunk = tickers[start:start + PRICE_QUERY_CHUNK_SIZE]
+            self.cursor.execute(f"""
+                SELECT ticker, trade_date, close_price FROM stock_daily_prices
+                WHERE ticker IN ({','.join('?' * len(chunk))})
+                ORDER BY ticker, trade_date
+            """, chunk)
+            for ticker, trade_date, close_price in self.cursor.fetchall():
+                grouped[ticker][0].append(str(trade_date)[:10])
+                grouped[ticker][1].append(close_price)
+        return {
+            ticker: (np.array(dates, dtype='datetime64[D]'), np.array(closes, dtype=np.float64))
+            for ticker, (dates, closes) in grouped.items()
+        }
+
+    def weekly_price_fingerprints(self):
+        """(주 시작일, 종목)별 종가 지문 - 그 주 종가가 백필/수정되면 달라짐 (SQL 집계만 읽음)"""
+        if not self.table_exists('stock_daily_prices'):
+            return {}
+        self.cursor.execute("""
+            SELECT date(SUBSTR(trade_date, 1, 10), 'weekday 0', '-6 days') AS week_start, ticker,
+                   COUNT(*), TOTAL(close_price)
+            FROM stock_daily_prices
+            GROUP BY week_start, ticker
+        """)
+        return {(week, ticker): values for week, ticker, *values in self.cursor.fetchall()}
+
+    def load_names(self):
+        if not self.table_exists('merry_mentioned_stocks'):
+            return {}
+        self.cursor.execute("SELECT ticker, name FROM merry_mentioned_stocks")
+        return dict(self.cursor.fetchall())
+
+    @staticmethod
+    def price_moves(prices, first_dates, week_ends):
+        """언급일 이후 첫 거래일 종가 대비 주말/최신 종가 변화율 (벡터 연산)"""
+        count = len(first_dates)
+        base = np.full(count, np.nan)
+        to_week_end = np.full(count, np.nan)
+        to_latest = np.full(count, np.nan)
+        if prices is None or len(prices[0]) == 0:
+            return base, to_week_end, to_latest
+
+        dates, closes = prices
+        start = np.searchsorted(dates, first_dates, side='left')
+        end = np.searchsorted(dates, week_ends, side='right') - 1
+        has_base = start < len(dates)
+        base[has_base] = closes[start[has_base]]
+
+        has_end = has_base & (end >= start)
+        to_week_end[has_end] = (closes[end[has_end]] / base[has_end] - 1) * 100
+        to_latest[has_base] = (closes[-1] / base[has_base] - 1) * 100
+        return base, to_week_end, to_latest
+
+    @staticmethod
+    def stock_summaries(aggregates, occurrences, names):
+        """주별 종목 집계 {주 시작일: [(종목 행, 최초 언급일)]} - 가격 항목은 build()에서 채움"""
+        # 종목별 최초 언급 주 (신규 종목 판정)
+        first_week = {}
+        for week, ticker, *_ in aggregates:
+            if ticker not in first_week or week < first_week[ticker]:
+                first_week[ticker] = week
+        avg_scores = {(week, ticker): avg for week, ticker, _, avg, *_ in aggregates}
+
+        summaries = defaultdict(list)
+        for week, ticker, post_count, avg_score, positive, negative, neutral, first_date in aggregates:
+            counts = {'positive': positive, 'negative': negative, 'neutral': neutral}
+            dominant = max(counts, key=counts.get)
+            if list(counts.values()).count(counts[dominant]) > 1:
+                dominant = 'neutral'
+
+            previous = avg_scores.get((str(np.datetime64(week) - 7), ticker))
+            summaries[week].append(({
+                'ticker': ticker,
+                'name': names.get(ticker, ticker),
+                'sentiment': dominant,
+                'mentionCount': occurrences.get((week, ticker), post_count),
+                'postCount': post_count,
+                'avgSentimentScore': round(avg_score or 0.0, 3),
+                'sentimentShift': round(avg_score - previous, 3) if previous is not None and avg_score is not None else None,
+                'firstMentionDate': first_date,
+                'isNewTicker': first_week[ticker] == week,
+            }, first_date))
+        return summaries
+
+    def build(self, weeks_to_store=None, force=False):
+        """입력이 바뀐 주만 계산해 저장 - 저장한 주 수
+        weeks_to_store가 있으면 해당 주차만 지문과 관계없이 다시 계산, force면 전체 다시 계산"""
+        self.ensure_schema()
+        post_ids, titles, dates, weeks = self.load_post_weeks()
+        aggregates, occurrences = self.aggregate_mentions()
+        summaries = self.stock_summaries(aggregates, occurrences, self.load_names())
+        price_fingerprints = self.weekly_price_fingerprints()
+
+        order = np.lexsort((post_ids, weeks))
+        posts_by_week = defaultdict(list)
+        for i in order:
+            posts_by_week[str(weeks[i])].append({
+                'id': int(post_ids[i]), 'title': titles[i], 'publishedAt': str(dates[i])
+            })
+
+        # 주별 입력 지문 (최신 종가 대비 변화율 제외 - 매일 바뀌므로)
+        keys = {week: week_key(date.fromisoformat(week)) for week in posts_by_week}
+        hashes = {}
+        for week, source_posts in posts_by_week.items():
+            rows = summaries.get(week, [])
+            source = [
+                source_posts,
+                [row for row, _ in rows],
+                [price_fingerprints.get((week, row['ticker'])) for row, _ in rows],
+            ]
+            hashes[week] = hashlib.sha1(json.dumps(source, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+
+        stored = self.stored_hashes()
+        if weeks_to_store:
+            targets = {week for week, key in keys.items() if key in weeks_to_store}
+        else:
+            targets = {week for week, key in keys.items() if force or stored.get(key) != hashes[week]}
+            # 포스트가 모두 빠진 주 (작성일 변경 / 삭제 / 중복 표시)
+            current = set(keys.values())
+            self.cursor.executemany(
+                "DELETE FROM weekly_reports WHERE week_key = ?", [(key,) for key in stored if key not in current]
+            )
+
+        prices = self.load_price_arrays({row['ticker'] for week in targets for row, _ in summaries.get(week, [])})
+
+        by_ticker = defaultdict(list)
+        for week in targets:
+            for row, first_date in summaries.get(week, []):
+                by_ticker[row['ticker']].append((week, row, first_date))
+        for ticker, rows in by_ticker.items():
+            first_dates = np.array([first_date for _, _, first_date in rows], dtype='datetime64[D]')
+            week_ends = np.array([week for week, _, _ in rows], dtype='datetime64[D]') + 6
+            base, to_week_end, to_latest = self.price_moves(prices.get(ticker), first_dates, week_ends)
+            for i, (_, row, _) in enumerate(rows):
+                row['priceAtFirstMention'] = None if np.isnan(base[i]) else round(float(base[i]), 4)
+                row['priceChangeToWeekEnd'] = None if np.isnan(to_week_end[i]) else round(float(to_week_end[i]), 2)
+                row['priceChangeToLatest'] = None if np.isnan(to_latest[i]) else round(float(to_latest[i]), 2)
+
+        generated_at = datetime.now().isoformat(timespec='seconds')
+        records = []
+        # "글이 없으면 분석하지 말라" - 포스트가 있는 주만 저장
+        for week in sorted(targets):
+            source_posts = posts_by_week[week]
+            start = date.fromisoformat(week)
+            key = keys[week]
+
+            stocks = sorted((row for row, _ in summaries.get(week, [])), key=lambda s: (-s['mentionCount'], s['ticker']))
+            payload = {
+                'week': key,
+                'weekLabel': week_label(start),
+                'period': f"{start} ~ {start + timedelta(days=6)}",
+                'totalPosts': len(source_posts),
+                'stockAnalysis': stocks[:TOP_TICKERS],
+                'newTickers': [s['ticker'] for s in stocks if s['isNewTicker']],
+                'sourcePosts': source_posts,
+                'generatedAt': generated_at,
+                'analysisMethod': 'precomputed_aggregates',
+            }
+            records.append((
+                key, str(start), str(start + timedelta(days=6)), len(source_posts),
+                json.dumps(payload, ensure_ascii=False, separators=(',', ':')), hashes[week]
+            ))
+
+        self.cursor.executemany("""
+            INSERT OR REPLACE INTO weekly_reports
+                (week_key, period_start, period_end, total_posts, payload, source_hash, built_at)
+            VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, records)
+        self.conn.commit()
+        return len(records)
+
+    def close(self):
+        """DB 연결 종료"""
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="주간보고 정량 데이터 사전 계산")
+    parser.add_argument('--week', action='append', help="저장할 주차 (예: 2025-W34, 여러 번 지정 가능)")
+    parser.add_argument('--recent', type=int, help="최근 N주만 저장")
+    parser.add_argument('--force', action='store_true', help="입력 지문과 관계없이 전체 주 다시 계산 (최신 종가 반영)")
+    parser.add_argument('--db', default='database.db', help="SQLite DB 경로")
+    args = parser.parse_args()
+
+    weeks = set(args.week or [])
+    if args.recent:
+        today = date.today()
+        this_monday = today - timedelta(days=today.weekday())
+        weeks.update(week_key(this_monday - timedelta(weeks=i)) for i in range(args.recent))
+
+    builder = WeeklyReportBuilder(args.db)
+    try:
+        count = builder.build(weeks or None, force=args.force)
+        print(f"주간보고 저장 완료: {count}주")
+    finally:
+        builder.close()